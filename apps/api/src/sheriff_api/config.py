@@ -23,8 +23,53 @@ class Settings(BaseSettings):
     suggestion_queue_key: str = "pixel_sheriff:suggest_jobs:v1"
     media_queue_key: str = "pixel_sheriff:media_jobs:v1"
     prelabel_queue_key: str = "pixel_sheriff:prelabel_jobs:v1"
+    # Push prelabel jobs into per-session live/bulk lanes that the worker dispatches fairly;
+    # false pushes straight onto the FIFO list (for workers that predate the dispatcher).
+    prelabel_fair_queue: bool = True
+    # Sessions whose category match maps, prompts and inference adapter a prelabel worker keeps
+    # between jobs (least recently used dropped first); 0 rebuilds them for every asset.
+    prelabel_context_cache_sessions: int = 64
+    # Assets per bulk prelabel job; each job makes one batch inference call and one proposal insert.
+    # 1 enqueues a job per asset. Live frames are always enqueued one at a time.
+    prelabel_job_assets: int = 8
+    # Florence-2 sessions with several prompts: "combined" sends them as one open-vocabulary query,
+    # "per_prompt" has the trainer decode each prompt against image features it computes once.
+    prelabel_florence_prompt_mode: str = "combined"
+    # Upper bound of the pooled Redis connections shared by all API job queues.
+    redis_max_connections: int = 20
     trainer_inference_base_url: str = "http://trainer:8020"
     trainer_inference_timeout_seconds: float = 15.0
+    trainer_inference_batch_size: int = 32
+    # "auto" uses inotify when available and falls back to polling; "inotify" or "poll" force one.
+    experiment_events_watch: str = "auto"
+    experiment_events_poll_seconds: float = 0.8
+    # "file" keeps the per-project JSON documents; "sql" stores the experiment/model/dataset/deployment
+    # registry in indexed tables on REGISTRY_DATABASE_URL (defaults to DATABASE_URL).
+    registry_backend: str = "file"
+    registry_database_url: str | None = None
+    # Per-process TTL of cached asset totals served by GET /projects/{id}/assets/count; 0 disables caching.
+    asset_count_cache_seconds: float = 30.0
+    # Most files accepted by one POST /projects/{id}/assets/upload-batch request; all of them commit together.
+    asset_upload_batch_max_files: int = 256
+    # Resumable video uploads (POST /projects/{id}/video-uploads): largest accepted file and how long an
+    # unfinished upload is kept after its last chunk.
+    video_upload_max_bytes: int = 50 * 1024**3
+    video_upload_expiry_hours: float = 24.0
+    # Frame extraction splits a video into this many time ranges decoded by concurrent ffmpeg processes
+    # (1 = one pass), never into segments shorter than video_extract_min_segment_frames. Frames are
+    # ingested as they land and committed at least every video_extract_poll_seconds.
+    video_extract_segments: int = 4
+    video_extract_min_segment_frames: int = 50
+    video_extract_commit_frames: int = 50
+    video_extract_poll_seconds: float = 0.5
+    # "pipe" streams frames from ffmpeg's stdout straight into storage; "files" has ffmpeg write them
+    # to a temp directory first.
+    video_extract_mode: str = "pipe"
+    # Video and webcam frames get a perceptual hash at ingest. A frame within frame_dedup_max_distance
+    # bits of its sequence's previous kept frame is "flag"ged (stored, marked near_duplicate_of and left
+    # out of prelabeling) or "skip"ped (not stored); "off" only records the hash.
+    frame_dedup_mode: str = "flag"
+    frame_dedup_max_distance: int = 4
 
     @model_validator(mode="after")
     def apply_database_url_default(self) -> "Settings":
@@ -40,6 +85,12 @@ class Settings(BaseSettings):
             self.database_url = "sqlite+aiosqlite:///./pixel_sheriff.db"
         return self
 
+    def registry_url(self) -> str | None:
+        """Database URL of the SQL registry, or None while the file registry is in use."""
+        if self.registry_backend.strip().lower() != "sql":
+            return None
+        return self.registry_database_url or self.database_url
+
 
 @lru_cache
 def get_settings() -> Settings:
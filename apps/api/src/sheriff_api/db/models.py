@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from pathlib import PurePosixPath
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, Enum, Float, ForeignKey, Integer, JSON, String, UniqueConstraint
+from sqlalchemy import Boolean, CheckConstraint, DateTime, Enum, Float, ForeignKey, Index, Integer, JSON, String, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -91,6 +91,8 @@ class Task(Base):
     kind: Mapped[TaskKind] = mapped_column(Enum(TaskKind, name="taskkind"), nullable=False)
     label_mode: Mapped[TaskLabelMode | None] = mapped_column(Enum(TaskLabelMode, name="tasklabelmode"), nullable=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
+    # Bumped on every category create, update and delete; prelabel workers key cached label maps on it.
+    categories_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -170,6 +172,16 @@ class AssetSequence(Base):
 
 class Asset(Base):
     __tablename__ = "assets"
+    # Keyset pagination orders: created (created_at, id) and path (sort_path, id), also within a folder;
+    # (project_id, checksum) serves the ingest dedup lookup and (project_id, perceptual_hash)
+    # near-duplicate queries over frames.
+    __table_args__ = (
+        Index("ix_assets_project_created_id", "project_id", "created_at", "id"),
+        Index("ix_assets_project_sort_path_id", "project_id", "sort_path", "id"),
+        Index("ix_assets_project_folder_sort_path_id", "project_id", "folder_id", "sort_path", "id"),
+        Index("ix_assets_project_checksum", "project_id", "checksum"),
+        Index("ix_assets_project_perceptual_hash", "project_id", "perceptual_hash"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"), index=True)
@@ -180,6 +192,8 @@ class Asset(Base):
         index=True,
     )
     file_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    # ``relative_path`` at creation; folders and files are never renamed, so it stays current.
+    sort_path: Mapped[str] = mapped_column(String, nullable=False, default="")
     sequence_id: Mapped[str | None] = mapped_column(
         ForeignKey("asset_sequences.id", name="fk_assets_sequence_id", ondelete="SET NULL"),
         nullable=True,
@@ -193,6 +207,8 @@ class Asset(Base):
     width: Mapped[int | None] = mapped_column(Integer, nullable=True)
     height: Mapped[int | None] = mapped_column(Integer, nullable=True)
     checksum: Mapped[str] = mapped_column(String, nullable=False)
+    # 64-bit dHash of video and webcam frames as 16 hex digits (services/frame_dedup.py).
+    perceptual_hash: Mapped[str | None] = mapped_column(String(16), nullable=True)
     metadata_json: Mapped[dict] = mapped_column(JSON, default=dict)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -227,7 +243,10 @@ class Asset(Base):
 
 class Annotation(Base):
     __tablename__ = "annotations"
-    __table_args__ = (UniqueConstraint("asset_id", "task_id", name="uq_annotation_asset_task"),)
+    __table_args__ = (
+        UniqueConstraint("asset_id", "task_id", name="uq_annotation_asset_task"),
+        Index("ix_annotations_project_task_created_id", "project_id", "task_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     asset_id: Mapped[str] = mapped_column(ForeignKey("assets.id"), index=True)
@@ -263,6 +282,7 @@ class PrelabelSession(Base):
     sampling_value: Mapped[float] = mapped_column(Float, nullable=False, default=15.0)
     confidence_threshold: Mapped[float] = mapped_column(Float, nullable=False, default=0.25)
     max_detections_per_frame: Mapped[int] = mapped_column(Integer, nullable=False, default=20)
+    decoding_profile: Mapped[str] = mapped_column(String, nullable=False, default="quality")
     live_mode: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
     input_closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -271,11 +291,57 @@ class PrelabelSession(Base):
     generated_proposals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     skipped_unmatched: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     error_message: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Legacy inline debug log, kept empty; detections now go to prelabel_debug_detections.
     debug_detections_json: Mapped[list] = mapped_column(JSON, default=list)
+    # seq of the session's latest debug detection (0 before the first).
+    debug_detection_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class PrelabelDebugDetection(Base):
+    """One raw detection of a prelabel session, kept for the UI's debug log.
+
+    ``seq`` counts up per session and is the retrieval cursor. Only the latest
+    rows of a session are kept; older ones are deleted as new jobs append.
+    """
+
+    __tablename__ = "prelabel_debug_detections"
+    __table_args__ = (UniqueConstraint("session_id", "seq", name="uq_prelabel_debug_detections_session_seq"),)
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id: Mapped[str] = mapped_column(
+        ForeignKey("prelabel_sessions.id", name="fk_prelabel_debug_detections_session_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    asset_id: Mapped[str] = mapped_column(String, nullable=False)
+    asset_frame_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    label_text: Mapped[str] = mapped_column(String, nullable=False)
+    resolved_category_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    resolved_category_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    bbox_xyxy_json: Mapped[list] = mapped_column(JSON, default=list)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class PrelabelSessionAsset(Base):
+    """An asset a prelabel session has finished, written with its proposals.
+
+    Jobs are delivered at least once; a redelivered job skips the assets recorded here.
+    """
+
+    __tablename__ = "prelabel_session_assets"
+
+    session_id: Mapped[str] = mapped_column(
+        ForeignKey("prelabel_sessions.id", name="fk_prelabel_session_assets_session_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    asset_id: Mapped[str] = mapped_column(String, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class PrelabelProposal(Base):
     __tablename__ = "prelabel_proposals"
 
@@ -152,7 +152,7 @@ async def seed_demo_prelabels(project_id: str, task_id: str) -> dict[str, object
                     timestamp_seconds=float(frame_spec["timestamp_seconds"]),
                     asset_id=frame_spec["id"],
                 )
-                storage.write_bytes(storage_uri, content)
+                storage.write_asset_bytes(storage_uri, content, asset.checksum)
                 db.add(asset)
                 await db.flush()
             created_assets.append(asset)
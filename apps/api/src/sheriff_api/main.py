@@ -12,6 +12,8 @@ from sheriff_api.db.session import engine
 from sheriff_api.errors import http_exception_handler, request_validation_exception_handler
 from sheriff_api.routers import annotations, assets, categories, datasets, deployments, experiments, exports, folders, health, models, prelabels, projects, sequences, tasks, video_imports
 from sheriff_api.services.migrations import run_startup_migrations
+from sheriff_api.services.pagination import NEXT_CURSOR_HEADER
+from sheriff_api.services.queue_client import close_queue_clients
 
 settings = get_settings()
 
@@ -30,6 +32,7 @@ async def lifespan(app: FastAPI):
                 await conn.execute(text(f"ALTER TYPE tasktype ADD VALUE IF NOT EXISTS '{value.value}'"))
     await run_startup_migrations(engine)
     yield
+    await close_queue_clients()
 
 
 app = FastAPI(title="pixel-sheriff", version="0.1.0", lifespan=lifespan)
@@ -42,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(health.router, prefix="/api/v1")
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sheriff_api.db.models import Annotation, Asset, Category, Project, Task
@@ -7,6 +8,16 @@ from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.annotations import AnnotationRead, AnnotationUpsert
 from sheriff_api.services.annotation_payload import PayloadValidationError, normalize_annotation_payload
+from sheriff_api.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    asset_counts,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    project_rows,
+)
 from sheriff_api.services.prelabels import sync_annotation_prelabel_proposals
 
 router = APIRouter(tags=["annotations"])
@@ -75,12 +86,23 @@ async def upsert_annotation(project_id: str, payload: AnnotationUpsert, db: Asyn
     await db.flush()
     await sync_annotation_prelabel_proposals(db, annotation=annotation)
     await db.commit()
+    # Asset totals filtered by annotation status depend on this row.
+    asset_counts.invalidate(project_id)
     await db.refresh(annotation)
     return annotation
 
 
 @router.get("/projects/{project_id}/annotations", response_model=list[AnnotationRead])
-async def list_annotations(project_id: str, task_id: str, db: AsyncSession = Depends(get_db)) -> list[Annotation]:
+async def list_annotations(
+    project_id: str,
+    task_id: str,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_db),
+) -> list[Annotation] | JSONResponse:
+    """List a task's annotations, optionally paged by (created_at, id) with ``limit``/``cursor``."""
     task = await db.get(Task, task_id)
     if task is None or task.project_id != project_id:
         raise api_error(
@@ -89,6 +111,26 @@ async def list_annotations(project_id: str, task_id: str, db: AsyncSession = Dep
             message="Task not found in project",
             details={"project_id": project_id, "task_id": task_id},
         )
+    projection = parse_fields(fields, AnnotationRead)
 
-    result = await db.execute(select(Annotation).where(Annotation.project_id == project_id, Annotation.task_id == task_id))
-    return list(result.scalars().all())
+    stmt = select(Annotation).where(Annotation.project_id == project_id, Annotation.task_id == task_id)
+    next_cursor: str | None = None
+    if limit is None and cursor is None:
+        annotations = list((await db.execute(stmt)).scalars().all())
+    else:
+        page_size = limit or DEFAULT_PAGE_SIZE
+        if cursor:
+            created_at, annotation_id = decode_cursor(cursor, order="created", arity=(2,))
+            stmt = stmt.where(tuple_(Annotation.created_at, Annotation.id) > tuple_(created_at, annotation_id))
+        stmt = stmt.order_by(Annotation.created_at, Annotation.id).limit(page_size + 1)
+        annotations = list((await db.execute(stmt)).scalars().all())
+        if len(annotations) > page_size:
+            annotations = annotations[:page_size]
+            next_cursor = encode_cursor("created", annotations[-1].created_at, annotations[-1].id)
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if projection is not None:
+        items = [AnnotationRead.model_validate(annotation) for annotation in annotations]
+        return JSONResponse(content=project_rows(items, projection), headers=headers)
+    response.headers.update(headers)
+    return annotations
@@ -1,19 +1,53 @@
+import asyncio
 import os
+from pathlib import Path
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, File, Form, Response, UploadFile, status
-from fastapi.responses import FileResponse
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, File, Form, Query, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy import delete, exists, func, select, tuple_
+from sqlalchemy.orm import contains_eager
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sheriff_api.config import get_settings
 from sheriff_api.db.models import Annotation, Asset, Folder, Project, Suggestion
 from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
-from sheriff_api.schemas.assets import AssetCreate, AssetRead
-from sheriff_api.services.asset_ingest import persist_asset_bytes
+from sheriff_api.schemas.assets import (
+    AssetBatchUploadResponse,
+    AssetCount,
+    AssetCreate,
+    AssetRead,
+    AssetUploadError,
+)
+from sheriff_api.services.asset_ingest import (
+    StagedUpload,
+    persist_asset_bytes,
+    persist_staged_assets,
+    stage_stream,
+)
 from sheriff_api.services.folders import ensure_folder_path, split_relative_path
+from sheriff_api.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    asset_counts,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    project_rows,
+)
 from sheriff_api.services.sequences import asset_to_read, refresh_sequence_counts
 from sheriff_api.services.storage import LocalStorage
+from sheriff_api.services.thumbnails import (
+    DEFAULT_THUMBNAIL_SIZE,
+    THUMBNAIL_FORMATS,
+    ThumbnailUnsupportedError,
+    ensure_thumbnail,
+    snap_thumbnail_size,
+    thumbnail_cache_key,
+    thumbnail_etag,
+)
 
 router = APIRouter(tags=["assets"])
 settings = get_settings()
@@ -27,21 +61,118 @@ async def create_asset(project_id: str, payload: AssetCreate, db: AsyncSession =
         raise api_error(status.HTTP_404_NOT_FOUND, code="project_not_found", message="Project not found")
 
     asset = Asset(project_id=project_id, **payload.model_dump())
+    if not asset.file_name:
+        # Path pagination keys on file_name; store the name derived from the legacy metadata/uri.
+        asset.file_name = asset.resolved_file_name
+    folder = await db.get(Folder, asset.folder_id) if asset.folder_id else None
+    if folder is not None:
+        asset.folder = folder
+    asset.sort_path = asset.relative_path
     db.add(asset)
     await db.commit()
+    asset_counts.invalidate(project_id)
     await db.refresh(asset)
     return asset_to_read(asset)
 
 
+def _asset_filters(project_id: str, annotation_status: str | None, folder_id: str | None) -> list[Any]:
+    filters: list[Any] = [Asset.project_id == project_id]
+    if annotation_status:
+        # EXISTS instead of a join so an asset annotated in several tasks is listed once.
+        filters.append(exists().where(Annotation.asset_id == Asset.id, Annotation.status == annotation_status))
+    if folder_id:
+        filters.append(Asset.folder_id == folder_id)
+    return filters
+
+
+async def _page_assets_by_created(
+    db: AsyncSession, filters: list[Any], cursor: str | None, limit: int
+) -> tuple[list[Asset], str | None]:
+    stmt = select(Asset).where(*filters)
+    if cursor:
+        created_at, asset_id = decode_cursor(cursor, order="created", arity=(2,))
+        stmt = stmt.where(tuple_(Asset.created_at, Asset.id) > tuple_(created_at, asset_id))
+    rows = list((await db.execute(stmt.order_by(Asset.created_at, Asset.id).limit(limit + 1))).scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor("created", last.created_at, last.id)
+
+
+async def _page_assets_by_path(
+    db: AsyncSession, filters: list[Any], cursor: str | None, limit: int
+) -> tuple[list[Asset], str | None]:
+    """Page by (``relative_path``, id), the order of the unpaged listing.
+
+    Reads a slice of ix_assets_project_sort_path_id (the folder variant when
+    ``folder_id`` is set), so no query sorts more than the page it returns.
+    """
+    stmt = select(Asset).outerjoin(Folder, Asset.folder_id == Folder.id).options(contains_eager(Asset.folder)).where(*filters)
+    if cursor:
+        sort_path, asset_id = decode_cursor(cursor, order="path", arity=(2,))
+        stmt = stmt.where(tuple_(Asset.sort_path, Asset.id) > tuple_(sort_path, asset_id))
+    rows = list((await db.execute(stmt.order_by(Asset.sort_path, Asset.id).limit(limit + 1))).unique().scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor("path", last.sort_path, last.id)
+
+
 @router.get("/projects/{project_id}/assets", response_model=list[AssetRead])
-async def list_assets(project_id: str, status: str | None = None, db: AsyncSession = Depends(get_db)) -> list[Asset]:
-    stmt = select(Asset).where(Asset.project_id == project_id)
-    if status:
-        stmt = stmt.join(Annotation, Annotation.asset_id == Asset.id).where(Annotation.status == status)
-    result = await db.execute(stmt)
-    assets = list(result.scalars().all())
-    assets.sort(key=lambda asset: (asset.relative_path, asset.id))
-    return [asset_to_read(asset) for asset in assets]
+async def list_assets(
+    project_id: str,
+    response: Response,
+    status: str | None = None,
+    folder_id: str | None = None,
+    order: Literal["path", "created"] = "path",
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_db),
+) -> list[AssetRead] | JSONResponse:
+    """List project assets; without ``limit``/``cursor`` the whole project is returned in one response.
+
+    Paged calls return the cursor of the next page in the ``X-Next-Cursor``
+    header (absent on the last page). ``fields`` trims each item to the named
+    ``AssetRead`` fields (``id`` is always included).
+    """
+    projection = parse_fields(fields, AssetRead)
+    filters = _asset_filters(project_id, status, folder_id)
+    next_cursor: str | None = None
+    if limit is None and cursor is None:
+        if order == "created":
+            result = await db.execute(select(Asset).where(*filters).order_by(Asset.created_at, Asset.id))
+            assets = list(result.scalars().all())
+        else:
+            result = await db.execute(select(Asset).where(*filters).order_by(Asset.sort_path, Asset.id))
+            assets = list(result.scalars().all())
+    elif order == "created":
+        assets, next_cursor = await _page_assets_by_created(db, filters, cursor, limit or DEFAULT_PAGE_SIZE)
+    else:
+        assets, next_cursor = await _page_assets_by_path(db, filters, cursor, limit or DEFAULT_PAGE_SIZE)
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    items = [asset_to_read(asset) for asset in assets]
+    if projection is not None:
+        return JSONResponse(content=project_rows(items, projection), headers=headers)
+    response.headers.update(headers)
+    return items
+
+
+@router.get("/projects/{project_id}/assets/count", response_model=AssetCount)
+async def count_assets(
+    project_id: str,
+    status: str | None = None,
+    folder_id: str | None = None,
+    db: AsyncSession = Depends(get_db),
+) -> AssetCount:
+    key = ("assets", status or None, folder_id or None)
+    total = asset_counts.get(project_id, key)
+    if total is None:
+        stmt = select(func.count()).select_from(Asset).where(*_asset_filters(project_id, status, folder_id))
+        total = int((await db.execute(stmt)).scalar_one())
+        asset_counts.put(project_id, key, total)
+    return AssetCount(total=total)
 
 
 @router.post("/projects/{project_id}/assets/upload", response_model=AssetRead)
@@ -108,6 +239,7 @@ async def upload_asset(
             original_filename=file.filename or file_name,
             source_kind="image",
             commit=True,
+            reuse_identical=True,
         )
     except Exception as exc:
         raise api_error(
@@ -117,11 +249,130 @@ async def upload_asset(
             details={"filename": file.filename, "project_id": project_id},
         ) from exc
 
+    asset_counts.invalidate(project_id)
     return asset_to_read(asset)
 
 
-@router.get("/assets/{asset_id}/content")
-async def get_asset_content(asset_id: str, db: AsyncSession = Depends(get_db)) -> FileResponse:
+@router.post("/projects/{project_id}/assets/upload-batch", response_model=AssetBatchUploadResponse)
+async def upload_asset_batch(
+    project_id: str,
+    files: list[UploadFile] = File(...),
+    relative_paths: list[str] | None = Form(default=None),
+    folder_id: str | None = Form(default=None),
+    db: AsyncSession = Depends(get_db),
+) -> AssetBatchUploadResponse:
+    """Ingest many files in one request and one transaction.
+
+    Each part is streamed to the storage staging area while its checksum and
+    image dimensions are computed, so no file is ever held in memory whole.
+    Files that cannot be accepted (empty, bad relative path) are reported in
+    ``errors``; the rest are committed together.
+    """
+    project = await db.get(Project, project_id)
+    if project is None:
+        raise api_error(
+            status.HTTP_404_NOT_FOUND,
+            code="project_not_found",
+            message="Project not found",
+            details={"project_id": project_id},
+        )
+    if len(files) > settings.asset_upload_batch_max_files:
+        raise api_error(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            code="asset_batch_too_large",
+            message="Too many files in one upload batch",
+            details={"files": len(files), "max_files": settings.asset_upload_batch_max_files},
+        )
+    if relative_paths is not None and len(relative_paths) != len(files):
+        raise api_error(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            code="asset_relative_paths_mismatch",
+            message="relative_paths must have one entry per file",
+            details={"files": len(files), "relative_paths": len(relative_paths)},
+        )
+
+    base_folder: Folder | None = None
+    if folder_id:
+        base_folder = await db.get(Folder, folder_id)
+        if base_folder is None or base_folder.project_id != project_id:
+            raise api_error(
+                status.HTTP_404_NOT_FOUND,
+                code="folder_not_found",
+                message="Folder not found",
+                details={"project_id": project_id, "folder_id": folder_id},
+            )
+
+    storage.ensure_project_dirs(project_id)
+    staging_dir = storage.staging_dir()
+    folders_by_path: dict[str, Folder | None] = {}
+    uploads: list[StagedUpload] = []
+    errors: list[AssetUploadError] = []
+    try:
+        for index, file in enumerate(files):
+            relative_path = relative_paths[index] if relative_paths is not None else None
+            folder = base_folder
+            file_name = file.filename or "upload.bin"
+            if relative_path:
+                try:
+                    folder_path, file_name = split_relative_path(relative_path, file_name)
+                except ValueError as exc:
+                    errors.append(
+                        AssetUploadError(
+                            index=index, filename=file.filename, code="asset_relative_path_invalid", message=str(exc)
+                        )
+                    )
+                    continue
+                if folder_path not in folders_by_path:
+                    folders_by_path[folder_path] = await ensure_folder_path(db, project_id, folder_path)
+                folder = folders_by_path[folder_path]
+
+            staged = await asyncio.to_thread(stage_stream, file.file, staging_dir)
+            if staged.size_bytes == 0:
+                staged.path.unlink(missing_ok=True)
+                errors.append(
+                    AssetUploadError(
+                        index=index, filename=file.filename, code="uploaded_file_empty", message="Uploaded file is empty"
+                    )
+                )
+                continue
+            uploads.append(
+                StagedUpload(
+                    staged=staged,
+                    file_name=file_name,
+                    mime_type=file.content_type or "application/octet-stream",
+                    folder=folder,
+                    original_filename=file.filename or file_name,
+                )
+            )
+    except BaseException:
+        for upload in uploads:
+            upload.staged.path.unlink(missing_ok=True)
+        raise
+
+    if not uploads:
+        # Folders created for rejected files are rolled back with nothing to show for them.
+        await db.rollback()
+        return AssetBatchUploadResponse(items=[], errors=errors)
+
+    try:
+        results = await persist_staged_assets(db=db, storage=storage, project_id=project_id, uploads=uploads)
+    except Exception as exc:
+        raise api_error(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            code="asset_persist_failed",
+            message="Failed to persist uploaded assets",
+            details={"files": len(uploads), "project_id": project_id},
+        ) from exc
+
+    asset_counts.invalidate(project_id)
+    return AssetBatchUploadResponse(
+        items=[asset_to_read(asset) for asset, _reused in results],
+        errors=errors,
+        reused=sum(1 for _asset, reused in results if reused),
+    )
+
+
+async def _resolve_asset_file(db: AsyncSession, asset_id: str) -> tuple[Asset, str, Path]:
     asset = await db.get(Asset, asset_id)
     if asset is None:
         raise api_error(status.HTTP_404_NOT_FOUND, code="asset_not_found", message="Asset not found")
@@ -152,10 +403,54 @@ async def get_asset_content(asset_id: str, db: AsyncSession = Depends(get_db)) -
             message="Asset file not found on disk",
             details={"asset_id": asset_id},
         )
+    return asset, storage_uri, path
+
 
+@router.get("/assets/{asset_id}/content")
+async def get_asset_content(asset_id: str, db: AsyncSession = Depends(get_db)) -> FileResponse:
+    asset, _storage_uri, path = await _resolve_asset_file(db, asset_id)
     return FileResponse(path=path, media_type=asset.mime_type, filename=os.path.basename(path))
 
 
+@router.get("/assets/{asset_id}/thumbnail")
+async def get_asset_thumbnail(
+    asset_id: str,
+    request: Request,
+    size: int = Query(default=DEFAULT_THUMBNAIL_SIZE, ge=1, le=4096),
+    format: Literal["webp", "jpeg"] = Query(default="webp"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    asset, storage_uri, path = await _resolve_asset_file(db, asset_id)
+    edge = snap_thumbnail_size(size)
+    cache_key = thumbnail_cache_key(storage_uri, path)
+    # Derivatives are keyed by the stored file's identity, so a matching validator never goes stale.
+    headers = {
+        "ETag": thumbnail_etag(cache_key, edge, format),
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        thumbnail_path = await asyncio.to_thread(
+            ensure_thumbnail,
+            storage,
+            path,
+            cache_key=cache_key,
+            size=edge,
+            fmt=format,
+        )
+    except ThumbnailUnsupportedError as exc:
+        raise api_error(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            code="asset_thumbnail_unsupported",
+            message="Asset cannot be rendered as a thumbnail",
+            details={"asset_id": asset_id, "mime_type": asset.mime_type, "reason": str(exc)},
+        ) from exc
+    return FileResponse(path=thumbnail_path, media_type=THUMBNAIL_FORMATS[format], headers=headers)
+
+
 @router.delete("/projects/{project_id}/assets/{asset_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_asset(project_id: str, asset_id: str, db: AsyncSession = Depends(get_db)) -> Response:
     asset = await db.get(Asset, asset_id)
@@ -164,6 +459,7 @@ async def delete_asset(project_id: str, asset_id: str, db: AsyncSession = Depend
 
     storage_uri = asset.metadata_json.get("storage_uri") if isinstance(asset.metadata_json, dict) else None
     sequence_id = asset.sequence_id
+    checksum = asset.checksum
 
     await db.execute(delete(Annotation).where(Annotation.asset_id == asset_id))
     await db.execute(delete(Suggestion).where(Suggestion.asset_id == asset_id))
@@ -171,10 +467,11 @@ async def delete_asset(project_id: str, asset_id: str, db: AsyncSession = Depend
     if sequence_id:
         await refresh_sequence_counts(db, sequence_id)
     await db.commit()
+    asset_counts.invalidate(project_id)
 
     if isinstance(storage_uri, str) and storage_uri:
         try:
-            storage.delete_file(storage_uri)
+            storage.delete_asset_file(storage_uri, checksum)
         except ValueError:
             pass
 
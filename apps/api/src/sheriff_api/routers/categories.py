@@ -1,7 +1,7 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sheriff_api.config import get_settings
@@ -9,11 +9,11 @@ from sheriff_api.db.models import Annotation, Category, Task
 from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.categories import CategoryCreate, CategoryRead, CategoryUpdate
-from sheriff_api.services.dataset_store import DatasetStore
+from sheriff_api.services.dataset_store import create_dataset_store
 
 router = APIRouter(tags=["categories"])
 settings = get_settings()
-dataset_store = DatasetStore(settings.storage_root)
+dataset_store = create_dataset_store(settings.storage_root, database_url=settings.registry_url())
 
 
 def _task_has_dataset_versions(project_id: str, task_id: str) -> bool:
@@ -22,6 +22,10 @@ def _task_has_dataset_versions(project_id: str, task_id: str) -> bool:
     return isinstance(items, list) and len(items) > 0
 
 
+async def _bump_categories_version(db: AsyncSession, task_id: str) -> None:
+    await db.execute(update(Task).where(Task.id == task_id).values(categories_version=Task.categories_version + 1))
+
+
 def _payload_references_category(payload_json: Any, category_id: str, task_kind: str | None = None) -> bool:
     if not isinstance(payload_json, dict):
         return False
@@ -82,6 +86,7 @@ async def create_category(project_id: str, payload: CategoryCreate, db: AsyncSes
 
     category = Category(project_id=project_id, task_id=payload.task_id, name=payload.name, display_order=payload.display_order)
     db.add(category)
+    await _bump_categories_version(db, payload.task_id)
     await db.commit()
     await db.refresh(category)
     return category
@@ -124,6 +129,7 @@ async def patch_category(category_id: str, payload: CategoryUpdate, db: AsyncSes
         value = getattr(payload, field)
         if value is not None:
             setattr(category, field, value)
+    await _bump_categories_version(db, category.task_id)
     await db.commit()
     await db.refresh(category)
     return category
@@ -176,5 +182,6 @@ async def delete_category(category_id: str, db: AsyncSession = Depends(get_db))
         )
 
     await db.delete(category)
+    await _bump_categories_version(db, category.task_id)
     await db.commit()
     return {"ok": True, "category_id": category_id}
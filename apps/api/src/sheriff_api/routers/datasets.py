@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import Any
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,10 +19,17 @@ from sheriff_api.schemas.datasets import (
     DatasetVersionAssetsResponse,
     DatasetVersionCreateRequest,
     DatasetVersionEnvelope,
+    DatasetVersionExportJobResponse,
     DatasetVersionExportResponse,
     DatasetVersionListResponse,
 )
-from sheriff_api.services.dataset_export_builder import build_dataset_export
+from sheriff_api.services.dataset_export_builder import (
+    EXPORT_JOB_TYPE,
+    build_dataset_export,
+    export_storage_uri,
+    read_export_job_status,
+    write_export_job_status,
+)
 from sheriff_api.services.dataset_selection import (
     build_category_snapshot,
     class_counts,
@@ -33,13 +40,15 @@ from sheriff_api.services.dataset_selection import (
     to_selection_payload,
     validate_split_ratios,
 )
-from sheriff_api.services.dataset_store import DatasetStore, DatasetStoreValidationError
+from sheriff_api.services.dataset_store import DatasetStoreValidationError, create_dataset_store
+from sheriff_api.services.media_queue import MediaQueue
 from sheriff_api.services.storage import LocalStorage
 
 router = APIRouter(tags=["datasets"])
 settings = get_settings()
-dataset_store = DatasetStore(settings.storage_root)
+dataset_store = create_dataset_store(settings.storage_root, database_url=settings.registry_url())
 storage = LocalStorage(settings.storage_root)
+media_queue = MediaQueue()
 
 
 async def _require_project(db: AsyncSession, project_id: str) -> Project:
@@ -429,6 +438,94 @@ async def export_dataset_version(
     )
 
 
+def _completed_export_job(project_id: str, dataset_version_id: str) -> DatasetVersionExportJobResponse | None:
+    artifact = dataset_store.get_export_artifact(project_id, dataset_version_id)
+    if not isinstance(artifact, dict) or not isinstance(artifact.get("hash"), str):
+        return None
+    if not storage.resolve(export_storage_uri(project_id, artifact["hash"])).exists():
+        return None
+    return DatasetVersionExportJobResponse(
+        dataset_version_id=dataset_version_id,
+        status="completed",
+        hash=artifact["hash"],
+        export_uri=str(artifact.get("export_uri")),
+    )
+
+
+@router.post(
+    "/projects/{project_id}/datasets/versions/{dataset_version_id}/export/jobs",
+    response_model=DatasetVersionExportJobResponse,
+)
+async def enqueue_dataset_version_export(
+    project_id: str,
+    dataset_version_id: str,
+    db: AsyncSession = Depends(get_db),
+) -> DatasetVersionExportJobResponse:
+    await _require_project(db, project_id)
+    if dataset_store.get_version(project_id, dataset_version_id) is None:
+        raise api_error(
+            status_code=404,
+            code="dataset_version_not_found",
+            message="Dataset version not found in project",
+            details={"project_id": project_id, "dataset_version_id": dataset_version_id},
+        )
+    completed = _completed_export_job(project_id, dataset_version_id)
+    if completed is not None:
+        return completed
+    current = read_export_job_status(storage, project_id, dataset_version_id)
+    if isinstance(current, dict) and current.get("status") in {"queued", "running"}:
+        return DatasetVersionExportJobResponse.model_validate(current)
+
+    queued = {"status": "queued", "dataset_version_id": dataset_version_id}
+    write_export_job_status(storage, project_id, dataset_version_id, queued)
+    try:
+        await media_queue.enqueue_dataset_export_job(
+            {
+                "job_version": "1",
+                "job_type": EXPORT_JOB_TYPE,
+                "project_id": project_id,
+                "dataset_version_id": dataset_version_id,
+            }
+        )
+    except Exception as exc:
+        write_export_job_status(
+            storage,
+            project_id,
+            dataset_version_id,
+            {
+                "status": "failed",
+                "dataset_version_id": dataset_version_id,
+                "error": {"code": "media_queue_unavailable", "message": "Export queue is unavailable"},
+            },
+        )
+        raise api_error(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            code="media_queue_unavailable",
+            message="Export queue is unavailable",
+            details={"project_id": project_id, "dataset_version_id": dataset_version_id},
+        ) from exc
+    return DatasetVersionExportJobResponse.model_validate(queued)
+
+
+@router.get(
+    "/projects/{project_id}/datasets/versions/{dataset_version_id}/export/jobs",
+    response_model=DatasetVersionExportJobResponse,
+)
+async def get_dataset_version_export_job(project_id: str, dataset_version_id: str) -> DatasetVersionExportJobResponse:
+    current = read_export_job_status(storage, project_id, dataset_version_id)
+    if isinstance(current, dict) and isinstance(current.get("status"), str):
+        return DatasetVersionExportJobResponse.model_validate(current)
+    completed = _completed_export_job(project_id, dataset_version_id)
+    if completed is not None:
+        return completed
+    raise api_error(
+        status_code=404,
+        code="export_job_not_found",
+        message="No export job for this dataset version",
+        details={"project_id": project_id, "dataset_version_id": dataset_version_id},
+    )
+
+
 @router.get("/projects/{project_id}/datasets/versions/{dataset_version_id}/export/download")
 async def download_dataset_version_export(project_id: str, dataset_version_id: str) -> FileResponse:
     artifact = dataset_store.get_export_artifact(project_id, dataset_version_id)
@@ -464,8 +561,11 @@ async def download_dataset_version_export(project_id: str, dataset_version_id: s
             message="Export file not found",
             details={"project_id": project_id, "dataset_version_id": dataset_version_id},
         )
+    # Exports are content-addressed, so the hash is a strong validator; FileResponse
+    # serves Range/If-Range requests against it for resumable downloads.
     return FileResponse(
         path=path,
         media_type="application/zip",
         filename=f"{project_id}-{dataset_version_id[:8]}-{content_hash[:8]}.zip",
+        headers={"ETag": f'"{content_hash}"', "Cache-Control": "private, max-age=31536000, immutable"},
     )
@@ -28,7 +28,7 @@ from sheriff_api.schemas.deployments import (
     PredictRequest,
     PredictResponse,
 )
-from sheriff_api.services.deployment_store import DeploymentStore
+from sheriff_api.services.deployment_store import create_deployment_store
 from sheriff_api.services.inference_client import InferenceClient
 from sheriff_api.services.storage import LocalStorage
 
@@ -37,10 +37,11 @@ from .experiments.shared import experiment_store, normalize_task, require_projec
 router = APIRouter(tags=["deployments"])
 settings = get_settings()
 storage = LocalStorage(settings.storage_root)
-deployment_store = DeploymentStore(settings.storage_root)
+deployment_store = create_deployment_store(settings.storage_root, database_url=settings.registry_url())
 inference_client = InferenceClient(
     base_url=settings.trainer_inference_base_url,
     timeout_seconds=float(settings.trainer_inference_timeout_seconds),
+    batch_size=settings.trainer_inference_batch_size,
 )
 
 
@@ -236,101 +237,101 @@ async def _prepare_prediction_context(
     return deployment, deployment_task, source, metadata_relpath, class_ids, category_name_by_id
 
 
-async def _predict_for_asset(
+def _inference_error(exc: Exception) -> HTTPException:
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code == 503:
+            return api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable")
+        return api_error(status_code=502, code="inference_failed", message="Inference request failed")
+    return api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable")
+
+
+def _infer_payload(
     *,
-    asset: Asset,
     deployment: dict[str, Any],
     deployment_task: str,
     source: dict[str, Any],
     metadata_relpath: str,
-    class_ids: list[str],
-    category_name_by_id: dict[str, str],
     top_k: int,
     score_threshold: float,
-) -> PredictResponse:
-    storage_uri = _storage_uri_for_asset(asset)
-
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "onnx_relpath": source.get("onnx_relpath"),
+        "metadata_relpath": metadata_relpath,
+        "device_preference": deployment.get("device_preference", "auto"),
+        "model_key": deployment.get("model_key"),
+    }
     if deployment_task == "classification":
-        infer_payload = {
-            "onnx_relpath": source.get("onnx_relpath"),
-            "metadata_relpath": metadata_relpath,
-            "asset_relpath": storage_uri,
-            "device_preference": deployment.get("device_preference", "auto"),
-            "top_k": top_k,
-            "model_key": deployment.get("model_key"),
-        }
-        try:
-            infer_response = await inference_client.infer_classification(infer_payload)
-        except httpx.HTTPStatusError as exc:
-            if exc.response.status_code == 503:
-                raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable") from exc
-            raise api_error(status_code=502, code="inference_failed", message="Inference request failed") from exc
-        except Exception as exc:
-            raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable") from exc
+        payload["top_k"] = top_k
+    else:
+        payload["score_threshold"] = score_threshold
+    return payload
 
-        predictions_raw = infer_response.get("predictions")
-        if not isinstance(predictions_raw, list):
-            predictions_raw = []
-        output_dim = infer_response.get("output_dim")
-        if isinstance(output_dim, int) and output_dim > len(class_ids):
-            raise api_error(
-                status_code=409,
-                code="deployment_output_dim_mismatch",
-                message="Inference output does not match deployment class_ids",
-            )
-        max_class_index = max((int(item.get("class_index")) for item in predictions_raw if isinstance(item, dict)), default=-1)
-        if max_class_index >= len(class_ids):
-            raise api_error(
-                status_code=409,
-                code="deployment_output_dim_mismatch",
-                message="Inference output does not match deployment class_ids",
-            )
 
-        predictions: list[dict[str, Any]] = []
-        for row in predictions_raw:
-            if not isinstance(row, dict):
-                continue
-            class_index = row.get("class_index")
-            score = row.get("score")
-            if not isinstance(class_index, int) or class_index < 0 or class_index >= len(class_ids):
-                continue
-            class_id = class_ids[class_index]
-            predictions.append(
-                {
-                    "class_index": class_index,
-                    "class_id": class_id,
-                    "class_name": category_name_by_id[class_id],
-                    "score": float(score) if isinstance(score, (int, float)) else 0.0,
-                }
-            )
+def _classification_response(
+    *,
+    asset: Asset,
+    deployment: dict[str, Any],
+    infer_response: dict[str, Any],
+    device_selected: Any,
+    class_ids: list[str],
+    category_name_by_id: dict[str, str],
+) -> PredictClassificationResponse:
+    predictions_raw = infer_response.get("predictions")
+    if not isinstance(predictions_raw, list):
+        predictions_raw = []
+    output_dim = infer_response.get("output_dim")
+    if isinstance(output_dim, int) and output_dim > len(class_ids):
+        raise api_error(
+            status_code=409,
+            code="deployment_output_dim_mismatch",
+            message="Inference output does not match deployment class_ids",
+        )
+    max_class_index = max((int(item.get("class_index")) for item in predictions_raw if isinstance(item, dict)), default=-1)
+    if max_class_index >= len(class_ids):
+        raise api_error(
+            status_code=409,
+            code="deployment_output_dim_mismatch",
+            message="Inference output does not match deployment class_ids",
+        )
 
-        return PredictClassificationResponse(
-            asset_id=asset.id,
-            deployment_id=str(deployment.get("deployment_id")),
-            task="classification",
-            device_selected=str(infer_response.get("device_selected") or "cpu"),
-            predictions=predictions,
-            deployment_name=str(deployment.get("name") or ""),
-            device_preference=str(deployment.get("device_preference") or "auto"),
+    predictions: list[dict[str, Any]] = []
+    for row in predictions_raw:
+        if not isinstance(row, dict):
+            continue
+        class_index = row.get("class_index")
+        score = row.get("score")
+        if not isinstance(class_index, int) or class_index < 0 or class_index >= len(class_ids):
+            continue
+        class_id = class_ids[class_index]
+        predictions.append(
+            {
+                "class_index": class_index,
+                "class_id": class_id,
+                "class_name": category_name_by_id[class_id],
+                "score": float(score) if isinstance(score, (int, float)) else 0.0,
+            }
         )
 
-    infer_payload = {
-        "onnx_relpath": source.get("onnx_relpath"),
-        "metadata_relpath": metadata_relpath,
-        "asset_relpath": storage_uri,
-        "device_preference": deployment.get("device_preference", "auto"),
-        "score_threshold": score_threshold,
-        "model_key": deployment.get("model_key"),
-    }
-    try:
-        infer_response = await inference_client.infer_detection(infer_payload)
-    except httpx.HTTPStatusError as exc:
-        if exc.response.status_code == 503:
-            raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable") from exc
-        raise api_error(status_code=502, code="inference_failed", message="Inference request failed") from exc
-    except Exception as exc:
-        raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable") from exc
+    return PredictClassificationResponse(
+        asset_id=asset.id,
+        deployment_id=str(deployment.get("deployment_id")),
+        task="classification",
+        device_selected=str(device_selected or "cpu"),
+        predictions=predictions,
+        deployment_name=str(deployment.get("name") or ""),
+        device_preference=str(deployment.get("device_preference") or "auto"),
+    )
 
+
+def _bbox_response(
+    *,
+    asset: Asset,
+    deployment: dict[str, Any],
+    infer_response: dict[str, Any],
+    device_selected: Any,
+    class_ids: list[str],
+    category_name_by_id: dict[str, str],
+) -> PredictBBoxResponse:
     boxes_raw = infer_response.get("boxes")
     if not isinstance(boxes_raw, list):
         boxes_raw = []
@@ -365,13 +366,74 @@ async def _predict_for_asset(
         asset_id=asset.id,
         deployment_id=str(deployment.get("deployment_id")),
         task="bbox",
-        device_selected=str(infer_response.get("device_selected") or "cpu"),
+        device_selected=str(device_selected or "cpu"),
         boxes=boxes,
         deployment_name=str(deployment.get("name") or ""),
         device_preference=str(deployment.get("device_preference") or "auto"),
     )
 
 
+def _prediction_response(
+    *,
+    asset: Asset,
+    deployment: dict[str, Any],
+    deployment_task: str,
+    infer_response: dict[str, Any],
+    device_selected: Any,
+    class_ids: list[str],
+    category_name_by_id: dict[str, str],
+) -> PredictResponse:
+    build = _classification_response if deployment_task == "classification" else _bbox_response
+    return build(
+        asset=asset,
+        deployment=deployment,
+        infer_response=infer_response,
+        device_selected=device_selected,
+        class_ids=class_ids,
+        category_name_by_id=category_name_by_id,
+    )
+
+
+async def _predict_for_asset(
+    *,
+    asset: Asset,
+    deployment: dict[str, Any],
+    deployment_task: str,
+    source: dict[str, Any],
+    metadata_relpath: str,
+    class_ids: list[str],
+    category_name_by_id: dict[str, str],
+    top_k: int,
+    score_threshold: float,
+) -> PredictResponse:
+    infer_payload = _infer_payload(
+        deployment=deployment,
+        deployment_task=deployment_task,
+        source=source,
+        metadata_relpath=metadata_relpath,
+        top_k=top_k,
+        score_threshold=score_threshold,
+    )
+    infer_payload["asset_relpath"] = _storage_uri_for_asset(asset)
+    try:
+        if deployment_task == "classification":
+            infer_response = await inference_client.infer_classification(infer_payload)
+        else:
+            infer_response = await inference_client.infer_detection(infer_payload)
+    except Exception as exc:
+        raise _inference_error(exc) from exc
+
+    return _prediction_response(
+        asset=asset,
+        deployment=deployment,
+        deployment_task=deployment_task,
+        infer_response=infer_response,
+        device_selected=infer_response.get("device_selected"),
+        class_ids=class_ids,
+        category_name_by_id=category_name_by_id,
+    )
+
+
 @router.post("/projects/{project_id}/deployments", response_model=DeploymentCreateResponse)
 async def create_deployment(
     project_id: str,
@@ -506,27 +568,81 @@ async def predict_batch(
     ).scalars()
     asset_by_id = {asset.id: asset for asset in asset_rows}
 
+    errors_by_asset: dict[str, PredictBatchError] = {}
+    storage_uri_by_asset: dict[str, str] = {}
+    for asset_id in dict.fromkeys(requested_asset_ids):
+        asset = asset_by_id.get(asset_id)
+        if asset is None:
+            errors_by_asset[asset_id] = PredictBatchError(asset_id=asset_id, code="asset_not_found", message="Asset not found in project")
+            continue
+        try:
+            storage_uri_by_asset[asset_id] = _storage_uri_for_asset(asset)
+        except HTTPException as exc:
+            code, message = _error_payload_from_http_exception(exc)
+            errors_by_asset[asset_id] = PredictBatchError(asset_id=asset_id, code=code, message=message)
+
+    # One trainer round trip per chunk of assets; the trainer stacks them into batched ONNX runs.
+    infer_items_by_asset: dict[str, dict[str, Any]] = {}
+    device_selected: Any = None
+    if storage_uri_by_asset:
+        infer_payload = _infer_payload(
+            deployment=deployment,
+            deployment_task=deployment_task,
+            source=source,
+            metadata_relpath=metadata_relpath,
+            top_k=payload.top_k,
+            score_threshold=payload.score_threshold,
+        )
+        batch_asset_ids = list(storage_uri_by_asset)
+        infer_payload["asset_relpaths"] = [storage_uri_by_asset[asset_id] for asset_id in batch_asset_ids]
+        try:
+            batch_response = await inference_client.predict_many(deployment_task, infer_payload)
+        except Exception as exc:
+            code, message = _error_payload_from_http_exception(_inference_error(exc))
+            for asset_id in batch_asset_ids:
+                errors_by_asset[asset_id] = PredictBatchError(asset_id=asset_id, code=code, message=message)
+        else:
+            device_selected = batch_response.get("device_selected")
+            batch_items = batch_response.get("items")
+            if not isinstance(batch_items, list):
+                batch_items = []
+            for asset_id, item in zip(batch_asset_ids, batch_items):
+                infer_items_by_asset[asset_id] = item if isinstance(item, dict) else {}
+            for asset_id in batch_asset_ids[len(batch_items):]:
+                errors_by_asset[asset_id] = PredictBatchError(
+                    asset_id=asset_id, code="inference_failed", message="Inference request failed"
+                )
+
     predictions: list[PredictResponse] = []
     errors: list[PredictBatchError] = []
     pending_review_count = 0
     empty_count = 0
 
     for asset_id in requested_asset_ids:
-        asset = asset_by_id.get(asset_id)
-        if asset is None:
-            errors.append(PredictBatchError(asset_id=asset_id, code="asset_not_found", message="Asset not found in project"))
+        error = errors_by_asset.get(asset_id)
+        if error is not None:
+            errors.append(error)
+            continue
+        item = infer_items_by_asset.get(asset_id, {})
+        item_error = item.get("error")
+        if isinstance(item_error, dict):
+            errors.append(
+                PredictBatchError(
+                    asset_id=asset_id,
+                    code=str(item_error.get("code") or "inference_failed"),
+                    message=str(item_error.get("message") or "Inference request failed"),
+                )
+            )
             continue
         try:
-            response = await _predict_for_asset(
-                asset=asset,
+            response = _prediction_response(
+                asset=asset_by_id[asset_id],
                 deployment=deployment,
                 deployment_task=deployment_task,
-                source=source,
-                metadata_relpath=metadata_relpath,
+                infer_response=item,
+                device_selected=device_selected,
                 class_ids=class_ids,
                 category_name_by_id=category_name_by_id,
-                top_k=payload.top_k,
-                score_threshold=payload.score_threshold,
             )
         except HTTPException as exc:
             code, message = _error_payload_from_http_exception(exc)
@@ -574,12 +690,8 @@ async def warmup_deployment(project_id: str, deployment_id: str, db: AsyncSessio
             response = await inference_client.warmup_classification(infer_payload)
         else:
             response = await inference_client.warmup_detection(infer_payload)
-    except httpx.HTTPStatusError as exc:
-        if exc.response.status_code == 503:
-            raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable") from exc
-        raise api_error(status_code=502, code="inference_failed", message="Inference request failed") from exc
     except Exception as exc:
-        raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable") from exc
+        raise _inference_error(exc) from exc
     return {
         "ok": True,
         "deployment_id": deployment_id,
@@ -4,6 +4,7 @@ from fastapi import APIRouter
 
 from . import analytics, crud, evaluation, onnx, runs
 from .shared import (
+    event_tails,
     experiment_store,
     model_store,
     settings,
@@ -24,6 +25,7 @@ __all__ = [
     "settings",
     "model_store",
     "experiment_store",
+    "event_tails",
     "storage",
     "train_queue",
     "shared_architecture_family",
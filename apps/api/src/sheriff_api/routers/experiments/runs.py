@@ -13,9 +13,11 @@ from sheriff_api.schemas.experiments import ProjectExperimentActionResponse
 
 from .shared import (
     as_sse,
+    as_sse_encoded,
     collect_config_issues,
     ensure_dataset_export_zip,
     ensure_model_matches_dataset_version,
+    event_tails,
     experiment_store,
     get_dataset_version,
     model_store,
@@ -27,6 +29,8 @@ from .shared import (
 
 router = APIRouter()
 
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 @router.post("/projects/{project_id}/experiments/{experiment_id}/start", response_model=ProjectExperimentActionResponse)
 async def start_project_experiment(
@@ -294,43 +298,62 @@ async def stream_project_experiment_events(
         cursor = max(0, int(from_line))
         done = False
         sent_snapshot = False
-        while True:
-            rows = experiment_store.read_events(
-                project_id=project_id,
-                experiment_id=experiment_id,
-                attempt=resolved_attempt,
-                from_line=cursor,
-            )
-            if rows:
-                for row in rows:
-                    cursor = int(row["line"])
-                    event = row.get("event")
-                    if isinstance(event, dict) and str(event.get("type")) == "done":
-                        done = True
-                    yield as_sse(row)
-                if done:
-                    break
-                if not follow:
-                    break
-                continue
-
-            status_row = experiment_store.get_status_row(project_id, experiment_id)
-            status = str(status_row.get("status", "draft"))
-            line_count = experiment_store.get_event_line_count(
-                project_id=project_id,
-                experiment_id=experiment_id,
-                attempt=resolved_attempt,
-            )
-            if not sent_snapshot:
-                sent_snapshot = True
-                yield as_sse(
-                    {
-                        "line": cursor,
-                        "attempt": resolved_attempt,
-                        "event": {"type": "status", "status": status, "attempt": resolved_attempt},
-                    }
-                )
-                if status in {"completed", "failed", "canceled", "draft"} and line_count <= cursor:
+        loop = asyncio.get_running_loop()
+        last_write = loop.time()
+        run_dir = experiment_store.events_path(
+            project_id=project_id,
+            experiment_id=experiment_id,
+            attempt=resolved_attempt,
+        ).parent
+        watch_dirs = [run_dir, experiment_store.experiment_dir(project_id=project_id, experiment_id=experiment_id)]
+        # One tail per run reads appended bytes once and serves every open stream.
+        async with event_tails.subscribe(
+            (project_id, experiment_id, resolved_attempt),
+            path=run_dir / "events.jsonl",
+            attempt=resolved_attempt,
+            status_reader=lambda: experiment_store.get_status_row(project_id, experiment_id),
+            watch_dirs=watch_dirs,
+        ) as tail:
+            while True:
+                rows, covered = await tail.rows_after(cursor)
+                if covered > cursor:
+                    cursor = covered
+                    for row in rows:
+                        if str(row.event.get("type")) == "done":
+                            done = True
+                        yield as_sse_encoded(row.encoded())
+                        last_write = loop.time()
+                    if done:
+                        break
+                    if not follow:
+                        break
+                    continue
+
+                status = str(tail.status_row.get("status", "draft"))
+                line_count = tail.line_count
+                if not sent_snapshot:
+                    sent_snapshot = True
+                    yield as_sse(
+                        {
+                            "line": cursor,
+                            "attempt": resolved_attempt,
+                            "event": {"type": "status", "status": status, "attempt": resolved_attempt},
+                        }
+                    )
+                    last_write = loop.time()
+                    if status in {"completed", "failed", "canceled", "draft"} and line_count <= cursor:
+                        yield as_sse(
+                            {
+                                "line": cursor,
+                                "attempt": resolved_attempt,
+                                "event": {"type": "done", "status": status, "attempt": resolved_attempt},
+                            }
+                        )
+                        break
+                    if not follow:
+                        break
+                    continue
+                if status in {"completed", "failed", "canceled"} and line_count <= cursor:
                     yield as_sse(
                         {
                             "line": cursor,
@@ -339,23 +362,13 @@ async def stream_project_experiment_events(
                         }
                     )
                     break
+
                 if not follow:
                     break
-                continue
-            if status in {"completed", "failed", "canceled"} and line_count <= cursor:
-                yield as_sse(
-                    {
-                        "line": cursor,
-                        "attempt": resolved_attempt,
-                        "event": {"type": "done", "status": status, "attempt": resolved_attempt},
-                    }
-                )
-                break
-
-            if not follow:
-                break
-            yield ": keep-alive\n\n"
-            await asyncio.sleep(0.8)
+                if loop.time() - last_write >= SSE_KEEPALIVE_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_write = loop.time()
+                await tail.wait(cursor, timeout=SSE_KEEPALIVE_SECONDS)
 
     return StreamingResponse(
         event_stream(),
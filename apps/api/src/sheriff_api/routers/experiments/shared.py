@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import datetime, timezone
 from pathlib import Path
@@ -13,10 +14,12 @@ from sheriff_api.db.models import Annotation, Asset, Project, Task, TaskKind, Ta
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.experiments import ExperimentSampleItem, ProjectExperimentRecord, ProjectExperimentSummary, TrainingConfigV0
 from sheriff_api.services.augmentation import effective_augmentation_metadata, task_default_augmentation_profile
-from sheriff_api.services.deployment_store import DeploymentStore
-from sheriff_api.services.dataset_store import DatasetStore
-from sheriff_api.services.experiment_store import ExperimentStore
-from sheriff_api.services.exporter_coco import ExportValidationError, build_export_result
+from sheriff_api.services.deployment_store import create_deployment_store
+from sheriff_api.services.dataset_store import create_dataset_store
+from sheriff_api.services.dataset_export_builder import export_storage_uri, locate_asset_path, write_dataset_export
+from sheriff_api.services.event_tail import EventTailRegistry
+from sheriff_api.services.experiment_store import create_experiment_store
+from sheriff_api.services.exporter_coco import ExportValidationError, build_export_plan
 from sheriff_api.services.model_store import ProjectModelStore, create_project_model_store
 from sheriff_api.services.storage import LocalStorage
 from sheriff_api.services.train_queue import TrainQueue
@@ -34,10 +37,14 @@ except Exception:
 
 
 settings = get_settings()
-model_store: ProjectModelStore = create_project_model_store(settings.storage_root)
-dataset_store = DatasetStore(settings.storage_root)
-experiment_store = ExperimentStore(settings.storage_root)
-deployment_store = DeploymentStore(settings.storage_root)
+model_store: ProjectModelStore = create_project_model_store(settings.storage_root, database_url=settings.registry_url())
+dataset_store = create_dataset_store(settings.storage_root, database_url=settings.registry_url())
+experiment_store = create_experiment_store(settings.storage_root, database_url=settings.registry_url())
+event_tails = EventTailRegistry(
+    watch_mode=settings.experiment_events_watch,
+    poll_seconds=settings.experiment_events_poll_seconds,
+)
+deployment_store = create_deployment_store(settings.storage_root, database_url=settings.registry_url())
 storage = LocalStorage(settings.storage_root)
 train_queue = TrainQueue()
 
@@ -47,7 +54,11 @@ def utc_now_iso() -> str:
 
 
 def as_sse(payload: dict[str, Any]) -> str:
-    return f"data: {json.dumps(payload, separators=(',', ':'))}\n\n"
+    return as_sse_encoded(json.dumps(payload, separators=(",", ":")))
+
+
+def as_sse_encoded(encoded_payload: str) -> str:
+    return f"data: {encoded_payload}\n\n"
 
 
 def normalize_task(raw_task: str) -> str:
@@ -440,19 +451,6 @@ def _map_uuid_payload_to_coco_int(payload_json: dict[str, Any], class_to_coco: d
     return payload
 
 
-def _load_asset_bytes(local_storage: LocalStorage, asset: dict[str, Any]) -> bytes | None:
-    storage_uri = asset.get("storage_uri")
-    if not isinstance(storage_uri, str) or not storage_uri:
-        return None
-    try:
-        path = local_storage.resolve(storage_uri)
-    except ValueError:
-        return None
-    if not path.exists() or not path.is_file():
-        return None
-    return path.read_bytes()
-
-
 async def ensure_dataset_export_zip(
     *,
     db: AsyncSession,
@@ -558,7 +556,7 @@ async def ensure_dataset_export_zip(
                 split_by_asset_id[asset_id] = split_name
 
     try:
-        _manifest, _coco, content_hash, zip_bytes = build_export_result(
+        plan = build_export_plan(
             project_id=project.id,
             project_name=project.name,
             task_type=_task_type_for_task(task),
@@ -613,14 +611,15 @@ async def ensure_dataset_export_zip(
                 }
                 for annotation in selected_annotations
             ],
-            load_asset_bytes=lambda asset: _load_asset_bytes(storage, asset),
+            locate_asset=lambda asset: locate_asset_path(storage, asset),
             split_by_asset_id=split_by_asset_id,
         )
     except ExportValidationError as exc:
         raise api_error(status_code=422, code=exc.code, message=exc.message, details=exc.details) from exc
 
-    relpath = f"exports/{project.id}/{content_hash}.zip"
-    storage.write_bytes(relpath, zip_bytes)
+    content_hash = plan.content_hash
+    relpath = export_storage_uri(project.id, content_hash)
+    await asyncio.to_thread(write_dataset_export, storage, project.id, plan)
     dataset_store.set_export_artifact(
         project.id,
         dataset_version_id,
@@ -8,6 +8,7 @@ from sheriff_api.db.models import Annotation, Asset, AssetSequence, Folder, Proj
 from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.folders import FolderRead
+from sheriff_api.services.pagination import asset_counts
 from sheriff_api.services.sequences import folder_to_read
 from sheriff_api.services.storage import LocalStorage
 from sheriff_api.config import get_settings
@@ -69,8 +70,8 @@ async def delete_folder(project_id: str, folder_id: str, db: AsyncSession = Depe
         (await db.execute(select(AssetSequence).where(AssetSequence.project_id == project_id, AssetSequence.folder_id.in_(descendant_ids)))).scalars().all()
     )
     asset_ids = [asset.id for asset in assets]
-    storage_uris = [
-        asset.metadata_json.get("storage_uri")
+    stored_files = [
+        (asset.metadata_json.get("storage_uri"), asset.checksum)
         for asset in assets
         if isinstance(asset.metadata_json, dict) and isinstance(asset.metadata_json.get("storage_uri"), str)
     ]
@@ -83,10 +84,11 @@ async def delete_folder(project_id: str, folder_id: str, db: AsyncSession = Depe
         await db.execute(delete(AssetSequence).where(AssetSequence.id.in_([sequence.id for sequence in sequences])))
     await db.execute(delete(Folder).where(Folder.id.in_(descendant_ids)))
     await db.commit()
+    asset_counts.invalidate(project_id)
 
-    for storage_uri in storage_uris:
+    for storage_uri, checksum in stored_files:
         try:
-            storage.delete_file(storage_uri)
+            storage.delete_asset_file(storage_uri, checksum)
         except ValueError:
             continue
 
@@ -1,8 +1,16 @@
 from fastapi import APIRouter
 
+from sheriff_api.services.queue_client import queue_metrics_snapshot
+
 router = APIRouter(prefix="/health", tags=["health"])
 
 
 @router.get("")
 async def health_check() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/queues")
+async def queue_metrics() -> dict:
+    """Per-queue enqueue counters, recent enqueue latency and last observed depth for this process."""
+    return {"queues": queue_metrics_snapshot()}
@@ -30,14 +30,14 @@ from sheriff_api.services.model_config_factory import (
     validate_model_config,
 )
 from sheriff_api.services.model_store import ProjectModelStore, create_project_model_store
-from sheriff_api.services.dataset_store import DatasetStore
+from sheriff_api.services.dataset_store import create_dataset_store
 from sheriff_api.services.storage import LocalStorage
 from sheriff_api.services.suggestion_queue import SuggestionQueue
 
 router = APIRouter(tags=["models"])
 settings = get_settings()
-model_store: ProjectModelStore = create_project_model_store(settings.storage_root)
-dataset_store = DatasetStore(settings.storage_root)
+model_store: ProjectModelStore = create_project_model_store(settings.storage_root, database_url=settings.registry_url())
+dataset_store = create_dataset_store(settings.storage_root, database_url=settings.registry_url())
 storage = LocalStorage(settings.storage_root)
 suggestion_queue = SuggestionQueue()
 
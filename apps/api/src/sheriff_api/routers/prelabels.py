@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import httpx
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sheriff_api.db.models import AssetSequence, PrelabelSession, Project, Task
@@ -11,6 +11,7 @@ from sheriff_api.errors import api_error
 from sheriff_api.schemas.prelabels import (
     PrelabelCloseResponse,
     PrelabelConfigCreate,
+    PrelabelDebugDetectionListResponse,
     PrelabelProposalListResponse,
     PrelabelReviewAction,
     PrelabelReviewResponse,
@@ -24,8 +25,10 @@ from sheriff_api.services.prelabels import (
     close_prelabel_session_input,
     create_prelabel_session,
     enqueue_existing_sequence_assets_for_session,
+    list_session_debug_detections,
     list_session_proposals,
     list_sequence_prelabel_sessions,
+    prelabel_debug_detection_to_read,
     prelabel_proposal_to_read,
     prelabel_session_to_read,
     reject_prelabel_proposals,
@@ -183,6 +186,32 @@ async def get_session_proposals(
     return PrelabelProposalListResponse(items=[prelabel_proposal_to_read(proposal) for proposal in proposals])
 
 
+@router.get(
+    "/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/debug-detections",
+    response_model=PrelabelDebugDetectionListResponse,
+)
+async def get_session_debug_detections(
+    project_id: str,
+    task_id: str,
+    session_id: str,
+    after: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+) -> PrelabelDebugDetectionListResponse:
+    await _require_project(db, project_id)
+    await _require_task(db, project_id, task_id)
+    session = await _require_session(db, project_id, task_id, session_id)
+    rows = await list_session_debug_detections(db, session=session, after_seq=after, limit=limit)
+    if rows:
+        next_after = int(rows[-1].seq)
+    else:
+        next_after = after if after is not None else int(session.debug_detection_seq or 0)
+    return PrelabelDebugDetectionListResponse(
+        items=[prelabel_debug_detection_to_read(row) for row in rows],
+        next_after=next_after,
+    )
+
+
 @router.post("/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/accept", response_model=PrelabelReviewResponse)
 async def accept_session_proposals(
     project_id: str,
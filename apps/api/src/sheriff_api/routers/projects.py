@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 
 from fastapi import APIRouter, Depends, Response, status
@@ -9,6 +10,8 @@ from sheriff_api.db.models import Annotation, Asset, AssetSequence, Category, Fo
 from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.projects import ProjectCreate, ProjectRead
+from sheriff_api.services.pagination import asset_counts
+from sheriff_api.services.sql_registry import delete_registry_project
 from sheriff_api.services.storage import LocalStorage
 
 router = APIRouter(prefix="/projects", tags=["projects"])
@@ -116,14 +119,14 @@ async def delete_project(project_id: str, db: AsyncSession = Depends(get_db)) ->
     asset_rows = list(
         (
             await db.execute(
-                select(Asset.id, Asset.metadata_json).where(Asset.project_id == project_id),
+                select(Asset.id, Asset.metadata_json, Asset.checksum).where(Asset.project_id == project_id),
             )
         ).all()
     )
-    asset_ids = [asset_id for asset_id, _metadata in asset_rows]
-    storage_uris = [
-        metadata.get("storage_uri")
-        for _asset_id, metadata in asset_rows
+    asset_ids = [asset_id for asset_id, _metadata, _checksum in asset_rows]
+    stored_files = [
+        (metadata.get("storage_uri"), checksum)
+        for _asset_id, metadata, checksum in asset_rows
         if isinstance(metadata, dict) and isinstance(metadata.get("storage_uri"), str)
     ]
 
@@ -139,13 +142,18 @@ async def delete_project(project_id: str, db: AsyncSession = Depends(get_db)) ->
     await db.execute(delete(Folder).where(Folder.project_id == project_id))
     await db.delete(project)
     await db.commit()
+    asset_counts.invalidate(project_id)
 
-    for storage_uri in storage_uris:
+    for storage_uri, checksum in stored_files:
         try:
-            storage.delete_file(storage_uri)
+            storage.delete_asset_file(storage_uri, checksum)
         except ValueError:
             continue
 
+    registry_url = settings.registry_url()
+    if registry_url:
+        await asyncio.to_thread(delete_registry_project, registry_url, project_id)
+
     for relative_dir in (
         f"assets/{project_id}",
         f"exports/{project_id}",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from fastapi import APIRouter, Depends, File, Form, UploadFile, status
 import logging
@@ -17,6 +18,7 @@ from sheriff_api.services.prelabels import (
     enqueue_live_prelabel_jobs_for_asset,
 )
 from sheriff_api.services.asset_ingest import persist_asset_bytes
+from sheriff_api.services.frame_dedup import NEAR_DUPLICATE_KEY, hamming_distance, perceptual_hash, previous_kept_frame
 from sheriff_api.services.sequences import (
     annotated_asset_ids_for_sequence,
     asset_to_read,
@@ -266,6 +268,20 @@ async def upload_webcam_frame(
             details={"filename": file.filename},
         )
 
+    # A near duplicate of the previous kept frame is flagged, or not stored and answered with that frame.
+    frame_hash = await asyncio.to_thread(perceptual_hash, content)
+    duplicate_of: Asset | None = None
+    if frame_hash is not None and settings.frame_dedup_mode in {"flag", "skip"}:
+        kept = await previous_kept_frame(db, sequence_id=sequence.id, frame_index=frame_index)
+        if (
+            kept is not None
+            and kept.perceptual_hash is not None
+            and hamming_distance(frame_hash, kept.perceptual_hash) <= settings.frame_dedup_max_distance
+        ):
+            duplicate_of = kept
+    if duplicate_of is not None and settings.frame_dedup_mode == "skip":
+        return asset_to_read(duplicate_of)
+
     storage.ensure_project_dirs(project_id)
     asset: Asset | None = None
     storage_uri: str | None = None
@@ -291,8 +307,11 @@ async def upload_webcam_frame(
             frame_index=frame_index,
             timestamp_seconds=timestamp_seconds,
             commit=False,
+            perceptual_hash=frame_hash,
         )
         storage_uri = asset.metadata_json.get("storage_uri") if isinstance(asset.metadata_json, dict) else None
+        if duplicate_of is not None:
+            asset.metadata_json = {**asset.metadata_json, NEAR_DUPLICATE_KEY: duplicate_of.id}
         await refresh_sequence_counts(db, sequence.id)
         if asset.width is not None:
             sequence.width = asset.width
@@ -306,7 +325,7 @@ async def upload_webcam_frame(
         await db.rollback()
         if isinstance(storage_uri, str):
             try:
-                storage.delete_file(storage_uri)
+                storage.delete_asset_file(storage_uri, asset.checksum if asset is not None else None)
             except ValueError:
                 pass
         raise api_error(
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
+import asyncio
 from typing import Any
 
 from fastapi import APIRouter, Depends
@@ -14,67 +13,44 @@ from sheriff_api.db.models import Annotation, Category, Project, Task, TaskKind,
 from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.tasks import TaskCreate, TaskRead
+from sheriff_api.services.dataset_store import create_dataset_store
+from sheriff_api.services.deployment_store import create_deployment_store
+from sheriff_api.services.experiment_store import create_experiment_store
+from sheriff_api.services.model_store import create_project_model_store
 
 router = APIRouter(tags=["tasks"])
 settings = get_settings()
+dataset_store = create_dataset_store(settings.storage_root, database_url=settings.registry_url())
+model_store = create_project_model_store(settings.storage_root, database_url=settings.registry_url())
+experiment_store = create_experiment_store(settings.storage_root, database_url=settings.registry_url())
+deployment_store = create_deployment_store(settings.storage_root, database_url=settings.registry_url())
 
 
-def _read_json(path: Path) -> dict[str, Any] | list[Any] | None:
-    try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return None
-    if isinstance(raw, (dict, list)):
-        return raw
-    return None
-
-
-def _file_counts_for_task(project_id: str, task_id: str) -> dict[str, int]:
-    root = Path(settings.storage_root)
-
-    dataset_count = 0
-    datasets_path = root / "datasets" / project_id / "datasets.json"
-    datasets_doc = _read_json(datasets_path)
-    if isinstance(datasets_doc, dict):
-        for item in datasets_doc.get("items", []):
-            if isinstance(item, dict) and str(item.get("task_id") or "") == task_id:
-                dataset_count += 1
+def _registry_counts_for_task(project_id: str, task_id: str) -> dict[str, int]:
+    dataset_count = len(dataset_store.list_versions(project_id, task_id=task_id)["items"])
 
     model_count = 0
-    models_path = root / "models" / project_id / "records.json"
-    models_doc = _read_json(models_path)
-    if isinstance(models_doc, list):
-        for row in models_doc:
-            if not isinstance(row, dict):
-                continue
-            if str(row.get("task_id") or "") == task_id:
-                model_count += 1
-                continue
-            source_dataset = row.get("config_json", {}).get("source_dataset") if isinstance(row.get("config_json"), dict) else {}
-            if isinstance(source_dataset, dict) and str(source_dataset.get("task_id") or "") == task_id:
-                model_count += 1
+    for row in model_store.list_by_project(project_id):
+        if str(row.get("task_id") or "") == task_id:
+            model_count += 1
+            continue
+        source_dataset = row.get("config_json", {}).get("source_dataset") if isinstance(row.get("config_json"), dict) else {}
+        if isinstance(source_dataset, dict) and str(source_dataset.get("task_id") or "") == task_id:
+            model_count += 1
 
     experiment_count = 0
-    experiments_path = root / "experiments" / project_id / "records.json"
-    experiments_doc = _read_json(experiments_path)
-    if isinstance(experiments_doc, list):
-        for row in experiments_doc:
-            if not isinstance(row, dict):
-                continue
-            if str(row.get("task_id") or "") == task_id:
-                experiment_count += 1
-                continue
-            config_json = row.get("config_json")
-            if isinstance(config_json, dict) and str(config_json.get("task_id") or "") == task_id:
-                experiment_count += 1
+    for row in experiment_store.list_index_records(project_id):
+        if str(row.get("task_id") or "") == task_id:
+            experiment_count += 1
+            continue
+        config_json = row.get("config_json")
+        if isinstance(config_json, dict) and str(config_json.get("task_id") or "") == task_id:
+            experiment_count += 1
 
     deployment_count = 0
-    deployments_path = root / "deployments" / project_id / "deployments.json"
-    deployments_doc = _read_json(deployments_path)
-    if isinstance(deployments_doc, dict):
-        for row in deployments_doc.get("items", []):
-            if isinstance(row, dict) and str(row.get("task_id") or "") == task_id:
-                deployment_count += 1
+    for row in deployment_store.list(project_id)["items"]:
+        if str(row.get("task_id") or "") == task_id:
+            deployment_count += 1
 
     return {
         "datasets": dataset_count,
@@ -201,7 +177,7 @@ async def delete_task(project_id: str, task_id: str, db: AsyncSession = Depends(
 
     category_count = int((await db.execute(select(func.count(Category.id)).where(Category.task_id == task_id))).scalar_one())
     annotation_count = int((await db.execute(select(func.count(Annotation.id)).where(Annotation.task_id == task_id))).scalar_one())
-    file_counts = _file_counts_for_task(project_id, task_id)
+    file_counts = await asyncio.to_thread(_registry_counts_for_task, project_id, task_id)
     details = {
         "project_id": project_id,
         "task_id": task_id,
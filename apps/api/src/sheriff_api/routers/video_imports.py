@@ -1,7 +1,9 @@
 from __future__ import annotations
+import asyncio
 from pathlib import Path
+from typing import Any, Callable
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Request, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sheriff_api.config import get_settings
@@ -9,9 +11,11 @@ from sheriff_api.db.models import Project, Task
 from sheriff_api.db.session import get_db
 from sheriff_api.errors import api_error
 from sheriff_api.schemas.prelabels import PrelabelConfigCreate
-from sheriff_api.schemas.video_imports import VideoImportResponse
+from sheriff_api.schemas.video_imports import VideoImportResponse, VideoUploadCreate, VideoUploadRead
+from sheriff_api.services.asset_ingest import stage_stream
 from sheriff_api.services.media_queue import MediaQueue
 from sheriff_api.services.prelabels import create_prelabel_session
+from sheriff_api.services.resumable_uploads import ResumableUpload, ResumableUploadError, ResumableUploadStore
 from sheriff_api.services.sequences import create_sequence_with_folder, sequence_to_read
 from sheriff_api.services.storage import LocalStorage
 from sheriff_api.services.video_frames import validate_video_import_params, VideoImportValidationError
@@ -20,6 +24,14 @@ router = APIRouter(tags=["video-imports"])
 settings = get_settings()
 storage = LocalStorage(settings.storage_root)
 media_queue = MediaQueue()
+video_uploads = ResumableUploadStore(storage, expiry_seconds=settings.video_upload_expiry_hours * 3600.0)
+
+_UPLOAD_ERROR_STATUS = {
+    "upload_not_found": status.HTTP_404_NOT_FOUND,
+    "upload_offset_mismatch": status.HTTP_409_CONFLICT,
+    "upload_incomplete": status.HTTP_409_CONFLICT,
+    "upload_length_exceeded": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+}
 
 
 async def _require_project(db: AsyncSession, project_id: str) -> Project:
@@ -43,33 +55,9 @@ async def _require_task(db: AsyncSession, project_id: str, task_id: str | None)
     return task
 
 
-@router.post("/projects/{project_id}/video-imports", response_model=VideoImportResponse)
-async def import_video(
-    project_id: str,
-    file: UploadFile = File(...),
-    task_id: str | None = Form(default=None),
-    folder_id: str | None = Form(default=None),
-    name: str | None = Form(default=None),
-    fps: float = Form(default=2.0),
-    max_frames: int = Form(default=500),
-    resize_mode: str = Form(default="original"),
-    resize_width: int | None = Form(default=None),
-    resize_height: int | None = Form(default=None),
-    prelabel_config: str | None = Form(default=None),
-    db: AsyncSession = Depends(get_db),
-) -> VideoImportResponse:
-    await _require_project(db, project_id)
-    task = await _require_task(db, project_id, task_id)
-
+def _validate_params(**kwargs: Any) -> dict[str, Any]:
     try:
-        params = validate_video_import_params(
-            filename=file.filename,
-            fps=fps,
-            max_frames=max_frames,
-            resize_mode=resize_mode,
-            resize_width=resize_width,
-            resize_height=resize_height,
-        )
+        return validate_video_import_params(**kwargs)
     except VideoImportValidationError as exc:
         raise api_error(
             status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -78,28 +66,31 @@ async def import_video(
             details=exc.details,
         ) from exc
 
-    content = await file.read()
-    if not content:
-        raise api_error(
-            status.HTTP_400_BAD_REQUEST,
-            code="uploaded_file_empty",
-            message="Uploaded file is empty",
-            details={"filename": file.filename},
-        )
 
-    parsed_prelabel_config: PrelabelConfigCreate | None = None
-    if prelabel_config is not None:
-        try:
-            parsed_prelabel_config = PrelabelConfigCreate.model_validate_json(prelabel_config)
-        except Exception as exc:
-            raise api_error(
-                status.HTTP_422_UNPROCESSABLE_ENTITY,
-                code="prelabel_config_invalid",
-                message="Prelabel config is invalid",
-                details={"reason": str(exc)},
-            ) from exc
+def _upload_error(exc: ResumableUploadError) -> HTTPException:
+    return api_error(
+        _UPLOAD_ERROR_STATUS.get(exc.code, status.HTTP_422_UNPROCESSABLE_ENTITY),
+        code=exc.code,
+        message=exc.message,
+        details=exc.details,
+    )
+
 
-    requested_name = (name or Path(file.filename or "video_session").stem).strip() or "video_session"
+async def _start_video_import(
+    db: AsyncSession,
+    *,
+    project_id: str,
+    task: Task | None,
+    task_id: str | None,
+    folder_id: str | None,
+    requested_name: str,
+    source_filename: str | None,
+    params: dict[str, Any],
+    prelabel_config: PrelabelConfigCreate | None,
+    place_source: Callable[[str], None],
+    source_sha256: str | None = None,
+) -> VideoImportResponse:
+    """Create the processing sequence, put the uploaded video at its import path and queue extraction."""
     try:
         folder, sequence = await create_sequence_with_folder(
             db,
@@ -108,7 +99,7 @@ async def import_video(
             folder_id=folder_id,
             requested_name=requested_name,
             source_type="video_file",
-            source_filename=file.filename,
+            source_filename=source_filename,
             status="processing",
             fps=params["fps"],
         )
@@ -123,7 +114,7 @@ async def import_video(
         raise api_error(status.HTTP_500_INTERNAL_SERVER_ERROR, code="video_import_create_failed", message="Failed to create video import") from exc
 
     prelabel_session_id: str | None = None
-    if parsed_prelabel_config is not None:
+    if prelabel_config is not None:
         if task is None:
             raise api_error(status.HTTP_422_UNPROCESSABLE_ENTITY, code="task_id_required", message="task_id is required for prelabels")
         try:
@@ -132,7 +123,7 @@ async def import_video(
                 project_id=project_id,
                 task=task,
                 sequence=sequence,
-                config=parsed_prelabel_config,
+                config=prelabel_config,
                 live_mode=False,
             )
             prelabel_session_id = prelabel_session.id
@@ -145,28 +136,33 @@ async def import_video(
             raise
 
     storage.ensure_project_dirs(project_id)
-    import_storage_uri = f"imports/{project_id}/{sequence.id}/{Path(file.filename or 'source.mp4').name}"
+    import_storage_uri = f"imports/{project_id}/{sequence.id}/{Path(source_filename or 'source.mp4').name}"
     wrote_file = False
     try:
-        storage.write_bytes(import_storage_uri, content)
+        place_source(import_storage_uri)
         wrote_file = True
-        await media_queue.enqueue_extract_video_job(
-            {
-                "job_version": "1",
-                "job_type": "extract_video_frames",
-                "project_id": project_id,
-                "sequence_id": sequence.id,
-                "task_id": task_id,
-                "folder_id": folder.id,
-                "video_storage_uri": import_storage_uri,
-                "fps": params["fps"],
-                "max_frames": params["max_frames"],
-                "resize_mode": params["resize_mode"],
-                "resize_width": params["resize_width"],
-                "resize_height": params["resize_height"],
-                "prelabel_session_id": prelabel_session_id,
-            }
-        )
+        job_payload: dict[str, Any] = {
+            "job_version": "1",
+            "job_type": "extract_video_frames",
+            "project_id": project_id,
+            "sequence_id": sequence.id,
+            "task_id": task_id,
+            "folder_id": folder.id,
+            "video_storage_uri": import_storage_uri,
+            "fps": params["fps"],
+            "max_frames": params["max_frames"],
+            "resize_mode": params["resize_mode"],
+            "resize_width": params["resize_width"],
+            "resize_height": params["resize_height"],
+            "frame_format": params["frame_format"],
+            "jpeg_quality": params["jpeg_quality"],
+            "sampling_mode": params["sampling_mode"],
+            "scene_threshold": params["scene_threshold"],
+            "prelabel_session_id": prelabel_session_id,
+        }
+        if source_sha256:
+            job_payload["video_sha256"] = source_sha256
+        await media_queue.enqueue_extract_video_job(job_payload)
         await db.commit()
         await db.refresh(sequence)
     except Exception as exc:
@@ -176,6 +172,8 @@ async def import_video(
                 storage.delete_file(import_storage_uri)
             except ValueError:
                 pass
+        if isinstance(exc, HTTPException):
+            raise
         raise api_error(
             status.HTTP_503_SERVICE_UNAVAILABLE,
             code="media_queue_unavailable",
@@ -184,3 +182,250 @@ async def import_video(
         ) from exc
 
     return VideoImportResponse(sequence=sequence_to_read(sequence, folder=folder), prelabel_session_id=prelabel_session_id)
+
+
+def _parse_prelabel_config(raw: str | None) -> PrelabelConfigCreate | None:
+    if raw is None:
+        return None
+    try:
+        return PrelabelConfigCreate.model_validate_json(raw)
+    except Exception as exc:
+        raise api_error(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            code="prelabel_config_invalid",
+            message="Prelabel config is invalid",
+            details={"reason": str(exc)},
+        ) from exc
+
+
+@router.post("/projects/{project_id}/video-imports", response_model=VideoImportResponse)
+async def import_video(
+    project_id: str,
+    file: UploadFile = File(...),
+    task_id: str | None = Form(default=None),
+    folder_id: str | None = Form(default=None),
+    name: str | None = Form(default=None),
+    fps: float = Form(default=2.0),
+    max_frames: int = Form(default=500),
+    resize_mode: str = Form(default="original"),
+    resize_width: int | None = Form(default=None),
+    resize_height: int | None = Form(default=None),
+    frame_format: str = Form(default="jpeg"),
+    jpeg_quality: int | None = Form(default=None),
+    sampling_mode: str = Form(default="fps"),
+    scene_threshold: float = Form(default=0.3),
+    prelabel_config: str | None = Form(default=None),
+    db: AsyncSession = Depends(get_db),
+) -> VideoImportResponse:
+    await _require_project(db, project_id)
+    task = await _require_task(db, project_id, task_id)
+    params = _validate_params(
+        filename=file.filename,
+        fps=fps,
+        max_frames=max_frames,
+        resize_mode=resize_mode,
+        resize_width=resize_width,
+        resize_height=resize_height,
+        frame_format=frame_format,
+        jpeg_quality=jpeg_quality,
+        sampling_mode=sampling_mode,
+        scene_threshold=scene_threshold,
+    )
+
+    # Copied to disk in chunks rather than read whole; large files should use /video-uploads instead.
+    staged = await asyncio.to_thread(stage_stream, file.file, storage.staging_dir())
+    try:
+        if staged.size_bytes == 0:
+            raise api_error(
+                status.HTTP_400_BAD_REQUEST,
+                code="uploaded_file_empty",
+                message="Uploaded file is empty",
+                details={"filename": file.filename},
+            )
+        return await _start_video_import(
+            db,
+            project_id=project_id,
+            task=task,
+            task_id=task_id,
+            folder_id=folder_id,
+            requested_name=(name or Path(file.filename or "video_session").stem).strip() or "video_session",
+            source_filename=file.filename,
+            params=params,
+            prelabel_config=_parse_prelabel_config(prelabel_config),
+            place_source=lambda import_storage_uri: storage.move_into(import_storage_uri, staged.path),
+            source_sha256=staged.checksum,
+        )
+    finally:
+        staged.path.unlink(missing_ok=True)
+
+
+def _upload_read(upload: ResumableUpload) -> VideoUploadRead:
+    return VideoUploadRead(
+        id=upload.id,
+        project_id=upload.project_id,
+        filename=upload.filename,
+        length=upload.length,
+        offset=upload.offset,
+        expires_at=upload.expires_at,
+    )
+
+
+def _upload_headers(upload: ResumableUpload) -> dict[str, str]:
+    return {"Upload-Offset": str(upload.offset), "Upload-Length": str(upload.length), "Cache-Control": "no-store"}
+
+
+def _project_upload(project_id: str, upload_id: str) -> ResumableUpload:
+    try:
+        upload = video_uploads.get(upload_id)
+    except ResumableUploadError as exc:
+        raise _upload_error(exc) from exc
+    if upload.project_id != project_id:
+        raise _upload_error(ResumableUploadError("upload_not_found", "Upload not found", {"upload_id": upload_id}))
+    return upload
+
+
+@router.post("/projects/{project_id}/video-uploads", response_model=VideoUploadRead, status_code=status.HTTP_201_CREATED)
+async def create_video_upload(
+    project_id: str,
+    payload: VideoUploadCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+) -> VideoUploadRead:
+    """Announce a video import whose bytes follow in resumable PATCH chunks."""
+    await _require_project(db, project_id)
+    await _require_task(db, project_id, payload.task_id)
+    params = _validate_params(
+        filename=payload.filename,
+        fps=payload.fps,
+        max_frames=payload.max_frames,
+        resize_mode=payload.resize_mode,
+        resize_width=payload.resize_width,
+        resize_height=payload.resize_height,
+        frame_format=payload.frame_format,
+        jpeg_quality=payload.jpeg_quality,
+        sampling_mode=payload.sampling_mode,
+        scene_threshold=payload.scene_threshold,
+    )
+    if payload.length > settings.video_upload_max_bytes:
+        raise api_error(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            code="upload_length_exceeded",
+            message="Video is larger than the upload limit",
+            details={"length": payload.length, "max_bytes": settings.video_upload_max_bytes},
+        )
+    upload = video_uploads.create(
+        project_id=project_id,
+        filename=payload.filename,
+        length=payload.length,
+        metadata={
+            "params": params,
+            "task_id": payload.task_id,
+            "folder_id": payload.folder_id,
+            "name": payload.name,
+            "checksum": payload.checksum,
+            "prelabel_config": payload.prelabel_config.model_dump(mode="json") if payload.prelabel_config else None,
+        },
+    )
+    response.headers.update(_upload_headers(upload))
+    response.headers["Location"] = f"/api/v1/projects/{project_id}/video-uploads/{upload.id}"
+    return _upload_read(upload)
+
+
+@router.head("/projects/{project_id}/video-uploads/{upload_id}")
+async def head_video_upload(project_id: str, upload_id: str) -> Response:
+    upload = _project_upload(project_id, upload_id)
+    return Response(status_code=status.HTTP_200_OK, headers=_upload_headers(upload))
+
+
+@router.get("/projects/{project_id}/video-uploads/{upload_id}", response_model=VideoUploadRead)
+async def get_video_upload(project_id: str, upload_id: str, response: Response) -> VideoUploadRead:
+    upload = _project_upload(project_id, upload_id)
+    response.headers.update(_upload_headers(upload))
+    return _upload_read(upload)
+
+
+@router.patch("/projects/{project_id}/video-uploads/{upload_id}", response_model=VideoUploadRead)
+async def append_video_upload(
+    project_id: str,
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(alias="Upload-Offset"),
+) -> VideoUploadRead:
+    """Append the raw request body at ``Upload-Offset``; the body is streamed to disk as it arrives."""
+    _project_upload(project_id, upload_id)
+    try:
+        upload = await video_uploads.append(upload_id, upload_offset, request.stream())
+    except ResumableUploadError as exc:
+        raise _upload_error(exc) from exc
+    response.headers.update(_upload_headers(upload))
+    return _upload_read(upload)
+
+
+@router.delete("/projects/{project_id}/video-uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_video_upload(project_id: str, upload_id: str) -> Response:
+    _project_upload(project_id, upload_id)
+    async with video_uploads.lock(upload_id):
+        video_uploads.delete(upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/projects/{project_id}/video-uploads/{upload_id}/finalize", response_model=VideoImportResponse)
+async def finalize_video_upload(
+    project_id: str,
+    upload_id: str,
+    db: AsyncSession = Depends(get_db),
+) -> VideoImportResponse:
+    """Verify a fully received upload and hand it to the media queue like a direct video import.
+
+    The upload's lock is held throughout and the upload is deleted before it is
+    released, so a concurrent finalize of the same upload gets ``upload_not_found``.
+    """
+    _project_upload(project_id, upload_id)
+    async with video_uploads.lock(upload_id):
+        upload = _project_upload(project_id, upload_id)
+        if not upload.complete:
+            raise _upload_error(
+                ResumableUploadError(
+                    "upload_incomplete",
+                    "Upload has not received all of its bytes",
+                    {"upload_id": upload_id, "offset": upload.offset, "length": upload.length},
+                )
+            )
+        checksum = await video_uploads.checksum(upload_id)
+        metadata = upload.metadata
+        expected = metadata.get("checksum")
+        if expected and str(expected).lower() != checksum:
+            raise api_error(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                code="upload_checksum_mismatch",
+                message="Uploaded bytes do not match the announced checksum",
+                details={"upload_id": upload_id, "expected": expected, "actual": checksum},
+            )
+
+        task_id = metadata.get("task_id")
+        task = await _require_task(db, project_id, task_id)
+        prelabel_config = metadata.get("prelabel_config")
+
+        def _place(import_storage_uri: str) -> None:
+            # Linked rather than moved: if the job cannot be queued the upload stays finalizable.
+            try:
+                video_uploads.link(upload_id, storage.resolve(import_storage_uri))
+            except ResumableUploadError as exc:
+                raise _upload_error(exc) from exc
+
+        response = await _start_video_import(
+            db,
+            project_id=project_id,
+            task=task,
+            task_id=task_id,
+            folder_id=metadata.get("folder_id"),
+            requested_name=(metadata.get("name") or Path(upload.filename).stem).strip() or "video_session",
+            source_filename=upload.filename,
+            params=metadata["params"],
+            prelabel_config=PrelabelConfigCreate.model_validate(prelabel_config) if prelabel_config else None,
+            place_source=_place,
+            source_sha256=checksum,
+        )
+        video_uploads.delete(upload_id)
+    return response
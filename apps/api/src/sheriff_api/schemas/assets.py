@@ -36,11 +36,30 @@ class AssetRead(BaseModel):
     width: int | None
     height: int | None
     checksum: str
+    perceptual_hash: str | None = None
     metadata_json: dict
 
     class Config:
         from_attributes = True
 
 
+class AssetCount(BaseModel):
+    total: int
+
+
+class AssetUploadError(BaseModel):
+    index: int
+    filename: str | None = None
+    code: str
+    message: str
+
+
+class AssetBatchUploadResponse(BaseModel):
+    items: list[AssetRead]
+    errors: list[AssetUploadError] = []
+    # Files that matched an existing asset (same bytes, folder and name) and returned it instead of a copy.
+    reused: int = 0
+
+
 class AssetListFilters(BaseModel):
     status: AnnotationStatus | None = None
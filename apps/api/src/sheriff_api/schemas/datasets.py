@@ -107,3 +107,22 @@ class DatasetVersionExportResponse(BaseModel):
     dataset_version_id: str
     hash: str
     export_uri: str
+
+
+class DatasetExportJobProgress(BaseModel):
+    done: int = 0
+    total: int = 0
+
+
+class DatasetExportJobError(BaseModel):
+    code: str
+    message: str
+
+
+class DatasetVersionExportJobResponse(BaseModel):
+    dataset_version_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    progress: DatasetExportJobProgress = Field(default_factory=DatasetExportJobProgress)
+    hash: str | None = None
+    export_uri: str | None = None
+    error: DatasetExportJobError | None = None
@@ -11,6 +11,8 @@ PrelabelSamplingMode = Literal["every_n_frames", "every_n_seconds"]
 PrelabelSessionStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
 PrelabelProposalStatus = Literal["pending", "accepted", "edited", "rejected"]
 PrelabelDebugDetectionStatus = Literal["matched", "unmatched", "discarded"]
+# Florence-2 decoding: "fast" is greedy, "quality" is 3-beam search. Ignored by deployment sources.
+PrelabelDecodingProfile = Literal["fast", "quality"]
 
 
 class PrelabelFrameSampling(BaseModel):
@@ -24,6 +26,7 @@ class PrelabelConfigCreate(BaseModel):
     frame_sampling: PrelabelFrameSampling = Field(default_factory=PrelabelFrameSampling)
     confidence_threshold: float = Field(default=0.25, ge=0.0, le=1.0)
     max_detections_per_frame: int = Field(default=20, ge=1, le=200)
+    decoding_profile: PrelabelDecodingProfile = "quality"
 
 
 class PrelabelSessionCreate(PrelabelConfigCreate):
@@ -31,6 +34,7 @@ class PrelabelSessionCreate(PrelabelConfigCreate):
 
 
 class PrelabelDebugDetectionRead(BaseModel):
+    seq: int
     asset_id: str
     asset_frame_index: int | None = None
     label_text: str
@@ -55,6 +59,7 @@ class PrelabelSessionRead(BaseModel):
     sampling_value: float
     confidence_threshold: float
     max_detections_per_frame: int
+    decoding_profile: PrelabelDecodingProfile = "quality"
     live_mode: bool
     status: PrelabelSessionStatus
     input_closed_at: datetime | None = None
@@ -63,7 +68,8 @@ class PrelabelSessionRead(BaseModel):
     generated_proposals: int
     skipped_unmatched: int
     error_message: str | None = None
-    debug_detections: list[PrelabelDebugDetectionRead] = Field(default_factory=list)
+    # seq of the latest debug detection; poll .../debug-detections?after=<seen seq> when it moves.
+    debug_detection_seq: int = 0
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
@@ -98,6 +104,12 @@ class PrelabelProposalListResponse(BaseModel):
     items: list[PrelabelProposalRead]
 
 
+class PrelabelDebugDetectionListResponse(BaseModel):
+    items: list[PrelabelDebugDetectionRead]
+    # Pass back as ``after`` to fetch only newer detections.
+    next_after: int
+
+
 class PrelabelSessionListResponse(BaseModel):
     items: list[PrelabelSessionRead]
 
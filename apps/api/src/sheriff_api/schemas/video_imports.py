@@ -20,4 +20,26 @@ class VideoImportParams(BaseModel):
     resize_mode: str = "original"
     resize_width: int | None = Field(default=None, ge=1)
     resize_height: int | None = Field(default=None, ge=1)
+    # "jpeg" (jpeg_quality 1-100, ffmpeg's default when unset) or lossless "png".
+    frame_format: str = "jpeg"
+    jpeg_quality: int | None = Field(default=None, ge=1, le=100)
+    # "fps", "seek", "keyframes" or "scene"; all but fps keep at most one frame per 1/fps seconds.
+    sampling_mode: str = "fps"
+    scene_threshold: float = Field(default=0.3, gt=0, lt=1)
     prelabel_config: PrelabelConfigCreate | None = None
+
+
+class VideoUploadCreate(VideoImportParams):
+    filename: str
+    length: int = Field(gt=0)
+    # Optional sha256 of the whole file, verified at finalize.
+    checksum: str | None = Field(default=None, pattern=r"^[0-9a-fA-F]{64}$")
+
+
+class VideoUploadRead(BaseModel):
+    id: str
+    project_id: str
+    filename: str
+    length: int
+    offset: int
+    expires_at: str
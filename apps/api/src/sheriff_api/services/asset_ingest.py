@@ -1,16 +1,65 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 import hashlib
 import uuid
 from pathlib import Path
+from typing import BinaryIO, Iterable
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sheriff_api.db.models import Asset, AssetType, Folder
 from sheriff_api.services.folders import join_folder_and_file, sanitize_file_name
-from sheriff_api.services.image_metadata import extract_image_dimensions
+from sheriff_api.services.image_metadata import ImageDimensionProbe, extract_image_dimensions
 from sheriff_api.services.storage import LocalStorage
 
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StagedFile:
+    """An upload copied to the storage staging area, with its metadata computed on the way."""
+
+    path: Path
+    size_bytes: int
+    checksum: str
+    width: int | None
+    height: int | None
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    staged: StagedFile
+    file_name: str
+    mime_type: str
+    folder: Folder | None
+    original_filename: str
+
+
+def stage_stream(source: BinaryIO, staging_dir: Path) -> StagedFile:
+    """Copy ``source`` to a staging file in chunks, hashing and probing image dimensions incrementally.
+
+    Blocking; run it in a worker thread.
+    """
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    path = staging_dir / f"{uuid.uuid4().hex}.partial"
+    digest = hashlib.sha256()
+    probe = ImageDimensionProbe()
+    size_bytes = 0
+    try:
+        with path.open("wb") as target:
+            while chunk := source.read(UPLOAD_CHUNK_BYTES):
+                digest.update(chunk)
+                probe.feed(chunk)
+                target.write(chunk)
+                size_bytes += len(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    width, height = probe.result()
+    return StagedFile(path=path, size_bytes=size_bytes, checksum=digest.hexdigest(), width=width, height=height)
+
 
 def build_asset_storage_uri(
     *,
@@ -29,7 +78,7 @@ def build_asset_storage_uri(
 def build_asset_record(
     *,
     project_id: str,
-    content: bytes,
+    content: bytes | None = None,
     file_name: str,
     mime_type: str,
     folder: Folder | None,
@@ -41,6 +90,8 @@ def build_asset_record(
     frame_index: int | None = None,
     timestamp_seconds: float | None = None,
     asset_id: str | None = None,
+    staged: StagedFile | None = None,
+    perceptual_hash: str | None = None,
 ) -> tuple[Asset, str]:
     generated_id = asset_id or str(uuid.uuid4())
     safe_file_name = sanitize_file_name(file_name, fallback=f"{generated_id}{Path(file_name).suffix.lower()}")
@@ -51,13 +102,21 @@ def build_asset_record(
         file_name=safe_file_name,
         sequence_id=sequence_id,
     )
-    width, height = extract_image_dimensions(content)
-    checksum = hashlib.sha256(content).hexdigest()
+    if staged is not None:
+        width, height = staged.width, staged.height
+        checksum = staged.checksum
+        size_bytes = staged.size_bytes
+    else:
+        if content is None:
+            raise ValueError("content or staged is required")
+        width, height = extract_image_dimensions(content)
+        checksum = hashlib.sha256(content).hexdigest()
+        size_bytes = len(content)
     metadata_json = {
         "storage_uri": storage_uri,
         "original_filename": original_filename or safe_file_name,
         "relative_path": relative_path,
-        "size_bytes": len(content),
+        "size_bytes": size_bytes,
         "source_kind": source_kind,
     }
     if isinstance(sequence_id, str) and sequence_id.strip():
@@ -75,6 +134,7 @@ def build_asset_record(
         type=asset_type,
         folder_id=folder.id if folder is not None else None,
         file_name=safe_file_name,
+        sort_path=relative_path,
         sequence_id=sequence_id,
         source_kind=source_kind,
         frame_index=frame_index,
@@ -84,11 +144,60 @@ def build_asset_record(
         width=width,
         height=height,
         checksum=checksum,
+        perceptual_hash=perceptual_hash,
         metadata_json=metadata_json,
     )
     return asset, storage_uri
 
 
+async def find_project_assets_by_checksum(
+    db: AsyncSession,
+    project_id: str,
+    checksums: Iterable[str],
+) -> dict[str, list[Asset]]:
+    """Existing assets of a project grouped by checksum (served by ``ix_assets_project_checksum``)."""
+    wanted = sorted(set(checksums))
+    if not wanted:
+        return {}
+    rows = await db.execute(select(Asset).where(Asset.project_id == project_id, Asset.checksum.in_(wanted)))
+    found: dict[str, list[Asset]] = {}
+    for asset in rows.scalars().all():
+        found.setdefault(asset.checksum, []).append(asset)
+    return found
+
+
+def find_identical_asset(candidates: Iterable[Asset], asset: Asset) -> Asset | None:
+    """An existing plain image with the same bytes at the same folder and file name as ``asset``."""
+    if asset.sequence_id is not None:
+        return None
+    for candidate in candidates:
+        if (
+            candidate.sequence_id is None
+            and candidate.checksum == asset.checksum
+            and candidate.folder_id == asset.folder_id
+            and candidate.file_name == asset.file_name
+        ):
+            return candidate
+    return None
+
+
+def adopt_existing_blob(storage: LocalStorage, checksum: str, existing: Iterable[Asset]) -> bool:
+    """Publish the file of an asset stored before the blob layer as the blob for ``checksum``."""
+    if storage.blobs.exists(checksum):
+        return False
+    for asset in existing:
+        storage_uri = asset.metadata_json.get("storage_uri") if isinstance(asset.metadata_json, dict) else None
+        if not isinstance(storage_uri, str) or not storage_uri:
+            continue
+        try:
+            path = storage.resolve(storage_uri)
+        except ValueError:
+            continue
+        if path.is_file() and storage.blobs.adopt(checksum, path):
+            return True
+    return False
+
+
 async def persist_asset_bytes(
     *,
     db: AsyncSession,
@@ -106,7 +215,14 @@ async def persist_asset_bytes(
     frame_index: int | None = None,
     timestamp_seconds: float | None = None,
     commit: bool = True,
+    reuse_identical: bool = False,
+    perceptual_hash: str | None = None,
 ) -> Asset:
+    """Store an asset's bytes through the blob store and add its row.
+
+    With ``reuse_identical`` an existing asset with the same bytes, folder and
+    file name is returned instead of creating a duplicate (re-imports).
+    """
     asset, storage_uri = build_asset_record(
         project_id=project_id,
         content=content,
@@ -120,11 +236,19 @@ async def persist_asset_bytes(
         source_kind=source_kind,
         frame_index=frame_index,
         timestamp_seconds=timestamp_seconds,
+        perceptual_hash=perceptual_hash,
     )
 
+    existing = (await find_project_assets_by_checksum(db, project_id, [asset.checksum])).get(asset.checksum, [])
+    if reuse_identical:
+        duplicate = find_identical_asset(existing, asset)
+        if duplicate is not None:
+            return duplicate
+    adopt_existing_blob(storage, asset.checksum, existing)
+
     wrote_file = False
     try:
-        storage.write_bytes(storage_uri, content)
+        storage.write_asset_bytes(storage_uri, content, asset.checksum)
         wrote_file = True
         db.add(asset)
         if commit:
@@ -137,9 +261,66 @@ async def persist_asset_bytes(
             await db.rollback()
         if wrote_file:
             try:
-                storage.delete_file(storage_uri)
+                storage.delete_asset_file(storage_uri, asset.checksum)
             except ValueError:
                 pass
         raise
 
     return asset
+
+
+async def persist_staged_assets(
+    *,
+    db: AsyncSession,
+    storage: LocalStorage,
+    project_id: str,
+    uploads: list[StagedUpload],
+    reuse_identical: bool = True,
+) -> list[tuple[Asset, bool]]:
+    """Move staged files into place and insert their rows in one transaction.
+
+    Returns ``(asset, reused)`` per upload; with ``reuse_identical`` an upload
+    matching an existing asset (same bytes, folder and file name) reuses it
+    and its staged file is dropped. On any failure the transaction is rolled
+    back and every moved or staged file is removed, so a batch is stored
+    completely or not at all.
+    """
+    results: list[tuple[Asset, bool]] = []
+    created: list[Asset] = []
+    moved: list[tuple[str, str]] = []
+    try:
+        existing = await find_project_assets_by_checksum(db, project_id, (upload.staged.checksum for upload in uploads))
+        for upload in uploads:
+            asset, storage_uri = build_asset_record(
+                project_id=project_id,
+                file_name=upload.file_name,
+                mime_type=upload.mime_type,
+                folder=upload.folder,
+                original_filename=upload.original_filename,
+                staged=upload.staged,
+            )
+            candidates = existing.setdefault(asset.checksum, [])
+            duplicate = find_identical_asset(candidates, asset) if reuse_identical else None
+            if duplicate is not None:
+                upload.staged.path.unlink(missing_ok=True)
+                results.append((duplicate, True))
+                continue
+            adopt_existing_blob(storage, asset.checksum, candidates)
+            storage.move_asset_into(storage_uri, upload.staged.path, asset.checksum)
+            moved.append((storage_uri, asset.checksum))
+            candidates.append(asset)
+            created.append(asset)
+            results.append((asset, False))
+        db.add_all(created)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        for storage_uri, checksum in moved:
+            try:
+                storage.delete_asset_file(storage_uri, checksum)
+            except ValueError:
+                pass
+        for upload in uploads:
+            upload.staged.path.unlink(missing_ok=True)
+        raise
+    return results
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import copy
+import json
+import logging
+import os
 from pathlib import Path
-from typing import Any
+import time
+from typing import Any, Callable
 
+from fastapi import HTTPException
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from sheriff_api.config import get_settings
 from sheriff_api.db.models import Annotation, Asset, Project, Task, TaskKind, TaskLabelMode, TaskType
+from sheriff_api.db.session import SessionLocal
 from sheriff_api.errors import api_error
-from sheriff_api.services.exporter_coco import ExportValidationError, build_export_result
+from sheriff_api.services.dataset_store import DatasetStore, create_dataset_store
+from sheriff_api.services.exporter_coco import ExportPlan, ExportValidationError, build_export_plan, write_export_zip_file
 from sheriff_api.services.storage import LocalStorage
 
+logger = logging.getLogger(__name__)
+
+EXPORT_JOB_TYPE = "build_dataset_export"
+_PROGRESS_INTERVAL_SECONDS = 1.0
+
 
 def task_type_for_task(task: Task) -> TaskType:
     if task.kind == TaskKind.classification:
@@ -62,7 +76,7 @@ def map_uuid_payload_to_coco_int(payload_json: dict[str, Any], class_to_coco: di
     return payload
 
 
-def load_asset_bytes(local_storage: LocalStorage, asset: dict[str, Any]) -> bytes | None:
+def locate_asset_path(local_storage: LocalStorage, asset: dict[str, Any]) -> Path | None:
     storage_uri = asset.get("storage_uri")
     if not isinstance(storage_uri, str) or not storage_uri:
         return None
@@ -72,17 +86,25 @@ def load_asset_bytes(local_storage: LocalStorage, asset: dict[str, Any]) -> byte
         return None
     if not path.exists() or not path.is_file():
         return None
-    return path.read_bytes()
+    return path
 
 
-async def build_dataset_export(
+def export_storage_uri(project_id: str, content_hash: str) -> str:
+    return f"exports/{project_id}/{content_hash}.zip"
+
+
+def export_download_uri(project_id: str, dataset_version_id: str) -> str:
+    return f"/api/v1/projects/{project_id}/datasets/versions/{dataset_version_id}/export/download"
+
+
+async def plan_dataset_export(
     *,
     db: AsyncSession,
     storage: LocalStorage,
     project: Project,
     task: Task,
     dataset_version: dict[str, Any],
-) -> tuple[str, str]:
+) -> ExportPlan:
     class_order = dataset_version.get("labels", {}).get("label_schema", {}).get("class_order")
     classes = dataset_version.get("labels", {}).get("label_schema", {}).get("classes")
     if not isinstance(class_order, list) or not isinstance(classes, list):
@@ -130,7 +152,7 @@ async def build_dataset_export(
     selected_annotations = [annotation for annotation in annotations if annotation.asset_id in selected_asset_ids]
 
     try:
-        manifest, _coco, content_hash, zip_bytes = build_export_result(
+        return build_export_plan(
             project_id=project.id,
             project_name=project.name,
             task_type=task_type_for_task(task),
@@ -185,13 +207,143 @@ async def build_dataset_export(
                 }
                 for annotation in selected_annotations
             ],
-            load_asset_bytes=lambda asset: load_asset_bytes(storage, asset),
+            locate_asset=lambda asset: locate_asset_path(storage, asset),
         )
     except ExportValidationError as exc:
         raise api_error(status_code=422, code=exc.code, message=exc.message, details=exc.details) from exc
 
-    storage_uri = f"exports/{project.id}/{content_hash}.zip"
-    if not storage.resolve(storage_uri).exists():
-        storage.write_bytes(storage_uri, zip_bytes)
-    export_uri = f"/api/v1/projects/{project.id}/datasets/versions/{dataset_version['dataset_version_id']}/export/download"
-    return content_hash, export_uri
+
+def write_dataset_export(
+    storage: LocalStorage,
+    project_id: str,
+    plan: ExportPlan,
+    *,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    """Stream the plan's archive to its content-addressed path (blocking)."""
+    storage_uri = export_storage_uri(project_id, plan.content_hash)
+    path = storage.resolve(storage_uri)
+    if path.exists():
+        return {"storage_uri": storage_uri, "size_bytes": path.stat().st_size}
+    zip_sha256, size_bytes = write_export_zip_file(plan, path, on_progress=on_progress)
+    return {"storage_uri": storage_uri, "size_bytes": size_bytes, "zip_sha256": zip_sha256}
+
+
+async def build_dataset_export(
+    *,
+    db: AsyncSession,
+    storage: LocalStorage,
+    project: Project,
+    task: Task,
+    dataset_version: dict[str, Any],
+) -> tuple[str, str]:
+    plan = await plan_dataset_export(db=db, storage=storage, project=project, task=task, dataset_version=dataset_version)
+    await asyncio.to_thread(write_dataset_export, storage, project.id, plan)
+    return plan.content_hash, export_download_uri(project.id, str(dataset_version["dataset_version_id"]))
+
+
+def _export_job_status_uri(project_id: str, dataset_version_id: str) -> str:
+    return f"exports/{project_id}/jobs/{dataset_version_id}.json"
+
+
+def read_export_job_status(storage: LocalStorage, project_id: str, dataset_version_id: str) -> dict[str, Any] | None:
+    try:
+        path = storage.resolve(_export_job_status_uri(project_id, dataset_version_id))
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def write_export_job_status(storage: LocalStorage, project_id: str, dataset_version_id: str, status: dict[str, Any]) -> None:
+    # Job progress lives beside the exports rather than in the dataset document so
+    # frequent worker updates cannot race API writes to dataset versions.
+    path = storage.resolve(_export_job_status_uri(project_id, dataset_version_id))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    partial.write_text(json.dumps(status, sort_keys=True), encoding="utf-8")
+    os.replace(partial, path)
+
+
+def _error_from_exception(exc: Exception) -> tuple[str, str]:
+    if isinstance(exc, HTTPException) and isinstance(exc.detail, dict):
+        code = exc.detail.get("code")
+        message = exc.detail.get("message")
+        if isinstance(code, str) and isinstance(message, str):
+            return code, message
+    if isinstance(exc, ExportValidationError):
+        return exc.code, exc.message
+    return "export_failed", str(exc) or "Dataset export failed"
+
+
+async def run_dataset_export_job(
+    payload: dict[str, Any],
+    *,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    storage: LocalStorage | None = None,
+    dataset_store: DatasetStore | None = None,
+) -> dict[str, Any]:
+    settings = get_settings()
+    effective_storage = storage or LocalStorage(settings.storage_root)
+    effective_store = dataset_store or create_dataset_store(settings.storage_root, database_url=settings.registry_url())
+    effective_session_factory = session_factory or SessionLocal
+
+    project_id = str(payload.get("project_id") or "").strip()
+    dataset_version_id = str(payload.get("dataset_version_id") or "").strip()
+    if not project_id or not dataset_version_id:
+        raise ValueError("project_id and dataset_version_id are required")
+
+    def set_status(status: str, **fields: Any) -> None:
+        write_export_job_status(
+            effective_storage,
+            project_id,
+            dataset_version_id,
+            {"status": status, "dataset_version_id": dataset_version_id, **fields},
+        )
+
+    set_status("running", progress={"done": 0, "total": 0})
+    try:
+        loaded = effective_store.get_version(project_id, dataset_version_id)
+        if loaded is None:
+            raise api_error(status_code=404, code="dataset_version_not_found", message="Dataset version not found in project")
+        version = loaded["version"]
+        async with effective_session_factory() as db:
+            project = await db.get(Project, project_id)
+            task = await db.get(Task, str(version.get("task_id") or ""))
+            if project is None:
+                raise api_error(status_code=404, code="project_not_found", message="Project not found")
+            if task is None or task.project_id != project_id:
+                raise api_error(status_code=404, code="task_not_found", message="Task not found in project")
+            plan = await plan_dataset_export(
+                db=db,
+                storage=effective_storage,
+                project=project,
+                task=task,
+                dataset_version=version,
+            )
+
+        last_report = 0.0
+
+        def report(done: int, total: int) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            if done < total and now - last_report < _PROGRESS_INTERVAL_SECONDS:
+                return
+            last_report = now
+            set_status("running", progress={"done": done, "total": total})
+
+        written = await asyncio.to_thread(write_dataset_export, effective_storage, project_id, plan, on_progress=report)
+    except Exception as exc:
+        code, message = _error_from_exception(exc)
+        set_status("failed", error={"code": code, "message": message})
+        logger.exception("Dataset export %s/%s failed", project_id, dataset_version_id)
+        return {"status": "failed", "dataset_version_id": dataset_version_id, "code": code}
+
+    export_uri = export_download_uri(project_id, dataset_version_id)
+    artifact = {"hash": plan.content_hash, "export_uri": export_uri, "size_bytes": written["size_bytes"]}
+    if "zip_sha256" in written:
+        artifact["zip_sha256"] = written["zip_sha256"]
+    effective_store.set_export_artifact(project_id, dataset_version_id, artifact)
+    total = len(plan.asset_sources)
+    set_status("completed", progress={"done": total, "total": total}, hash=plan.content_hash, export_uri=export_uri)
+    return {"status": "completed", "dataset_version_id": dataset_version_id, "hash": plan.content_hash}
@@ -136,14 +136,18 @@ class DatasetStore:
             }
         return None
 
-    def create_version(self, project_id: str, payload: dict[str, Any]) -> dict[str, Any]:
-        doc = self._read_doc(project_id)
+    def _prepare_version(self, project_id: str, payload: dict[str, Any]) -> dict[str, Any]:
         version = dict(payload)
         version.setdefault("schema_version", "2.0")
         version.setdefault("dataset_version_id", str(uuid.uuid4()))
         version.setdefault("project_id", project_id)
         version.setdefault("created_at", _utc_now_iso())
         self._validate_dataset_version(version)
+        return version
+
+    def create_version(self, project_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        doc = self._read_doc(project_id)
+        version = self._prepare_version(project_id, payload)
         doc["items"].append(version)
         self._write_doc(project_id, doc)
         return version
@@ -207,3 +211,11 @@ class DatasetStore:
         if isinstance(artifact, dict):
             return artifact
         return None
+
+
+def create_dataset_store(storage_root: str, *, database_url: str | None = None) -> DatasetStore:
+    if database_url:
+        from sheriff_api.services.sql_registry import SqlDatasetStore
+
+        return SqlDatasetStore(storage_root, database_url)
+    return DatasetStore(storage_root)
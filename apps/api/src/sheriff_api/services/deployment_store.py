@@ -20,6 +20,65 @@ def _default_doc(project_id: str) -> dict[str, Any]:
     }
 
 
+def new_deployment_item(
+    *,
+    name: str,
+    task_id: str | None,
+    task: str,
+    device_preference: str,
+    source: dict[str, Any],
+    model_key: str,
+) -> dict[str, Any]:
+    timestamp = _utc_now_iso()
+    return {
+        "deployment_id": str(uuid.uuid4()),
+        "task_id": task_id,
+        "name": name,
+        "task": task,
+        "provider": "onnxruntime",
+        "device_preference": device_preference,
+        "model_key": model_key,
+        "source": source,
+        "status": "available",
+        "created_at": timestamp,
+        "updated_at": timestamp,
+    }
+
+
+def references_experiment(item: dict[str, Any], experiment_id: str, *, include_archived: bool) -> bool:
+    if not include_archived and str(item.get("status") or "").strip().lower() == "archived":
+        return False
+    source = item.get("source")
+    return isinstance(source, dict) and str(source.get("experiment_id") or "") == experiment_id
+
+
+def apply_deployment_patch(
+    item: dict[str, Any],
+    active_deployment_id: str | None,
+    *,
+    name: str | None,
+    device_preference: str | None,
+    status: str | None,
+    is_active: bool | None,
+) -> str | None:
+    """Apply a patch to ``item`` in place and return the project's next active deployment id."""
+    deployment_id = str(item.get("deployment_id"))
+    if isinstance(name, str):
+        item["name"] = name
+    if isinstance(device_preference, str):
+        item["device_preference"] = device_preference
+    if isinstance(status, str):
+        item["status"] = status
+        if status == "archived" and active_deployment_id == deployment_id:
+            active_deployment_id = None
+    if is_active is True:
+        active_deployment_id = deployment_id
+    if is_active is False and active_deployment_id == deployment_id:
+        active_deployment_id = None
+    item["updated_at"] = _utc_now_iso()
+    return active_deployment_id
+
+
 class DeploymentStore:
     def __init__(self, storage_root: str) -> None:
         self._root = Path(storage_root)
@@ -76,19 +135,7 @@ class DeploymentStore:
         include_archived: bool = False,
     ) -> list[dict[str, Any]]:
         doc = self._read_doc(project_id)
-        matches: list[dict[str, Any]] = []
-        for item in doc["items"]:
-            if not isinstance(item, dict):
-                continue
-            if not include_archived and str(item.get("status") or "").strip().lower() == "archived":
-                continue
-            source = item.get("source")
-            if not isinstance(source, dict):
-                continue
-            if str(source.get("experiment_id") or "") != experiment_id:
-                continue
-            matches.append(item)
-        return matches
+        return [item for item in doc["items"] if references_experiment(item, experiment_id, include_archived=include_archived)]
 
     def create(
         self,
@@ -103,20 +150,14 @@ class DeploymentStore:
         is_active: bool = False,
     ) -> dict[str, Any]:
         doc = self._read_doc(project_id)
-        timestamp = _utc_now_iso()
-        item = {
-            "deployment_id": str(uuid.uuid4()),
-            "task_id": task_id,
-            "name": name,
-            "task": task,
-            "provider": "onnxruntime",
-            "device_preference": device_preference,
-            "model_key": model_key,
-            "source": source,
-            "status": "available",
-            "created_at": timestamp,
-            "updated_at": timestamp,
-        }
+        item = new_deployment_item(
+            name=name,
+            task_id=task_id,
+            task=task,
+            device_preference=device_preference,
+            source=source,
+            model_key=model_key,
+        )
         doc["items"].append(item)
         if is_active:
             doc["active_deployment_id"] = item["deployment_id"]
@@ -143,18 +184,21 @@ class DeploymentStore:
         if target is None:
             return None
 
-        if isinstance(name, str):
-            target["name"] = name
-        if isinstance(device_preference, str):
-            target["device_preference"] = device_preference
-        if isinstance(status, str):
-            target["status"] = status
-            if status == "archived" and doc.get("active_deployment_id") == deployment_id:
-                doc["active_deployment_id"] = None
-        if is_active is True:
-            doc["active_deployment_id"] = deployment_id
-        if is_active is False and doc.get("active_deployment_id") == deployment_id:
-            doc["active_deployment_id"] = None
-        target["updated_at"] = _utc_now_iso()
+        doc["active_deployment_id"] = apply_deployment_patch(
+            target,
+            doc.get("active_deployment_id"),
+            name=name,
+            device_preference=device_preference,
+            status=status,
+            is_active=is_active,
+        )
         self._write_doc(project_id, doc)
         return target
+
+
+def create_deployment_store(storage_root: str, *, database_url: str | None = None) -> DeploymentStore:
+    if database_url:
+        from sheriff_api.services.sql_registry import SqlDeploymentStore
+
+        return SqlDeploymentStore(storage_root, database_url)
+    return DeploymentStore(storage_root)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+from array import array
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+from typing import Any, AsyncIterator, Callable, Hashable, Protocol
+
+logger = logging.getLogger(__name__)
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_CATCH_UP_PAGE_CACHE = 8
+
+StatusReader = Callable[[], dict[str, Any]]
+
+
+class ChangeWatcher(Protocol):
+    async def wait(self, timeout: float) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+class PollingWatcher:
+    """Wakes the tail every ``interval`` seconds; used where inotify is unavailable."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = max(0.05, float(interval))
+
+    async def wait(self, timeout: float) -> bool:
+        await asyncio.sleep(min(self._interval, max(0.0, timeout)))
+        return True
+
+    def close(self) -> None:
+        return None
+
+
+class InotifyWatcher:
+    """Wakes the tail when anything in the watched directories is written or replaced."""
+
+    def __init__(self, directories: list[Path]) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            for directory in directories:
+                if libc.inotify_add_watch(fd, os.fsencode(str(directory)), _WATCH_MASK) < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        except OSError:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._changed = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(fd, self._drain)
+
+    def _drain(self) -> None:
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        except OSError:
+            logger.debug("inotify read failed", exc_info=True)
+        self._changed.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=max(0.0, timeout))
+            changed = True
+        except asyncio.TimeoutError:
+            changed = False
+        # Cleared before the caller reads, so a write that lands during the read re-arms the event.
+        self._changed.clear()
+        return changed
+
+    def close(self) -> None:
+        self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+
+
+def create_watcher(directories: list[Path], *, mode: str, poll_seconds: float) -> ChangeWatcher:
+    if mode != "poll" and all(directory.is_dir() for directory in directories):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError):
+            if mode == "inotify":
+                raise
+            logger.debug("inotify unavailable, polling event logs instead", exc_info=True)
+    return PollingWatcher(poll_seconds)
+
+
+class TailRow:
+    """One parsed event line, shared by every subscriber of a tail.
+
+    ``encoded()`` serializes the ``{"line", "attempt", "event"}`` payload once,
+    so fanning a row out to many streams does not re-encode it per stream.
+    """
+
+    __slots__ = ("line", "attempt", "event", "_encoded")
+
+    def __init__(self, line: int, attempt: int, event: dict[str, Any]) -> None:
+        self.line = line
+        self.attempt = attempt
+        self.event = event
+        self._encoded: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"line": self.line, "attempt": self.attempt, "event": self.event}
+
+    def encoded(self) -> str:
+        if self._encoded is None:
+            self._encoded = json.dumps(self.as_dict(), separators=(",", ":"))
+        return self._encoded
+
+
+def _parse_line(raw: bytes) -> dict[str, Any] | None:
+    try:
+        parsed = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+class EventLogTail:
+    """Follows one ``events.jsonl`` by byte offset and fans new rows out to all subscribers.
+
+    Only complete lines are consumed. Line numbers count every line (including
+    unparseable ones), matching ``ExperimentStore.read_events``. The most recent
+    ``history_limit`` rows are kept in memory; subscribers further behind read
+    the gap from the file in blocks of ``catch_up_lines``, located through the
+    per-line offset index and shared between subscribers catching up together.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Path,
+        attempt: int,
+        status_reader: StatusReader,
+        watcher: ChangeWatcher,
+        idle_timeout_seconds: float = 15.0,
+        history_limit: int = 2048,
+        catch_up_lines: int = 4096,
+    ) -> None:
+        self.path = path
+        self.attempt = attempt
+        self.line_count = 0
+        self.status_row: dict[str, Any] = {}
+        self._status_reader = status_reader
+        self._watcher = watcher
+        self._idle_timeout_seconds = max(0.05, float(idle_timeout_seconds))
+        self._catch_up_lines = max(1, int(catch_up_lines))
+        self._offset = 0
+        self._line_offsets = array("q")
+        self._recent: deque[TailRow] = deque(maxlen=max(1, int(history_limit)))
+        self._condition = asyncio.Condition()
+        self._pages: OrderedDict[int, asyncio.Future[list[TailRow]]] = OrderedDict()
+        self._task: asyncio.Task[None] | None = None
+        self.reads = 0
+
+    def _read_appended(self, offset: int) -> tuple[bytes, dict[str, Any], bool]:
+        status_row = self._status_reader()
+        try:
+            with self.path.open("rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if size < offset:
+                    handle.seek(0)
+                    return handle.read(), status_row, True
+                if size == offset:
+                    return b"", status_row, False
+                handle.seek(offset)
+                return handle.read(size - offset), status_row, False
+        except FileNotFoundError:
+            return b"", status_row, offset > 0
+
+    async def refresh(self) -> None:
+        chunk, status_row, truncated = await asyncio.to_thread(self._read_appended, self._offset)
+        self.reads += 1
+        async with self._condition:
+            if truncated:
+                self._offset = 0
+                self.line_count = 0
+                self._line_offsets = array("q")
+                self._recent.clear()
+                self._pages.clear()
+            end = chunk.rfind(b"\n") + 1
+            starts: list[int] = []
+            position = 0
+            while position < end:
+                starts.append(position)
+                position = chunk.index(b"\n", position) + 1
+            first_line = self.line_count + 1
+            self._line_offsets.extend(self._offset + start for start in starts)
+            self.line_count += len(starts)
+            # Lines that would be evicted from the history straight away are indexed but not parsed.
+            keep_from = max(0, len(starts) - (self._recent.maxlen or len(starts)))
+            for index in range(keep_from, len(starts)):
+                stop = starts[index + 1] if index + 1 < len(starts) else end
+                event = _parse_line(chunk[starts[index] : stop - 1])
+                if event is not None:
+                    self._recent.append(TailRow(first_line + index, self.attempt, event))
+            self._offset += end
+            self.status_row = status_row
+            self._condition.notify_all()
+
+    def _read_range(self, first_line: int, start: int, stop: int) -> list[TailRow]:
+        rows: list[TailRow] = []
+        with self.path.open("rb") as handle:
+            handle.seek(start)
+            data = handle.read(stop - start)
+        for index, raw in enumerate(data.split(b"\n")[:-1]):
+            event = _parse_line(raw)
+            if event is not None:
+                rows.append(TailRow(first_line + index, self.attempt, event))
+        return rows
+
+    async def rows_after(self, cursor: int) -> tuple[list[TailRow], int]:
+        """Return parsed rows after line ``cursor`` and the line number they cover up to."""
+        if cursor >= self.line_count:
+            return [], cursor
+        oldest = self._recent[0].line if self._recent else self.line_count + 1
+        if cursor + 1 >= oldest:
+            rows: list[TailRow] = []
+            for row in reversed(self._recent):
+                if row.line <= cursor:
+                    break
+                rows.append(row)
+            rows.reverse()
+            return rows, self.line_count
+        page = cursor // self._catch_up_lines
+        page_rows = await self._catch_up_page(page)
+        stop_line = min(self.line_count, (page + 1) * self._catch_up_lines)
+        return [row for row in page_rows if row.line > cursor], stop_line
+
+    async def _catch_up_page(self, page: int) -> list[TailRow]:
+        """Parse one fixed block of lines; complete blocks are shared by concurrent catch-ups."""
+        first_line = page * self._catch_up_lines + 1
+        stop_line = min(self.line_count, (page + 1) * self._catch_up_lines)
+        start = self._line_offsets[first_line - 1]
+        stop = self._line_offsets[stop_line] if stop_line < self.line_count else self._offset
+        if stop_line < (page + 1) * self._catch_up_lines:
+            return await asyncio.to_thread(self._read_range, first_line, start, stop)
+
+        pending = self._pages.get(page)
+        if pending is None:
+            pending = asyncio.ensure_future(asyncio.to_thread(self._read_range, first_line, start, stop))
+            self._pages[page] = pending
+            while len(self._pages) > _CATCH_UP_PAGE_CACHE:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page)
+        try:
+            return await asyncio.shield(pending)
+        except Exception:
+            self._pages.pop(page, None)
+            raise
+
+    async def wait(self, cursor: int, timeout: float) -> bool:
+        """Wait for the next refresh unless lines past ``cursor`` are already available.
+
+        Returns False when ``timeout`` elapses without a refresh.
+        """
+        async with self._condition:
+            if self.line_count > cursor:
+                return True
+            try:
+                await asyncio.wait_for(self._condition.wait(), timeout=max(0.0, timeout))
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def _follow(self) -> None:
+        while True:
+            await self._watcher.wait(self._idle_timeout_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to read experiment event log %s", self.path)
+
+    async def start(self) -> None:
+        await self.refresh()
+        self._task = asyncio.create_task(self._follow(), name=f"event-tail-{self.path.parent.name}")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._watcher.close()
+
+
+class EventTailRegistry:
+    """Shares one :class:`EventLogTail` between all open streams of the same run."""
+
+    def __init__(self, *, watch_mode: str = "auto", poll_seconds: float = 0.8, idle_timeout_seconds: float = 15.0) -> None:
+        self._watch_mode = watch_mode
+        self._poll_seconds = poll_seconds
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._tails: dict[Hashable, tuple[EventLogTail, int]] = {}
+        self._lock = asyncio.Lock()
+
+    def subscriber_count(self, key: Hashable) -> int:
+        entry = self._tails.get(key)
+        return entry[1] if entry is not None else 0
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        key: Hashable,
+        *,
+        path: Path,
+        attempt: int,
+        status_reader: StatusReader,
+        watch_dirs: list[Path],
+    ) -> AsyncIterator[EventLogTail]:
+        async with self._lock:
+            entry = self._tails.get(key)
+            if entry is None:
+                watcher = create_watcher(watch_dirs, mode=self._watch_mode, poll_seconds=self._poll_seconds)
+                idle_timeout = self._poll_seconds if isinstance(watcher, PollingWatcher) else self._idle_timeout_seconds
+                tail = EventLogTail(
+                    path=path,
+                    attempt=attempt,
+                    status_reader=status_reader,
+                    watcher=watcher,
+                    idle_timeout_seconds=idle_timeout,
+                )
+                try:
+                    await tail.start()
+                except BaseException:
+                    watcher.close()
+                    raise
+                entry = (tail, 0)
+            tail, count = entry
+            self._tails[key] = (tail, count + 1)
+        try:
+            yield tail
+        finally:
+            async with self._lock:
+                tail, count = self._tails[key]
+                if count <= 1:
+                    del self._tails[key]
+                    await tail.close()
+                else:
+                    self._tails[key] = (tail, count - 1)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
+import os
 from pathlib import Path
 from typing import Any, Callable
 import uuid
@@ -23,6 +24,23 @@ def _default_summary() -> dict[str, Any]:
     }
 
 
+def write_json_atomic(path: Path, payload: Any) -> int:
+    """Write ``payload`` through a temp file and rename; returns the file's ``st_mtime_ns``.
+
+    Readers in other processes (the trainer, event tails) never see a partial
+    document, and the returned mtime is the one the rename published.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{uuid.uuid4().hex}.partial")
+    try:
+        partial.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        mtime_ns = partial.stat().st_mtime_ns
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return mtime_ns
+
+
 def _default_checkpoints() -> list[dict[str, Any]]:
     return [
         {"kind": "best_metric", "epoch": None, "metric_name": None, "value": None, "updated_at": None, "uri": None, "status": "pending", "error": None},
@@ -48,6 +66,9 @@ class ExperimentStore:
     def _status_path(self, project_id: str, experiment_id: str) -> Path:
         return self._experiment_dir(project_id, experiment_id) / "status.json"
 
+    def _summary_path(self, project_id: str, experiment_id: str) -> Path:
+        return self._experiment_dir(project_id, experiment_id) / "summary.json"
+
     def _legacy_metrics_path(self, project_id: str, experiment_id: str) -> Path:
         return self._experiment_dir(project_id, experiment_id) / "metrics.jsonl"
 
@@ -132,8 +153,7 @@ class ExperimentStore:
         return payload
 
     def _write_json(self, path: Path, payload: Any) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        write_json_atomic(path, payload)
 
     def _read_records(self, project_id: str) -> list[dict[str, Any]]:
         payload = self._read_json(self._records_path(project_id), [])
@@ -144,6 +164,19 @@ class ExperimentStore:
     def _write_records(self, project_id: str, records: list[dict[str, Any]]) -> None:
         self._write_json(self._records_path(project_id), records)
 
+    def _insert_record(self, project_id: str, record: dict[str, Any]) -> None:
+        records = self._read_records(project_id)
+        records.append(record)
+        self._write_records(project_id, records)
+
+    def _remove_record(self, project_id: str, experiment_id: str) -> None:
+        records = self._read_records(project_id)
+        self._write_records(project_id, [row for row in records if str(row.get("id")) != experiment_id])
+
+    def _record_attempt(self, project_id: str, experiment_id: str, run_row: dict[str, Any]) -> None:
+        # run.json is the file registry's attempt index; the SQL registry also keeps a row per attempt.
+        return None
+
     def _read_status(self, project_id: str, experiment_id: str) -> dict[str, Any]:
         payload = self._read_json(self._status_path(project_id, experiment_id), self._status_default())
         if not isinstance(payload, dict):
@@ -223,6 +256,20 @@ class ExperimentStore:
             return record
         return None
 
+    @staticmethod
+    def _merge_status(record: dict[str, Any], status_row: dict[str, Any]) -> dict[str, Any]:
+        merged = dict(record)
+        merged["status"] = str(status_row.get("status", record.get("status", "draft")))
+        merged["current_run_attempt"] = status_row.get("current_run_attempt")
+        merged["last_completed_attempt"] = status_row.get("last_completed_attempt")
+        merged["active_job_id"] = status_row.get("active_job_id")
+        merged["error"] = status_row.get("error")
+        return merged
+
+    def list_index_records(self, project_id: str) -> list[dict[str, Any]]:
+        """Return the project's experiment records without status hydration."""
+        return self._read_records(project_id)
+
     def list_by_project(self, project_id: str, *, model_id: str | None = None) -> list[dict[str, Any]]:
         records = self._read_records(project_id)
         if model_id:
@@ -232,14 +279,7 @@ class ExperimentStore:
             experiment_id = str(row.get("id") or "")
             if not experiment_id:
                 continue
-            status_row = self._read_status(project_id, experiment_id)
-            merged = dict(row)
-            merged["status"] = str(status_row.get("status", row.get("status", "draft")))
-            merged["current_run_attempt"] = status_row.get("current_run_attempt")
-            merged["last_completed_attempt"] = status_row.get("last_completed_attempt")
-            merged["active_job_id"] = status_row.get("active_job_id")
-            merged["error"] = status_row.get("error")
-            hydrated.append(merged)
+            hydrated.append(self._merge_status(row, self._read_status(project_id, experiment_id)))
         return sorted(hydrated, key=lambda item: str(item.get("updated_at", "")), reverse=True)
 
     def get_index_record(self, project_id: str, experiment_id: str) -> dict[str, Any] | None:
@@ -266,13 +306,8 @@ class ExperimentStore:
         checkpoints = self._read_checkpoints_for_attempt(project_id, experiment_id, resolved_attempt)
         metrics = self.read_metrics(project_id, experiment_id, limit=metrics_limit, attempt=resolved_attempt)
 
-        payload = dict(index_record)
+        payload = self._merge_status(index_record, status_row)
         payload["config_json"] = config if isinstance(config, dict) else {}
-        payload["status"] = str(status_row.get("status", index_record.get("status", "draft")))
-        payload["current_run_attempt"] = status_row.get("current_run_attempt")
-        payload["last_completed_attempt"] = status_row.get("last_completed_attempt")
-        payload["active_job_id"] = status_row.get("active_job_id")
-        payload["error"] = status_row.get("error")
         payload["checkpoints"] = checkpoints
         payload["metrics"] = metrics
         return payload
@@ -287,7 +322,6 @@ class ExperimentStore:
         config_json: dict[str, Any],
         status: str = "draft",
     ) -> dict[str, Any]:
-        records = self._read_records(project_id)
         timestamp = _utc_now_iso()
         experiment_id = str(uuid.uuid4())
         record = {
@@ -303,8 +337,7 @@ class ExperimentStore:
             "summary_json": _default_summary(),
             "artifacts_json": {},
         }
-        records.append(record)
-        self._write_records(project_id, records)
+        self._insert_record(project_id, record)
 
         self._write_json(self._config_path(project_id, experiment_id), config_json)
         self._write_status(
@@ -682,18 +715,17 @@ class ExperimentStore:
         run_dir.mkdir(parents=True, exist_ok=True)
         (run_dir / "checkpoints").mkdir(parents=True, exist_ok=True)
 
-        self._write_json(
-            self._run_json_path(project_id, experiment_id, attempt),
-            {
-                "attempt": attempt,
-                "job_id": job_id,
-                "dataset_export": dataset_export,
-                "task": task,
-                "model_family": model_family,
-                "started_at": None,
-                "ended_at": None,
-            },
-        )
+        run_row = {
+            "attempt": attempt,
+            "job_id": job_id,
+            "dataset_export": dataset_export,
+            "task": task,
+            "model_family": model_family,
+            "started_at": None,
+            "ended_at": None,
+        }
+        self._write_json(self._run_json_path(project_id, experiment_id, attempt), run_row)
+        self._record_attempt(project_id, experiment_id, run_row)
         self._events_path(project_id, experiment_id, attempt).write_text("", encoding="utf-8")
         self._write_events_meta(project_id, experiment_id, attempt, 0)
         self._metrics_path(project_id, experiment_id, attempt).write_text("", encoding="utf-8")
@@ -794,6 +826,9 @@ class ExperimentStore:
     def events_path(self, *, project_id: str, experiment_id: str, attempt: int) -> Path:
         return self._events_path(project_id, experiment_id, attempt)
 
+    def experiment_dir(self, *, project_id: str, experiment_id: str) -> Path:
+        return self._experiment_dir(project_id, experiment_id)
+
     def run_metadata(self, *, project_id: str, experiment_id: str, attempt: int) -> dict[str, Any]:
         payload = self._read_json(self._run_json_path(project_id, experiment_id, attempt), {})
         if isinstance(payload, dict):
@@ -807,9 +842,7 @@ class ExperimentStore:
             return
 
     def delete(self, *, project_id: str, experiment_id: str) -> bool:
-        records = self._read_records(project_id)
-        next_records = [row for row in records if str(row.get("id")) != experiment_id]
-        if len(next_records) == len(records):
+        if self.get_index_record(project_id, experiment_id) is None:
             return False
 
         experiment_dir = self._experiment_dir(project_id, experiment_id)
@@ -821,7 +854,7 @@ class ExperimentStore:
             experiment_dir.rename(trashed_dir)
 
         try:
-            self._write_records(project_id, next_records)
+            self._remove_record(project_id, experiment_id)
         except Exception:
             if trashed_dir is not None and trashed_dir.exists() and not experiment_dir.exists():
                 trashed_dir.rename(experiment_dir)
@@ -830,3 +863,11 @@ class ExperimentStore:
         if trashed_dir is not None and trashed_dir.exists():
             shutil.rmtree(trashed_dir, ignore_errors=False)
         return True
+
+
+def create_experiment_store(storage_root: str, *, database_url: str | None = None) -> ExperimentStore:
+    if database_url:
+        from sheriff_api.services.sql_registry import SqlExperimentStore
+
+        return SqlExperimentStore(storage_root, database_url)
+    return ExperimentStore(storage_root)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from io import BytesIO
 import math
-from pathlib import PurePosixPath
+import os
+from pathlib import Path, PurePosixPath
 import re
-from typing import Any, Callable
+from typing import Any, BinaryIO, Callable
 import uuid
 import zipfile
 
@@ -26,6 +28,23 @@ def _err(code: str, message: str, details: dict[str, Any] | None = None) -> Expo
     return ExportValidationError(code=code, message=message, details=details)
 
 
+@dataclass
+class ExportPlan:
+    """Validated export content; asset payloads are referenced, not loaded."""
+
+    manifest: dict[str, Any]
+    coco: dict[str, Any]
+    content_hash: str
+    asset_sources: dict[str, Any]
+
+
+# Already-compressed media gains nothing from deflate, so it is stored as-is.
+STORED_EXTENSIONS = frozenset(
+    {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".heic", ".mp4", ".mov", ".webm", ".mkv", ".avi", ".zip", ".gz"}
+)
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
 def _safe_relative_path(value: str, fallback_filename: str) -> str:
     normalized = value.replace("\\", "/").strip("/")
     parts = [part for part in PurePosixPath(normalized).parts if part not in ("", ".", "..")]
@@ -179,7 +198,7 @@ def _task_contract(task_type: TaskType) -> tuple[dict[str, Any], str]:
     }, "segmentation"
 
 
-def build_export_result(
+def build_export_plan(
     *,
     project_id: str,
     project_name: str,
@@ -188,10 +207,16 @@ def build_export_result(
     categories: list[dict[str, Any]],
     assets: list[dict[str, Any]],
     annotations: list[dict[str, Any]],
-    load_asset_bytes: Callable[[dict[str, Any]], bytes | None],
+    locate_asset: Callable[[dict[str, Any]], Any | None],
     split_by_asset_id: dict[str, str] | None = None,
     tool_version: str = "0.1.0",
-) -> tuple[dict[str, Any], dict[str, Any], str, bytes]:
+) -> ExportPlan:
+    """Validate and build manifest/COCO payloads.
+
+    ``locate_asset`` returns a source for each asset (a path, bytes, ...) or
+    None when the file is missing; sources are collected per zip path and only
+    read when the archive is written.
+    """
     categories = sorted(categories, key=lambda item: (item.get("display_order", 0), item["id"]))
     assets = sorted(assets, key=lambda item: (str(item.get("relative_path", "")), item["id"]))
     annotations = sorted(annotations, key=lambda item: (item["asset_id"], item["id"]))
@@ -239,7 +264,7 @@ def build_export_result(
 
     asset_records: list[dict[str, Any]] = []
     coco_images: list[dict[str, Any]] = []
-    asset_data_by_zip_path: dict[str, bytes] = {}
+    asset_source_by_zip_path: dict[str, Any] = {}
     asset_by_id: dict[str, dict[str, Any]] = {}
     used_paths: set[str] = set()
 
@@ -263,10 +288,10 @@ def build_export_result(
             n += 1
         used_paths.add(zip_path)
 
-        content = load_asset_bytes(asset)
-        if content is None:
+        source = locate_asset(asset)
+        if source is None:
             raise _err("export_asset_file_missing", "Asset file is missing and cannot be packaged", {"asset_id": asset_id})
-        asset_data_by_zip_path[zip_path] = content
+        asset_source_by_zip_path[zip_path] = source
 
         width = int(asset.get("width") or 1)
         height = int(asset.get("height") or 1)
@@ -480,7 +505,7 @@ def build_export_result(
         coco_images = [item for item in coco_images if item["id"] in included_asset_ids]
         asset_by_id = {item["asset_id"]: item for item in asset_records}
         valid_paths = {item["path"] for item in asset_records}
-        asset_data_by_zip_path = {path: content for path, content in asset_data_by_zip_path.items() if path in valid_paths}
+        asset_source_by_zip_path = {path: source for path, source in asset_source_by_zip_path.items() if path in valid_paths}
 
     coco_image_ids = {item["id"] for item in coco_images}
     manifest_asset_ids = {item["asset_id"] for item in asset_records}
@@ -597,11 +622,137 @@ def build_export_result(
     hash_manifest["exported_at"] = "stable"
     content_hash = stable_hash({"manifest": hash_manifest, "coco_instances": coco_payload})
 
-    buffer = BytesIO()
-    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-        archive.writestr("manifest.json", json.dumps(manifest, indent=2, sort_keys=True))
-        archive.writestr("coco_instances.json", json.dumps(coco_payload, indent=2, sort_keys=True))
-        for zip_path in sorted(asset_data_by_zip_path.keys()):
-            archive.writestr(zip_path, asset_data_by_zip_path[zip_path])
+    return ExportPlan(
+        manifest=manifest,
+        coco=coco_payload,
+        content_hash=content_hash,
+        asset_sources=asset_source_by_zip_path,
+    )
+
+
+class _HashingWriter:
+    """Forward-only file wrapper that hashes every byte written.
+
+    It has no ``seek``, so ``zipfile`` writes data descriptors instead of
+    patching local headers, and the digest matches the final archive bytes.
+    """
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self._fileobj = fileobj
+        self._position = 0
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._fileobj.write(data)
+        self.digest.update(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+
+def _compression_for(zip_path: str) -> int:
+    if PurePosixPath(zip_path).suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
 
-    return manifest, coco_payload, content_hash, buffer.getvalue()
+def write_export_archive(
+    plan: ExportPlan,
+    fileobj: BinaryIO,
+    *,
+    open_asset: Callable[[Any], BinaryIO],
+    on_progress: Callable[[int, int], None] | None = None,
+) -> str:
+    """Stream the export zip into ``fileobj`` and return the archive's sha256.
+
+    Assets are copied in chunks (never fully buffered); JSON documents are
+    deflated, already-compressed media is stored.
+    """
+    writer = _HashingWriter(fileobj)
+    zip_paths = sorted(plan.asset_sources.keys())
+    total = len(zip_paths)
+    with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        archive.writestr("manifest.json", json.dumps(plan.manifest, indent=2, sort_keys=True))
+        archive.writestr("coco_instances.json", json.dumps(plan.coco, indent=2, sort_keys=True))
+        for index, zip_path in enumerate(zip_paths, start=1):
+            info = zipfile.ZipInfo(zip_path, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = _compression_for(zip_path)
+            with open_asset(plan.asset_sources[zip_path]) as source:
+                # Known sizes let zipfile pick zip64 headers up front on a non-seekable stream.
+                source.seek(0, os.SEEK_END)
+                info.file_size = source.tell()
+                source.seek(0)
+                with archive.open(info, mode="w") as target:
+                    while True:
+                        chunk = source.read(_COPY_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+            if on_progress is not None:
+                on_progress(index, total)
+    writer.flush()
+    return writer.digest.hexdigest()
+
+
+def write_export_zip_file(
+    plan: ExportPlan,
+    destination: Path,
+    *,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> tuple[str, int]:
+    """Write the archive for a plan whose sources are file paths.
+
+    The zip is written next to ``destination`` and renamed into place, so a
+    reader never observes a partial file. Returns ``(zip_sha256, size_bytes)``.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f"{destination.name}.{uuid.uuid4().hex}.partial")
+    try:
+        with partial.open("wb") as handle:
+            zip_sha256 = write_export_archive(
+                plan,
+                handle,
+                open_asset=lambda source: Path(source).open("rb"),
+                on_progress=on_progress,
+            )
+        size_bytes = partial.stat().st_size
+        os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
+    return zip_sha256, size_bytes
+
+
+def build_export_result(
+    *,
+    project_id: str,
+    project_name: str,
+    task_type: TaskType,
+    selection_criteria: dict[str, Any],
+    categories: list[dict[str, Any]],
+    assets: list[dict[str, Any]],
+    annotations: list[dict[str, Any]],
+    load_asset_bytes: Callable[[dict[str, Any]], bytes | None],
+    split_by_asset_id: dict[str, str] | None = None,
+    tool_version: str = "0.1.0",
+) -> tuple[dict[str, Any], dict[str, Any], str, bytes]:
+    """In-memory variant of :func:`build_export_plan` + :func:`write_export_archive`."""
+    plan = build_export_plan(
+        project_id=project_id,
+        project_name=project_name,
+        task_type=task_type,
+        selection_criteria=selection_criteria,
+        categories=categories,
+        assets=assets,
+        annotations=annotations,
+        locate_asset=load_asset_bytes,
+        split_by_asset_id=split_by_asset_id,
+        tool_version=tool_version,
+    )
+    buffer = BytesIO()
+    write_export_archive(plan, buffer, open_asset=BytesIO)
+    return plan.manifest, plan.coco, plan.content_hash, buffer.getvalue()
@@ -0,0 +1,157 @@
+"""Perceptual hashes of frames and the per-sequence near-duplicate check run at ingest.
+
+``perceptual_hash`` is a 64-bit difference hash (dHash): the frame is reduced
+to a 9x8 grayscale grid and each bit records whether a cell is brighter than
+its right neighbour. Re-encoding, small noise and exposure drift move only a
+few bits, so frames of a static scene end up within a small Hamming distance.
+A frame is a near duplicate when it is that close to the closest earlier frame
+of its sequence that was kept.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from io import BytesIO
+
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sheriff_api.db.models import Asset
+
+FRAME_DEDUP_MODES = ("off", "flag", "skip")
+NEAR_DUPLICATE_KEY = "near_duplicate_of"
+_HASH_SIZE = 8
+
+
+def perceptual_hash(content: bytes) -> str | None:
+    """dHash of an encoded image as 16 hex digits; None when it cannot be decoded."""
+    try:
+        with Image.open(BytesIO(content)) as image:
+            # JPEG frames are decoded at a reduced DCT scale; nothing near full resolution is needed.
+            image.draft("L", (_HASH_SIZE * 8, _HASH_SIZE * 8))
+            grid = image.convert("L").resize((_HASH_SIZE + 1, _HASH_SIZE), Image.Resampling.BOX)
+            pixels = grid.tobytes()
+    except (Image.DecompressionBombError, OSError, SyntaxError, ValueError):
+        return None
+    bits = 0
+    for row in range(_HASH_SIZE):
+        offset = row * (_HASH_SIZE + 1)
+        for column in range(_HASH_SIZE):
+            bits = (bits << 1) | int(pixels[offset + column] > pixels[offset + column + 1])
+    return f"{bits:016x}"
+
+
+def hamming_distance(left: str, right: str) -> int:
+    return (int(left, 16) ^ int(right, 16)).bit_count()
+
+
+def near_duplicate_of(asset: Asset) -> str | None:
+    """Id of the kept frame ``asset`` was flagged as a near duplicate of, if any."""
+    value = asset.metadata_json.get(NEAR_DUPLICATE_KEY) if isinstance(asset.metadata_json, dict) else None
+    return value if isinstance(value, str) and value else None
+
+
+class NearDuplicateIndex:
+    """Kept frames of one sequence, ordered by frame index.
+
+    Each frame is compared with the kept frame closest before it among those seen
+    so far; ``FrameDedupQueue`` feeds it frames in frame order.
+    """
+
+    def __init__(self, max_distance: int) -> None:
+        self._max_distance = max_distance
+        self._indices: list[int] = []
+        self._kept: dict[int, tuple[str, str]] = {}
+
+    def match(self, frame_index: int, frame_hash: str | None) -> str | None:
+        """Asset id of the kept frame ``frame_index`` duplicates, or None when it should be kept."""
+        if frame_hash is None:
+            return None
+        position = bisect_left(self._indices, frame_index)
+        if position == 0:
+            return None
+        kept_hash, kept_asset_id = self._kept[self._indices[position - 1]]
+        if hamming_distance(frame_hash, kept_hash) <= self._max_distance:
+            return kept_asset_id
+        return None
+
+    def keep(self, frame_index: int, frame_hash: str | None, asset_id: str) -> None:
+        if frame_hash is None:
+            return
+        if frame_index not in self._kept:
+            insort(self._indices, frame_index)
+        self._kept[frame_index] = (frame_hash, asset_id)
+
+
+class FrameDedupQueue:
+    """Decides frames in frame order while concurrent extraction segments deliver them interleaved.
+
+    A segment delivers its own frames in order, so a frame can be decided once every
+    earlier segment is complete: all of its ``frame_count`` frames arrived, or ``finish``
+    was called. Until then only the frame's index, hash and asset id wait here, and the
+    decisions are the same however the segments interleave.
+    """
+
+    def __init__(self, index: NearDuplicateIndex, segments: list[tuple[int, int]]) -> None:
+        self._index = index
+        self._starts = [start for start, _ in segments]
+        self._remaining = [count for _, count in segments]
+        self._current = 0
+        self._waiting: dict[int, list[tuple[int, str | None, str]]] = {}
+
+    def add(self, frame_index: int, frame_hash: str | None, asset_id: str | None) -> list[tuple[int, str | None]]:
+        """Record an arrived frame; returns the ``(frame_index, duplicate_of)`` decisions it unblocked.
+
+        ``asset_id`` is None for a frame that needs no decision, such as one stored by an
+        earlier delivery of the job; it still counts towards its segment.
+        """
+        segment = max(0, bisect_right(self._starts, frame_index) - 1)
+        self._remaining[segment] -= 1
+        if asset_id is not None:
+            self._waiting.setdefault(segment, []).append((frame_index, frame_hash, asset_id))
+        return self._release()
+
+    def finish(self) -> list[tuple[int, str | None]]:
+        """Decide every waiting frame; call once all segments have delivered."""
+        self._remaining = [0] * len(self._remaining)
+        return self._release()
+
+    def _release(self) -> list[tuple[int, str | None]]:
+        decisions: list[tuple[int, str | None]] = []
+        while self._current < len(self._starts):
+            for frame_index, frame_hash, asset_id in sorted(self._waiting.pop(self._current, [])):
+                duplicate_of = self._index.match(frame_index, frame_hash)
+                if duplicate_of is None:
+                    self._index.keep(frame_index, frame_hash, asset_id)
+                decisions.append((frame_index, duplicate_of))
+            if self._remaining[self._current] > 0:
+                break
+            self._current += 1
+        return decisions
+
+
+async def previous_kept_frame(db: AsyncSession, *, sequence_id: str, frame_index: int) -> Asset | None:
+    """The hashed frame of a sequence that a new ``frame_index`` is compared with.
+
+    That is the closest earlier hashed frame or, when that one was flagged, the
+    kept frame it was flagged against.
+    """
+    previous = (
+        await db.execute(
+            select(Asset)
+            .where(
+                Asset.sequence_id == sequence_id,
+                Asset.frame_index < frame_index,
+                Asset.perceptual_hash.is_not(None),
+            )
+            .order_by(Asset.frame_index.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    if previous is None:
+        return None
+    kept_id = near_duplicate_of(previous)
+    if kept_id is None:
+        return previous
+    return await db.get(Asset, kept_id)
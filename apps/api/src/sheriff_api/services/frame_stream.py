@@ -0,0 +1,113 @@
+"""Split concatenated JPEG or PNG images, as ffmpeg's ``image2pipe`` muxer writes them.
+
+The stream is parsed by structure rather than searched for end markers:
+JPEG segments are skipped by their length and entropy-coded data is scanned
+for the next non-stuffed marker; PNG chunks are skipped by their length up to
+``IEND``. Bytes are buffered only until the frame they belong to is complete.
+"""
+
+from __future__ import annotations
+
+_JPEG_SOI = b"\xff\xd8"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_JPEG_EOI = 0xD9
+_JPEG_SOS = 0xDA
+# Markers that stand alone, without a length field: TEM and RST0-7.
+_JPEG_STANDALONE = {0x01, *range(0xD0, 0xD8)}
+
+
+class FrameStreamError(ValueError):
+    pass
+
+
+class FrameStreamSplitter:
+    def __init__(self, frame_format: str) -> None:
+        if frame_format not in {"jpeg", "png"}:
+            raise ValueError(f"Unsupported frame format: {frame_format}")
+        self._format = frame_format
+        self._buffer = bytearray()
+        # Parse position inside the current frame, and whether it is inside JPEG scan data.
+        self._pos = 0
+        self._in_scan = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add bytes from the stream; returns the frames they completed."""
+        self._buffer += chunk
+        frames: list[bytes] = []
+        while True:
+            end = self._find_jpeg_end() if self._format == "jpeg" else self._find_png_end()
+            if end is None:
+                return frames
+            frames.append(bytes(self._buffer[:end]))
+            del self._buffer[:end]
+            self._pos = 0
+            self._in_scan = False
+
+    def finish(self) -> None:
+        """Raise if the stream ended inside a frame."""
+        if self._buffer:
+            raise FrameStreamError(f"Frame stream ended with {len(self._buffer)} bytes of an incomplete {self._format} frame")
+
+    def _find_jpeg_end(self) -> int | None:
+        buffer = self._buffer
+        if self._pos == 0:
+            if len(buffer) < 2:
+                return None
+            if buffer[:2] != _JPEG_SOI:
+                raise FrameStreamError("JPEG frame does not start with SOI")
+            self._pos = 2
+        while True:
+            if self._in_scan:
+                index = buffer.find(b"\xff", self._pos)
+                if index < 0 or index + 1 >= len(buffer):
+                    # Keep a trailing 0xFF for the next chunk.
+                    self._pos = len(buffer) - 1 if index >= 0 else len(buffer)
+                    return None
+                following = buffer[index + 1]
+                if following == 0x00 or following in _JPEG_STANDALONE:
+                    self._pos = index + 2
+                    continue
+                if following == 0xFF:
+                    self._pos = index + 1
+                    continue
+                self._pos = index
+                self._in_scan = False
+            if self._pos + 1 >= len(buffer):
+                return None
+            if buffer[self._pos] != 0xFF:
+                raise FrameStreamError("Expected a JPEG marker")
+            marker = buffer[self._pos + 1]
+            if marker == 0xFF:
+                self._pos += 1
+                continue
+            if marker == _JPEG_EOI:
+                return self._pos + 2
+            if marker in _JPEG_STANDALONE:
+                self._pos += 2
+                continue
+            if self._pos + 4 > len(buffer):
+                return None
+            segment_end = self._pos + 2 + int.from_bytes(buffer[self._pos + 2 : self._pos + 4], "big")
+            if segment_end > len(buffer):
+                return None
+            self._pos = segment_end
+            self._in_scan = marker == _JPEG_SOS
+
+    def _find_png_end(self) -> int | None:
+        buffer = self._buffer
+        if self._pos == 0:
+            if len(buffer) < len(_PNG_SIGNATURE):
+                return None
+            if buffer[: len(_PNG_SIGNATURE)] != _PNG_SIGNATURE:
+                raise FrameStreamError("PNG frame does not start with the PNG signature")
+            self._pos = len(_PNG_SIGNATURE)
+        while self._pos + 8 <= len(buffer):
+            length = int.from_bytes(buffer[self._pos : self._pos + 4], "big")
+            chunk_type = bytes(buffer[self._pos + 4 : self._pos + 8])
+            chunk_end = self._pos + 12 + length
+            if chunk_end > len(buffer):
+                return None
+            self._pos = chunk_end
+            if chunk_type == b"IEND":
+                return chunk_end
+        return None
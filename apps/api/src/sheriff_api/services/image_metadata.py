@@ -119,3 +119,39 @@ def extract_image_dimensions(content: bytes) -> tuple[int | None, int | None]:
         if parsed is not None:
             return parsed
     return None, None
+
+
+# JPEG SOF markers can follow large EXIF/ICC segments; give up after this many header bytes.
+MAX_HEADER_PROBE_BYTES = 512 * 1024
+
+
+class ImageDimensionProbe:
+    """Finds image dimensions while a file is streamed in chunks.
+
+    Only the leading bytes are kept, and parsing stops as soon as the header
+    yields a size or ``max_bytes`` have been seen, so large files cost no more
+    than their header.
+    """
+
+    def __init__(self, max_bytes: int = MAX_HEADER_PROBE_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._header = bytearray()
+        self._done = False
+        self.width: int | None = None
+        self.height: int | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self._done:
+            return
+        self._header += chunk[: self._max_bytes - len(self._header)]
+        width, height = extract_image_dimensions(bytes(self._header))
+        if width is not None:
+            self.width, self.height = width, height
+            self._done = True
+        elif len(self._header) >= self._max_bytes:
+            self._done = True
+        if self._done:
+            self._header = bytearray()
+
+    def result(self) -> tuple[int | None, int | None]:
+        return self.width, self.height
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 import httpx
 
@@ -10,6 +11,12 @@ _TASK_INFER_ENDPOINT: dict[str, str] = {
     "segmentation": "/infer/segmentation",
 }
 
+_TASK_BATCH_ENDPOINT: dict[str, str] = {
+    "classification": "/infer/classification/batch",
+    "bbox": "/infer/detection/batch",
+    "segmentation": "/infer/segmentation/batch",
+}
+
 _TASK_WARMUP_ENDPOINT: dict[str, str] = {
     "classification": "/infer/classification/warmup",
     "bbox": "/infer/detection/warmup",
@@ -17,9 +24,28 @@ _TASK_WARMUP_ENDPOINT: dict[str, str] = {
 
 
 class InferenceClient:
-    def __init__(self, *, base_url: str, timeout_seconds: float = 15.0) -> None:
+    def __init__(self, *, base_url: str, timeout_seconds: float = 15.0, batch_size: int = 32, keep_alive: bool = False) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = float(timeout_seconds)
+        self._batch_size = max(1, int(batch_size))
+        self._keep_alive = keep_alive
+        self._http: httpx.AsyncClient | None = None
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[httpx.AsyncClient]:
+        """A fresh HTTP client per call, or with ``keep_alive`` one pooled client until ``aclose``."""
+        if not self._keep_alive:
+            async with httpx.AsyncClient(timeout=self._timeout) as client:
+                yield client
+            return
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self._timeout)
+        yield self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def infer(self, task_kind: str, payload: dict[str, Any]) -> dict[str, Any]:
         """Route inference request by task kind.
@@ -29,12 +55,43 @@ class InferenceClient:
         endpoint = _TASK_INFER_ENDPOINT.get(task_kind)
         if endpoint is None:
             raise ValueError(f"Unsupported task kind for inference: {task_kind!r}")
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
+        async with self._connection() as client:
             response = await client.post(f"{self._base_url}{endpoint}", json=payload)
         response.raise_for_status()
         parsed = response.json()
         return parsed if isinstance(parsed, dict) else {}
 
+    async def predict_many(self, task_kind: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Run one model over many assets via the trainer batch endpoints.
+
+        ``payload`` carries ``asset_relpaths`` instead of ``asset_relpath``. The
+        list is sent in chunks of ``batch_size`` over one connection, and the
+        per-asset ``items`` are returned in request order.
+        """
+        endpoint = _TASK_BATCH_ENDPOINT.get(task_kind)
+        if endpoint is None:
+            raise ValueError(f"Unsupported task kind for batch inference: {task_kind!r}")
+        return await self._post_in_chunks(endpoint, payload)
+
+    async def _post_in_chunks(self, endpoint: str, payload: dict[str, Any]) -> dict[str, Any]:
+        asset_relpaths = list(payload.get("asset_relpaths") or [])
+        device_selected: str | None = None
+        items: list[dict[str, Any]] = []
+        async with self._connection() as client:
+            for start in range(0, len(asset_relpaths), self._batch_size):
+                chunk = {**payload, "asset_relpaths": asset_relpaths[start : start + self._batch_size]}
+                response = await client.post(f"{self._base_url}{endpoint}", json=chunk)
+                response.raise_for_status()
+                parsed = response.json()
+                if not isinstance(parsed, dict):
+                    continue
+                if device_selected is None and isinstance(parsed.get("device_selected"), str):
+                    device_selected = parsed["device_selected"]
+                chunk_items = parsed.get("items")
+                if isinstance(chunk_items, list):
+                    items.extend(item for item in chunk_items if isinstance(item, dict))
+        return {"device_selected": device_selected or "cpu", "items": items}
+
     async def infer_classification(self, payload: dict[str, Any]) -> dict[str, Any]:
         return await self.infer("classification", payload)
 
@@ -45,14 +102,18 @@ class InferenceClient:
         return await self.infer("segmentation", payload)
 
     async def florence_detect(self, payload: dict[str, Any]) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
+        async with self._connection() as client:
             response = await client.post(f"{self._base_url}/infer/florence/detect", json=payload)
         response.raise_for_status()
         parsed = response.json()
         return parsed if isinstance(parsed, dict) else {}
 
+    async def florence_detect_many(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Florence-2 detection over ``asset_relpaths``, chunked like ``predict_many``."""
+        return await self._post_in_chunks("/infer/florence/detect/batch", payload)
+
     async def warmup_florence(self, payload: dict[str, Any]) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
+        async with self._connection() as client:
             response = await client.post(f"{self._base_url}/infer/florence/warmup", json=payload)
         response.raise_for_status()
         parsed = response.json()
@@ -62,7 +123,7 @@ class InferenceClient:
         endpoint = _TASK_WARMUP_ENDPOINT.get(task_kind)
         if endpoint is None:
             raise ValueError(f"Unsupported task kind for warmup: {task_kind!r}")
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
+        async with self._connection() as client:
             response = await client.post(f"{self._base_url}{endpoint}", json=payload)
         response.raise_for_status()
         parsed = response.json()
@@ -6,7 +6,7 @@ import logging
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Any
 
 from sqlalchemy import bindparam, inspect, text
@@ -20,6 +20,13 @@ MIGRATION_TABLE = "schema_migrations"
 MULTI_TASK_MIGRATION_VERSION = "multi_task_projects_v1"
 FOLDERS_SEQUENCES_MIGRATION_VERSION = "folders_sequences_v1"
 PRELABELS_MIGRATION_VERSION = "prelabels_v2"
+LIST_PAGINATION_MIGRATION_VERSION = "list_pagination_indexes_v1"
+ASSET_CHECKSUM_INDEX_MIGRATION_VERSION = "asset_checksum_index_v1"
+ASSET_PERCEPTUAL_HASH_MIGRATION_VERSION = "asset_perceptual_hash_v1"
+TASK_CATEGORIES_VERSION_MIGRATION_VERSION = "task_categories_version_v1"
+PRELABEL_DECODING_PROFILE_MIGRATION_VERSION = "prelabel_decoding_profile_v1"
+PRELABEL_DEBUG_DETECTIONS_MIGRATION_VERSION = "prelabel_debug_detections_v1"
+ASSET_SORT_PATH_MIGRATION_VERSION = "asset_sort_path_v1"
 
 
 @dataclass
@@ -1364,6 +1371,161 @@ async def _apply_prelabels_migration(engine: AsyncEngine) -> None:
         await _ensure_prelabels_schema(conn)
 
 
+async def _apply_list_pagination_migration(engine: AsyncEngine) -> None:
+    # create_all only builds indexes for new tables; existing databases get the keyset indexes here.
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_assets_project_created_id ON assets (project_id, created_at, id)"))
+        await conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_assets_project_folder_file_id ON assets (project_id, folder_id, file_name, id)")
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_annotations_project_task_created_id "
+                "ON annotations (project_id, task_id, created_at, id)"
+            )
+        )
+
+
+async def _apply_asset_checksum_index_migration(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_assets_project_checksum ON assets (project_id, checksum)"))
+
+
+async def _apply_asset_perceptual_hash_migration(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await _add_column_if_missing(conn, "assets", "perceptual_hash", "perceptual_hash VARCHAR(16) NULL")
+        await conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_assets_project_perceptual_hash ON assets (project_id, perceptual_hash)")
+        )
+
+
+async def _apply_task_categories_version_migration(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await _add_column_if_missing(conn, "tasks", "categories_version", "categories_version INTEGER NOT NULL DEFAULT 0")
+
+
+async def _apply_prelabel_decoding_profile_migration(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await _add_column_if_missing(
+            conn,
+            "prelabel_sessions",
+            "decoding_profile",
+            "decoding_profile VARCHAR NOT NULL DEFAULT 'quality'",
+        )
+
+
+def _legacy_debug_detection_rows(value: Any) -> list[dict[str, Any]]:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    if not isinstance(value, list):
+        return []
+    rows: list[dict[str, Any]] = []
+    for row in value:
+        if not isinstance(row, dict):
+            continue
+        bbox_xyxy = row.get("bbox_xyxy")
+        status = str(row.get("status") or "").strip().lower()
+        if not str(row.get("asset_id") or "").strip() or not str(row.get("label_text") or "").strip():
+            continue
+        if status not in {"matched", "unmatched", "discarded"}:
+            continue
+        if not isinstance(bbox_xyxy, list) or len(bbox_xyxy) != 4:
+            continue
+        if not all(isinstance(item, (int, float)) for item in bbox_xyxy):
+            continue
+        rows.append(row)
+    return rows
+
+
+async def _apply_prelabel_debug_detections_migration(engine: AsyncEngine) -> None:
+    # create_all has already built prelabel_debug_detections; move each session's inline list into it.
+    from sheriff_api.db.models import PrelabelDebugDetection
+
+    async with engine.begin() as conn:
+        await _add_column_if_missing(
+            conn,
+            "prelabel_sessions",
+            "debug_detection_seq",
+            "debug_detection_seq INTEGER NOT NULL DEFAULT 0",
+        )
+        result = await conn.execute(
+            text("SELECT id, debug_detections_json FROM prelabel_sessions WHERE debug_detections_json IS NOT NULL")
+        )
+        sessions = result.mappings().all()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for session in sessions:
+            legacy_rows = _legacy_debug_detection_rows(session["debug_detections_json"])
+            if legacy_rows:
+                await conn.execute(
+                    PrelabelDebugDetection.__table__.insert(),
+                    [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "session_id": session["id"],
+                            "seq": seq,
+                            "asset_id": str(row["asset_id"]).strip(),
+                            "asset_frame_index": (
+                                row["asset_frame_index"] if isinstance(row.get("asset_frame_index"), int) else None
+                            ),
+                            "label_text": str(row["label_text"]).strip(),
+                            "resolved_category_id": str(row.get("resolved_category_id") or "").strip() or None,
+                            "resolved_category_name": str(row.get("resolved_category_name") or "").strip() or None,
+                            "confidence": float(row.get("confidence") or 0.0),
+                            "bbox_xyxy_json": [float(item) for item in row["bbox_xyxy"]],
+                            "status": str(row["status"]).strip().lower(),
+                            "created_at": now,
+                        }
+                        for seq, row in enumerate(legacy_rows, start=1)
+                    ],
+                )
+            await conn.execute(
+                # The legacy column is JSON NOT NULL on databases created before this migration.
+                text("UPDATE prelabel_sessions SET debug_detection_seq = :seq, debug_detections_json = '[]' WHERE id = :id"),
+                {"seq": len(legacy_rows), "id": session["id"]},
+            )
+
+
+def _asset_sort_path_for_migration(row: Any) -> str:
+    # Mirrors Asset.relative_path: folder path and file name, falling back to the legacy metadata.
+    legacy_path = PurePosixPath(
+        _legacy_asset_relative_path_for_migration(_coerce_json_dict(row["metadata_json"]), row["uri"], row["id"])
+    )
+    folder_path = str(row["folder_path"] or "").strip()
+    if not folder_path:
+        folder_path = str(legacy_path.parent).strip("/")
+        folder_path = "" if folder_path == "." else folder_path
+    file_name = row["file_name"] if isinstance(row["file_name"], str) and row["file_name"].strip() else legacy_path.name
+    return f"{folder_path}/{file_name}" if folder_path else file_name
+
+
+async def _apply_asset_sort_path_migration(engine: AsyncEngine) -> None:
+    from sheriff_api.db.models import Asset
+
+    asset_update = Asset.__table__.update().where(Asset.id == bindparam("asset_id")).values(sort_path=bindparam("sort_path"))
+    async with engine.begin() as conn:
+        await _add_column_if_missing(conn, "assets", "sort_path", "sort_path VARCHAR NOT NULL DEFAULT ''")
+        result = await conn.execute(
+            text(
+                "SELECT assets.id, assets.file_name, assets.uri, assets.metadata_json, folders.path AS folder_path "
+                "FROM assets LEFT JOIN folders ON folders.id = assets.folder_id WHERE assets.sort_path = ''"
+            )
+        )
+        updates = [{"asset_id": row["id"], "sort_path": _asset_sort_path_for_migration(row)} for row in result.mappings().all()]
+        if updates:
+            await conn.execute(asset_update, updates)
+        await conn.execute(text("DROP INDEX IF EXISTS ix_assets_project_folder_file_id"))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_assets_project_sort_path_id ON assets (project_id, sort_path, id)"))
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_assets_project_folder_sort_path_id "
+                "ON assets (project_id, folder_id, sort_path, id)"
+            )
+        )
+
+
 async def run_startup_migrations(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
         await _ensure_migration_table(conn)
@@ -1383,3 +1545,38 @@ async def run_startup_migrations(engine: AsyncEngine) -> None:
         await _apply_prelabels_migration(engine)
         async with engine.begin() as conn:
             await _mark_migration_applied(conn, PRELABELS_MIGRATION_VERSION)
+
+    if LIST_PAGINATION_MIGRATION_VERSION not in applied_versions:
+        await _apply_list_pagination_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, LIST_PAGINATION_MIGRATION_VERSION)
+
+    if ASSET_CHECKSUM_INDEX_MIGRATION_VERSION not in applied_versions:
+        await _apply_asset_checksum_index_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, ASSET_CHECKSUM_INDEX_MIGRATION_VERSION)
+
+    if ASSET_PERCEPTUAL_HASH_MIGRATION_VERSION not in applied_versions:
+        await _apply_asset_perceptual_hash_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, ASSET_PERCEPTUAL_HASH_MIGRATION_VERSION)
+
+    if TASK_CATEGORIES_VERSION_MIGRATION_VERSION not in applied_versions:
+        await _apply_task_categories_version_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, TASK_CATEGORIES_VERSION_MIGRATION_VERSION)
+
+    if PRELABEL_DECODING_PROFILE_MIGRATION_VERSION not in applied_versions:
+        await _apply_prelabel_decoding_profile_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, PRELABEL_DECODING_PROFILE_MIGRATION_VERSION)
+
+    if PRELABEL_DEBUG_DETECTIONS_MIGRATION_VERSION not in applied_versions:
+        await _apply_prelabel_debug_detections_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, PRELABEL_DEBUG_DETECTIONS_MIGRATION_VERSION)
+
+    if ASSET_SORT_PATH_MIGRATION_VERSION not in applied_versions:
+        await _apply_asset_sort_path_migration(engine)
+        async with engine.begin() as conn:
+            await _mark_migration_applied(conn, ASSET_SORT_PATH_MIGRATION_VERSION)
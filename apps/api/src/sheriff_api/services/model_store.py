@@ -11,6 +11,19 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def new_model_record(*, project_id: str, name: str, config_json: dict[str, Any], task_id: str | None) -> dict[str, Any]:
+    timestamp = _utc_now_iso()
+    return {
+        "id": str(uuid.uuid4()),
+        "project_id": project_id,
+        "task_id": task_id,
+        "name": name,
+        "config_json": config_json,
+        "created_at": timestamp,
+        "updated_at": timestamp,
+    }
+
+
 class ProjectModelStore(Protocol):
     def list_by_project(self, project_id: str) -> list[dict[str, Any]]:
         ...
@@ -26,10 +39,7 @@ class ProjectModelStore(Protocol):
 
 
 class FileProjectModelStore:
-    """Temporary file-backed model store.
-
-    TODO: replace with DB-backed project model table once migrations are in place.
-    """
+    """File-backed model store; ``SqlProjectModelStore`` is the database-backed alternative."""
 
     def __init__(self, storage_root: str) -> None:
         self._root = Path(storage_root)
@@ -67,16 +77,7 @@ class FileProjectModelStore:
 
     def create(self, *, project_id: str, name: str, config_json: dict[str, Any], task_id: str | None = None) -> dict[str, Any]:
         records = self._read_records(project_id)
-        timestamp = _utc_now_iso()
-        record = {
-            "id": str(uuid.uuid4()),
-            "project_id": project_id,
-            "task_id": task_id,
-            "name": name,
-            "config_json": config_json,
-            "created_at": timestamp,
-            "updated_at": timestamp,
-        }
+        record = new_model_record(project_id=project_id, name=name, config_json=config_json, task_id=task_id)
         records.append(record)
         self._write_records(project_id, records)
         return record
@@ -93,7 +94,11 @@ class FileProjectModelStore:
         return None
 
 
-def create_project_model_store(storage_root: str) -> ProjectModelStore:
+def create_project_model_store(storage_root: str, *, database_url: str | None = None) -> ProjectModelStore:
+    if database_url:
+        from sheriff_api.services.sql_registry import SqlProjectModelStore
+
+        return SqlProjectModelStore(database_url)
     return FileProjectModelStore(storage_root)
 
 
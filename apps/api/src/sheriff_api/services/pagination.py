@@ -0,0 +1,118 @@
+"""Keyset (cursor) pagination helpers and cached list totals.
+
+Cursors are opaque to clients: a base64url JSON array holding the ordering
+name followed by the sort-key values of the last row on the page. The next
+page resumes strictly after that key, so deep pages cost the same as the
+first one and rows inserted mid-walk never shift later pages.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+import json
+import threading
+import time
+from typing import Any, Hashable, Iterable
+
+from fastapi import status
+from pydantic import BaseModel
+
+from sheriff_api.config import get_settings
+from sheriff_api.errors import api_error
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and isinstance(value.get("dt"), str):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(order: str, *values: Any) -> str:
+    raw = json.dumps([order, *(_encode_value(value) for value in values)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *, order: str, arity: Iterable[int]) -> list[Any]:
+    """Return the key values stored in ``cursor``; rejects cursors minted for another ordering."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or not payload or payload[0] != order or len(payload) - 1 not in set(arity):
+            raise ValueError("cursor does not match the requested ordering")
+        return [_decode_value(value) for value in payload[1:]]
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise api_error(
+            status.HTTP_400_BAD_REQUEST,
+            code="invalid_cursor",
+            message="Pagination cursor is invalid for this listing",
+            details={"order": order, "reason": str(exc)},
+        ) from exc
+
+
+def parse_fields(fields: str | None, model: type[BaseModel]) -> set[str] | None:
+    """Validate a comma-separated ``fields`` projection against the response model."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(model.model_fields))
+    if not requested or unknown:
+        raise api_error(
+            422,
+            code="invalid_fields",
+            message="Unknown field in projection",
+            details={"unknown": unknown, "allowed": sorted(model.model_fields)},
+        )
+    return requested | {"id"}
+
+
+def project_rows(rows: Iterable[BaseModel], fields: set[str] | None) -> list[dict[str, Any]]:
+    return [row.model_dump(mode="json", include=fields) for row in rows]
+
+
+class CountCache:
+    """Per-process TTL cache for list totals, dropped per project on local writes.
+
+    Writers in other processes (worker frame extraction, other API replicas)
+    are only reflected once the entry expires, so the TTL bounds staleness.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl = max(0.0, float(ttl_seconds))
+        self._entries: dict[tuple[str, Hashable], tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str, key: Hashable) -> int | None:
+        with self._lock:
+            entry = self._entries.get((project_id, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[(project_id, key)]
+                return None
+            return value
+
+    def put(self, project_id: str, key: Hashable, value: int) -> None:
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(project_id, key)] = (time.monotonic() + self._ttl, int(value))
+
+    def invalidate(self, project_id: str) -> None:
+        with self._lock:
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == project_id]:
+                del self._entries[entry_key]
+
+
+asset_counts = CountCache(get_settings().asset_count_cache_seconds)
@@ -51,6 +51,7 @@ class ActiveDeploymentPrelabelAdapter:
         self._client = InferenceClient(
             base_url=settings.trainer_inference_base_url,
             timeout_seconds=float(settings.trainer_inference_timeout_seconds),
+            keep_alive=True,
         )
 
     async def warmup(self) -> None:
@@ -63,6 +64,9 @@ class ActiveDeploymentPrelabelAdapter:
             }
         )
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
     async def detect(
         self,
         *,
@@ -81,45 +85,52 @@ class ActiveDeploymentPrelabelAdapter:
                 "model_key": self._model_key,
             }
         )
-        detections: list[DetectionResult] = []
-        for row in list(response.get("boxes") or [])[:max_detections]:
-            if not isinstance(row, dict):
-                continue
-            bbox = row.get("bbox")
-            if not isinstance(bbox, list) or len(bbox) != 4:
-                continue
-            if not all(isinstance(value, (int, float)) for value in bbox):
-                continue
-            x, y, width, height = (float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3]))
-            if width <= 0 or height <= 0:
-                continue
-            label_text = str(row.get("class_name") or "").strip()
-            if not label_text:
-                continue
-            detections.append(
-                DetectionResult(
-                    label_text=label_text,
-                    score=float(row.get("score") or 0.0),
-                    bbox_xyxy=(x, y, x + width, y + height),
-                    raw=row,
-                )
-            )
-        return detections
+        return _deployment_detections(response.get("boxes"), max_detections=max_detections)
+
+    async def detect_many(
+        self,
+        *,
+        asset_storage_uris: list[str],
+        prompts: list[str],
+        threshold: float,
+        max_detections: int,
+    ) -> list[list[DetectionResult]]:
+        response = await self._client.predict_many(
+            "bbox",
+            {
+                "onnx_relpath": self._onnx_relpath,
+                "metadata_relpath": self._metadata_relpath,
+                "asset_relpaths": asset_storage_uris,
+                "device_preference": str(self._deployment.get("device_preference") or "auto"),
+                "score_threshold": threshold,
+                "model_key": self._model_key,
+            },
+        )
+        return [
+            _deployment_detections(boxes, max_detections=max_detections)
+            for boxes in _batch_item_boxes(response, asset_storage_uris)
+        ]
 
 
 class Florence2PrelabelAdapter:
-    def __init__(self, *, model_name: str = "microsoft/Florence-2-base-ft") -> None:
+    def __init__(self, *, model_name: str = "microsoft/Florence-2-base-ft", decoding_profile: str = "quality") -> None:
         settings = get_settings()
         self.name = model_name
         self._model_name = model_name
+        self._decoding_profile = decoding_profile
+        self._prompt_mode = "per_prompt" if settings.prelabel_florence_prompt_mode.strip().lower() == "per_prompt" else "combined"
         self._client = InferenceClient(
             base_url=settings.trainer_inference_base_url,
             timeout_seconds=float(settings.trainer_inference_timeout_seconds),
+            keep_alive=True,
         )
 
     async def warmup(self) -> None:
         await self._client.warmup_florence({"model_name": self._model_name})
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
     async def detect(
         self,
         *,
@@ -135,37 +146,108 @@ class Florence2PrelabelAdapter:
                 "prompts": prompts,
                 "score_threshold": threshold,
                 "max_detections": max_detections,
+                "decoding_profile": self._decoding_profile,
+                "prompt_mode": self._prompt_mode,
+            }
+        )
+        return _florence_detections(response.get("boxes"), max_detections=max_detections)
+
+    async def detect_many(
+        self,
+        *,
+        asset_storage_uris: list[str],
+        prompts: list[str],
+        threshold: float,
+        max_detections: int,
+    ) -> list[list[DetectionResult]]:
+        response = await self._client.florence_detect_many(
+            {
+                "asset_relpaths": asset_storage_uris,
+                "model_name": self._model_name,
+                "prompts": prompts,
+                "score_threshold": threshold,
+                "max_detections": max_detections,
+                "decoding_profile": self._decoding_profile,
+                "prompt_mode": self._prompt_mode,
             }
         )
-        detections: list[DetectionResult] = []
-        for row in list(response.get("boxes") or [])[:max_detections]:
-            if not isinstance(row, dict):
-                continue
-            bbox = row.get("bbox")
-            if not isinstance(bbox, list) or len(bbox) != 4:
-                continue
-            if not all(isinstance(value, (int, float)) for value in bbox):
-                continue
-            x1, y1, x2, y2 = (float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3]))
-            score = float(row.get("score") or 0.0)
-            label_text = str(row.get("label_text") or "").strip()
-            if (
-                not label_text
-                or not all(math.isfinite(value) for value in (x1, y1, x2, y2))
-                or not math.isfinite(score)
-                or (max(x1, x2) - min(x1, x2)) <= 0
-                or (max(y1, y2) - min(y1, y2)) <= 0
-            ):
-                continue
-            detections.append(
-                DetectionResult(
-                    label_text=label_text,
-                    score=score,
-                    bbox_xyxy=(x1, y1, x2, y2),
-                    raw=row,
-                )
+        return [
+            _florence_detections(boxes, max_detections=max_detections)
+            for boxes in _batch_item_boxes(response, asset_storage_uris)
+        ]
+
+
+def _batch_item_boxes(response: dict[str, Any], asset_storage_uris: list[str]) -> list[Any]:
+    """Per-asset ``boxes`` of a trainer batch response, in request order; an item error fails the call."""
+    items = response.get("items")
+    if not isinstance(items, list) or len(items) != len(asset_storage_uris):
+        raise RuntimeError("Batch inference returned an unexpected number of items")
+    boxes: list[Any] = []
+    for item in items:
+        error = item.get("error")
+        if isinstance(error, dict):
+            raise RuntimeError(str(error.get("message") or error.get("code") or "Batch inference item failed"))
+        boxes.append(item.get("boxes"))
+    return boxes
+
+
+def _deployment_detections(rows: Any, *, max_detections: int) -> list[DetectionResult]:
+    detections: list[DetectionResult] = []
+    for row in list(rows or [])[:max_detections]:
+        if not isinstance(row, dict):
+            continue
+        bbox = row.get("bbox")
+        if not isinstance(bbox, list) or len(bbox) != 4:
+            continue
+        if not all(isinstance(value, (int, float)) for value in bbox):
+            continue
+        x, y, width, height = (float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3]))
+        if width <= 0 or height <= 0:
+            continue
+        label_text = str(row.get("class_name") or "").strip()
+        if not label_text:
+            continue
+        detections.append(
+            DetectionResult(
+                label_text=label_text,
+                score=float(row.get("score") or 0.0),
+                bbox_xyxy=(x, y, x + width, y + height),
+                raw=row,
             )
-        return detections
+        )
+    return detections
+
+
+def _florence_detections(rows: Any, *, max_detections: int) -> list[DetectionResult]:
+    detections: list[DetectionResult] = []
+    for row in list(rows or [])[:max_detections]:
+        if not isinstance(row, dict):
+            continue
+        bbox = row.get("bbox")
+        if not isinstance(bbox, list) or len(bbox) != 4:
+            continue
+        if not all(isinstance(value, (int, float)) for value in bbox):
+            continue
+        x1, y1, x2, y2 = (float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3]))
+        score = float(row.get("score") or 0.0)
+        label_text = str(row.get("label_text") or "").strip()
+        if (
+            not label_text
+            or not all(math.isfinite(value) for value in (x1, y1, x2, y2))
+            or not math.isfinite(score)
+            or (max(x1, x2) - min(x1, x2)) <= 0
+            or (max(y1, y2) - min(y1, y2)) <= 0
+        ):
+            continue
+        detections.append(
+            DetectionResult(
+                label_text=label_text,
+                score=score,
+                bbox_xyxy=(x1, y1, x2, y2),
+                raw=row,
+            )
+        )
+    return detections
 
 
 PrelabelAdapterFactory = Callable[..., PrelabelAdapter]
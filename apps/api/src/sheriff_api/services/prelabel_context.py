@@ -0,0 +1,76 @@
+"""Per-process cache of the setup every prelabel job of a session shares.
+
+All jobs of a session need the same category match maps, prompts and
+inference adapter, and a worker runs them one at a time (jobs are partitioned
+by session). Entries are keyed by session id and reused only while the
+session's source config and its task's ``categories_version`` are unchanged;
+otherwise the caller rebuilds them. Beyond ``max_sessions`` the least recently
+used entry is dropped and its adapter's connections are closed.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sheriff_api.db.models import Category
+from sheriff_api.services.prelabel_adapters import PrelabelAdapter
+
+
+@dataclass(frozen=True)
+class PrelabelContext:
+    source_key: tuple[Any, ...]
+    categories_version: int
+    exact_mapping: dict[str, Category]
+    alias_mapping: dict[str, Category]
+    prompts: list[str]
+    adapter: PrelabelAdapter
+
+
+async def close_prelabel_adapter(adapter: PrelabelAdapter) -> None:
+    close = getattr(adapter, "aclose", None)
+    if close is not None:
+        await close()
+
+
+class PrelabelContextCache:
+    def __init__(self, max_sessions: int) -> None:
+        self._max_sessions = max(0, int(max_sessions))
+        self._entries: OrderedDict[str, PrelabelContext] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, session_id: str, *, source_key: tuple[Any, ...], categories_version: int) -> PrelabelContext | None:
+        context = self._entries.get(session_id)
+        if context is None:
+            return None
+        if context.source_key != source_key or context.categories_version != categories_version:
+            await self.discard(session_id)
+            return None
+        self._entries.move_to_end(session_id)
+        return context
+
+    async def put(self, session_id: str, context: PrelabelContext) -> bool:
+        """Keep ``context`` for later jobs; False when caching is disabled and the caller still owns it."""
+        if self._max_sessions == 0:
+            return False
+        previous = self._entries.pop(session_id, None)
+        if previous is not None and previous.adapter is not context.adapter:
+            await close_prelabel_adapter(previous.adapter)
+        self._entries[session_id] = context
+        while len(self._entries) > self._max_sessions:
+            _, evicted = self._entries.popitem(last=False)
+            await close_prelabel_adapter(evicted.adapter)
+        return True
+
+    async def discard(self, session_id: str) -> None:
+        context = self._entries.pop(session_id, None)
+        if context is not None:
+            await close_prelabel_adapter(context.adapter)
+
+    async def clear(self) -> None:
+        while self._entries:
+            _, context = self._entries.popitem(last=False)
+            await close_prelabel_adapter(context.adapter)
@@ -1,23 +1,99 @@
-from __future__ import annotations
+"""Prelabel job queue with per-session lanes.
+
+With ``prelabel_fair_queue`` enabled, jobs are not pushed onto the worker's
+ready list directly. Each session gets its own list in one of two lanes::
+
+    {queue}:lane:live:{session_id}    webcam frames; newest wins
+    {queue}:lane:bulk:{session_id}    sequence backfills
+    {queue}:lane:{lane}:sessions      set of sessions with queued jobs
+    {queue}:lane:bulk:weights         optional hash session_id -> weight
+    {queue}:wake                      one-slot list that wakes the dispatcher
 
-import json
-from typing import Any
+The worker's dispatcher moves jobs from the lanes into ``{queue}`` itself:
+live frames first (superseded ones dropped), then bulk sessions by weighted
+round-robin, so one large backfill no longer starves a live session.
+"""
+
+from __future__ import annotations
 
-from redis.asyncio import Redis
+from typing import Any, Iterable
 
 from sheriff_api.config import get_settings
+from sheriff_api.services.queue_client import RedisJobQueue, encode_job, get_queue_client
+
+LIVE_LANE = "live"
+BULK_LANE = "bulk"
+LANES = (LIVE_LANE, BULK_LANE)
+
+
+def lane_key(queue_key: str, lane: str, session_id: str) -> str:
+    return f"{queue_key}:lane:{lane}:{session_id}"
+
 
+def lane_sessions_key(queue_key: str, lane: str) -> str:
+    return f"{queue_key}:lane:{lane}:sessions"
 
-class PrelabelQueue:
-    def __init__(self, *, redis_url: str | None = None, queue_key: str | None = None) -> None:
+
+def lane_weights_key(queue_key: str) -> str:
+    return f"{queue_key}:lane:{BULK_LANE}:weights"
+
+
+def wake_key(queue_key: str) -> str:
+    return f"{queue_key}:wake"
+
+
+class PrelabelQueue(RedisJobQueue):
+    def __init__(
+        self,
+        *,
+        redis_url: str | None = None,
+        queue_key: str | None = None,
+        fair: bool | None = None,
+    ) -> None:
         settings = get_settings()
-        self._redis_url = redis_url or settings.redis_url
-        self._queue_key = queue_key or settings.prelabel_queue_key
+        super().__init__(redis_url=redis_url, queue_key=queue_key or settings.prelabel_queue_key)
+        self._fair = settings.prelabel_fair_queue if fair is None else fair
 
     async def enqueue_asset_job(self, job_payload: dict[str, Any]) -> None:
-        redis = Redis.from_url(self._redis_url, decode_responses=True)
-        try:
-            await redis.rpush(self._queue_key, json.dumps(job_payload, separators=(",", ":")))
-        finally:
-            await redis.aclose()
+        await self.enqueue_asset_jobs([job_payload])
+
+    async def enqueue_asset_jobs(self, job_payloads: Iterable[dict[str, Any]]) -> int:
+        payloads = list(job_payloads)
+        if not self._fair:
+            return await self.enqueue_many(payloads)
+        grouped: dict[tuple[str, str], list[str]] = {}
+        for payload in payloads:
+            lane = LIVE_LANE if payload.get("lane") == LIVE_LANE else BULK_LANE
+            session_id = str(payload.get("session_id") or "")
+            grouped.setdefault((lane, session_id), []).append(encode_job(payload))
+        if not grouped:
+            return 0
+
+        def _push(pipe: Any) -> None:
+            for (lane, session_id), encoded in grouped.items():
+                pipe.rpush(lane_key(self._queue_key, lane, session_id), *encoded)
+                pipe.sadd(lane_sessions_key(self._queue_key, lane), session_id)
+            pipe.delete(wake_key(self._queue_key))
+            pipe.rpush(wake_key(self._queue_key), "1")
+
+        await get_queue_client(self._redis_url).run_pipeline(self._queue_key, jobs=len(payloads), build=_push)
+        return len(payloads)
 
+    async def depth(self) -> int:
+        """Jobs waiting in the ready list plus every session lane."""
+        ready = await super().depth()
+        if not self._fair:
+            return ready
+        redis = get_queue_client(self._redis_url).redis
+        lane_keys = [
+            lane_key(self._queue_key, lane, session_id)
+            for lane in LANES
+            for session_id in await redis.smembers(lane_sessions_key(self._queue_key, lane))
+        ]
+        if not lane_keys:
+            return ready
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in lane_keys:
+                pipe.llen(key)
+            lengths = await pipe.execute()
+        return ready + sum(int(length) for length in lengths)
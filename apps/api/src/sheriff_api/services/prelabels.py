@@ -5,11 +5,12 @@ from collections import defaultdict
 from datetime import datetime
 import httpx
 import logging
-import math
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
 
 from sheriff_api.config import get_settings
 from sheriff_api.db.models import (
@@ -18,36 +19,45 @@ from sheriff_api.db.models import (
     Asset,
     AssetSequence,
     Category,
+    PrelabelDebugDetection,
     PrelabelProposal,
     PrelabelSession,
+    PrelabelSessionAsset,
     Task,
     TaskKind,
 )
 from sheriff_api.db.session import SessionLocal
 from sheriff_api.schemas.prelabels import (
     PrelabelConfigCreate,
+    PrelabelDebugDetectionRead,
     PrelabelProposalRead,
     PrelabelSessionRead,
 )
 from sheriff_api.services.annotation_payload import normalize_annotation_payload
-from sheriff_api.services.deployment_store import DeploymentStore
+from sheriff_api.services.deployment_store import create_deployment_store
+from sheriff_api.services.frame_dedup import near_duplicate_of
 from sheriff_api.services.inference_client import InferenceClient
 from sheriff_api.services.prelabel_adapters import (
     DetectionResult,
     PrelabelAdapter,
     PRELABEL_ADAPTER_REGISTRY,
 )
-from sheriff_api.services.prelabel_queue import PrelabelQueue
+from sheriff_api.services.prelabel_context import PrelabelContext, PrelabelContextCache, close_prelabel_adapter
+from sheriff_api.services.prelabel_queue import BULK_LANE, LIVE_LANE, PrelabelQueue
 
 
 settings = get_settings()
-deployment_store = DeploymentStore(settings.storage_root)
+deployment_store = create_deployment_store(settings.storage_root, database_url=settings.registry_url())
 inference_client = InferenceClient(
     base_url=settings.trainer_inference_base_url,
     timeout_seconds=float(settings.trainer_inference_timeout_seconds),
 )
+prelabel_contexts = PrelabelContextCache(settings.prelabel_context_cache_sessions)
 logger = logging.getLogger(__name__)
+# Latest debug detections kept per session. Older rows are deleted once a further
+# _PRELABEL_DEBUG_DETECTIONS_TRIM_EVERY have been appended, so most jobs only insert.
 _PRELABEL_DEBUG_DETECTIONS_LIMIT = 200
+_PRELABEL_DEBUG_DETECTIONS_TRIM_EVERY = 50
 _FLORENCE_WARMUP_RETRY_DELAY_SECONDS = 0.5
 _FLORENCE_WARMUP_MAX_ATTEMPTS = 2
 
@@ -118,6 +128,7 @@ def prelabel_session_to_read(session: PrelabelSession) -> PrelabelSessionRead:
         sampling_value=float(session.sampling_value),
         confidence_threshold=float(session.confidence_threshold),
         max_detections_per_frame=int(session.max_detections_per_frame),
+        decoding_profile=str(session.decoding_profile or "quality"),
         live_mode=bool(session.live_mode),
         status=str(session.status),
         input_closed_at=session.input_closed_at,
@@ -126,7 +137,7 @@ def prelabel_session_to_read(session: PrelabelSession) -> PrelabelSessionRead:
         generated_proposals=int(session.generated_proposals or 0),
         skipped_unmatched=int(session.skipped_unmatched or 0),
         error_message=session.error_message,
-        debug_detections=_normalized_debug_detections(session.debug_detections_json),
+        debug_detection_seq=int(session.debug_detection_seq or 0),
         created_at=session.created_at,
         updated_at=session.updated_at,
     )
@@ -160,63 +171,94 @@ def sequence_pending_total_from_counts(counts_by_asset: dict[str, int]) -> int:
     return sum(int(value or 0) for value in counts_by_asset.values())
 
 
-def _normalized_debug_detections(raw_rows: Any) -> list[dict[str, Any]]:
-    if not isinstance(raw_rows, list):
-        return []
-    detections: list[dict[str, Any]] = []
-    for row in raw_rows[:_PRELABEL_DEBUG_DETECTIONS_LIMIT]:
-        if not isinstance(row, dict):
-            continue
-        asset_id = str(row.get("asset_id") or "").strip()
-        label_text = str(row.get("label_text") or "").strip()
-        bbox_xyxy = row.get("bbox_xyxy")
-        status = str(row.get("status") or "").strip().lower()
-        if not asset_id or not label_text:
-            continue
-        if status not in {"matched", "unmatched", "discarded"}:
-            continue
-        if not isinstance(bbox_xyxy, list) or len(bbox_xyxy) != 4:
-            continue
-        if not all(isinstance(value, (int, float)) and math.isfinite(float(value)) for value in bbox_xyxy):
-            continue
-        asset_frame_index = row.get("asset_frame_index")
-        detections.append(
-            {
-                "asset_id": asset_id,
-                "asset_frame_index": int(asset_frame_index) if isinstance(asset_frame_index, int) else None,
-                "label_text": label_text,
-                "resolved_category_id": str(row.get("resolved_category_id") or "").strip() or None,
-                "resolved_category_name": str(row.get("resolved_category_name") or "").strip() or None,
-                "confidence": float(row.get("confidence") or 0.0),
-                "bbox_xyxy": [float(value) for value in bbox_xyxy],
-                "status": status,
-            }
-        )
-    return detections
+def prelabel_debug_detection_to_read(row: PrelabelDebugDetection) -> PrelabelDebugDetectionRead:
+    return PrelabelDebugDetectionRead(
+        seq=int(row.seq),
+        asset_id=row.asset_id,
+        asset_frame_index=row.asset_frame_index,
+        label_text=row.label_text,
+        resolved_category_id=row.resolved_category_id,
+        resolved_category_name=row.resolved_category_name,
+        confidence=float(row.confidence or 0.0),
+        bbox_xyxy=[float(value) for value in list(row.bbox_xyxy_json or [])[:4]],
+        status=str(row.status),
+    )
 
 
-def _append_debug_detection(
+def _debug_detection_row(
     session: PrelabelSession,
     *,
     asset: Asset,
     detection: DetectionResult,
     status: str,
     category: Category | None,
-) -> None:
-    debug_detections = _normalized_debug_detections(session.debug_detections_json)
-    debug_detections.append(
-        {
-            "asset_id": asset.id,
-            "asset_frame_index": int(asset.frame_index) if isinstance(asset.frame_index, int) else None,
-            "label_text": str(detection.label_text or "").strip(),
-            "resolved_category_id": category.id if category is not None else None,
-            "resolved_category_name": category.name if category is not None else None,
-            "confidence": float(detection.score),
-            "bbox_xyxy": [float(value) for value in detection.bbox_xyxy],
-            "status": status,
-        }
+) -> dict[str, Any]:
+    return {
+        "session_id": session.id,
+        "asset_id": asset.id,
+        "asset_frame_index": int(asset.frame_index) if isinstance(asset.frame_index, int) else None,
+        "label_text": str(detection.label_text or "").strip(),
+        "resolved_category_id": category.id if category is not None else None,
+        "resolved_category_name": category.name if category is not None else None,
+        "confidence": float(detection.score),
+        "bbox_xyxy_json": [float(value) for value in detection.bbox_xyxy],
+        "status": status,
+    }
+
+
+async def _append_debug_detections(db: AsyncSession, session: PrelabelSession, rows: list[dict[str, Any]]) -> None:
+    """Insert ``rows`` under the session's next ``seq`` values and advance ``debug_detection_seq``."""
+    if not rows:
+        return
+    # Reserve the seq range in the database: jobs of one session can run on several workers at once,
+    # and the row lock taken here holds a concurrent reservation back until this transaction commits.
+    result = await db.execute(
+        update(PrelabelSession)
+        .where(PrelabelSession.id == session.id)
+        .values(debug_detection_seq=PrelabelSession.debug_detection_seq + len(rows))
+        .returning(PrelabelSession.debug_detection_seq)
+        .execution_options(synchronize_session=False)
+    )
+    last_seq = int(result.scalar_one())
+    previous_seq = last_seq - len(rows)
+    set_committed_value(session, "debug_detection_seq", last_seq)
+    kept = rows[-_PRELABEL_DEBUG_DETECTIONS_LIMIT:]
+    first_kept_seq = last_seq - len(kept) + 1
+    await db.execute(
+        insert(PrelabelDebugDetection),
+        [{**row, "seq": first_kept_seq + offset} for offset, row in enumerate(kept)],
+    )
+    oldest_kept_seq = last_seq - _PRELABEL_DEBUG_DETECTIONS_LIMIT + 1
+    previous_oldest_seq = previous_seq - _PRELABEL_DEBUG_DETECTIONS_LIMIT + 1
+    if oldest_kept_seq > 1 and (
+        oldest_kept_seq // _PRELABEL_DEBUG_DETECTIONS_TRIM_EVERY > previous_oldest_seq // _PRELABEL_DEBUG_DETECTIONS_TRIM_EVERY
+    ):
+        await db.execute(
+            delete(PrelabelDebugDetection).where(
+                PrelabelDebugDetection.session_id == session.id,
+                PrelabelDebugDetection.seq < oldest_kept_seq,
+            )
+        )
+
+
+async def list_session_debug_detections(
+    db: AsyncSession,
+    *,
+    session: PrelabelSession,
+    after_seq: int | None,
+    limit: int,
+) -> list[PrelabelDebugDetection]:
+    """Debug detections in ``seq`` order: those after ``after_seq``, or the latest ``limit`` without a cursor."""
+    oldest_kept_seq = int(session.debug_detection_seq or 0) - _PRELABEL_DEBUG_DETECTIONS_LIMIT + 1
+    stmt = select(PrelabelDebugDetection).where(
+        PrelabelDebugDetection.session_id == session.id,
+        PrelabelDebugDetection.seq >= max(oldest_kept_seq, (after_seq or 0) + 1),
     )
-    session.debug_detections_json = debug_detections[-_PRELABEL_DEBUG_DETECTIONS_LIMIT:]
+    if after_seq is None:
+        result = await db.execute(stmt.order_by(PrelabelDebugDetection.seq.desc()).limit(limit))
+        return list(reversed(result.scalars().all()))
+    result = await db.execute(stmt.order_by(PrelabelDebugDetection.seq.asc()).limit(limit))
+    return list(result.scalars().all())
 
 
 def _sampling_interval_frames(session: PrelabelSession, sequence_fps: float | None) -> int:
@@ -228,11 +270,16 @@ def _sampling_interval_frames(session: PrelabelSession, sequence_fps: float | No
 
 
 def asset_matches_sampling(session: PrelabelSession, sequence: AssetSequence, asset: Asset) -> bool:
+    if near_duplicate_of(asset) is not None:
+        return False
     frame_index = int(asset.frame_index or 0)
     interval_frames = _sampling_interval_frames(session, sequence.fps)
     return frame_index % interval_frames == 0
 
 
+_TERMINAL_SESSION_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
 def _maybe_finalize_session(session: PrelabelSession) -> None:
     if str(session.status) in {"failed", "cancelled"}:
         return
@@ -424,6 +471,7 @@ async def create_prelabel_session(
         sampling_value=float(config.frame_sampling.value),
         confidence_threshold=float(config.confidence_threshold),
         max_detections_per_frame=int(config.max_detections_per_frame),
+        decoding_profile=config.decoding_profile,
         live_mode=bool(live_mode),
         status="queued",
     )
@@ -544,15 +592,33 @@ async def list_sequence_prelabel_sessions(
     return list(result.scalars().all())
 
 
-def _job_payload(*, session: PrelabelSession, asset: Asset) -> dict[str, Any]:
+def _job_payload(*, session: PrelabelSession, asset: Asset, lane: str = BULK_LANE) -> dict[str, Any]:
     return {
         "job_version": "1",
         "job_type": "prelabel_asset",
         "session_id": session.id,
         "asset_id": asset.id,
+        "lane": lane,
     }
 
 
+def _bulk_job_payloads(*, session: PrelabelSession, assets: list[Asset]) -> list[dict[str, Any]]:
+    """Bulk-lane jobs for ``assets``, ``prelabel_job_assets`` per ``prelabel_assets`` job."""
+    chunk_size = max(1, int(settings.prelabel_job_assets))
+    if chunk_size == 1:
+        return [_job_payload(session=session, asset=asset) for asset in assets]
+    return [
+        {
+            "job_version": "1",
+            "job_type": "prelabel_assets",
+            "session_id": session.id,
+            "asset_ids": [asset.id for asset in assets[start : start + chunk_size]],
+            "lane": BULK_LANE,
+        }
+        for start in range(0, len(assets), chunk_size)
+    ]
+
+
 async def enqueue_live_prelabel_jobs_for_asset(
     db: AsyncSession,
     *,
@@ -579,7 +645,7 @@ async def enqueue_live_prelabel_jobs_for_asset(
             continue
         session.enqueued_assets = int(session.enqueued_assets or 0) + 1
         session.status = "running"
-        await effective_queue.enqueue_asset_job(_job_payload(session=session, asset=asset))
+        await effective_queue.enqueue_asset_job(_job_payload(session=session, asset=asset, lane=LIVE_LANE))
         enqueued_ids.append(session.id)
     return enqueued_ids
 
@@ -596,7 +662,7 @@ async def enqueue_existing_sequence_assets_for_session(
         session = await db.get(PrelabelSession, session_id)
         if session is None:
             return {"session_id": session_id, "enqueued": 0, "status": "missing"}
-        if str(session.status) in {"failed", "cancelled", "completed"}:
+        if str(session.status) in _TERMINAL_SESSION_STATUSES:
             return {"session_id": session_id, "enqueued": 0, "status": session.status}
         if session.input_closed_at is not None or int(session.enqueued_assets or 0) > 0:
             return {"session_id": session_id, "enqueued": int(session.enqueued_assets or 0), "status": session.status}
@@ -617,20 +683,43 @@ async def enqueue_existing_sequence_assets_for_session(
                 )
             ).scalars().all()
         )
-        enqueued = 0
-        for asset in assets:
-            if not asset_matches_sampling(session, sequence, asset):
-                continue
-            session.enqueued_assets = int(session.enqueued_assets or 0) + 1
+        sampled = [asset for asset in assets if asset_matches_sampling(session, sequence, asset)]
+        enqueued = len(sampled)
+        if sampled:
+            session.enqueued_assets = int(session.enqueued_assets or 0) + enqueued
             session.status = "running"
-            await effective_queue.enqueue_asset_job(_job_payload(session=session, asset=asset))
-            enqueued += 1
+            await effective_queue.enqueue_asset_jobs(_bulk_job_payloads(session=session, assets=sampled))
         session.input_closed_at = utc_now_dt()
         _maybe_finalize_session(session)
         await db.commit()
         return {"session_id": session.id, "enqueued": enqueued, "status": session.status}
 
 
+async def enqueue_sequence_frames_for_session(
+    db: AsyncSession,
+    *,
+    session_id: str,
+    sequence: AssetSequence,
+    assets: list[Asset],
+    queue: PrelabelQueue | None = None,
+) -> int:
+    """Enqueue bulk jobs for frames committed while the sequence is still being extracted.
+
+    The session input stays open; the extractor closes it after its last frame.
+    """
+    session = await db.get(PrelabelSession, session_id)
+    if session is None or str(session.status) in _TERMINAL_SESSION_STATUSES:
+        return 0
+    if session.input_closed_at is not None:
+        return 0
+    sampled = [asset for asset in assets if asset_matches_sampling(session, sequence, asset)]
+    if sampled:
+        session.enqueued_assets = int(session.enqueued_assets or 0) + len(sampled)
+        session.status = "running"
+        await (queue or PrelabelQueue()).enqueue_asset_jobs(_bulk_job_payloads(session=session, assets=sampled))
+    return len(sampled)
+
+
 async def close_prelabel_session_input(db: AsyncSession, session: PrelabelSession) -> None:
     if session.input_closed_at is None:
         session.input_closed_at = utc_now_dt()
@@ -700,115 +789,275 @@ async def _build_adapter(
     adapter_factory = PRELABEL_ADAPTER_REGISTRY.get(str(session.source_type))
     if adapter_factory is None:
         raise RuntimeError(f"Unsupported prelabel source: {session.source_type}")
-    return adapter_factory(model_name=str(session.source_ref or "microsoft/Florence-2-base-ft"))
+    return adapter_factory(
+        model_name=str(session.source_ref or "microsoft/Florence-2-base-ft"),
+        decoding_profile=str(session.decoding_profile or "quality"),
+    )
 
 
-async def process_prelabel_asset_job(
-    payload: dict[str, Any],
+def _prelabel_source_key(session: PrelabelSession) -> tuple[Any, ...]:
+    return (
+        str(session.project_id),
+        str(session.task_id),
+        str(session.source_type),
+        str(session.source_ref or ""),
+        tuple(str(prompt) for prompt in session.prompts_json or []),
+        str(session.decoding_profile or "quality"),
+    )
+
+
+async def _load_prelabel_context(
+    db: AsyncSession,
     *,
-    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    session: PrelabelSession,
+    source_key: tuple[Any, ...],
+    categories_version: int,
+) -> PrelabelContext:
+    categories = await list_task_categories(db, project_id=session.project_id, task_id=session.task_id)
+    # Detached, so later jobs' commits never expire the cached rows.
+    for category in categories:
+        db.expunge(category)
+    exact_mapping, alias_mapping = _category_match_maps(categories)
+    adapter = await _build_adapter(db, project_id=session.project_id, task_id=session.task_id, session=session)
+    return PrelabelContext(
+        source_key=source_key,
+        categories_version=categories_version,
+        exact_mapping=exact_mapping,
+        alias_mapping=alias_mapping,
+        prompts=list(session.prompts_json or []),
+        adapter=adapter,
+    )
+
+
+async def _detect_assets(
+    adapter: PrelabelAdapter,
+    *,
+    asset_storage_uris: list[str],
+    prompts: list[str],
+    threshold: float,
+    max_detections: int,
+) -> list[list[DetectionResult]]:
+    """Detections per asset: one batch call when the adapter has ``detect_many``, else one call per asset."""
+    detect_many = getattr(adapter, "detect_many", None)
+    if detect_many is not None and len(asset_storage_uris) > 1:
+        return await detect_many(
+            asset_storage_uris=asset_storage_uris,
+            prompts=list(prompts),
+            threshold=threshold,
+            max_detections=max_detections,
+        )
+    return [
+        await adapter.detect(
+            asset_storage_uri=asset_storage_uri,
+            prompts=list(prompts),
+            threshold=threshold,
+            max_detections=max_detections,
+        )
+        for asset_storage_uri in asset_storage_uris
+    ]
+
+
+async def _process_prelabel_assets(
+    session_id: str,
+    asset_ids: list[str],
+    *,
+    session_factory: async_sessionmaker[AsyncSession] | None,
 ) -> dict[str, Any]:
     effective_session_factory = session_factory or SessionLocal
-    session_id = str(payload.get("session_id") or "").strip()
-    asset_id = str(payload.get("asset_id") or "").strip()
-    if not session_id or not asset_id:
-        raise RuntimeError("session_id and asset_id are required")
-
     async with effective_session_factory() as db:
         session = await db.get(PrelabelSession, session_id)
         if session is None:
+            await prelabel_contexts.discard(session_id)
             raise RuntimeError("Prelabel session not found")
-        if str(session.status) == "cancelled":
-            return {"session_id": session_id, "asset_id": asset_id, "status": "cancelled"}
-        asset = await db.get(Asset, asset_id)
-        sequence = await db.get(AssetSequence, session.sequence_id)
-        task = await db.get(Task, session.task_id)
-        if asset is None or sequence is None or task is None:
+        if str(session.status) in _TERMINAL_SESSION_STATUSES:
+            # Also a redelivery of a job whose first attempt ended the session: nothing to redo.
+            await prelabel_contexts.discard(session_id)
+            return {"session_id": session_id, "asset_ids": asset_ids, "status": str(session.status)}
+        done_asset_ids = set(
+            (
+                await db.execute(
+                    select(PrelabelSessionAsset.asset_id).where(
+                        PrelabelSessionAsset.session_id == session_id,
+                        PrelabelSessionAsset.asset_id.in_(asset_ids),
+                    )
+                )
+            ).scalars()
+        )
+        if done_asset_ids:
+            asset_ids = [asset_id for asset_id in asset_ids if asset_id not in done_asset_ids]
+            if not asset_ids:
+                return {"session_id": session_id, "asset_ids": [], "status": str(session.status), "generated_proposals": 0}
+        assets_by_id = {
+            asset.id: asset
+            for asset in (await db.execute(select(Asset).where(Asset.id.in_(asset_ids)))).scalars().all()
+        }
+        # Assets deleted while the session runs are skipped; they still count as processed so the session finishes.
+        assets = [assets_by_id[asset_id] for asset_id in asset_ids if asset_id in assets_by_id]
+        missing_assets = len(asset_ids) - len(assets)
+        categories_version = (
+            await db.execute(select(Task.categories_version).where(Task.id == session.task_id))
+        ).scalar_one_or_none()
+        source_key = _prelabel_source_key(session)
+        context = None
+        if categories_version is not None:
+            context = await prelabel_contexts.get(session.id, source_key=source_key, categories_version=categories_version)
+        if context is None and (categories_version is None or await db.get(AssetSequence, session.sequence_id) is None):
             session.status = "failed"
             session.error_message = "Prelabel context is missing"
             await db.commit()
             raise RuntimeError("Prelabel context is missing")
 
-        categories = await list_task_categories(db, project_id=session.project_id, task_id=session.task_id)
-        category_exact_map, category_alias_map = _category_match_maps(categories)
-        storage_uri = None
-        if isinstance(asset.metadata_json, dict):
-            storage_uri = asset.metadata_json.get("storage_uri")
-        if not isinstance(storage_uri, str) or not storage_uri.strip():
-            session.status = "failed"
-            session.error_message = "Asset storage path is missing"
-            await db.commit()
-            raise RuntimeError("Asset storage path is missing")
+        storage_uris: list[str] = []
+        for asset in assets:
+            storage_uri = None
+            if isinstance(asset.metadata_json, dict):
+                storage_uri = asset.metadata_json.get("storage_uri")
+            if not isinstance(storage_uri, str) or not storage_uri.strip():
+                session.status = "failed"
+                session.error_message = "Asset storage path is missing"
+                await db.commit()
+                raise RuntimeError("Asset storage path is missing")
+            storage_uris.append(storage_uri)
 
+        owned_adapter: PrelabelAdapter | None = None
         try:
-            adapter = await _build_adapter(db, project_id=session.project_id, task_id=session.task_id, session=session)
-            detections = await adapter.detect(
-                asset_storage_uri=storage_uri,
-                prompts=list(session.prompts_json or []),
-                threshold=float(session.confidence_threshold),
-                max_detections=int(session.max_detections_per_frame),
+            if context is None:
+                context = await _load_prelabel_context(
+                    db,
+                    session=session,
+                    source_key=source_key,
+                    categories_version=int(categories_version or 0),
+                )
+                if not await prelabel_contexts.put(session.id, context):
+                    owned_adapter = context.adapter
+            detections_per_asset = (
+                await _detect_assets(
+                    context.adapter,
+                    asset_storage_uris=storage_uris,
+                    prompts=context.prompts,
+                    threshold=float(session.confidence_threshold),
+                    max_detections=int(session.max_detections_per_frame),
+                )
+                if assets
+                else []
             )
-            proposals_created = 0
+            proposal_rows: list[dict[str, Any]] = []
+            debug_rows: list[dict[str, Any]] = []
             skipped_unmatched = 0
-            for detection in detections:
-                category = _match_detection_category(
-                    label_text=detection.label_text,
-                    exact_mapping=category_exact_map,
-                    alias_mapping=category_alias_map,
-                )
-                if category is None:
-                    _append_debug_detection(session, asset=asset, detection=detection, status="unmatched", category=None)
-                    skipped_unmatched += 1
-                    logger.info(
-                        "Skipping unmatched prelabel detection",
-                        extra={
+            for asset, detections in zip(assets, detections_per_asset, strict=True):
+                for detection in detections:
+                    category = _match_detection_category(
+                        label_text=detection.label_text,
+                        exact_mapping=context.exact_mapping,
+                        alias_mapping=context.alias_mapping,
+                    )
+                    if category is None:
+                        debug_rows.append(
+                            _debug_detection_row(session, asset=asset, detection=detection, status="unmatched", category=None)
+                        )
+                        skipped_unmatched += 1
+                        logger.info(
+                            "Skipping unmatched prelabel detection",
+                            extra={
+                                "session_id": session.id,
+                                "asset_id": asset.id,
+                                "label_text": detection.label_text,
+                            },
+                        )
+                        continue
+                    bbox_xywh = _bbox_xyxy_to_xywh(detection.bbox_xyxy, width=asset.width, height=asset.height)
+                    if bbox_xywh is None:
+                        debug_rows.append(
+                            _debug_detection_row(session, asset=asset, detection=detection, status="discarded", category=category)
+                        )
+                        continue
+                    debug_rows.append(
+                        _debug_detection_row(session, asset=asset, detection=detection, status="matched", category=category)
+                    )
+                    proposal_rows.append(
+                        {
                             "session_id": session.id,
                             "asset_id": asset.id,
-                            "label_text": detection.label_text,
-                        },
+                            "project_id": session.project_id,
+                            "task_id": session.task_id,
+                            "category_id": category.id,
+                            "label_text": category.name,
+                            "prompt_text": detection.label_text,
+                            "confidence": float(detection.score),
+                            "bbox_json": bbox_xywh,
+                            "status": "pending",
+                        }
                     )
-                    continue
-                bbox_xywh = _bbox_xyxy_to_xywh(detection.bbox_xyxy, width=asset.width, height=asset.height)
-                if bbox_xywh is None:
-                    _append_debug_detection(session, asset=asset, detection=detection, status="discarded", category=category)
-                    continue
-                _append_debug_detection(session, asset=asset, detection=detection, status="matched", category=category)
-                proposal = PrelabelProposal(
-                    session_id=session.id,
-                    asset_id=asset.id,
-                    project_id=session.project_id,
-                    task_id=session.task_id,
-                    category_id=category.id,
-                    label_text=category.name,
-                    prompt_text=detection.label_text,
-                    confidence=float(detection.score),
-                    bbox_json=bbox_xywh,
-                    status="pending",
-                )
-                db.add(proposal)
-                proposals_created += 1
+            if proposal_rows:
+                # One executemany INSERT per job instead of a flush per proposal object.
+                await db.execute(insert(PrelabelProposal), proposal_rows)
+            await db.execute(
+                insert(PrelabelSessionAsset),
+                [{"session_id": session.id, "asset_id": asset_id} for asset_id in asset_ids],
+            )
+            await _append_debug_detections(db, session, debug_rows)
 
-            session.processed_assets = int(session.processed_assets or 0) + 1
-            session.generated_proposals = int(session.generated_proposals or 0) + proposals_created
+            session.processed_assets = int(session.processed_assets or 0) + len(asset_ids)
+            session.generated_proposals = int(session.generated_proposals or 0) + len(proposal_rows)
             session.skipped_unmatched = int(session.skipped_unmatched or 0) + skipped_unmatched
             session.status = "running"
             _maybe_finalize_session(session)
-            await db.commit()
+            try:
+                await db.commit()
+            except IntegrityError:
+                # A concurrent delivery of the same job committed these assets first.
+                await db.rollback()
+                return {"session_id": session_id, "asset_ids": asset_ids, "status": "duplicate", "generated_proposals": 0}
+            if str(session.status) == "completed":
+                await prelabel_contexts.discard(session.id)
             return {
                 "session_id": session.id,
-                "asset_id": asset.id,
+                "asset_ids": asset_ids,
                 "status": session.status,
-                "generated_proposals": proposals_created,
+                "generated_proposals": len(proposal_rows),
                 "skipped_unmatched": skipped_unmatched,
+                "skipped_missing": missing_assets,
             }
         except Exception as exc:
             await db.rollback()
+            await prelabel_contexts.discard(session_id)
             session = await db.get(PrelabelSession, session_id)
             if session is not None:
                 session.status = "failed"
                 session.error_message = str(exc) or "Prelabel inference failed"
                 await db.commit()
             raise
+        finally:
+            if owned_adapter is not None:
+                await close_prelabel_adapter(owned_adapter)
+
+
+async def process_prelabel_asset_job(
+    payload: dict[str, Any],
+    *,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> dict[str, Any]:
+    session_id = str(payload.get("session_id") or "").strip()
+    asset_id = str(payload.get("asset_id") or "").strip()
+    if not session_id or not asset_id:
+        raise RuntimeError("session_id and asset_id are required")
+    result = await _process_prelabel_assets(session_id, [asset_id], session_factory=session_factory)
+    result.pop("asset_ids")
+    return {"session_id": result.pop("session_id"), "asset_id": asset_id, **result}
+
+
+async def process_prelabel_assets_job(
+    payload: dict[str, Any],
+    *,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> dict[str, Any]:
+    """Run a ``prelabel_assets`` bulk job: one detection call and one proposal insert for its ``asset_ids``."""
+    session_id = str(payload.get("session_id") or "").strip()
+    raw_asset_ids = payload.get("asset_ids")
+    asset_ids = [str(value).strip() for value in raw_asset_ids if str(value).strip()] if isinstance(raw_asset_ids, list) else []
+    if not session_id or not asset_ids:
+        raise RuntimeError("session_id and asset_ids are required")
+    return await _process_prelabel_assets(session_id, asset_ids, session_factory=session_factory)
 
 
 async def mark_prelabel_session_failed(
@@ -827,6 +1076,25 @@ async def mark_prelabel_session_failed(
         await db.commit()
 
 
+async def record_superseded_prelabel_assets(
+    session_id: str,
+    *,
+    count: int,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> None:
+    """Count live frames the dispatcher dropped for a newer frame as processed, with no proposals."""
+    if count <= 0:
+        return
+    effective_session_factory = session_factory or SessionLocal
+    async with effective_session_factory() as db:
+        session = await db.get(PrelabelSession, session_id)
+        if session is None or str(session.status) in {"failed", "cancelled"}:
+            return
+        session.processed_assets = int(session.processed_assets or 0) + count
+        _maybe_finalize_session(session)
+        await db.commit()
+
+
 def _proposal_scope_filter(
     *,
     session_id: str,
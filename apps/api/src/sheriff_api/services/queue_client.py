@@ -0,0 +1,181 @@
+"""Shared Redis connection pool and job-queue base class for the API's queues.
+
+Every queue (media, train, prelabel, suggestion) pushes through one
+``QueueClient`` per Redis URL, so an enqueue reuses a pooled connection
+instead of opening and closing one per job. ``enqueue_many`` packs many
+payloads into a few ``RPUSH`` commands sent in one pipeline round trip.
+Clients are created lazily and closed by the application lifespan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import json
+import time
+from typing import Any, Callable, Iterable
+
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from sheriff_api.config import get_settings
+
+_LATENCY_WINDOW = 512
+_RPUSH_CHUNK = 500
+
+
+def encode_job(job_payload: dict[str, Any]) -> str:
+    return json.dumps(job_payload, separators=(",", ":"))
+
+
+@dataclass
+class QueueMetrics:
+    """Enqueue counters for one queue key; ``depth`` is the list length Redis reported on the last push."""
+
+    enqueued: int = 0
+    round_trips: int = 0
+    errors: int = 0
+    depth: int | None = None
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+    def observe(self, *, jobs: int, elapsed_ms: float, depth: int | None) -> None:
+        self.enqueued += jobs
+        self.round_trips += 1
+        self.latencies_ms.append(elapsed_ms)
+        if depth is not None:
+            self.depth = depth
+
+    def snapshot(self) -> dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        def _percentile(fraction: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))], 3)
+
+        return {
+            "enqueued": self.enqueued,
+            "round_trips": self.round_trips,
+            "errors": self.errors,
+            "depth": self.depth,
+            "latency_ms_p50": _percentile(0.5),
+            "latency_ms_p99": _percentile(0.99),
+        }
+
+
+class QueueClient:
+    """Pooled Redis client bound to the event loop that created it."""
+
+    def __init__(self, redis_url: str, *, redis: Redis | None = None) -> None:
+        self.redis_url = redis_url
+        if redis is None:
+            pool = BlockingConnectionPool.from_url(
+                redis_url,
+                decode_responses=True,
+                max_connections=get_settings().redis_max_connections,
+            )
+            redis = Redis(connection_pool=pool)
+        self.redis = redis
+        self.loop = asyncio.get_running_loop()
+
+    async def enqueue(self, queue_key: str, job_payload: dict[str, Any]) -> int:
+        return await self.enqueue_many(queue_key, [job_payload])
+
+    async def enqueue_many(self, queue_key: str, job_payloads: Iterable[dict[str, Any]]) -> int:
+        """Append payloads in order with one pipelined round trip; returns the number pushed."""
+        encoded = [encode_job(payload) for payload in job_payloads]
+        if not encoded:
+            return 0
+        metrics = _queue_metrics(queue_key)
+        started = time.perf_counter()
+        try:
+            if len(encoded) <= _RPUSH_CHUNK:
+                depths = [await self.redis.rpush(queue_key, *encoded)]
+            else:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for offset in range(0, len(encoded), _RPUSH_CHUNK):
+                        pipe.rpush(queue_key, *encoded[offset : offset + _RPUSH_CHUNK])
+                    depths = await pipe.execute()
+        except Exception:
+            metrics.errors += 1
+            raise
+        metrics.observe(jobs=len(encoded), elapsed_ms=(time.perf_counter() - started) * 1000.0, depth=int(depths[-1]))
+        return len(encoded)
+
+    async def run_pipeline(self, queue_key: str, *, jobs: int, build: Callable[[Any], None]) -> list[Any]:
+        """Run the commands ``build`` queues in one MULTI round trip, recorded as ``jobs`` enqueued on ``queue_key``."""
+        metrics = _queue_metrics(queue_key)
+        started = time.perf_counter()
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                build(pipe)
+                replies = await pipe.execute()
+        except Exception:
+            metrics.errors += 1
+            raise
+        metrics.observe(jobs=jobs, elapsed_ms=(time.perf_counter() - started) * 1000.0, depth=None)
+        return replies
+
+    async def depth(self, queue_key: str) -> int:
+        value = int(await self.redis.llen(queue_key))
+        _queue_metrics(queue_key).depth = value
+        return value
+
+    async def aclose(self) -> None:
+        await self.redis.aclose()
+        await self.redis.connection_pool.disconnect()
+
+
+_clients: dict[str, QueueClient] = {}
+_metrics: dict[str, QueueMetrics] = {}
+
+
+def _queue_metrics(queue_key: str) -> QueueMetrics:
+    return _metrics.setdefault(queue_key, QueueMetrics())
+
+
+def get_queue_client(redis_url: str) -> QueueClient:
+    """Shared client for ``redis_url``; a client from another (closed) event loop is replaced."""
+    client = _clients.get(redis_url)
+    if client is None or client.loop is not asyncio.get_running_loop():
+        client = QueueClient(redis_url)
+        _clients[redis_url] = client
+    return client
+
+
+def register_queue_client(client: QueueClient) -> None:
+    """Use ``client`` for its URL (tests and benchmarks inject in-process Redis servers this way)."""
+    _clients[client.redis_url] = client
+
+
+async def close_queue_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        if client.loop is asyncio.get_running_loop():
+            await client.aclose()
+
+
+def queue_metrics_snapshot() -> dict[str, dict[str, Any]]:
+    return {queue_key: metrics.snapshot() for queue_key, metrics in sorted(_metrics.items())}
+
+
+class RedisJobQueue:
+    """Base for the API's job queues: one Redis list per queue key, JSON payloads pushed at the tail."""
+
+    def __init__(self, *, redis_url: str | None = None, queue_key: str) -> None:
+        self._redis_url = redis_url or get_settings().redis_url
+        self._queue_key = queue_key
+
+    @property
+    def queue_key(self) -> str:
+        return self._queue_key
+
+    async def _enqueue(self, job_payload: dict[str, Any]) -> None:
+        await get_queue_client(self._redis_url).enqueue(self._queue_key, job_payload)
+
+    async def enqueue_many(self, job_payloads: Iterable[dict[str, Any]]) -> int:
+        return await get_queue_client(self._redis_url).enqueue_many(self._queue_key, job_payloads)
+
+    async def depth(self) -> int:
+        return await get_queue_client(self._redis_url).depth(self._queue_key)
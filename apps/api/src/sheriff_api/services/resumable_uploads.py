@@ -0,0 +1,229 @@
+"""Resumable (tus-style) uploads for large files such as video imports.
+
+An upload is created with its final length, then filled by appending chunks at
+the current offset. After a dropped connection the client asks for the offset
+and continues from there instead of starting over. Every upload lives in the
+storage staging area::
+
+    tmp/resumable/{upload_id}.json   what was announced at creation
+    tmp/resumable/{upload_id}.part   the bytes received so far
+
+Chunks are streamed straight to the ``.part`` file, so memory stays flat
+whatever the file size. The sha256 is updated as bytes arrive; a process that
+did not see the earlier chunks (restart, another API worker) re-hashes the
+partial file once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+import time
+from typing import Any, AsyncIterator
+import uuid
+
+from sheriff_api.services.storage import LocalStorage
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_REHASH_CHUNK_BYTES = 1024 * 1024
+
+
+class ResumableUploadError(ValueError):
+    def __init__(self, code: str, message: str, details: dict[str, Any] | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+
+
+@dataclass
+class ResumableUpload:
+    id: str
+    project_id: str
+    filename: str
+    length: int
+    created_at: str
+    expires_at: str
+    offset: int = 0
+    # Whatever the caller needs to act on the finished file (e.g. validated import params).
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return self.offset >= self.length
+
+
+class ResumableUploadStore:
+    def __init__(self, storage: LocalStorage, *, expiry_seconds: float = 24 * 3600.0) -> None:
+        self._storage = storage
+        self._expiry_seconds = expiry_seconds
+        self._locks: dict[str, asyncio.Lock] = {}
+        # upload_id -> (offset, running sha256 of the bytes before offset)
+        self._digests: dict[str, tuple[int, Any]] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._storage.root / "tmp" / "resumable"
+
+    def create(self, *, project_id: str, filename: str, length: int, metadata: dict[str, Any] | None = None) -> ResumableUpload:
+        if length <= 0:
+            raise ResumableUploadError("upload_length_invalid", "Upload length must be positive", {"length": length})
+        self.expire_stale()
+        self.root.mkdir(parents=True, exist_ok=True)
+        now = datetime.utcnow()
+        upload = ResumableUpload(
+            id=uuid.uuid4().hex,
+            project_id=project_id,
+            filename=filename,
+            length=length,
+            created_at=now.isoformat(),
+            expires_at=(now + timedelta(seconds=self._expiry_seconds)).isoformat(),
+            metadata=dict(metadata or {}),
+        )
+        self._part_path(upload.id).touch()
+        state = asdict(upload)
+        state.pop("offset")
+        self._state_path(upload.id).write_text(json.dumps(state, sort_keys=True), encoding="utf-8")
+        self._digests[upload.id] = (0, hashlib.sha256())
+        return upload
+
+    def get(self, upload_id: str) -> ResumableUpload:
+        if not _UPLOAD_ID_RE.fullmatch(upload_id):
+            raise self._not_found(upload_id)
+        try:
+            state = json.loads(self._state_path(upload_id).read_text(encoding="utf-8"))
+            offset = self._part_path(upload_id).stat().st_size
+        except (FileNotFoundError, json.JSONDecodeError) as exc:
+            raise self._not_found(upload_id) from exc
+        return ResumableUpload(**state, offset=offset)
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> ResumableUpload:
+        """Append a request body at ``offset``; bytes received before a disconnect are kept."""
+        async with self.lock(upload_id):
+            upload = self.get(upload_id)
+            if offset != upload.offset:
+                raise ResumableUploadError(
+                    "upload_offset_mismatch",
+                    "Upload-Offset does not match the bytes received so far",
+                    {"upload_id": upload_id, "offset": upload.offset, "requested_offset": offset},
+                )
+            digest = await asyncio.to_thread(self._digest_at, upload_id, upload.offset)
+            received = upload.offset
+            try:
+                with self._part_path(upload_id).open("ab") as target:
+                    async for chunk in chunks:
+                        if not chunk:
+                            continue
+                        if received + len(chunk) > upload.length:
+                            raise ResumableUploadError(
+                                "upload_length_exceeded",
+                                "Chunk extends past the announced upload length",
+                                {"upload_id": upload_id, "length": upload.length},
+                            )
+                        await asyncio.to_thread(target.write, chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+            finally:
+                self._digests[upload_id] = (received, digest)
+            upload.offset = received
+            return upload
+
+    async def checksum(self, upload_id: str) -> str:
+        """The sha256 of the bytes received so far; call it with ``lock(upload_id)`` held."""
+        upload = self.get(upload_id)
+        digest = await asyncio.to_thread(self._digest_at, upload_id, upload.offset)
+        return digest.copy().hexdigest()
+
+    def complete(self, upload_id: str, target: Path) -> None:
+        """Move a finished upload's bytes to ``target`` and forget the upload."""
+        upload = self.get(upload_id)
+        if not upload.complete:
+            raise ResumableUploadError(
+                "upload_incomplete",
+                "Upload has not received all of its bytes",
+                {"upload_id": upload_id, "offset": upload.offset, "length": upload.length},
+            )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._part_path(upload_id), target)
+        self.delete(upload_id)
+
+    def link(self, upload_id: str, target: Path) -> None:
+        """Expose a finished upload's bytes at ``target`` and keep the upload.
+
+        The caller deletes the upload once the file has been handed off, or removes
+        ``target`` and leaves the upload to be finalized again.
+        """
+        upload = self.get(upload_id)
+        if not upload.complete:
+            raise ResumableUploadError(
+                "upload_incomplete",
+                "Upload has not received all of its bytes",
+                {"upload_id": upload_id, "offset": upload.offset, "length": upload.length},
+            )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # Same storage root, so a hard link avoids copying a multi-GB file.
+            os.link(self._part_path(upload_id), target)
+        except OSError:
+            shutil.copyfile(self._part_path(upload_id), target)
+
+    def delete(self, upload_id: str) -> bool:
+        if not _UPLOAD_ID_RE.fullmatch(upload_id):
+            return False
+        existed = self._state_path(upload_id).exists()
+        self._state_path(upload_id).unlink(missing_ok=True)
+        self._part_path(upload_id).unlink(missing_ok=True)
+        self._digests.pop(upload_id, None)
+        self._locks.pop(upload_id, None)
+        return existed
+
+    def expire_stale(self) -> int:
+        """Remove uploads untouched for longer than the expiry."""
+        if not self.root.is_dir():
+            return 0
+        cutoff = time.time() - self._expiry_seconds
+        removed = 0
+        for state_path in self.root.glob("*.json"):
+            upload_id = state_path.stem
+            part_path = self._part_path(upload_id)
+            try:
+                touched = max(state_path.stat().st_mtime, part_path.stat().st_mtime if part_path.exists() else 0.0)
+            except FileNotFoundError:
+                continue
+            if touched < cutoff and self.delete(upload_id):
+                removed += 1
+        return removed
+
+    def _digest_at(self, upload_id: str, offset: int) -> Any:
+        cached = self._digests.get(upload_id)
+        if cached is not None and cached[0] == offset:
+            return cached[1]
+        digest = hashlib.sha256()
+        with self._part_path(upload_id).open("rb") as source:
+            remaining = offset
+            while remaining > 0 and (chunk := source.read(min(_REHASH_CHUNK_BYTES, remaining))):
+                digest.update(chunk)
+                remaining -= len(chunk)
+        self._digests[upload_id] = (offset, digest)
+        return digest
+
+    def lock(self, upload_id: str) -> asyncio.Lock:
+        """Serializes appends and finalization of one upload within this process."""
+        return self._locks.setdefault(upload_id, asyncio.Lock())
+
+    def _state_path(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.json"
+
+    def _part_path(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.part"
+
+    @staticmethod
+    def _not_found(upload_id: str) -> ResumableUploadError:
+        return ResumableUploadError("upload_not_found", "Upload not found", {"upload_id": upload_id})
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sheriff_api.db.models import Annotation, Asset, AssetSequence, Folder
 from sheriff_api.services.folders import ensure_folder_path, ensure_unique_folder_path, sanitize_folder_name
 from sheriff_api.services.prelabels import get_latest_sequence_prelabel_session, pending_prelabel_counts_for_assets, sequence_pending_total_from_counts
+from sheriff_api.services.thumbnails import thumbnail_uri
 from sheriff_api.schemas.assets import AssetRead
 from sheriff_api.schemas.folders import FolderRead
 from sheriff_api.schemas.sequences import AssetSequenceRead, SequenceFrameAssetRead, SequenceStatusRead
@@ -35,6 +36,7 @@ def asset_to_read(asset: Asset) -> AssetRead:
         width=asset.width,
         height=asset.height,
         checksum=asset.checksum,
+        perceptual_hash=asset.perceptual_hash,
         metadata_json=asset.metadata_json,
     )
 
@@ -55,7 +57,7 @@ def sequence_frame_to_read(
         frame_index=asset.frame_index,
         timestamp_seconds=asset.timestamp_seconds,
         image_url=asset.uri,
-        thumbnail_url=asset.uri,
+        thumbnail_url=thumbnail_uri(asset.id),
         has_annotations=has_annotations,
         pending_prelabel_count=int(pending_prelabel_count or 0),
     )
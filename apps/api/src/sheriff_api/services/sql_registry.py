@@ -0,0 +1,808 @@
+"""SQL-backed registry for experiments, models, dataset versions and deployments.
+
+The file stores keep one JSON document per project and rewrite it whole on
+every mutation. The stores here keep one row per record in indexed tables on
+the application database, so listing is one indexed query and a mutation
+touches one row inside one transaction.
+
+Experiment artifacts (config, runs, events, metrics, checkpoints) stay on disk.
+The trainer has no database access and keeps exchanging state through
+``status.json`` and ``summary.json``; the registry re-reads either file only
+when its mtime differs from the one recorded with the row, and lists skip the
+check for experiments in a terminal status.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    event,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine, make_url
+
+from sheriff_api.services.dataset_store import DatasetStore
+from sheriff_api.services.deployment_store import (
+    DeploymentStore,
+    apply_deployment_patch,
+    new_deployment_item,
+    references_experiment,
+)
+from sheriff_api.services.experiment_store import ExperimentStore, write_json_atomic
+from sheriff_api.services.model_store import FileProjectModelStore, new_model_record
+
+EXPERIMENT = "experiment"
+MODEL = "model"
+DATASET_VERSION = "dataset_version"
+DATASET_EXPORT = "dataset_export"
+DEPLOYMENT = "deployment"
+
+# Only the API moves an experiment out of a terminal status (by starting a new attempt), so
+# listing skips the status.json/summary.json stat for these rows.
+_SETTLED_STATUSES = frozenset({"completed", "failed", "canceled"})
+_SYNC_DRIVERS = {"sqlite+aiosqlite": "sqlite", "postgresql+asyncpg": "postgresql+psycopg"}
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+registry_metadata = MetaData()
+
+registry_records = Table(
+    "registry_records",
+    registry_metadata,
+    Column("kind", String(32), primary_key=True),
+    Column("record_id", String, primary_key=True),
+    Column("project_id", String, nullable=False),
+    Column("task_id", String, nullable=True),
+    # model_id for experiments, source experiment_id for deployments.
+    Column("parent_id", String, nullable=True),
+    Column("archived", Boolean, nullable=False, default=False),
+    Column("created_at", String, nullable=False, default=""),
+    Column("updated_at", String, nullable=False, default=""),
+    Column("payload", JSON, nullable=False),
+    Index("ix_registry_records_created", "kind", "project_id", "created_at"),
+    Index("ix_registry_records_updated", "kind", "project_id", "updated_at"),
+    Index("ix_registry_records_parent", "kind", "project_id", "parent_id"),
+)
+
+registry_project_state = Table(
+    "registry_project_state",
+    registry_metadata,
+    Column("kind", String(32), primary_key=True),
+    Column("project_id", String, primary_key=True),
+    Column("active_id", String, nullable=True),
+)
+
+registry_experiment_status = Table(
+    "registry_experiment_status",
+    registry_metadata,
+    Column("experiment_id", String, primary_key=True),
+    Column("project_id", String, nullable=False),
+    Column("status", String(32), nullable=False),
+    Column("cancel_requested", Boolean, nullable=False, default=False),
+    Column("current_run_attempt", Integer, nullable=True),
+    Column("last_completed_attempt", Integer, nullable=True),
+    Column("active_job_id", String, nullable=True),
+    Column("error", Text, nullable=True),
+    Column("updated_at", String, nullable=True),
+    Column("status_mtime_ns", BigInteger, nullable=True),
+    Column("summary_mtime_ns", BigInteger, nullable=True),
+    Index("ix_registry_experiment_status_project", "project_id", "status"),
+)
+
+registry_experiment_attempts = Table(
+    "registry_experiment_attempts",
+    registry_metadata,
+    Column("experiment_id", String, primary_key=True),
+    Column("attempt", Integer, primary_key=True),
+    Column("project_id", String, nullable=False, index=True),
+    Column("job_id", String, nullable=True),
+    Column("task", String, nullable=True),
+    Column("model_family", String, nullable=True),
+    Column("dataset_export", JSON, nullable=True),
+)
+
+_STATUS_FIELDS = ("status", "cancel_requested", "current_run_attempt", "last_completed_attempt", "active_job_id", "error", "updated_at")
+
+
+def registry_sync_url(database_url: str) -> str:
+    """Map the application's async driver onto its synchronous counterpart."""
+    url = make_url(database_url)
+    return url.set(drivername=_SYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+
+def _sqlite_connect(dbapi_connection: Any, _record: Any) -> None:
+    # Let SQLAlchemy's "begin" hook issue BEGIN itself instead of pysqlite's implicit deferred BEGIN.
+    dbapi_connection.isolation_level = None
+
+
+def _sqlite_begin(connection: Connection) -> None:
+    # Take the write lock up front so read-modify-write transactions cannot fail on lock upgrade.
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@lru_cache(maxsize=None)
+def registry_engine(database_url: str) -> Engine:
+    url = make_url(registry_sync_url(database_url))
+    if url.get_backend_name() == "sqlite":
+        engine = create_engine(url, connect_args={"timeout": 30, "check_same_thread": False})
+        event.listen(engine, "connect", _sqlite_connect)
+        event.listen(engine, "begin", _sqlite_begin)
+    else:
+        engine = create_engine(url, pool_pre_ping=True)
+    registry_metadata.create_all(engine)
+    return engine
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _record_key(kind: str, record_id: str) -> Any:
+    return (registry_records.c.kind == kind) & (registry_records.c.record_id == record_id)
+
+
+def _project_records(kind: str, project_id: str) -> Any:
+    return (registry_records.c.kind == kind) & (registry_records.c.project_id == project_id)
+
+
+def _record_values(payload: dict[str, Any], **columns: Any) -> dict[str, Any]:
+    values = {
+        "task_id": payload.get("task_id") if isinstance(payload.get("task_id"), str) else None,
+        "created_at": str(payload.get("created_at") or ""),
+        "updated_at": str(payload.get("updated_at") or payload.get("created_at") or ""),
+        "payload": payload,
+    }
+    values.update(columns)
+    return values
+
+
+def _insert_record(conn: Connection, kind: str, project_id: str, record_id: str, payload: dict[str, Any], **columns: Any) -> None:
+    conn.execute(
+        insert(registry_records).values(kind=kind, record_id=record_id, project_id=project_id, **_record_values(payload, **columns))
+    )
+
+
+def _update_record(conn: Connection, kind: str, record_id: str, payload: dict[str, Any], **columns: Any) -> None:
+    conn.execute(update(registry_records).where(_record_key(kind, record_id)).values(**_record_values(payload, **columns)))
+
+
+def _upsert(conn: Connection, table: Table, key: dict[str, Any], values: dict[str, Any]) -> None:
+    condition = None
+    for name, value in key.items():
+        clause = table.c[name] == value
+        condition = clause if condition is None else condition & clause
+    if conn.execute(update(table).where(condition).values(**values)).rowcount == 0:
+        conn.execute(insert(table).values(**key, **values))
+
+
+def _get_active_id(conn: Connection, kind: str, project_id: str) -> str | None:
+    return conn.execute(
+        select(registry_project_state.c.active_id).where(
+            (registry_project_state.c.kind == kind) & (registry_project_state.c.project_id == project_id)
+        )
+    ).scalar_one_or_none()
+
+
+def _set_active_id(conn: Connection, kind: str, project_id: str, active_id: str | None) -> None:
+    _upsert(conn, registry_project_state, {"kind": kind, "project_id": project_id}, {"active_id": active_id})
+
+
+class _RegistryConnections:
+    def __init__(self, database_url: str) -> None:
+        self._engine = registry_engine(database_url)
+
+    @contextmanager
+    def _read(self) -> Iterator[Connection]:
+        with self._engine.connect() as conn:
+            yield conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Connection]:
+        with self._engine.begin() as conn:
+            yield conn
+
+
+class SqlProjectModelStore(_RegistryConnections):
+    def list_by_project(self, project_id: str) -> list[dict[str, Any]]:
+        with self._read() as conn:
+            rows = conn.execute(
+                select(registry_records.c.payload)
+                .where(_project_records(MODEL, project_id))
+                .order_by(registry_records.c.created_at.desc())
+            ).scalars()
+            return [dict(row) for row in rows]
+
+    def _load(self, conn: Connection, project_id: str, model_id: str, *, for_update: bool = False) -> dict[str, Any] | None:
+        query = select(registry_records.c.payload).where(_record_key(MODEL, model_id) & (registry_records.c.project_id == project_id))
+        payload = conn.execute(query.with_for_update() if for_update else query).scalar_one_or_none()
+        return dict(payload) if payload is not None else None
+
+    def get(self, project_id: str, model_id: str) -> dict[str, Any] | None:
+        with self._read() as conn:
+            return self._load(conn, project_id, model_id)
+
+    def create(self, *, project_id: str, name: str, config_json: dict[str, Any], task_id: str | None = None) -> dict[str, Any]:
+        record = new_model_record(project_id=project_id, name=name, config_json=config_json, task_id=task_id)
+        with self._transaction() as conn:
+            _insert_record(conn, MODEL, project_id, record["id"], record)
+        return record
+
+    def update_config(self, *, project_id: str, model_id: str, config_json: dict[str, Any]) -> dict[str, Any] | None:
+        with self._transaction() as conn:
+            record = self._load(conn, project_id, model_id, for_update=True)
+            if record is None:
+                return None
+            record["config_json"] = config_json
+            record["updated_at"] = _utc_now_iso()
+            _update_record(conn, MODEL, model_id, record)
+        return record
+
+
+class SqlDatasetStore(DatasetStore, _RegistryConnections):
+    def __init__(self, storage_root: str, database_url: str, *, schema_path: Path | None = None) -> None:
+        DatasetStore.__init__(self, storage_root, schema_path=schema_path)
+        _RegistryConnections.__init__(self, database_url)
+
+    @staticmethod
+    def _entry(payload: dict[str, Any], archived: bool, active_id: str | None) -> dict[str, Any]:
+        version_id = str(payload.get("dataset_version_id"))
+        return {"version": dict(payload), "is_archived": bool(archived), "is_active": version_id == active_id}
+
+    def _require(self, conn: Connection, project_id: str, dataset_version_id: str) -> None:
+        exists = conn.execute(
+            select(registry_records.c.record_id).where(
+                _record_key(DATASET_VERSION, dataset_version_id) & (registry_records.c.project_id == project_id)
+            )
+        ).first()
+        if exists is None:
+            raise KeyError("dataset_version_not_found")
+
+    def list_versions(self, project_id: str, task_id: str | None = None) -> dict[str, Any]:
+        query = select(registry_records.c.payload, registry_records.c.archived).where(_project_records(DATASET_VERSION, project_id))
+        if isinstance(task_id, str) and task_id.strip():
+            query = query.where(registry_records.c.task_id == task_id.strip())
+        with self._read() as conn:
+            active_id = _get_active_id(conn, DATASET_VERSION, project_id)
+            rows = conn.execute(query.order_by(registry_records.c.created_at.desc())).all()
+        return {
+            "active_dataset_version_id": active_id,
+            "items": [self._entry(row.payload, row.archived, active_id) for row in rows],
+        }
+
+    def get_version(self, project_id: str, dataset_version_id: str) -> dict[str, Any] | None:
+        with self._read() as conn:
+            row = conn.execute(
+                select(registry_records.c.payload, registry_records.c.archived).where(
+                    _record_key(DATASET_VERSION, dataset_version_id) & (registry_records.c.project_id == project_id)
+                )
+            ).first()
+            if row is None:
+                return None
+            return self._entry(row.payload, row.archived, _get_active_id(conn, DATASET_VERSION, project_id))
+
+    def create_version(self, project_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        version = self._prepare_version(project_id, payload)
+        with self._transaction() as conn:
+            _insert_record(conn, DATASET_VERSION, project_id, str(version["dataset_version_id"]), version)
+        return version
+
+    def set_active(self, project_id: str, dataset_version_id: str | None) -> None:
+        with self._transaction() as conn:
+            if dataset_version_id is not None:
+                self._require(conn, project_id, dataset_version_id)
+            _set_active_id(conn, DATASET_VERSION, project_id, dataset_version_id)
+
+    def archive_version(self, project_id: str, dataset_version_id: str, archived: bool = True) -> None:
+        with self._transaction() as conn:
+            self._require(conn, project_id, dataset_version_id)
+            conn.execute(update(registry_records).where(_record_key(DATASET_VERSION, dataset_version_id)).values(archived=archived))
+
+    def delete_version(self, project_id: str, dataset_version_id: str) -> None:
+        with self._transaction() as conn:
+            self._require(conn, project_id, dataset_version_id)
+            conn.execute(delete(registry_records).where(_record_key(DATASET_VERSION, dataset_version_id)))
+            conn.execute(delete(registry_records).where(_record_key(DATASET_EXPORT, dataset_version_id)))
+            if _get_active_id(conn, DATASET_VERSION, project_id) == dataset_version_id:
+                _set_active_id(conn, DATASET_VERSION, project_id, None)
+
+    def set_export_artifact(self, project_id: str, dataset_version_id: str, artifact: dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            self._require(conn, project_id, dataset_version_id)
+            conn.execute(delete(registry_records).where(_record_key(DATASET_EXPORT, dataset_version_id)))
+            _insert_record(conn, DATASET_EXPORT, project_id, dataset_version_id, dict(artifact))
+
+    def get_export_artifact(self, project_id: str, dataset_version_id: str) -> dict[str, Any] | None:
+        with self._read() as conn:
+            payload = conn.execute(
+                select(registry_records.c.payload).where(
+                    _record_key(DATASET_EXPORT, dataset_version_id) & (registry_records.c.project_id == project_id)
+                )
+            ).scalar_one_or_none()
+        return dict(payload) if isinstance(payload, dict) else None
+
+
+def _deployment_parent(item: dict[str, Any]) -> str | None:
+    source = item.get("source")
+    experiment_id = source.get("experiment_id") if isinstance(source, dict) else None
+    return str(experiment_id) if experiment_id else None
+
+
+class SqlDeploymentStore(DeploymentStore, _RegistryConnections):
+    def __init__(self, storage_root: str, database_url: str) -> None:
+        DeploymentStore.__init__(self, storage_root)
+        _RegistryConnections.__init__(self, database_url)
+
+    def _load(self, conn: Connection, project_id: str, deployment_id: str, *, for_update: bool = False) -> dict[str, Any] | None:
+        query = select(registry_records.c.payload).where(
+            _record_key(DEPLOYMENT, deployment_id) & (registry_records.c.project_id == project_id)
+        )
+        payload = conn.execute(query.with_for_update() if for_update else query).scalar_one_or_none()
+        return dict(payload) if payload is not None else None
+
+    def list(self, project_id: str) -> dict[str, Any]:
+        with self._read() as conn:
+            active_id = _get_active_id(conn, DEPLOYMENT, project_id)
+            rows = conn.execute(
+                select(registry_records.c.payload)
+                .where(_project_records(DEPLOYMENT, project_id))
+                .order_by(registry_records.c.created_at.desc())
+            ).scalars()
+            return {"active_deployment_id": active_id, "items": [dict(row) for row in rows]}
+
+    def get(self, project_id: str, deployment_id: str) -> dict[str, Any] | None:
+        with self._read() as conn:
+            return self._load(conn, project_id, deployment_id)
+
+    def list_referencing_experiment(
+        self,
+        project_id: str,
+        experiment_id: str,
+        *,
+        include_archived: bool = False,
+    ) -> list[dict[str, Any]]:
+        with self._read() as conn:
+            rows = conn.execute(
+                select(registry_records.c.payload).where(
+                    _project_records(DEPLOYMENT, project_id) & (registry_records.c.parent_id == experiment_id)
+                )
+            ).scalars()
+            items = [dict(row) for row in rows]
+        return [item for item in items if references_experiment(item, experiment_id, include_archived=include_archived)]
+
+    def create(
+        self,
+        *,
+        project_id: str,
+        name: str,
+        task_id: str | None,
+        task: str,
+        device_preference: str,
+        source: dict[str, Any],
+        model_key: str,
+        is_active: bool = False,
+    ) -> dict[str, Any]:
+        item = new_deployment_item(
+            name=name,
+            task_id=task_id,
+            task=task,
+            device_preference=device_preference,
+            source=source,
+            model_key=model_key,
+        )
+        with self._transaction() as conn:
+            _insert_record(conn, DEPLOYMENT, project_id, item["deployment_id"], item, parent_id=_deployment_parent(item))
+            if is_active:
+                _set_active_id(conn, DEPLOYMENT, project_id, item["deployment_id"])
+        return item
+
+    def patch(
+        self,
+        *,
+        project_id: str,
+        deployment_id: str,
+        name: str | None = None,
+        device_preference: str | None = None,
+        status: str | None = None,
+        is_active: bool | None = None,
+    ) -> dict[str, Any] | None:
+        with self._transaction() as conn:
+            item = self._load(conn, project_id, deployment_id, for_update=True)
+            if item is None:
+                return None
+            active_id = _get_active_id(conn, DEPLOYMENT, project_id)
+            next_active_id = apply_deployment_patch(
+                item,
+                active_id,
+                name=name,
+                device_preference=device_preference,
+                status=status,
+                is_active=is_active,
+            )
+            _update_record(conn, DEPLOYMENT, deployment_id, item, parent_id=_deployment_parent(item))
+            if next_active_id != active_id:
+                _set_active_id(conn, DEPLOYMENT, project_id, next_active_id)
+        return item
+
+
+class SqlExperimentStore(ExperimentStore, _RegistryConnections):
+    """Experiment index, status and attempts in SQL; run artifacts stay under ``storage_root``.
+
+    ``status.json`` is still written on every status change because the trainer
+    reads ``cancel_requested`` and the current attempt from it.
+    """
+
+    def __init__(self, storage_root: str, database_url: str) -> None:
+        ExperimentStore.__init__(self, storage_root)
+        _RegistryConnections.__init__(self, database_url)
+
+    def _status_from_row(self, row: Any) -> dict[str, Any]:
+        status_row = self._status_default()
+        status_row.update({name: row[name] for name in _STATUS_FIELDS if row[name] is not None})
+        status_row["cancel_requested"] = bool(row["cancel_requested"])
+        return status_row
+
+    def _store_status(self, conn: Connection, project_id: str, experiment_id: str, status_row: dict[str, Any], mtime_ns: int | None) -> None:
+        values = {name: status_row.get(name) for name in _STATUS_FIELDS}
+        values["status"] = str(values["status"] or "draft")
+        values["cancel_requested"] = bool(values["cancel_requested"])
+        for name in ("current_run_attempt", "last_completed_attempt"):
+            if not isinstance(values[name], int):
+                values[name] = None
+        values["project_id"] = project_id
+        values["status_mtime_ns"] = mtime_ns
+        _upsert(conn, registry_experiment_status, {"experiment_id": experiment_id}, values)
+
+    def _sync_from_files(
+        self,
+        project_id: str,
+        experiment_id: str,
+        record: dict[str, Any] | None,
+        status_row: Any,
+        *,
+        experiment_dir: Path | None = None,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+        """Pick up ``status.json``/``summary.json`` writes made outside the registry (by the trainer)."""
+        experiment_dir = experiment_dir or self._experiment_dir(project_id, experiment_id)
+        status_path = experiment_dir / "status.json"
+        summary_path = experiment_dir / "summary.json"
+        status_mtime = _mtime_ns(status_path)
+        summary_mtime = _mtime_ns(summary_path)
+        known_status = status_row["status_mtime_ns"] if status_row is not None else None
+        known_summary = status_row["summary_mtime_ns"] if status_row is not None else None
+        status_changed = status_mtime is not None and status_mtime != known_status
+        summary_changed = record is not None and summary_mtime is not None and summary_mtime != known_summary
+
+        summary = self._read_json(summary_path, None) if summary_changed else None
+        # A file caught mid-write by the trainer (which does not write atomically) is retried on the next read.
+        summary_changed = isinstance(summary, dict)
+        file_status = self._read_json(status_path, None) if status_changed else None
+        status_changed = isinstance(file_status, dict)
+        if status_changed:
+            status = self._status_default()
+            status.update(file_status)
+        elif status_row is not None:
+            status = self._status_from_row(status_row)
+        else:
+            status = self._status_default()
+        if not status_changed and not summary_changed:
+            return record, status
+
+        with self._transaction() as conn:
+            if status_changed:
+                self._store_status(conn, project_id, experiment_id, status, status_mtime)
+            if summary_changed and record is not None:
+                record = dict(record)
+                record["summary_json"] = summary
+                record["updated_at"] = _utc_now_iso()
+                _update_record(conn, EXPERIMENT, experiment_id, record, parent_id=record.get("model_id"))
+                conn.execute(
+                    update(registry_experiment_status)
+                    .where(registry_experiment_status.c.experiment_id == experiment_id)
+                    .values(summary_mtime_ns=summary_mtime)
+                )
+        return record, status
+
+    def _load_status_row(self, conn: Connection, experiment_id: str) -> Any:
+        return conn.execute(
+            select(registry_experiment_status).where(registry_experiment_status.c.experiment_id == experiment_id)
+        ).mappings().first()
+
+    def _read_status(self, project_id: str, experiment_id: str) -> dict[str, Any]:
+        with self._read() as conn:
+            row = self._load_status_row(conn, experiment_id)
+        return self._sync_from_files(project_id, experiment_id, None, row)[1]
+
+    def _write_status(self, project_id: str, experiment_id: str, status_row: dict[str, Any]) -> dict[str, Any]:
+        next_row = dict(self._status_default())
+        next_row.update(status_row)
+        next_row["updated_at"] = _utc_now_iso()
+        mtime_ns = write_json_atomic(self._status_path(project_id, experiment_id), next_row)
+        with self._transaction() as conn:
+            self._store_status(conn, project_id, experiment_id, next_row, mtime_ns)
+        return next_row
+
+    def _read_records(self, project_id: str) -> list[dict[str, Any]]:
+        with self._read() as conn:
+            rows = conn.execute(select(registry_records.c.payload).where(_project_records(EXPERIMENT, project_id))).scalars()
+            return [dict(row) for row in rows]
+
+    def _insert_record(self, project_id: str, record: dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            _insert_record(conn, EXPERIMENT, project_id, str(record["id"]), record, parent_id=record.get("model_id"))
+
+    def _remove_record(self, project_id: str, experiment_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(delete(registry_records).where(_record_key(EXPERIMENT, experiment_id)))
+            conn.execute(delete(registry_experiment_status).where(registry_experiment_status.c.experiment_id == experiment_id))
+            conn.execute(delete(registry_experiment_attempts).where(registry_experiment_attempts.c.experiment_id == experiment_id))
+
+    def _record_attempt(self, project_id: str, experiment_id: str, run_row: dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            _upsert(
+                conn,
+                registry_experiment_attempts,
+                {"experiment_id": experiment_id, "attempt": int(run_row["attempt"])},
+                {
+                    "project_id": project_id,
+                    "job_id": run_row.get("job_id"),
+                    "task": run_row.get("task"),
+                    "model_family": run_row.get("model_family"),
+                    "dataset_export": run_row.get("dataset_export"),
+                },
+            )
+
+    def _list_attempts(self, project_id: str, experiment_id: str) -> list[int]:
+        with self._read() as conn:
+            attempts = list(
+                conn.execute(
+                    select(registry_experiment_attempts.c.attempt)
+                    .where(registry_experiment_attempts.c.experiment_id == experiment_id)
+                    .order_by(registry_experiment_attempts.c.attempt.desc())
+                ).scalars()
+            )
+        # Run directories written without init_run_attempt (e.g. restored from a backup) are still found.
+        return attempts or super()._list_attempts(project_id, experiment_id)
+
+    def _update_record(
+        self,
+        *,
+        project_id: str,
+        experiment_id: str,
+        mutator: Callable[[dict[str, Any]], None],
+    ) -> dict[str, Any] | None:
+        with self._transaction() as conn:
+            payload = conn.execute(
+                select(registry_records.c.payload)
+                .where(_record_key(EXPERIMENT, experiment_id) & (registry_records.c.project_id == project_id))
+                .with_for_update()
+            ).scalar_one_or_none()
+            if payload is None:
+                return None
+            record = dict(payload)
+            mutator(record)
+            record["updated_at"] = _utc_now_iso()
+            _update_record(conn, EXPERIMENT, experiment_id, record, parent_id=record.get("model_id"))
+        return record
+
+    def get_index_record(self, project_id: str, experiment_id: str) -> dict[str, Any] | None:
+        with self._read() as conn:
+            payload = conn.execute(
+                select(registry_records.c.payload).where(
+                    _record_key(EXPERIMENT, experiment_id) & (registry_records.c.project_id == project_id)
+                )
+            ).scalar_one_or_none()
+            if payload is None:
+                return None
+            status_row = self._load_status_row(conn, experiment_id)
+        return self._sync_from_files(project_id, experiment_id, dict(payload), status_row)[0]
+
+    def list_by_project(self, project_id: str, *, model_id: str | None = None) -> list[dict[str, Any]]:
+        query = (
+            select(registry_records.c.payload, registry_experiment_status)
+            .select_from(
+                registry_records.outerjoin(
+                    registry_experiment_status,
+                    registry_experiment_status.c.experiment_id == registry_records.c.record_id,
+                )
+            )
+            .where(_project_records(EXPERIMENT, project_id))
+            .order_by(registry_records.c.updated_at.desc())
+        )
+        if model_id:
+            query = query.where(registry_records.c.parent_id == model_id)
+        with self._read() as conn:
+            rows = conn.execute(query).mappings().all()
+
+        # Resolved once per listing; per-row Path.resolve() would cost more than the stats themselves.
+        project_dir = self._storage.resolve(f"experiments/{project_id}")
+        hydrated: list[dict[str, Any]] = []
+        for row in rows:
+            record = dict(row["payload"])
+            experiment_id = str(record.get("id") or "")
+            if not experiment_id:
+                continue
+            status_row = row if row["experiment_id"] is not None else None
+            if status_row is None or row["status"] not in _SETTLED_STATUSES:
+                plain_name = Path(experiment_id).name == experiment_id and experiment_id not in {".", ".."}
+                record, status = self._sync_from_files(
+                    project_id,
+                    experiment_id,
+                    record,
+                    status_row,
+                    experiment_dir=project_dir / experiment_id if plain_name else None,
+                )
+            else:
+                status = self._status_from_row(status_row)
+            hydrated.append(self._merge_status(record or {}, status))
+        hydrated.sort(key=lambda item: str(item.get("updated_at", "")), reverse=True)
+        return hydrated
+
+    def list_index_records(self, project_id: str) -> list[dict[str, Any]]:
+        return self._read_records(project_id)
+
+
+def delete_registry_project(database_url: str, project_id: str) -> None:
+    """Remove every registry row of a project (records, status, attempts and active pointers)."""
+    with registry_engine(database_url).begin() as conn:
+        conn.execute(delete(registry_records).where(registry_records.c.project_id == project_id))
+        conn.execute(delete(registry_project_state).where(registry_project_state.c.project_id == project_id))
+        conn.execute(delete(registry_experiment_status).where(registry_experiment_status.c.project_id == project_id))
+        conn.execute(delete(registry_experiment_attempts).where(registry_experiment_attempts.c.project_id == project_id))
+
+
+def _file_registry_projects(storage_root: Path) -> list[str]:
+    project_ids: set[str] = set()
+    for area in ("experiments", "models", "datasets", "deployments"):
+        base = storage_root / area
+        if base.is_dir():
+            project_ids.update(child.name for child in base.iterdir() if child.is_dir() and not child.name.startswith("."))
+    return sorted(project_ids)
+
+
+def _insert_missing_record(conn: Connection, kind: str, project_id: str, record_id: str, payload: dict[str, Any], **columns: Any) -> bool:
+    exists = conn.execute(select(registry_records.c.record_id).where(_record_key(kind, record_id))).first()
+    if exists is not None:
+        return False
+    _insert_record(conn, kind, project_id, record_id, payload, **columns)
+    return True
+
+
+def _import_project(
+    conn: Connection,
+    project_id: str,
+    *,
+    experiments: ExperimentStore,
+    models: FileProjectModelStore,
+    datasets: DatasetStore,
+    deployments: DeploymentStore,
+    registry: SqlExperimentStore,
+    counts: dict[str, int],
+) -> None:
+    for record in experiments._read_records(project_id):
+        experiment_id = str(record.get("id") or "")
+        if not experiment_id or not _insert_missing_record(
+            conn, EXPERIMENT, project_id, experiment_id, record, parent_id=record.get("model_id")
+        ):
+            continue
+        counts["experiments"] += 1
+        status_path = experiments._status_path(project_id, experiment_id)
+        registry._store_status(
+            conn, project_id, experiment_id, experiments._read_status(project_id, experiment_id), _mtime_ns(status_path)
+        )
+        for attempt in experiments._list_attempts(project_id, experiment_id):
+            run_row = experiments.run_metadata(project_id=project_id, experiment_id=experiment_id, attempt=attempt)
+            conn.execute(
+                insert(registry_experiment_attempts).values(
+                    experiment_id=experiment_id,
+                    attempt=attempt,
+                    project_id=project_id,
+                    job_id=run_row.get("job_id"),
+                    task=run_row.get("task"),
+                    model_family=run_row.get("model_family"),
+                    dataset_export=run_row.get("dataset_export"),
+                )
+            )
+            counts["attempts"] += 1
+
+    for record in models._read_records(project_id):
+        model_id = str(record.get("id") or "")
+        if model_id and _insert_missing_record(conn, MODEL, project_id, model_id, record):
+            counts["models"] += 1
+
+    dataset_doc = datasets._read_doc(project_id)
+    archived_ids = set(dataset_doc["meta"]["archived_ids"])
+    for version in dataset_doc["items"]:
+        version_id = str(version.get("dataset_version_id") or "")
+        if version_id and _insert_missing_record(
+            conn, DATASET_VERSION, project_id, version_id, version, archived=version_id in archived_ids
+        ):
+            counts["dataset_versions"] += 1
+    for version_id, artifact in dataset_doc["meta"]["export_artifacts"].items():
+        if isinstance(artifact, dict):
+            _insert_missing_record(conn, DATASET_EXPORT, project_id, str(version_id), artifact)
+    if dataset_doc["active_dataset_version_id"] and _get_active_id(conn, DATASET_VERSION, project_id) is None:
+        _set_active_id(conn, DATASET_VERSION, project_id, dataset_doc["active_dataset_version_id"])
+
+    deployment_doc = deployments._read_doc(project_id)
+    for item in deployment_doc["items"]:
+        deployment_id = str(item.get("deployment_id") or "")
+        if deployment_id and _insert_missing_record(
+            conn, DEPLOYMENT, project_id, deployment_id, item, parent_id=_deployment_parent(item)
+        ):
+            counts["deployments"] += 1
+    if deployment_doc["active_deployment_id"] and _get_active_id(conn, DEPLOYMENT, project_id) is None:
+        _set_active_id(conn, DEPLOYMENT, project_id, deployment_doc["active_deployment_id"])
+
+
+def import_file_registry(storage_root: str, database_url: str, *, project_ids: list[str] | None = None) -> dict[str, int]:
+    """Copy the file registry under ``storage_root`` into the SQL registry.
+
+    Each project is imported in one transaction. Records that already exist in
+    the database are left untouched, so the import can be re-run after new
+    records were written to the files. The JSON documents are not modified.
+    """
+    root = Path(storage_root)
+    experiments = ExperimentStore(storage_root)
+    models = FileProjectModelStore(storage_root)
+    datasets = DatasetStore(storage_root)
+    deployments = DeploymentStore(storage_root)
+    registry = SqlExperimentStore(storage_root, database_url)
+    counts = {"projects": 0, "experiments": 0, "attempts": 0, "models": 0, "dataset_versions": 0, "deployments": 0}
+    for project_id in project_ids if project_ids is not None else _file_registry_projects(root):
+        with registry_engine(database_url).begin() as conn:
+            _import_project(
+                conn,
+                project_id,
+                experiments=experiments,
+                models=models,
+                datasets=datasets,
+                deployments=deployments,
+                registry=registry,
+                counts=counts,
+            )
+        counts["projects"] += 1
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    from sheriff_api.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Import the file-based experiment/model/dataset/deployment registry into SQL.")
+    parser.add_argument("--storage-root", default=settings.storage_root)
+    parser.add_argument("--database-url", default=settings.registry_database_url or settings.database_url)
+    parser.add_argument("--project", action="append", dest="project_ids", help="Import only this project (repeatable).")
+    args = parser.parse_args(argv)
+    print(json.dumps(import_file_registry(args.storage_root, args.database_url, project_ids=args.project_ids), sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,143 @@
+import argparse
+from dataclasses import asdict, dataclass
+import json
+import os
+import re
 import shutil
 from pathlib import Path
 
+_CHECKSUM_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class BlobGarbageReport:
+    scanned: int = 0
+    removed: int = 0
+    bytes_freed: int = 0
+
+
+class BlobStore:
+    """Content-addressed copies of asset bytes, keyed by sha256, under ``objects/ab/cdef…``.
+
+    Asset files keep their per-asset storage paths, but each one is a hard link
+    to its blob, so identical bytes are stored once and written once. The blob's
+    link count is its reference count: ``st_nlink - 1`` asset files share it.
+    Deleting an asset file releases the reference; a blob left with no other
+    links is garbage and is removed by ``release`` or ``collect_garbage``.
+    Where hard links are unavailable the asset file is a plain copy.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path(self, checksum: str) -> Path:
+        if not _CHECKSUM_RE.fullmatch(checksum):
+            raise ValueError("Blob checksum must be a lowercase sha256 hex digest")
+        return self.root / checksum[:2] / checksum[2:]
+
+    def exists(self, checksum: str) -> bool:
+        return self.path(checksum).is_file()
+
+    def refcount(self, checksum: str) -> int:
+        try:
+            return self.path(checksum).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def link_bytes(self, checksum: str, content: bytes, target: Path) -> bool:
+        """Link ``target`` to the blob for ``checksum``, writing ``content`` only if it is not stored yet.
+
+        Returns True when an existing blob was reused and nothing was written.
+        """
+        if self._link_existing(checksum, target):
+            return True
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Never write through an old link: that would rewrite every asset sharing its blob.
+        target.unlink(missing_ok=True)
+        target.write_bytes(content)
+        self.adopt(checksum, target)
+        return False
+
+    def link_file(self, checksum: str, source: Path, target: Path) -> bool:
+        """Like ``link_bytes`` for a staged file on the same filesystem; ``source`` is consumed."""
+        if self._link_existing(checksum, target):
+            source.unlink(missing_ok=True)
+            return True
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+        self.adopt(checksum, target)
+        return False
+
+    def adopt(self, checksum: str, existing: Path) -> bool:
+        """Publish an already written asset file as the blob for ``checksum`` (no-op if one exists)."""
+        blob = self.path(checksum)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(existing, blob)
+        except OSError:
+            # Already published by a concurrent writer, or no hard links here.
+            return False
+        return True
+
+    def release(self, checksum: str | None) -> bool:
+        """Remove the blob if no asset file links to it any more."""
+        if not isinstance(checksum, str) or not _CHECKSUM_RE.fullmatch(checksum):
+            return False
+        blob = self.path(checksum)
+        try:
+            if blob.stat().st_nlink > 1:
+                return False
+            blob.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def collect_garbage(self) -> BlobGarbageReport:
+        """Remove every blob that no asset file links to."""
+        report = BlobGarbageReport()
+        if not self.root.is_dir():
+            return report
+        for shard in os.scandir(self.root):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                report.scanned += 1
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_nlink > 1:
+                    continue
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                report.removed += 1
+                report.bytes_freed += stat.st_size
+        return report
+
+    def _link_existing(self, checksum: str, target: Path) -> bool:
+        blob = self.path(checksum)
+        if not blob.is_file():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(blob, target)
+        except FileNotFoundError:
+            # Collected between the existence check and the link.
+            return False
+        except FileExistsError:
+            target.unlink()
+            os.link(blob, target)
+        except OSError:
+            shutil.copyfile(blob, target)
+        return True
+
 
 class LocalStorage:
     def __init__(self, root: str) -> None:
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
+        self.blobs = BlobStore(self.root / "objects")
 
     def resolve(self, relative_uri: str) -> Path:
         root = self.root.resolve()
@@ -25,6 +157,24 @@ class LocalStorage:
         target.write_bytes(content)
         return target
 
+    def write_asset_bytes(self, relative_uri: str, content: bytes, checksum: str) -> bool:
+        """Write asset bytes through the blob store; True if identical bytes were already stored."""
+        return self.blobs.link_bytes(checksum, content, self.resolve(relative_uri))
+
+    def staging_dir(self) -> Path:
+        # Inside the storage root so staged uploads reach their final path with a rename.
+        return self.root / "tmp" / "uploads"
+
+    def move_into(self, relative_uri: str, source: Path) -> Path:
+        target = self.resolve(relative_uri)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+        return target
+
+    def move_asset_into(self, relative_uri: str, source: Path, checksum: str) -> bool:
+        """Move a staged asset file through the blob store; True if identical bytes were already stored."""
+        return self.blobs.link_file(checksum, source, self.resolve(relative_uri))
+
     def delete_file(self, relative_uri: str) -> bool:
         target = self.resolve(relative_uri)
         if not target.exists() or not target.is_file():
@@ -32,9 +182,28 @@ class LocalStorage:
         target.unlink()
         return True
 
+    def delete_asset_file(self, relative_uri: str, checksum: str | None) -> bool:
+        """Delete an asset file and its blob once nothing else links to it."""
+        deleted = self.delete_file(relative_uri)
+        self.blobs.release(checksum)
+        return deleted
+
     def delete_tree(self, relative_uri: str) -> bool:
         target = self.resolve(relative_uri)
         if not target.exists() or not target.is_dir():
             return False
         shutil.rmtree(target)
         return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    from sheriff_api.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Remove asset blobs that no asset file references any more.")
+    parser.add_argument("--storage-root", default=get_settings().storage_root)
+    args = parser.parse_args(argv)
+    print(json.dumps(asdict(LocalStorage(args.storage_root).blobs.collect_garbage()), sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+import uuid
+
+from PIL import Image, ImageOps
+
+from sheriff_api.services.storage import LocalStorage
+
+THUMBNAIL_SIZES = (128, 256, 512)
+DEFAULT_THUMBNAIL_SIZE = 256
+THUMBNAIL_FORMATS = {"webp": "image/webp", "jpeg": "image/jpeg"}
+_SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+class ThumbnailUnsupportedError(Exception):
+    pass
+
+
+def thumbnail_cache_key(storage_uri: str, source: Path) -> str:
+    """Key derivatives on the stored file itself: its storage path, size and mtime.
+
+    Asset checksums can be client supplied, so they are never used to name a
+    shared cache entry. Replacing the file changes its size or mtime and
+    therefore the key.
+    """
+    stat = source.stat()
+    return hashlib.sha256(f"{storage_uri}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")).hexdigest()
+
+
+def thumbnail_uri(asset_id: str) -> str:
+    return f"/api/v1/assets/{asset_id}/thumbnail"
+
+
+def snap_thumbnail_size(requested: int | None) -> int:
+    """Map a requested edge length onto the nearest cached size that is not smaller."""
+    if requested is None or requested <= 0:
+        return DEFAULT_THUMBNAIL_SIZE
+    for size in THUMBNAIL_SIZES:
+        if requested <= size:
+            return size
+    return THUMBNAIL_SIZES[-1]
+
+
+def thumbnail_relpath(cache_key: str, size: int, fmt: str) -> str:
+    extension = "jpg" if fmt == "jpeg" else fmt
+    return f"derived/thumbnails/{cache_key[:2]}/{cache_key}-{size}.{extension}"
+
+
+def thumbnail_etag(cache_key: str, size: int, fmt: str) -> str:
+    return f'"{cache_key}-{size}-{fmt}"'
+
+
+def render_thumbnail(source: Path, destination: Path, *, size: int, fmt: str) -> None:
+    """Decode ``source`` and write a ``size``-bounded thumbnail to ``destination``.
+
+    JPEG sources are decoded at a reduced DCT scale when possible, so large
+    frames never have to be expanded to full resolution first.
+    """
+    try:
+        with Image.open(source) as image:
+            image.draft("RGB", (size, size))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            if fmt == "jpeg" or image.mode not in {"RGB", "RGBA"}:
+                image = image.convert("RGBA" if fmt == "webp" and "A" in image.getbands() else "RGB")
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            partial = destination.with_name(f"{destination.name}.{uuid.uuid4().hex}.partial")
+            try:
+                image.save(partial, **_SAVE_OPTIONS[fmt])
+                os.replace(partial, destination)
+            finally:
+                partial.unlink(missing_ok=True)
+    except (Image.DecompressionBombError, OSError, SyntaxError, ValueError) as exc:
+        raise ThumbnailUnsupportedError(str(exc) or exc.__class__.__name__) from exc
+
+
+def ensure_thumbnail(storage: LocalStorage, source: Path, *, cache_key: str, size: int, fmt: str) -> Path:
+    """Return the cached thumbnail for ``cache_key``, rendering it on first use.
+
+    Thumbnails are keyed by the source file's identity (see ``thumbnail_cache_key``),
+    so a cached file never needs invalidation.
+    """
+    if fmt not in THUMBNAIL_FORMATS:
+        raise ValueError(f"unsupported thumbnail format: {fmt}")
+    destination = storage.resolve(thumbnail_relpath(cache_key, size, fmt))
+    if not destination.is_file():
+        render_thumbnail(source, destination, size=size, fmt=fmt)
+    return destination
@@ -1,23 +1,14 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 
-from redis.asyncio import Redis
-
 from sheriff_api.config import get_settings
+from sheriff_api.services.queue_client import RedisJobQueue
 
 
-class TrainQueue:
+class TrainQueue(RedisJobQueue):
     def __init__(self, *, redis_url: str | None = None, queue_key: str | None = None) -> None:
-        settings = get_settings()
-        self._redis_url = redis_url or settings.redis_url
-        self._queue_key = queue_key or settings.job_queue_key
+        super().__init__(redis_url=redis_url, queue_key=queue_key or get_settings().job_queue_key)
 
     async def enqueue_train_job(self, job_payload: dict[str, Any]) -> None:
-        redis = Redis.from_url(self._redis_url, decode_responses=True)
-        try:
-            await redis.rpush(self._queue_key, json.dumps(job_payload, separators=(",", ":")))
-        finally:
-            await redis.aclose()
-
+        await self._enqueue(job_payload)
@@ -1,20 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
 import json
+import math
+import re
 import subprocess
 from fractions import Fraction
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any
+from typing import Any, AsyncIterator
 
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from sheriff_api.config import get_settings
-from sheriff_api.db.models import Annotation, Asset, AssetSequence, AssetType, Folder, Suggestion
+from sheriff_api.db.models import Annotation, Asset, AssetSequence, AssetType, Folder, PrelabelSession, Suggestion
 from sheriff_api.db.session import SessionLocal
 from sheriff_api.services.asset_ingest import build_asset_record
-from sheriff_api.services.prelabels import enqueue_existing_sequence_assets_for_session, mark_prelabel_session_failed
+from sheriff_api.services.frame_dedup import (
+    NEAR_DUPLICATE_KEY,
+    FrameDedupQueue,
+    NearDuplicateIndex,
+    near_duplicate_of,
+    perceptual_hash,
+)
+from sheriff_api.services.frame_stream import FrameStreamError, FrameStreamSplitter
+from sheriff_api.services.prelabels import (
+    close_prelabel_session_input,
+    enqueue_sequence_frames_for_session,
+    mark_prelabel_session_failed,
+)
 from sheriff_api.services.storage import LocalStorage
 
 ALLOWED_VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv"}
@@ -22,6 +39,21 @@ DEFAULT_IMPORT_FPS = 2.0
 DEFAULT_IMPORT_MAX_FRAMES = 500
 MAX_IMPORT_FPS = 10.0
 MAX_IMPORT_FRAMES = 5000
+# frame_format -> (file extension, mime type, ffmpeg encoder). png is lossless; jpeg takes jpeg_quality.
+FRAME_FORMATS = {
+    "jpeg": (".jpg", "image/jpeg", "mjpeg"),
+    "png": (".png", "image/png", "png"),
+}
+DEFAULT_FRAME_FORMAT = "jpeg"
+# fps: every 1/fps seconds from one decode of the whole video. seek: the same timestamps, each decoded
+# from the nearest keyframe. keyframes / scene: only I-frames / scene changes, at most one per 1/fps.
+SAMPLING_MODES = ("fps", "seek", "keyframes", "scene")
+DEFAULT_SAMPLING_MODE = "fps"
+DEFAULT_SCENE_THRESHOLD = 0.3
+# Probed timestamps are printed rounded; seeking slightly before one still lands on that frame.
+_SEEK_LEAD_SECONDS = 0.001
+_SHOWINFO_PTS_RE = re.compile(r"pts_time:\s*([0-9.]+)")
+PIPE_READ_BYTES = 256 * 1024
 
 
 class VideoImportValidationError(ValueError):
@@ -44,6 +76,10 @@ def validate_video_import_params(
     resize_mode: str,
     resize_width: int | None,
     resize_height: int | None,
+    frame_format: str = DEFAULT_FRAME_FORMAT,
+    jpeg_quality: int | None = None,
+    sampling_mode: str = DEFAULT_SAMPLING_MODE,
+    scene_threshold: float = DEFAULT_SCENE_THRESHOLD,
 ) -> dict[str, Any]:
     suffix = Path(str(filename or "")).suffix.lower()
     if suffix not in ALLOWED_VIDEO_EXTENSIONS:
@@ -84,6 +120,32 @@ def validate_video_import_params(
             message="Resize height must be a positive integer when resize_mode=height",
             details={"resize_height": resize_height},
         )
+    normalized_frame_format = str(frame_format or DEFAULT_FRAME_FORMAT).strip().lower()
+    if normalized_frame_format not in FRAME_FORMATS:
+        raise VideoImportValidationError(
+            code="video_import_frame_format_invalid",
+            message="Frame format must be jpeg or png",
+            details={"frame_format": frame_format, "allowed_formats": sorted(FRAME_FORMATS)},
+        )
+    if jpeg_quality is not None and not 1 <= jpeg_quality <= 100:
+        raise VideoImportValidationError(
+            code="video_import_jpeg_quality_invalid",
+            message="JPEG quality must be between 1 and 100",
+            details={"jpeg_quality": jpeg_quality},
+        )
+    normalized_sampling_mode = str(sampling_mode or DEFAULT_SAMPLING_MODE).strip().lower()
+    if normalized_sampling_mode not in SAMPLING_MODES:
+        raise VideoImportValidationError(
+            code="video_import_sampling_mode_invalid",
+            message="Sampling mode must be fps, seek, keyframes, or scene",
+            details={"sampling_mode": sampling_mode, "allowed_modes": list(SAMPLING_MODES)},
+        )
+    if not 0 < scene_threshold < 1:
+        raise VideoImportValidationError(
+            code="video_import_scene_threshold_invalid",
+            message="Scene threshold must be > 0 and < 1",
+            details={"scene_threshold": scene_threshold},
+        )
 
     return {
         "fps": float(fps),
@@ -91,6 +153,10 @@ def validate_video_import_params(
         "resize_mode": normalized_resize_mode,
         "resize_width": int(resize_width) if resize_width is not None else None,
         "resize_height": int(resize_height) if resize_height is not None else None,
+        "frame_format": normalized_frame_format,
+        "jpeg_quality": int(jpeg_quality) if jpeg_quality is not None else None,
+        "sampling_mode": normalized_sampling_mode,
+        "scene_threshold": float(scene_threshold),
         "extension": suffix,
     }
 
@@ -99,6 +165,10 @@ def _run_command(args: list[str]) -> subprocess.CompletedProcess[str]:
     return subprocess.run(args, capture_output=True, text=True, check=False)
 
 
+async def _spawn_command(args: list[str]) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+
 def _parse_fraction(value: str | None) -> float | None:
     if not isinstance(value, str) or not value.strip():
         return None
@@ -154,6 +224,152 @@ def probe_video_metadata(input_path: Path) -> dict[str, Any]:
     }
 
 
+@dataclass(frozen=True)
+class FrameSegment:
+    """Output frames ``start_frame`` to ``start_frame + frame_count - 1`` of one extraction.
+
+    The segment is decoded from ``start_seconds``, or ``start_frame / fps`` when that is unset.
+    """
+
+    start_frame: int
+    frame_count: int
+    start_seconds: float | None = None
+
+
+def plan_frame_segments(
+    *,
+    duration_seconds: float | None,
+    fps: float,
+    max_frames: int,
+    segments: int,
+    min_segment_frames: int,
+) -> list[FrameSegment]:
+    """Split the output frames into contiguous ranges decoded by concurrent ffmpeg processes.
+
+    Boundaries fall on output frames: a segment seeks to ``start_frame / fps`` so its frames line
+    up with what a single pass would produce. Without a known duration the video is extracted in
+    one pass.
+    """
+    if duration_seconds is None or duration_seconds <= 0 or fps <= 0:
+        return [FrameSegment(start_frame=0, frame_count=max_frames)]
+    total_frames = max(1, min(max_frames, math.ceil(duration_seconds * fps)))
+    count = max(1, min(segments, total_frames // max(1, min_segment_frames)))
+    base, extra = divmod(total_frames, count)
+    planned: list[FrameSegment] = []
+    start_frame = 0
+    for position in range(count):
+        frame_count = base + (1 if position < extra else 0)
+        planned.append(FrameSegment(start_frame=start_frame, frame_count=frame_count))
+        start_frame += frame_count
+    return planned
+
+
+def plan_timestamp_segments(timestamps: list[float], *, fps: float, max_frames: int) -> list[FrameSegment]:
+    """One single-frame segment per timestamp, keeping at most one per ``1 / fps`` seconds."""
+    min_gap = 1.0 / fps if fps > 0 else 0.0
+    planned: list[FrameSegment] = []
+    last_kept: float | None = None
+    for timestamp in sorted(timestamps):
+        if len(planned) >= max_frames:
+            break
+        if last_kept is not None and timestamp - last_kept < min_gap - 1e-6:
+            continue
+        planned.append(FrameSegment(start_frame=len(planned), frame_count=1, start_seconds=max(0.0, timestamp)))
+        last_kept = timestamp
+    return planned
+
+
+def plan_sampling(
+    input_path: Path,
+    *,
+    sampling_mode: str,
+    scene_threshold: float,
+    duration_seconds: float | None,
+    fps: float,
+    max_frames: int,
+    segments: int,
+    min_segment_frames: int,
+) -> list[FrameSegment]:
+    """Segments to extract for ``sampling_mode``; runs the keyframe or scene probe it needs."""
+    if sampling_mode == "keyframes":
+        return plan_timestamp_segments(probe_keyframe_timestamps(input_path), fps=fps, max_frames=max_frames)
+    if sampling_mode == "scene":
+        changes = detect_scene_changes(input_path, threshold=scene_threshold)
+        return plan_timestamp_segments(changes, fps=fps, max_frames=max_frames)
+    if sampling_mode == "seek" and duration_seconds and fps > 0:
+        total_frames = max(1, min(max_frames, math.ceil(duration_seconds * fps)))
+        return plan_timestamp_segments([index / fps for index in range(total_frames)], fps=fps, max_frames=max_frames)
+    return plan_frame_segments(
+        duration_seconds=duration_seconds,
+        fps=fps,
+        max_frames=max_frames,
+        segments=segments,
+        min_segment_frames=min_segment_frames,
+    )
+
+
+def _parse_timestamps(lines: list[str]) -> list[float]:
+    timestamps: list[float] = []
+    for line in lines:
+        for field in line.split(","):
+            try:
+                timestamps.append(float(field))
+                break
+            except ValueError:
+                continue
+    return timestamps
+
+
+def probe_keyframe_timestamps(input_path: Path) -> list[float]:
+    """Presentation times of the video's I-frames; only those frames are decoded."""
+    result = _run_command(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-skip_frame",
+            "nokey",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "frame=best_effort_timestamp_time",
+            "-of",
+            "csv=p=0",
+            str(input_path),
+        ]
+    )
+    if result.returncode != 0:
+        raise VideoFrameExtractionError(result.stderr.strip() or "ffprobe failed")
+    return _parse_timestamps(result.stdout.splitlines())
+
+
+def detect_scene_changes(input_path: Path, *, threshold: float) -> list[float]:
+    """Times of frames whose scene score exceeds ``threshold``, plus the first frame.
+
+    Scene scores compare consecutive frames, so this pass decodes the whole video once; what
+    it saves is the near-duplicate frames that would otherwise be stored and prelabeled.
+    """
+    result = _run_command(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(input_path),
+            "-an",
+            "-vf",
+            f"select='gt(scene,{threshold:g})',showinfo",
+            "-f",
+            "null",
+            "-",
+        ]
+    )
+    if result.returncode != 0:
+        raise VideoFrameExtractionError(result.stderr.strip() or "ffmpeg scene detection failed")
+    changes = [float(match) for match in _SHOWINFO_PTS_RE.findall(result.stderr)]
+    return [0.0, *changes]
+
+
 def build_ffmpeg_command(
     *,
     input_path: Path,
@@ -163,26 +379,184 @@ def build_ffmpeg_command(
     resize_mode: str,
     resize_width: int | None,
     resize_height: int | None,
+    start_seconds: float | None = None,
+    frame_format: str = DEFAULT_FRAME_FORMAT,
+    jpeg_quality: int | None = None,
 ) -> list[str]:
+    """ffmpeg arguments writing frames to ``output_pattern``; ``pipe:1`` streams them over stdout."""
     filters = [f"fps={fps:g}"]
     if resize_mode == "width" and resize_width is not None:
         filters.append(f"scale={resize_width}:-1")
     elif resize_mode == "height" and resize_height is not None:
         filters.append(f"scale=-1:{resize_height}")
 
+    # Input-side seeking: ffmpeg jumps to the nearest keyframe and decodes from there instead of
+    # decoding everything before the segment.
+    seek = ["-ss", f"{start_seconds:.6f}"] if start_seconds else []
+    encoder = ["-c:v", FRAME_FORMATS[frame_format][2]]
+    if frame_format == "jpeg" and jpeg_quality is not None:
+        # mjpeg's qscale runs from 2 (best) to 31 (worst).
+        encoder += ["-q:v", str(round(2 + (100 - jpeg_quality) * 29 / 99))]
+    muxer = ["-f", "image2pipe"] if output_pattern == "pipe:1" else []
     return [
         "ffmpeg",
         "-y",
+        "-v",
+        "error",
+        *seek,
         "-i",
         str(input_path),
         "-vf",
         ",".join(filters),
         "-frames:v",
         str(max_frames),
+        *encoder,
+        *muxer,
         output_pattern,
     ]
 
 
+async def _extract_frame_batches(
+    segments: list[tuple[FrameSegment, Path, list[str]]],
+    *,
+    concurrency: int,
+    poll_seconds: float,
+) -> AsyncIterator[list[tuple[int, bytes]]]:
+    """Run the segments' ffmpeg, ``concurrency`` at a time, each into its own directory, and yield
+    ``(frame_index, content)`` as frames land.
+
+    ffmpeg writes a segment's frames in order, so a file is complete once a later one exists or
+    its process has exited.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(command: list[str]) -> subprocess.CompletedProcess[str]:
+        async with limit:
+            return await asyncio.to_thread(_run_command, command)
+
+    tasks = [asyncio.create_task(run(command)) for _, _, command in segments]
+    yielded = [0] * len(segments)
+    try:
+        while True:
+            await asyncio.wait(tasks, timeout=poll_seconds)
+            # Snapshot before listing: a process that exits mid-scan is picked up on the next pass.
+            finished = [task.done() for task in tasks]
+            for task, done in zip(tasks, finished):
+                if done and task.result().returncode != 0:
+                    raise VideoFrameExtractionError(task.result().stderr.strip() or "ffmpeg failed")
+
+            batch: list[tuple[int, bytes]] = []
+            for position, (segment, directory, _) in enumerate(segments):
+                frame_paths = sorted(directory.glob("frame_*"))
+                if not finished[position]:
+                    frame_paths = frame_paths[:-1]
+                frame_paths = frame_paths[: segment.frame_count]
+                for local_index in range(yielded[position], len(frame_paths)):
+                    batch.append((segment.start_frame + local_index, frame_paths[local_index].read_bytes()))
+                yielded[position] = max(yielded[position], len(frame_paths))
+            if batch:
+                yield batch
+            if all(finished):
+                return
+    finally:
+        # The processes cannot be interrupted from here; let them exit before their output
+        # directory is removed.
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _read_frame_stream(
+    segment: FrameSegment,
+    command: list[str],
+    *,
+    frame_format: str,
+    frames: asyncio.Queue[tuple[int, bytes]],
+    limit: asyncio.Semaphore,
+) -> None:
+    async with limit:
+        await _pipe_frames(segment, command, frame_format=frame_format, frames=frames)
+
+
+async def _pipe_frames(
+    segment: FrameSegment,
+    command: list[str],
+    *,
+    frame_format: str,
+    frames: asyncio.Queue[tuple[int, bytes]],
+) -> None:
+    process = await _spawn_command(command)
+    stderr_task = asyncio.create_task(process.stderr.read())
+    splitter = FrameStreamSplitter(frame_format)
+    emitted = 0
+    try:
+        while chunk := await process.stdout.read(PIPE_READ_BYTES):
+            for content in splitter.feed(chunk):
+                if emitted < segment.frame_count:
+                    await frames.put((segment.start_frame + emitted, content))
+                emitted += 1
+        returncode = await process.wait()
+        stderr = (await stderr_task).decode("utf-8", errors="replace")
+        if returncode != 0:
+            raise VideoFrameExtractionError(stderr.strip() or "ffmpeg failed")
+        splitter.finish()
+    except FrameStreamError as exc:
+        _stop_process(process, stderr_task)
+        raise VideoFrameExtractionError(str(exc)) from exc
+    except BaseException:
+        _stop_process(process, stderr_task)
+        raise
+
+
+def _stop_process(process: asyncio.subprocess.Process, stderr_task: asyncio.Task[bytes]) -> None:
+    if process.returncode is None:
+        process.kill()
+    stderr_task.cancel()
+
+
+async def _stream_frame_batches(
+    segments: list[tuple[FrameSegment, list[str]]],
+    *,
+    frame_format: str,
+    concurrency: int,
+    batch_frames: int,
+    poll_seconds: float,
+) -> AsyncIterator[list[tuple[int, bytes]]]:
+    """Run the segments' ffmpeg, ``concurrency`` at a time, with frames on stdout and yield
+    ``(frame_index, content)`` batches.
+
+    A batch closes when it is full or ``poll_seconds`` passed. The bounded queue holds back the
+    readers, and with them ffmpeg, while a batch is being stored.
+    """
+    frames: asyncio.Queue[tuple[int, bytes]] = asyncio.Queue(maxsize=2 * batch_frames)
+    limit = asyncio.Semaphore(max(1, concurrency))
+    readers = [
+        asyncio.create_task(_read_frame_stream(segment, command, frame_format=frame_format, frames=frames, limit=limit))
+        for segment, command in segments
+    ]
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            batch: list[tuple[int, bytes]] = []
+            deadline = loop.time() + poll_seconds
+            while len(batch) < batch_frames:
+                if frames.empty() and all(reader.done() for reader in readers):
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(frames.get(), timeout=max(0.0, deadline - loop.time())))
+                except asyncio.TimeoutError:
+                    break
+            for reader in readers:
+                if reader.done() and reader.exception() is not None:
+                    raise reader.exception()
+            if batch:
+                yield batch
+            elif frames.empty() and all(reader.done() for reader in readers):
+                return
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
 async def _mark_sequence_failed(
     *,
     session_factory: async_sessionmaker[AsyncSession],
@@ -203,12 +577,148 @@ async def _mark_sequence_failed(
         await db.commit()
 
 
+@asynccontextmanager
+async def _frame_batches(
+    plan: list[FrameSegment],
+    *,
+    input_path: Path,
+    sequence_id: str,
+    mode: str,
+    fps: float,
+    resize_mode: str,
+    resize_width: int | None,
+    resize_height: int | None,
+    frame_format: str,
+    jpeg_quality: int | None,
+    concurrency: int,
+    batch_frames: int,
+    poll_seconds: float,
+) -> AsyncIterator[AsyncIterator[list[tuple[int, bytes]]]]:
+    """Frame batches of every planned segment, read from ffmpeg's stdout or, in ``files`` mode, a temp directory."""
+
+    def command(segment: FrameSegment, output_pattern: str) -> list[str]:
+        return build_ffmpeg_command(
+            input_path=input_path,
+            output_pattern=output_pattern,
+            fps=fps,
+            max_frames=segment.frame_count,
+            resize_mode=resize_mode,
+            resize_width=resize_width,
+            resize_height=resize_height,
+            start_seconds=(
+                max(0.0, segment.start_seconds - _SEEK_LEAD_SECONDS)
+                if segment.start_seconds is not None
+                else segment.start_frame / fps
+            ),
+            frame_format=frame_format,
+            jpeg_quality=jpeg_quality,
+        )
+
+    if mode != "files":
+        streamed = [(segment, command(segment, "pipe:1")) for segment in plan]
+        async with aclosing(
+            _stream_frame_batches(
+                streamed,
+                frame_format=frame_format,
+                concurrency=concurrency,
+                batch_frames=batch_frames,
+                poll_seconds=poll_seconds,
+            )
+        ) as batches:
+            yield batches
+        return
+
+    extension = FRAME_FORMATS[frame_format][0]
+    with TemporaryDirectory(prefix=f"pixel_sheriff_frames_{sequence_id}_") as temp_dir:
+        segments: list[tuple[FrameSegment, Path, list[str]]] = []
+        for position, segment in enumerate(plan):
+            segment_dir = Path(temp_dir) / f"segment_{position:06d}"
+            segment_dir.mkdir()
+            segments.append((segment, segment_dir, command(segment, str(segment_dir / f"frame_%06d{extension}"))))
+        async with aclosing(_extract_frame_batches(segments, concurrency=concurrency, poll_seconds=poll_seconds)) as batches:
+            yield batches
+
+
+def _hash_frames(frames: list[tuple[int, bytes]]) -> list[str | None]:
+    return [perceptual_hash(content) for _, content in frames]
+
+
+async def _settle_frames(
+    db: AsyncSession,
+    storage: LocalStorage,
+    decisions: list[tuple[int, str | None]],
+    undecided: dict[int, tuple[Asset, str]],
+    written_storage_uris: list[tuple[str, str]],
+    *,
+    skip: bool,
+) -> tuple[list[Asset], int]:
+    """Apply dedup decisions to frames stored before they could be decided.
+
+    Returns the frames that stay, flagged or not, and the number of duplicates.
+    """
+    settled: list[Asset] = []
+    duplicates = 0
+    for frame_index, duplicate_of in decisions:
+        asset, storage_uri = undecided.pop(frame_index)
+        if duplicate_of is None:
+            settled.append(asset)
+            continue
+        duplicates += 1
+        if skip:
+            await db.delete(asset)
+            storage.delete_asset_file(storage_uri, asset.checksum)
+            written_storage_uris.remove((storage_uri, asset.checksum))
+        else:
+            asset.metadata_json = {**asset.metadata_json, NEAR_DUPLICATE_KEY: duplicate_of}
+            settled.append(asset)
+    return settled, duplicates
+
+
+def _failed_result(sequence_id: str, message: str) -> dict[str, Any]:
+    return {"status": "failed", "sequence_id": sequence_id, "error_message": message}
+
+
+async def _enqueue_prelabel_frames(
+    *,
+    session_factory: async_sessionmaker[AsyncSession],
+    session_id: str,
+    sequence: AssetSequence,
+    assets: list[Asset],
+) -> bool:
+    """Queue prelabel jobs for freshly committed frames; False once the session has failed."""
+    try:
+        async with session_factory() as db:
+            await enqueue_sequence_frames_for_session(db, session_id=session_id, sequence=sequence, assets=assets)
+            await db.commit()
+    except Exception as exc:
+        await mark_prelabel_session_failed(
+            session_id,
+            message=str(exc) or "Failed to enqueue prelabel jobs",
+            session_factory=session_factory,
+        )
+        return False
+    return True
+
+
 async def extract_video_sequence_job(
     payload: dict[str, Any],
     *,
     session_factory: async_sessionmaker[AsyncSession] | None = None,
     storage: LocalStorage | None = None,
 ) -> dict[str, Any]:
+    """Extract a video's frames into its sequence.
+
+    The timeline is split into segments decoded by concurrent ffmpeg processes, which stream
+    their frames over stdout (``VIDEO_EXTRACT_MODE=pipe``) or write them to a temp directory
+    (``files``). Frames are ingested as they land and committed in batches, so
+    ``processed_frames`` tracks progress and prelabel jobs start before the whole video is decoded.
+    Sparse ``sampling_mode`` values replace the segments with one short seek per kept frame.
+    Near-duplicate frames are flagged or skipped according to ``FRAME_DEDUP_MODE``.
+
+    The queue delivers jobs at least once, so a redelivered job keeps the frames an earlier
+    attempt committed and only ingests the missing frame indexes. Terminal failures clean up
+    and return a ``failed`` result instead of raising, since retrying them cannot succeed.
+    """
     settings = get_settings()
     effective_storage = storage or LocalStorage(settings.storage_root)
     effective_session_factory = session_factory or SessionLocal
@@ -232,6 +742,17 @@ async def extract_video_sequence_job(
         resize_height = int(resize_height) if resize_height is not None else None
     except (TypeError, ValueError):
         resize_height = None
+    frame_format = str(payload.get("frame_format") or DEFAULT_FRAME_FORMAT)
+    sampling_mode = str(payload.get("sampling_mode") or DEFAULT_SAMPLING_MODE)
+    try:
+        scene_threshold = float(payload.get("scene_threshold") or DEFAULT_SCENE_THRESHOLD)
+    except (TypeError, ValueError):
+        scene_threshold = DEFAULT_SCENE_THRESHOLD
+    jpeg_quality = payload.get("jpeg_quality")
+    try:
+        jpeg_quality = int(jpeg_quality) if jpeg_quality is not None else None
+    except (TypeError, ValueError):
+        jpeg_quality = None
 
     try:
         validate_video_import_params(
@@ -241,6 +762,10 @@ async def extract_video_sequence_job(
             resize_mode=resize_mode,
             resize_width=resize_width,
             resize_height=resize_height,
+            frame_format=frame_format,
+            jpeg_quality=jpeg_quality,
+            sampling_mode=sampling_mode,
+            scene_threshold=scene_threshold,
         )
     except VideoImportValidationError as exc:
         await _mark_sequence_failed(
@@ -248,120 +773,245 @@ async def extract_video_sequence_job(
             sequence_id=sequence_id,
             error_message=exc.message,
         )
-        raise VideoFrameExtractionError(exc.message) from exc
+        return _failed_result(sequence_id, exc.message)
+
+    async with effective_session_factory() as db:
+        sequence = await db.get(AssetSequence, sequence_id)
+        if sequence is not None and sequence.status == "ready":
+            # Redelivered after the previous attempt finished but before it was acknowledged.
+            effective_storage.delete_file(video_storage_uri)
+            return {
+                "status": "ready",
+                "sequence_id": sequence_id,
+                "frame_count": int(sequence.frame_count or 0),
+                "duration_seconds": sequence.duration_seconds,
+            }
 
     input_path = effective_storage.resolve(video_storage_uri)
     if not input_path.exists():
         message = f"Video source is missing: {video_storage_uri}"
         await _mark_sequence_failed(session_factory=effective_session_factory, sequence_id=sequence_id, error_message=message)
-        raise VideoFrameExtractionError(message)
+        return _failed_result(sequence_id, message)
 
-    written_storage_uris: list[str] = []
     metadata = probe_video_metadata(input_path)
+    commit_frames = max(1, settings.video_extract_commit_frames)
+    frame_extension, frame_mime_type, _ = FRAME_FORMATS[frame_format]
+    prelabel_session_id = str(payload.get("prelabel_session_id") or "").strip()
+    prelabel_active = bool(prelabel_session_id)
+    dedup_mode = settings.frame_dedup_mode
+    dedup_index = NearDuplicateIndex(settings.frame_dedup_max_distance) if dedup_mode in {"flag", "skip"} else None
+    written_storage_uris: list[tuple[str, str]] = []
+    frame_count = 0
+    processed_count = 0
+    near_duplicate_count = 0
+
+    async with effective_session_factory() as db:
+        sequence = await db.get(AssetSequence, sequence_id)
+        if sequence is None or sequence.project_id != project_id:
+            raise VideoFrameExtractionError("Target sequence was not found")
+        folder = await db.get(Folder, sequence.folder_id) if sequence.folder_id else None
+        # Frames committed by an earlier delivery of this job; their prelabel jobs were already queued.
+        existing_frames = {
+            int(asset.frame_index): asset
+            for asset in (await db.execute(select(Asset).where(Asset.sequence_id == sequence_id))).scalars().all()
+            if asset.frame_index is not None
+        }
+        for asset in existing_frames.values():
+            storage_uri = asset.metadata_json.get("storage_uri") if isinstance(asset.metadata_json, dict) else None
+            if isinstance(storage_uri, str) and storage_uri:
+                written_storage_uris.append((storage_uri, asset.checksum))
+            if dedup_index is not None and near_duplicate_of(asset) is None:
+                dedup_index.keep(int(asset.frame_index), asset.perceptual_hash, asset.id)
+        frame_count = len(existing_frames)
 
-    with TemporaryDirectory(prefix=f"pixel_sheriff_frames_{sequence_id}_") as temp_dir:
-        output_pattern = str(Path(temp_dir) / "frame_%06d.jpg")
-        command = build_ffmpeg_command(
-            input_path=input_path,
-            output_pattern=output_pattern,
-            fps=fps,
-            max_frames=max_frames,
-            resize_mode=resize_mode,
-            resize_width=resize_width,
-            resize_height=resize_height,
-        )
-        result = _run_command(command)
-        if result.returncode != 0:
-            message = result.stderr.strip() or "ffmpeg failed"
-            await _mark_sequence_failed(
-                session_factory=effective_session_factory,
-                sequence_id=sequence_id,
-                error_message=message,
+        try:
+            # Scene detection decodes the whole video; keep it off the event loop.
+            plan = await asyncio.to_thread(
+                plan_sampling,
+                input_path,
+                sampling_mode=sampling_mode,
+                scene_threshold=scene_threshold,
+                duration_seconds=metadata.get("duration_seconds"),
+                fps=fps,
+                max_frames=max_frames,
+                segments=settings.video_extract_segments,
+                min_segment_frames=settings.video_extract_min_segment_frames,
             )
-            effective_storage.delete_file(video_storage_uri)
-            raise VideoFrameExtractionError(message)
+            seek_times = {segment.start_frame: segment.start_seconds for segment in plan if segment.start_seconds is not None}
+            # Segments interleave; frames are stored as they land and decided in frame order.
+            dedup_queue = (
+                FrameDedupQueue(dedup_index, [(segment.start_frame, segment.frame_count) for segment in plan])
+                if dedup_index is not None
+                else None
+            )
+            undecided: dict[int, tuple[Asset, str]] = {}
+            # Expected total first so clients can show processed_frames / frame_count while frames land.
+            sequence.frame_count = sum(segment.frame_count for segment in plan)
+            sequence.processed_frames = 0
+            sequence.fps = fps
+            sequence.duration_seconds = metadata.get("duration_seconds")
+            sequence.width = metadata.get("width")
+            sequence.height = metadata.get("height")
+            await db.commit()
+
+            async with _frame_batches(
+                plan,
+                input_path=input_path,
+                sequence_id=sequence_id,
+                mode=settings.video_extract_mode,
+                fps=fps,
+                resize_mode=resize_mode,
+                resize_width=resize_width,
+                resize_height=resize_height,
+                frame_format=frame_format,
+                jpeg_quality=jpeg_quality,
+                concurrency=settings.video_extract_segments,
+                batch_frames=commit_frames,
+                poll_seconds=settings.video_extract_poll_seconds,
+            ) as batches:
+                async for batch in batches:
+                    for offset in range(0, len(batch), commit_frames):
+                        chunk = batch[offset : offset + commit_frames]
+                        processed_count += len(chunk)
+                        decisions: list[tuple[int, str | None]] = []
+                        if dedup_queue is not None:
+                            for index, _ in chunk:
+                                if index in existing_frames:
+                                    decisions.extend(dedup_queue.add(index, None, None))
+                        chunk = [(index, content) for index, content in chunk if index not in existing_frames]
+                        frame_hashes = await asyncio.to_thread(_hash_frames, chunk)
+                        records: list[tuple[Asset, str, bytes]] = []
+                        for (index, content), frame_hash in zip(chunk, frame_hashes):
+                            file_name = f"frame_{index + 1:06d}{frame_extension}"
+                            if index in seek_times:
+                                timestamp_seconds = round(seek_times[index], 6)
+                            else:
+                                timestamp_seconds = round(index / fps, 6) if fps > 0 else None
+                            # Checksum and dimensions come from the bytes in memory; they are written once, to storage.
+                            asset, storage_uri = build_asset_record(
+                                project_id=project_id,
+                                content=content,
+                                file_name=file_name,
+                                mime_type=frame_mime_type,
+                                folder=folder,
+                                original_filename=file_name,
+                                asset_type=AssetType.frame,
+                                sequence_id=sequence.id,
+                                sequence_name=sequence.name,
+                                source_kind="video_frame",
+                                frame_index=index,
+                                timestamp_seconds=timestamp_seconds,
+                                perceptual_hash=frame_hash,
+                            )
+                            records.append((asset, storage_uri, content))
+                            if dedup_queue is not None:
+                                decisions.extend(dedup_queue.add(index, frame_hash, asset.id))
+
+                        # Frames of this chunk decided already are suppressed before they are written.
+                        decided_now = {index: duplicate_of for index, duplicate_of in decisions if index not in undecided}
+                        assets: list[Asset] = []
+                        for asset, storage_uri, content in records:
+                            index = int(asset.frame_index)
+                            duplicate_of = decided_now.get(index)
+                            if duplicate_of is not None:
+                                near_duplicate_count += 1
+                                if dedup_mode == "skip":
+                                    continue
+                                asset.metadata_json[NEAR_DUPLICATE_KEY] = duplicate_of
+                            effective_storage.write_asset_bytes(storage_uri, content, asset.checksum)
+                            written_storage_uris.append((storage_uri, asset.checksum))
+                            db.add(asset)
+                            frame_count += 1
+                            if dedup_queue is None or index in decided_now:
+                                assets.append(asset)
+                            else:
+                                undecided[index] = (asset, storage_uri)
+                        settled, duplicates = await _settle_frames(
+                            db,
+                            effective_storage,
+                            [(index, duplicate_of) for index, duplicate_of in decisions if index not in decided_now],
+                            undecided,
+                            written_storage_uris,
+                            skip=dedup_mode == "skip",
+                        )
+                        assets.extend(settled)
+                        near_duplicate_count += duplicates
+                        if dedup_mode == "skip":
+                            frame_count -= duplicates
+                        # Skipped and resumed frames count as processed; frame_count settles on the kept frames at the end.
+                        sequence.processed_frames = processed_count
+                        await db.commit()
+                        if prelabel_active and assets:
+                            prelabel_active = await _enqueue_prelabel_frames(
+                                session_factory=effective_session_factory,
+                                session_id=prelabel_session_id,
+                                sequence=sequence,
+                                assets=assets,
+                            )
+
+            if dedup_queue is not None:
+                assets, duplicates = await _settle_frames(
+                    db,
+                    effective_storage,
+                    dedup_queue.finish(),
+                    undecided,
+                    written_storage_uris,
+                    skip=dedup_mode == "skip",
+                )
+                near_duplicate_count += duplicates
+                if dedup_mode == "skip":
+                    frame_count -= duplicates
+                await db.commit()
+                if prelabel_active and assets:
+                    prelabel_active = await _enqueue_prelabel_frames(
+                        session_factory=effective_session_factory,
+                        session_id=prelabel_session_id,
+                        sequence=sequence,
+                        assets=assets,
+                    )
 
-        extracted_paths = sorted(Path(temp_dir).glob("frame_*.jpg"))
-        if not extracted_paths:
-            message = "No frames were extracted from the uploaded video"
+            if frame_count == 0:
+                raise VideoFrameExtractionError("No frames were extracted from the uploaded video")
+
+            sequence.status = "ready"
+            sequence.error_message = None
+            sequence.frame_count = frame_count
+            sequence.processed_frames = frame_count
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            for storage_uri, checksum in written_storage_uris:
+                try:
+                    effective_storage.delete_asset_file(storage_uri, checksum)
+                except ValueError:
+                    pass
+            message = str(exc) or "Failed to persist extracted frames"
             await _mark_sequence_failed(
                 session_factory=effective_session_factory,
                 sequence_id=sequence_id,
                 error_message=message,
             )
             effective_storage.delete_file(video_storage_uri)
-            raise VideoFrameExtractionError(message)
-
-        async with effective_session_factory() as db:
-            sequence = await db.get(AssetSequence, sequence_id)
-            if sequence is None or sequence.project_id != project_id:
-                raise VideoFrameExtractionError("Target sequence was not found")
-            folder = await db.get(Folder, sequence.folder_id) if sequence.folder_id else None
-
-            try:
-                for index, frame_path in enumerate(extracted_paths):
-                    content = frame_path.read_bytes()
-                    timestamp_seconds = round(index / fps, 6) if fps > 0 else None
-                    asset, storage_uri = build_asset_record(
-                        project_id=project_id,
-                        content=content,
-                        file_name=frame_path.name,
-                        mime_type="image/jpeg",
-                        folder=folder,
-                        original_filename=frame_path.name,
-                        asset_type=AssetType.frame,
-                        sequence_id=sequence.id,
-                        sequence_name=sequence.name,
-                        source_kind="video_frame",
-                        frame_index=index,
-                        timestamp_seconds=timestamp_seconds,
-                    )
-                    effective_storage.write_bytes(storage_uri, content)
-                    written_storage_uris.append(storage_uri)
-                    db.add(asset)
-
-                sequence.status = "ready"
-                sequence.error_message = None
-                sequence.frame_count = len(extracted_paths)
-                sequence.processed_frames = len(extracted_paths)
-                sequence.fps = fps
-                sequence.duration_seconds = metadata.get("duration_seconds")
-                sequence.width = metadata.get("width")
-                sequence.height = metadata.get("height")
-                await db.commit()
-            except Exception as exc:
-                await db.rollback()
-                for storage_uri in written_storage_uris:
-                    try:
-                        effective_storage.delete_file(storage_uri)
-                    except ValueError:
-                        pass
-                message = str(exc) or "Failed to persist extracted frames"
-                await _mark_sequence_failed(
+            if prelabel_session_id:
+                await mark_prelabel_session_failed(
+                    prelabel_session_id,
+                    message=message,
                     session_factory=effective_session_factory,
-                    sequence_id=sequence_id,
-                    error_message=message,
                 )
-                effective_storage.delete_file(video_storage_uri)
-                raise
+            # The source video is gone, so a retry could only fail again.
+            return _failed_result(sequence_id, message)
 
     effective_storage.delete_file(video_storage_uri)
-    prelabel_session_id = str(payload.get("prelabel_session_id") or "").strip()
-    if prelabel_session_id:
-        try:
-            await enqueue_existing_sequence_assets_for_session(
-                prelabel_session_id,
-                session_factory=effective_session_factory,
-            )
-        except Exception as exc:
-            await mark_prelabel_session_failed(
-                prelabel_session_id,
-                message=str(exc) or "Failed to enqueue prelabel jobs",
-                session_factory=effective_session_factory,
-            )
+    if prelabel_active:
+        async with effective_session_factory() as db:
+            prelabel_session = await db.get(PrelabelSession, prelabel_session_id)
+            if prelabel_session is not None:
+                await close_prelabel_session_input(db, prelabel_session)
+                await db.commit()
     return {
         "status": "ready",
         "sequence_id": sequence_id,
-        "frame_count": len(extracted_paths),
+        "frame_count": frame_count,
+        "near_duplicate_frames": near_duplicate_count,
         "duration_seconds": metadata.get("duration_seconds"),
     }
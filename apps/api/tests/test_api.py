@@ -6,6 +6,7 @@ import uuid
 import zipfile
 
 from httpx import AsyncClient
+from PIL import Image
 import pytest
 import sheriff_api.routers.assets as assets_router
 import sheriff_api.routers.datasets as datasets_router
@@ -13,6 +14,7 @@ import sheriff_api.routers.deployments as deployments_router
 import sheriff_api.routers.exports as exports_router
 import sheriff_api.routers.models as models_router
 from sheriff_api.config import get_settings
+from sheriff_api.services.dataset_export_builder import run_dataset_export_job
 
 
 def assert_api_error(response, *, status_code: int, code: str, message: str | None = None) -> dict:
@@ -152,6 +154,110 @@ async def test_crud_and_export_flow(client: AsyncClient) -> None:
         assert coco["annotations"] == []
 
 
+@pytest.mark.asyncio
+async def test_dataset_version_export_job_streams_store_only_archive(client: AsyncClient, monkeypatch) -> None:
+    project = await _create_default_task_project(client, name="export-job-demo")
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    await _create_task_scoped_category(client, project_id=project_id, task_id=task_id, name="cat")
+    upload = await client.post(
+        f"/api/v1/projects/{project_id}/assets/upload",
+        files={"file": ("sample.jpg", b"fake-image-bytes", "image/jpeg")},
+    )
+    assert upload.status_code == 200
+    dataset_version_id = await _create_dataset_version_for_task(
+        client,
+        project_id=project_id,
+        task_id=task_id,
+        name="export-job",
+    )
+
+    enqueued: list[dict] = []
+
+    async def fake_enqueue(payload: dict) -> None:
+        enqueued.append(payload)
+
+    monkeypatch.setattr(datasets_router.media_queue, "enqueue_dataset_export_job", fake_enqueue)
+    jobs_path = f"/api/v1/projects/{project_id}/datasets/versions/{dataset_version_id}/export/jobs"
+
+    queued = await client.post(jobs_path)
+    assert queued.status_code == 200
+    assert queued.json()["status"] == "queued"
+    assert enqueued == [
+        {
+            "job_version": "1",
+            "job_type": "build_dataset_export",
+            "project_id": project_id,
+            "dataset_version_id": dataset_version_id,
+        }
+    ]
+    assert (await client.post(jobs_path)).json()["status"] == "queued"
+    assert len(enqueued) == 1
+
+    result = await run_dataset_export_job(enqueued[0])
+    assert result["status"] == "completed"
+
+    status_response = await client.get(jobs_path)
+    assert status_response.status_code == 200
+    job = status_response.json()
+    assert job["status"] == "completed"
+    assert job["hash"] == result["hash"]
+    assert job["progress"]["done"] == job["progress"]["total"] == 1
+
+    archive = await client.get(job["export_uri"])
+    assert archive.status_code == 200
+    assert archive.headers["etag"] == f'"{job["hash"]}"'
+    assert archive.headers["accept-ranges"] == "bytes"
+    with zipfile.ZipFile(BytesIO(archive.content), "r") as bundle:
+        infos = {info.filename: info for info in bundle.infolist()}
+        assert infos["manifest.json"].compress_type == zipfile.ZIP_DEFLATED
+        asset_infos = [info for name, info in infos.items() if name.startswith("assets/")]
+        assert len(asset_infos) == 1
+        assert asset_infos[0].compress_type == zipfile.ZIP_STORED
+        assert bundle.read(asset_infos[0].filename) == b"fake-image-bytes"
+
+    partial = await client.get(job["export_uri"], headers={"Range": "bytes=0-3"})
+    assert partial.status_code == 206
+    assert partial.content == b"PK\x03\x04"
+
+    artifact = datasets_router.dataset_store.get_export_artifact(project_id, dataset_version_id)
+    assert artifact["hash"] == job["hash"]
+    assert isinstance(artifact["zip_sha256"], str)
+    assert artifact["size_bytes"] == len(archive.content)
+
+    again = await client.post(jobs_path)
+    assert again.json()["status"] == "completed"
+    assert len(enqueued) == 1
+
+    sync_export = await client.post(f"/api/v1/projects/{project_id}/datasets/versions/{dataset_version_id}/export")
+    assert sync_export.json()["hash"] == job["hash"]
+
+
+@pytest.mark.asyncio
+async def test_dataset_version_export_job_reports_unavailable_queue(client: AsyncClient, monkeypatch) -> None:
+    project = await _create_default_task_project(client, name="export-job-queue-down")
+    dataset_version_id = await _create_dataset_version_for_task(
+        client,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name="export-job-queue-down",
+    )
+
+    async def failing_enqueue(payload: dict) -> None:
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(datasets_router.media_queue, "enqueue_dataset_export_job", failing_enqueue)
+    jobs_path = f"/api/v1/projects/{project['id']}/datasets/versions/{dataset_version_id}/export/jobs"
+    response = await client.post(jobs_path)
+    assert_api_error(response, status_code=503, code="media_queue_unavailable")
+    status_response = await client.get(jobs_path)
+    assert status_response.json()["status"] == "failed"
+    assert status_response.json()["error"]["code"] == "media_queue_unavailable"
+
+    missing = await client.get(f"/api/v1/projects/{project['id']}/datasets/versions/{uuid.uuid4()}/export/jobs")
+    assert_api_error(missing, status_code=404, code="export_job_not_found")
+
+
 @pytest.mark.asyncio
 async def test_asset_upload_and_content(client: AsyncClient) -> None:
     project = (await client.post("/api/v1/projects", json={"name": "upload-demo"})).json()
@@ -170,6 +276,93 @@ async def test_asset_upload_and_content(client: AsyncClient) -> None:
     assert content.content == b"fake-image-bytes"
 
 
+def _sample_jpeg(width: int, height: int) -> bytes:
+    image = Image.radial_gradient("L").resize((width, height)).convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_asset_thumbnail_is_cached_and_revalidated(client: AsyncClient) -> None:
+    project = (await client.post("/api/v1/projects", json={"name": "thumbnail-demo"})).json()
+    original = _sample_jpeg(1920, 1080)
+    upload = await client.post(
+        f"/api/v1/projects/{project['id']}/assets/upload",
+        files={"file": ("frame.jpg", original, "image/jpeg")},
+    )
+    assert upload.status_code == 200
+    asset = upload.json()
+    thumbnail_path = f"/api/v1/assets/{asset['id']}/thumbnail"
+
+    response = await client.get(thumbnail_path, params={"size": 200})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert "immutable" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+    cache_key = etag.strip('"').split("-")[0]
+    assert cache_key != asset["checksum"]
+    with Image.open(BytesIO(response.content)) as thumbnail:
+        assert max(thumbnail.size) == 256
+    assert len(original) > 10 * len(response.content)
+    cached = get_settings().storage_root + f"/derived/thumbnails/{cache_key[:2]}/{cache_key}-256.webp"
+    assert Path(cached).is_file()
+
+    revalidated = await client.get(thumbnail_path, params={"size": 256}, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+    jpeg = await client.get(thumbnail_path, params={"size": 128, "format": "jpeg"})
+    assert jpeg.status_code == 200
+    assert jpeg.headers["content-type"] == "image/jpeg"
+    assert jpeg.content[:2] == b"\xff\xd8"
+
+
+@pytest.mark.asyncio
+async def test_asset_thumbnail_ignores_client_supplied_checksum(client: AsyncClient) -> None:
+    project = (await client.post("/api/v1/projects", json={"name": "thumbnail-poison"})).json()
+    victim = (
+        await client.post(
+            f"/api/v1/projects/{project['id']}/assets/upload",
+            files={"file": ("victim.jpg", _sample_jpeg(640, 480), "image/jpeg")},
+        )
+    ).json()
+    decoy = (
+        await client.post(
+            f"/api/v1/projects/{project['id']}/assets/upload",
+            files={"file": ("decoy.jpg", _sample_jpeg(200, 800), "image/jpeg")},
+        )
+    ).json()
+    forged = await client.post(
+        f"/api/v1/projects/{project['id']}/assets",
+        json={
+            "uri": "forged.jpg",
+            "checksum": victim["checksum"],
+            "metadata_json": {"storage_uri": decoy["metadata_json"]["storage_uri"]},
+        },
+    )
+    assert forged.status_code == 200
+
+    forged_thumbnail = await client.get(f"/api/v1/assets/{forged.json()['id']}/thumbnail")
+    assert forged_thumbnail.status_code == 200
+    victim_thumbnail = await client.get(f"/api/v1/assets/{victim['id']}/thumbnail")
+    assert victim_thumbnail.status_code == 200
+    assert victim_thumbnail.headers["etag"] != forged_thumbnail.headers["etag"]
+    with Image.open(BytesIO(victim_thumbnail.content)) as thumbnail:
+        assert thumbnail.size == (256, 192)
+
+
+@pytest.mark.asyncio
+async def test_asset_thumbnail_rejects_undecodable_asset(client: AsyncClient) -> None:
+    project = (await client.post("/api/v1/projects", json={"name": "thumbnail-undecodable"})).json()
+    upload = await client.post(
+        f"/api/v1/projects/{project['id']}/assets/upload",
+        files={"file": ("sample.jpg", b"fake-image-bytes", "image/jpeg")},
+    )
+    response = await client.get(f"/api/v1/assets/{upload.json()['id']}/thumbnail")
+    assert_api_error(response, status_code=415, code="asset_thumbnail_unsupported")
+
+
 @pytest.mark.asyncio
 async def test_upload_rejects_unknown_project(client: AsyncClient) -> None:
     missing_project_id = str(uuid.uuid4())
@@ -2872,24 +3065,20 @@ async def test_predict_batch_returns_folder_review_summary(client: AsyncClient)
     )
     assert deployed.status_code == 200
 
-    infer_calls = {"count": 0}
+    batch_calls: list[tuple[str, dict]] = []
 
-    async def _infer(_payload: dict) -> dict:
-        infer_calls["count"] += 1
-        if infer_calls["count"] == 1:
-            return {
-                "device_selected": "cpu",
-                "predictions": [{"class_index": 0, "score": 0.9}],
-                "output_dim": 2,
-            }
+    async def _predict_many(task_kind: str, payload: dict) -> dict:
+        batch_calls.append((task_kind, payload))
         return {
             "device_selected": "cpu",
-            "predictions": [],
-            "output_dim": 2,
+            "items": [
+                {"asset_relpath": payload["asset_relpaths"][0], "predictions": [{"class_index": 0, "score": 0.9}], "output_dim": 2},
+                {"asset_relpath": payload["asset_relpaths"][1], "predictions": [], "output_dim": 2},
+            ],
         }
 
     monkeypatch = pytest.MonkeyPatch()
-    monkeypatch.setattr(deployments_router.inference_client, "infer_classification", _infer)
+    monkeypatch.setattr(deployments_router.inference_client, "predict_many", _predict_many)
     response = await client.post(
         f"/api/v1/projects/{project_id}/predict/batch",
         json={"asset_ids": [first_asset_id, second_asset_id, "missing-asset-id"], "top_k": 5},
@@ -2906,6 +3095,10 @@ async def test_predict_batch_returns_folder_review_summary(client: AsyncClient)
     assert payload["predictions"][0]["predictions"][0]["class_id"] == class_ids[0]
     assert payload["errors"][0]["asset_id"] == "missing-asset-id"
     assert payload["errors"][0]["code"] == "asset_not_found"
+    assert len(batch_calls) == 1
+    assert batch_calls[0][0] == "classification"
+    assert len(batch_calls[0][1]["asset_relpaths"]) == 2
+    assert batch_calls[0][1]["top_k"] == 5
 
 
 @pytest.mark.asyncio
@@ -2957,23 +3150,35 @@ async def test_predict_batch_detection_captures_per_asset_inference_errors(clien
     )
     assert deployed.status_code == 200
 
-    infer_calls = {"count": 0}
+    async def _predict_many(task_kind: str, payload: dict) -> dict:
+        assert task_kind == "bbox"
+        assert payload["score_threshold"] == 0.3
+        return {
+            "device_selected": "cpu",
+            "items": [
+                {"asset_relpath": payload["asset_relpaths"][0], "boxes": [{"class_index": 0, "score": 0.8, "bbox": [10, 20, 30, 40]}]},
+                {
+                    "asset_relpath": payload["asset_relpaths"][1],
+                    "boxes": [],
+                    "error": {"code": "preprocess_failed", "message": "cannot identify image file"},
+                },
+            ],
+        }
 
-    async def _infer(_payload: dict) -> dict:
-        infer_calls["count"] += 1
-        if infer_calls["count"] == 1:
-            return {
-                "device_selected": "cpu",
-                "boxes": [{"class_index": 0, "score": 0.8, "bbox": [10, 20, 30, 40]}],
-            }
+    async def _predict_many_unavailable(_task_kind: str, _payload: dict) -> dict:
         raise api_error(status_code=503, code="inference_unavailable", message="Inference service unavailable")
 
     monkeypatch = pytest.MonkeyPatch()
-    monkeypatch.setattr(deployments_router.inference_client, "infer_detection", _infer)
+    monkeypatch.setattr(deployments_router.inference_client, "predict_many", _predict_many)
     response = await client.post(
         f"/api/v1/projects/{project_id}/predict/batch",
         json={"asset_ids": [first_asset_id, second_asset_id], "score_threshold": 0.3},
     )
+    monkeypatch.setattr(deployments_router.inference_client, "predict_many", _predict_many_unavailable)
+    unavailable = await client.post(
+        f"/api/v1/projects/{project_id}/predict/batch",
+        json={"asset_ids": [first_asset_id, second_asset_id], "score_threshold": 0.3},
+    )
     monkeypatch.undo()
     assert response.status_code == 200
     payload = response.json()
@@ -2983,7 +3188,10 @@ async def test_predict_batch_detection_captures_per_asset_inference_errors(clien
     assert payload["error_count"] == 1
     assert payload["predictions"][0]["boxes"][0]["class_id"] == category_ids[0]
     assert payload["errors"][0]["asset_id"] == second_asset_id
-    assert payload["errors"][0]["code"] == "inference_unavailable"
+    assert payload["errors"][0]["code"] == "preprocess_failed"
+    assert unavailable.status_code == 200
+    assert unavailable.json()["error_count"] == 2
+    assert {row["code"] for row in unavailable.json()["errors"]} == {"inference_unavailable"}
 
 
 @pytest.mark.asyncio
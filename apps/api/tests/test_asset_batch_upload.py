@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from io import BytesIO
+import hashlib
+
+from httpx import AsyncClient
+from PIL import Image
+import pytest
+
+from sheriff_api.services import asset_ingest
+from sheriff_api.services.asset_ingest import stage_stream
+from sheriff_api.services.image_metadata import extract_image_dimensions
+
+
+def _sample_png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(10, 20, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_stage_stream_hashes_and_probes_across_chunks(tmp_path, monkeypatch) -> None:
+    content = _sample_png(37, 21)
+    monkeypatch.setattr(asset_ingest, "UPLOAD_CHUNK_BYTES", 7)
+
+    staged = stage_stream(BytesIO(content), tmp_path / "staging")
+
+    assert staged.path.read_bytes() == content
+    assert staged.size_bytes == len(content)
+    assert staged.checksum == hashlib.sha256(content).hexdigest()
+    assert (staged.width, staged.height) == extract_image_dimensions(content) == (37, 21)
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_commits_files_together_and_reports_rejects(client: AsyncClient) -> None:
+    project_id = (await client.post("/api/v1/projects", json={"name": "batch-upload"})).json()["id"]
+    image = _sample_png(64, 48)
+
+    response = await client.post(
+        f"/api/v1/projects/{project_id}/assets/upload-batch",
+        data={"relative_paths": ["train/a.png", "train/b.png", "empty.png", "../escape.png"]},
+        files=[
+            ("files", ("a.png", image, "image/png")),
+            ("files", ("b.png", b"not-an-image", "image/png")),
+            ("files", ("empty.png", b"", "image/png")),
+            ("files", ("escape.png", image, "image/png")),
+        ],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["relative_path"] for item in body["items"]] == ["train/a.png", "train/b.png"]
+    assert body["items"][0]["folder_path"] == "train"
+    assert (body["items"][0]["width"], body["items"][0]["height"]) == (64, 48)
+    assert body["items"][0]["checksum"] == hashlib.sha256(image).hexdigest()
+    assert body["items"][1]["width"] is None
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [
+        (2, "uploaded_file_empty"),
+        (3, "asset_relative_path_invalid"),
+    ]
+
+    content = await client.get(body["items"][0]["uri"])
+    assert content.content == image
+    count = await client.get(f"/api/v1/projects/{project_id}/assets/count")
+    assert count.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_rejects_mismatched_relative_paths(client: AsyncClient) -> None:
+    project_id = (await client.post("/api/v1/projects", json={"name": "batch-mismatch"})).json()["id"]
+
+    response = await client.post(
+        f"/api/v1/projects/{project_id}/assets/upload-batch",
+        data={"relative_paths": ["a.png"]},
+        files=[("files", ("a.png", b"x", "image/png")), ("files", ("b.png", b"y", "image/png"))],
+    )
+
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "asset_relative_paths_mismatch"
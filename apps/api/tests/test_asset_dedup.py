@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from io import BytesIO
+import hashlib
+
+from httpx import AsyncClient
+from PIL import Image
+import pytest
+
+from sheriff_api.routers.assets import storage
+from sheriff_api.services.storage import LocalStorage
+
+
+def _sample_png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(40, 50, 60)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_blob_store_shares_identical_bytes_and_collects_garbage(tmp_path) -> None:
+    storage = LocalStorage(str(tmp_path))
+    content = b"same-bytes"
+    checksum = hashlib.sha256(content).hexdigest()
+
+    assert storage.write_asset_bytes("assets/p/a.jpg", content, checksum) is False
+    assert storage.write_asset_bytes("assets/p/b.jpg", content, checksum) is True
+    staged = tmp_path / "staged.partial"
+    staged.write_bytes(content)
+    assert storage.move_asset_into("assets/q/c.jpg", staged, checksum) is True
+    assert not staged.exists()
+    assert storage.blobs.refcount(checksum) == 3
+    assert storage.resolve("assets/p/a.jpg").stat().st_ino == storage.blobs.path(checksum).stat().st_ino
+
+    storage.delete_asset_file("assets/p/a.jpg", checksum)
+    storage.delete_asset_file("assets/p/b.jpg", checksum)
+    assert storage.blobs.refcount(checksum) == 1
+    storage.delete_tree("assets/q")
+    report = storage.blobs.collect_garbage()
+    assert (report.scanned, report.removed, report.bytes_freed) == (1, 1, len(content))
+    assert not storage.blobs.exists(checksum)
+
+
+@pytest.mark.asyncio
+async def test_reimported_images_reuse_assets_and_blobs(client: AsyncClient) -> None:
+    project_id = (await client.post("/api/v1/projects", json={"name": "dedup"})).json()["id"]
+    image = _sample_png(16, 16)
+    checksum = hashlib.sha256(image).hexdigest()
+    upload_url = f"/api/v1/projects/{project_id}/assets/upload"
+
+    first = (await client.post(upload_url, data={"relative_path": "a/x.png"}, files={"file": ("x.png", image, "image/png")})).json()
+    again = (await client.post(upload_url, data={"relative_path": "a/x.png"}, files={"file": ("x.png", image, "image/png")})).json()
+    assert again["id"] == first["id"]
+
+    batch = await client.post(
+        f"/api/v1/projects/{project_id}/assets/upload-batch",
+        data={"relative_paths": ["a/x.png", "b/x.png"]},
+        files=[("files", ("x.png", image, "image/png")), ("files", ("x.png", image, "image/png"))],
+    )
+    body = batch.json()
+    assert body["reused"] == 1
+    assert body["items"][0]["id"] == first["id"]
+    copy_id = body["items"][1]["id"]
+    assert copy_id != first["id"]
+    assert storage.blobs.refcount(checksum) == 2
+    assert (await client.get(f"/api/v1/projects/{project_id}/assets/count")).json()["total"] == 2
+
+    assert (await client.delete(f"/api/v1/projects/{project_id}/assets/{first['id']}")).status_code == 204
+    assert (await client.get(body["items"][1]["uri"])).content == image
+    assert storage.blobs.refcount(checksum) == 1
+    assert (await client.delete(f"/api/v1/projects/{project_id}/assets/{copy_id}")).status_code == 204
+    assert not storage.blobs.exists(checksum)
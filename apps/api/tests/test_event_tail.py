@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from sheriff_api.services.event_tail import EventLogTail, EventTailRegistry, InotifyWatcher, PollingWatcher, create_watcher
+
+
+def _append(path: Path, *events: dict) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        for event in events:
+            handle.write(json.dumps(event) + "\n")
+
+
+def _status() -> dict:
+    return {"status": "running"}
+
+
+@pytest.mark.asyncio
+async def test_event_tail_fans_out_one_read_to_all_subscribers(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, {"type": "status", "status": "running"}, {"type": "epoch", "epoch": 1})
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("not-json\n")
+    registry = EventTailRegistry(watch_mode="poll", poll_seconds=0.05)
+    kwargs = {"path": path, "attempt": 1, "status_reader": _status, "watch_dirs": [tmp_path]}
+
+    async with registry.subscribe("run", **kwargs) as first, registry.subscribe("run", **kwargs) as second:
+        assert first is second
+        assert registry.subscriber_count("run") == 2
+        rows, covered = await first.rows_after(0)
+        assert covered == 3
+        assert [row.line for row in rows] == [1, 2]
+        assert rows[1].event == {"type": "epoch", "epoch": 1}
+        assert json.loads(rows[1].encoded()) == {"line": 2, "attempt": 1, "event": {"type": "epoch", "epoch": 1}}
+        assert (await second.rows_after(0))[0][1] is rows[1]
+
+        # A partial line is not consumed until its newline arrives.
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write('{"type": "epoch", "epoch": 2}')
+        await first.refresh()
+        assert first.line_count == 3
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write("\n")
+        assert await second.wait(3, timeout=2.0)
+        rows, covered = await second.rows_after(3)
+        assert [row.line for row in rows] == [4]
+        assert covered == 4
+        assert first.status_row == {"status": "running"}
+
+    assert registry.subscriber_count("run") == 0
+
+
+@pytest.mark.asyncio
+async def test_event_tail_serves_late_subscribers_from_the_line_index(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, *({"type": "epoch", "epoch": index} for index in range(1, 51)))
+    tail = EventLogTail(
+        path=path,
+        attempt=2,
+        status_reader=_status,
+        watcher=PollingWatcher(1.0),
+        history_limit=5,
+        catch_up_lines=8,
+    )
+    await tail.refresh()
+    assert tail.line_count == 50
+
+    cursor = 0
+    seen: list[int] = []
+    while cursor < tail.line_count:
+        rows, cursor = await tail.rows_after(cursor)
+        seen.extend(row.event["epoch"] for row in rows)
+        assert all(row.attempt == 2 for row in rows)
+    assert seen == list(range(1, 51))
+    assert await tail.wait(50, timeout=0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_inotify_watcher_wakes_on_append(tmp_path: Path) -> None:
+    watcher = create_watcher([tmp_path], mode="auto", poll_seconds=30.0)
+    if not isinstance(watcher, InotifyWatcher):
+        watcher.close()
+        pytest.skip("inotify is not available on this platform")
+    try:
+        assert await watcher.wait(0.01) is False
+        asyncio.get_running_loop().call_later(0.05, _append, tmp_path / "events.jsonl", {"type": "epoch"})
+        assert await watcher.wait(5.0) is True
+    finally:
+        watcher.close()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from io import BytesIO
 from pathlib import Path
@@ -111,6 +112,57 @@ async def test_experiment_events_snapshot_for_no_attempt_and_terminal_state(clie
     assert completed_events[1]["event"]["status"] == "completed"
 
 
+@pytest.mark.asyncio
+async def test_experiment_events_follow_streams_appends_until_done(client: AsyncClient, monkeypatch) -> None:
+    project_id, model_id = await _create_project_model(client, project_name="exp-events-follow")
+    created = await client.post(f"/api/v1/projects/{project_id}/experiments", json={"model_id": model_id})
+    assert created.status_code == 200
+    experiment_id = created.json()["id"]
+
+    import sheriff_api.routers.experiments as experiments_router
+
+    async def _enqueue(_job_payload: dict) -> None:
+        return None
+
+    monkeypatch.setattr(experiments_router.train_queue, "enqueue_train_job", _enqueue)
+    start = await client.post(f"/api/v1/projects/{project_id}/experiments/{experiment_id}/start")
+    assert start.status_code == 200
+    attempt = start.json()["attempt"]
+    store = experiments_router.experiment_store
+    baseline_lines = store.get_event_line_count(project_id=project_id, experiment_id=experiment_id, attempt=attempt)
+
+    async def _train() -> None:
+        await asyncio.sleep(0.05)
+        for epoch in (1, 2):
+            store.append_event(
+                project_id=project_id,
+                experiment_id=experiment_id,
+                attempt=attempt,
+                event={"type": "metric", "epoch": epoch},
+            )
+            await asyncio.sleep(0.05)
+        store.append_event(
+            project_id=project_id,
+            experiment_id=experiment_id,
+            attempt=attempt,
+            event={"type": "done", "status": "completed"},
+        )
+
+    trainer = asyncio.create_task(_train())
+    response = await asyncio.wait_for(
+        client.get(f"/api/v1/projects/{project_id}/experiments/{experiment_id}/events?attempt={attempt}&from_line=0&follow=true"),
+        timeout=10,
+    )
+    await trainer
+    assert response.status_code == 200
+    events = _parse_sse_events(response.text)
+    metric_epochs = [event["event"]["epoch"] for event in events if event["event"].get("type") == "metric"]
+    assert metric_epochs == [1, 2]
+    assert events[-1]["event"] == {"type": "done", "status": "completed"}
+    assert events[-1]["line"] == baseline_lines + 3
+    assert experiments_router.event_tails.subscriber_count((project_id, experiment_id, attempt)) == 0
+
+
 @pytest.mark.asyncio
 async def test_experiment_samples_falls_back_to_evaluation_when_predictions_missing(client: AsyncClient) -> None:
     project_id, model_id = await _create_project_model(client, project_name="exp-samples-eval-fallback")
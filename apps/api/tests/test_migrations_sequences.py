@@ -7,11 +7,10 @@ from sqlalchemy import text
 
 from sheriff_api.db.models import Base
 from sheriff_api.db.session import engine
-from sheriff_api.services.migrations import _apply_folders_sequences_migration
+from sheriff_api.services.migrations import _apply_asset_sort_path_migration, _apply_folders_sequences_migration
 
 
-@pytest.mark.asyncio
-async def test_folders_sequences_migration_backfills_folder_and_file_fields() -> None:
+async def _create_legacy_assets(rows: list[dict[str, str]]) -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.execute(
@@ -38,19 +37,29 @@ async def test_folders_sequences_migration_backfills_folder_and_file_fields() ->
                 VALUES (:id, :project_id, :type, :uri, :mime_type, :width, :height, :checksum, :metadata_json)
                 """
             ),
-            {
-                "id": "asset-1",
-                "project_id": "project-1",
-                "type": "image",
-                "uri": "/api/v1/assets/asset-1/content",
-                "mime_type": "image/jpeg",
-                "width": 640,
-                "height": 480,
-                "checksum": "a" * 64,
-                "metadata_json": json.dumps({"relative_path": "legacy/train/cat.jpg", "original_filename": "cat.jpg"}),
-            },
+            [
+                {
+                    "id": row["id"],
+                    "project_id": "project-1",
+                    "type": "image",
+                    "uri": f"/api/v1/assets/{row['id']}/content",
+                    "mime_type": "image/jpeg",
+                    "width": 640,
+                    "height": 480,
+                    "checksum": "a" * 64,
+                    "metadata_json": json.dumps(
+                        {"relative_path": row["relative_path"], "original_filename": row["relative_path"].rsplit("/", 1)[-1]}
+                    ),
+                }
+                for row in rows
+            ],
         )
 
+
+@pytest.mark.asyncio
+async def test_folders_sequences_migration_backfills_folder_and_file_fields() -> None:
+    await _create_legacy_assets([{"id": "asset-1", "relative_path": "legacy/train/cat.jpg"}])
+
     await _apply_folders_sequences_migration(engine)
 
     async with engine.begin() as conn:
@@ -77,3 +86,22 @@ async def test_folders_sequences_migration_backfills_folder_and_file_fields() ->
     metadata = json.loads(asset_row["metadata_json"])
     assert metadata["relative_path"] == "legacy/train/cat.jpg"
     assert metadata["original_filename"] == "cat.jpg"
+
+
+@pytest.mark.asyncio
+async def test_asset_sort_path_migration_backfills_relative_paths() -> None:
+    await _create_legacy_assets(
+        [
+            {"id": "asset-1", "relative_path": "train/cats/c1.jpg"},
+            {"id": "asset-2", "relative_path": "root.jpg"},
+        ]
+    )
+    await _apply_folders_sequences_migration(engine)
+
+    await _apply_asset_sort_path_migration(engine)
+
+    async with engine.begin() as conn:
+        sort_paths = dict((await conn.execute(text("SELECT id, sort_path FROM assets"))).tuples().all())
+        indexes = (await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'assets'"))).scalars().all()
+    assert sort_paths == {"asset-1": "train/cats/c1.jpg", "asset-2": "root.jpg"}
+    assert {"ix_assets_project_sort_path_id", "ix_assets_project_folder_sort_path_id"} <= set(indexes)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from httpx import AsyncClient
+import pytest
+
+
+async def _create_project(client: AsyncClient, *, name: str) -> dict:
+    response = await client.post("/api/v1/projects", json={"name": name})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _upload(client: AsyncClient, project_id: str, relative_path: str) -> dict:
+    response = await client.post(
+        f"/api/v1/projects/{project_id}/assets/upload",
+        data={"relative_path": relative_path},
+        files={"file": (relative_path.rsplit("/", 1)[-1], relative_path.encode("utf-8"), "image/jpeg")},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _walk(client: AsyncClient, url: str, **params: object) -> tuple[list[dict], int]:
+    items: list[dict] = []
+    pages = 0
+    cursor: str | None = None
+    while True:
+        response = await client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        items.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.asyncio
+async def test_asset_listing_pages_by_path_and_created_with_projection_and_counts(client: AsyncClient) -> None:
+    project_id = (await _create_project(client, name="paging"))["id"]
+    paths = ["b.jpg", "a.jpg", "train/cats/c2.jpg", "train/cats/c1.jpg", "train/dog.jpg", "val/v1.jpg", "val/v0.jpg"]
+    uploaded = [await _upload(client, project_id, path) for path in paths]
+    url = f"/api/v1/projects/{project_id}/assets"
+
+    by_path, pages = await _walk(client, url, limit=2)
+    assert pages == 4
+    assert [item["relative_path"] for item in by_path] == [
+        "a.jpg",
+        "b.jpg",
+        "train/cats/c1.jpg",
+        "train/cats/c2.jpg",
+        "train/dog.jpg",
+        "val/v0.jpg",
+        "val/v1.jpg",
+    ]
+    by_created, _ = await _walk(client, url, limit=3, order="created")
+    unpaged_created = (await client.get(url, params={"order": "created"})).json()
+    assert [item["id"] for item in by_created] == [item["id"] for item in unpaged_created]
+    assert {item["id"] for item in by_created} == {item["id"] for item in uploaded}
+    assert len((await client.get(url)).json()) == len(paths)
+
+    cats_folder_id = uploaded[2]["folder_id"]
+    in_folder, _ = await _walk(client, url, limit=1, folder_id=cats_folder_id)
+    assert [item["file_name"] for item in in_folder] == ["c1.jpg", "c2.jpg"]
+
+    projected = await client.get(url, params={"limit": 2, "fields": "file_name,folder_path"})
+    assert projected.json() == [
+        {"id": by_path[0]["id"], "file_name": "a.jpg", "folder_path": None},
+        {"id": by_path[1]["id"], "file_name": "b.jpg", "folder_path": None},
+    ]
+    assert projected.headers["x-next-cursor"]
+
+    bad_fields = await client.get(url, params={"fields": "file_name,secret"})
+    assert bad_fields.status_code == 422
+    assert bad_fields.json()["error"]["code"] == "invalid_fields"
+    wrong_order = await client.get(url, params={"order": "created", "cursor": projected.headers["x-next-cursor"]})
+    assert wrong_order.status_code == 400
+    assert wrong_order.json()["error"]["code"] == "invalid_cursor"
+    assert (await client.get(url, params={"cursor": "not-a-cursor"})).status_code == 400
+
+    count_url = f"{url}/count"
+    assert (await client.get(count_url)).json() == {"total": 7}
+    assert (await client.get(count_url, params={"folder_id": cats_folder_id})).json() == {"total": 2}
+    deleted = await client.delete(f"{url}/{uploaded[0]['id']}")
+    assert deleted.status_code == 204
+    assert (await client.get(count_url)).json() == {"total": 6}
+
+
+@pytest.mark.asyncio
+async def test_asset_path_pages_follow_the_unpaged_order(client: AsyncClient) -> None:
+    project_id = (await _create_project(client, name="paging-order"))["id"]
+    paths = ["c.jpg", "b/x.jpg", "b-2/x.jpg", "b/a/y.jpg", "a.jpg", "b.jpg", "b/z.jpg", "bb.jpg", "b/a.jpg"]
+    for path in paths:
+        await _upload(client, project_id, path)
+    url = f"/api/v1/projects/{project_id}/assets"
+
+    unpaged = (await client.get(url)).json()
+    for limit in (1, 2, 4):
+        paged, _ = await _walk(client, url, limit=limit)
+        assert [item["id"] for item in paged] == [item["id"] for item in unpaged]
+    assert [item["relative_path"] for item in unpaged] == sorted(paths)
+
+
+@pytest.mark.asyncio
+async def test_annotation_listing_pages_by_created_and_status_filter_counts_assets_once(client: AsyncClient) -> None:
+    project = await _create_project(client, name="annotation-paging")
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    second_task = await client.post(f"/api/v1/projects/{project_id}/tasks", json={"name": "second", "kind": "classification"})
+    assert second_task.status_code == 200
+    category = await client.post(f"/api/v1/projects/{project_id}/categories", json={"task_id": task_id, "name": "cat"})
+    second_category = await client.post(
+        f"/api/v1/projects/{project_id}/categories", json={"task_id": second_task.json()["id"], "name": "dog"}
+    )
+    assets = [await _upload(client, project_id, f"img-{index}.jpg") for index in range(5)]
+    count_url = f"/api/v1/projects/{project_id}/assets/count"
+    assert (await client.get(count_url, params={"status": "labeled"})).json() == {"total": 0}
+
+    for asset in assets:
+        response = await client.post(
+            f"/api/v1/projects/{project_id}/annotations",
+            json={"task_id": task_id, "asset_id": asset["id"], "payload_json": {"category_ids": [category.json()["id"]]}},
+        )
+        assert response.status_code == 200
+    response = await client.post(
+        f"/api/v1/projects/{project_id}/annotations",
+        json={
+            "task_id": second_task.json()["id"],
+            "asset_id": assets[0]["id"],
+            "payload_json": {"category_ids": [second_category.json()["id"]]},
+        },
+    )
+    assert response.status_code == 200
+
+    assert (await client.get(count_url, params={"status": "labeled"})).json() == {"total": 5}
+    labeled = await client.get(f"/api/v1/projects/{project_id}/assets", params={"status": "labeled"})
+    assert len(labeled.json()) == 5
+
+    url = f"/api/v1/projects/{project_id}/annotations"
+    paged, pages = await _walk(client, url, task_id=task_id, limit=2, fields="asset_id")
+    assert pages == 3
+    assert sorted(item["asset_id"] for item in paged) == sorted(asset["id"] for asset in assets)
+    assert set(paged[0]) == {"id", "asset_id"}
+    assert len((await client.get(url, params={"task_id": task_id})).json()) == 5
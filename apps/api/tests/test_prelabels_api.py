@@ -4,7 +4,7 @@ import json
 import httpx
 from httpx import AsyncClient
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select, text
 import struct
 import zlib
 
@@ -12,8 +12,17 @@ import sheriff_api.routers.prelabels as prelabels_router
 import sheriff_api.routers.video_imports as video_imports_router
 import sheriff_api.services.prelabel_adapters as prelabel_adapters
 import sheriff_api.services.prelabels as prelabels_service
-from sheriff_api.db.models import Asset, AssetSequence, PrelabelProposal, PrelabelSession, Task
-from sheriff_api.db.session import SessionLocal
+from sheriff_api.db.models import (
+    Asset,
+    AssetSequence,
+    Base,
+    PrelabelDebugDetection,
+    PrelabelProposal,
+    PrelabelSession,
+    Task,
+)
+from sheriff_api.db.session import SessionLocal, engine
+from sheriff_api.services.migrations import _apply_prelabel_debug_detections_migration
 
 
 async def _create_project(client: AsyncClient, *, name: str) -> dict:
@@ -261,8 +270,9 @@ async def test_webcam_live_prelabels_use_florence2_adapter_for_stream_frames(
                 )
             ]
 
-    def fake_florence_factory(*, model_name: str):
+    def fake_florence_factory(*, model_name: str, decoding_profile: str):
         adapter_calls["model_name"] = model_name
+        adapter_calls["decoding_profile"] = decoding_profile
         return FakeFlorenceAdapter()
 
     monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_job", fake_enqueue)
@@ -285,6 +295,7 @@ async def test_webcam_live_prelabels_use_florence2_adapter_for_stream_frames(
                 "frame_sampling": {"mode": "every_n_frames", "value": 1},
                 "confidence_threshold": 0.25,
                 "max_detections_per_frame": 5,
+                "decoding_profile": "fast",
             },
         },
     )
@@ -306,10 +317,12 @@ async def test_webcam_live_prelabels_use_florence2_adapter_for_stream_frames(
     assert enqueued_payloads[0]["job_type"] == "prelabel_asset"
     assert enqueued_payloads[0]["session_id"] == session_id
     assert enqueued_payloads[0]["asset_id"] == asset["id"]
+    assert enqueued_payloads[0]["lane"] == "live"
 
     result = await prelabels_service.process_prelabel_asset_job(dict(enqueued_payloads[0]))
     assert result["generated_proposals"] == 1
     assert adapter_calls["model_name"] == "microsoft/Florence-2-base-ft"
+    assert adapter_calls["decoding_profile"] == "fast"
     assert adapter_calls["prompts"] == ["person"]
     assert adapter_calls["threshold"] == 0.25
     assert adapter_calls["max_detections"] == 5
@@ -320,6 +333,12 @@ async def test_webcam_live_prelabels_use_florence2_adapter_for_stream_frames(
     assert session["source_type"] == "florence2"
     assert session["generated_proposals"] == 1
 
+    # Live frames the worker's dispatcher dropped for newer ones still count as processed.
+    await prelabels_service.record_superseded_prelabel_assets(session_id, count=2)
+    session_response = await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}")
+    assert session_response.json()["session"]["processed_assets"] == session["processed_assets"] + 2
+    assert session_response.json()["session"]["generated_proposals"] == 1
+
     proposals_response = await client.get(
         f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/proposals",
         params={"asset_id": asset["id"]},
@@ -442,6 +461,7 @@ async def test_florence_alias_matching_maps_common_variant_labels_to_task_catego
 
     async def fake_florence_detect(self, payload: dict[str, object]) -> dict[str, object]:
         assert payload["model_name"] == "microsoft/Florence-2-base-ft"
+        assert payload["prompt_mode"] == "per_prompt"
         return {
             "device_selected": "cpu",
             "boxes": [
@@ -454,6 +474,7 @@ async def test_florence_alias_matching_maps_common_variant_labels_to_task_catego
 
     monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_job", fake_enqueue)
     monkeypatch.setattr(prelabel_adapters.InferenceClient, "florence_detect", fake_florence_detect)
+    monkeypatch.setattr(prelabels_service.get_settings(), "prelabel_florence_prompt_mode", "per_prompt")
 
     project = await _create_project(client, name="florence-alias-matching")
     project_id = project["id"]
@@ -497,7 +518,11 @@ async def test_florence_alias_matching_maps_common_variant_labels_to_task_catego
 
     session_response = await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}")
     assert session_response.status_code == 200
-    debug_by_label = {row["label_text"]: row for row in session_response.json()["session"]["debug_detections"]}
+    assert session_response.json()["session"]["debug_detection_seq"] == 4
+    debug_response = await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/debug-detections")
+    assert debug_response.status_code == 200
+    assert [row["seq"] for row in debug_response.json()["items"]] == [1, 2, 3, 4]
+    debug_by_label = {row["label_text"]: row for row in debug_response.json()["items"]}
     assert debug_by_label["person"]["resolved_category_name"] == "human"
     assert debug_by_label["person"]["status"] == "matched"
     assert debug_by_label["glasses"]["resolved_category_name"] == "glass"
@@ -583,9 +608,10 @@ async def test_florence_adapter_skips_malformed_rows_and_clamps_valid_boxes(
     assert result["generated_proposals"] == 1
     assert result["skipped_unmatched"] == 1
 
-    session_response = await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}")
-    assert session_response.status_code == 200
-    debug_by_label = {row["label_text"]: row for row in session_response.json()["session"]["debug_detections"]}
+    debug_response = await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/debug-detections")
+    assert debug_response.status_code == 200
+    assert debug_response.json()["next_after"] == 2
+    debug_by_label = {row["label_text"]: row for row in debug_response.json()["items"]}
     assert debug_by_label["cat"]["status"] == "matched"
     assert debug_by_label["cat"]["resolved_category_name"] == "Cat"
     assert debug_by_label["horse"]["status"] == "unmatched"
@@ -603,6 +629,317 @@ async def test_florence_adapter_skips_malformed_rows_and_clamps_valid_boxes(
     assert proposals[0]["bbox"] == [20.0, 0.0, 80.0, 80.0]
 
 
+@pytest.mark.asyncio
+async def test_prelabel_jobs_reuse_session_context_until_categories_change(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued_payloads: list[dict[str, object]] = []
+    built_adapters: list[object] = []
+    closed_adapters: list[object] = []
+
+    async def fake_enqueue(self, payload: dict[str, object]) -> None:
+        enqueued_payloads.append(payload)
+
+    class FakeFlorenceAdapter:
+        name = "fake-florence"
+
+        async def warmup(self) -> None:
+            return None
+
+        async def aclose(self) -> None:
+            closed_adapters.append(self)
+
+        async def detect(
+            self,
+            *,
+            asset_storage_uri: str,
+            prompts: list[str],
+            threshold: float,
+            max_detections: int,
+        ) -> list[prelabels_service.DetectionResult]:
+            return [
+                prelabels_service.DetectionResult(label_text=label, score=0.9, bbox_xyxy=(4.0, 4.0, 20.0, 20.0), raw={})
+                for label in ("person", "dog")
+            ]
+
+    def fake_florence_factory(*, model_name: str, decoding_profile: str):
+        built_adapters.append(FakeFlorenceAdapter())
+        return built_adapters[-1]
+
+    monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_job", fake_enqueue)
+    monkeypatch.setitem(prelabels_service.PRELABEL_ADAPTER_REGISTRY, "florence2", fake_florence_factory)
+    monkeypatch.setattr(prelabels_service.get_settings(), "frame_dedup_mode", "off")
+
+    project = await _create_project(client, name="prelabel-context-cache")
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    await _create_category(client, project_id=project_id, task_id=task_id, name="person")
+    created = await client.post(
+        f"/api/v1/projects/{project_id}/webcam-sessions",
+        json={
+            "task_id": task_id,
+            "name": "cam-cache",
+            "fps": 2,
+            "prelabel_config": {
+                "source_type": "florence2",
+                "prompts": ["person", "dog"],
+                "frame_sampling": {"mode": "every_n_frames", "value": 1},
+            },
+        },
+    )
+    assert created.status_code == 200
+    sequence = created.json()["sequence"]
+    for frame_index in range(4):
+        await _upload_sequence_frame(client, project_id=project_id, sequence_id=sequence["id"], frame_index=frame_index)
+    assert len(enqueued_payloads) == 4
+
+    first = await prelabels_service.process_prelabel_asset_job(dict(enqueued_payloads[0]))
+    second = await prelabels_service.process_prelabel_asset_job(dict(enqueued_payloads[1]))
+    assert (first["generated_proposals"], first["skipped_unmatched"]) == (1, 1)
+    assert (second["generated_proposals"], second["skipped_unmatched"]) == (1, 1)
+    assert len(built_adapters) == 1
+
+    # A new category bumps the task's categories_version; the next job rebuilds maps and adapter.
+    await _create_category(client, project_id=project_id, task_id=task_id, name="dog")
+    third = await prelabels_service.process_prelabel_asset_job(dict(enqueued_payloads[2]))
+    assert (third["generated_proposals"], third["skipped_unmatched"]) == (2, 0)
+    assert len(built_adapters) == 2
+    assert closed_adapters == [built_adapters[0]]
+
+    await prelabels_service.process_prelabel_asset_job(dict(enqueued_payloads[3]))
+    assert len(built_adapters) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_prelabels_run_chunked_jobs_with_one_batch_call_per_chunk(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued_payloads: list[dict[str, object]] = []
+    batch_calls: list[list[str]] = []
+    single_calls: list[str] = []
+
+    async def fake_enqueue_asset_jobs(self, payloads) -> int:
+        enqueued_payloads.extend(payloads)
+        return len(enqueued_payloads)
+
+    def _detections(label: str) -> list[prelabels_service.DetectionResult]:
+        return [prelabels_service.DetectionResult(label_text=label, score=0.8, bbox_xyxy=(2.0, 2.0, 30.0, 30.0), raw={})]
+
+    class FakeBatchAdapter:
+        name = "fake-batch"
+
+        async def warmup(self) -> None:
+            return None
+
+        async def detect(
+            self,
+            *,
+            asset_storage_uri: str,
+            prompts: list[str],
+            threshold: float,
+            max_detections: int,
+        ) -> list[prelabels_service.DetectionResult]:
+            single_calls.append(asset_storage_uri)
+            return _detections("person")
+
+        async def detect_many(
+            self,
+            *,
+            asset_storage_uris: list[str],
+            prompts: list[str],
+            threshold: float,
+            max_detections: int,
+        ) -> list[list[prelabels_service.DetectionResult]]:
+            batch_calls.append(list(asset_storage_uris))
+            return [_detections("person") + _detections("cat") for _ in asset_storage_uris]
+
+    monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_jobs", fake_enqueue_asset_jobs)
+    monkeypatch.setitem(prelabels_service.PRELABEL_ADAPTER_REGISTRY, "florence2", lambda *, model_name, decoding_profile: FakeBatchAdapter())
+    monkeypatch.setattr(prelabels_service.get_settings(), "frame_dedup_mode", "off")
+    monkeypatch.setattr(prelabels_service.get_settings(), "prelabel_job_assets", 2)
+
+    project = await _create_project(client, name="prelabel-chunked-jobs")
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    await _create_category(client, project_id=project_id, task_id=task_id, name="person")
+    sequence, _ = await _create_sequence_with_frame(client, project_id=project_id, task_id=task_id, name="chunked")
+    for frame_index in range(1, 5):
+        await _upload_sequence_frame(client, project_id=project_id, sequence_id=sequence["id"], frame_index=frame_index)
+
+    created = await client.post(
+        f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels",
+        json={
+            "sequence_id": sequence["id"],
+            "source_type": "florence2",
+            "prompts": ["person"],
+            "frame_sampling": {"mode": "every_n_frames", "value": 1},
+        },
+    )
+    assert created.status_code == 200
+    session_id = created.json()["session"]["id"]
+    assert created.json()["session"]["enqueued_assets"] == 5
+    assert [payload["job_type"] for payload in enqueued_payloads] == ["prelabel_assets"] * 3
+    assert [len(payload["asset_ids"]) for payload in enqueued_payloads] == [2, 2, 1]
+
+    results = [await prelabels_service.process_prelabel_assets_job(dict(payload)) for payload in enqueued_payloads]
+
+    assert [len(call) for call in batch_calls] == [2, 2]
+    assert len(single_calls) == 1
+    assert [result["generated_proposals"] for result in results] == [2, 2, 1]
+    assert [result["skipped_unmatched"] for result in results] == [2, 2, 0]
+    assert results[-1]["status"] == "completed"
+    async with SessionLocal() as db:
+        session = await db.get(PrelabelSession, session_id)
+        assert session is not None
+        assert (session.processed_assets, session.generated_proposals, session.skipped_unmatched) == (5, 5, 4)
+        proposals = (
+            await db.execute(select(PrelabelProposal).where(PrelabelProposal.session_id == session_id))
+        ).scalars().all()
+        assert sorted(proposal.asset_id for proposal in proposals) == sorted(
+            asset_id for payload in enqueued_payloads for asset_id in payload["asset_ids"]
+        )
+        assert all(proposal.status == "pending" and proposal.id for proposal in proposals)
+
+
+@pytest.mark.asyncio
+async def test_bulk_prelabel_chunk_skips_assets_deleted_while_session_runs(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued_payloads: list[dict[str, object]] = []
+    batch_calls: list[list[str]] = []
+
+    async def fake_enqueue_asset_jobs(self, payloads) -> int:
+        enqueued_payloads.extend(payloads)
+        return len(enqueued_payloads)
+
+    class FakeBatchAdapter:
+        name = "fake-batch"
+
+        async def warmup(self) -> None:
+            return None
+
+        async def detect(self, *, asset_storage_uri: str, prompts: list[str], threshold: float, max_detections: int):
+            batch_calls.append([asset_storage_uri])
+            return [prelabels_service.DetectionResult(label_text="person", score=0.8, bbox_xyxy=(2.0, 2.0, 30.0, 30.0), raw={})]
+
+        async def detect_many(self, *, asset_storage_uris: list[str], prompts: list[str], threshold: float, max_detections: int):
+            return [
+                await self.detect(asset_storage_uri=uri, prompts=prompts, threshold=threshold, max_detections=max_detections)
+                for uri in asset_storage_uris
+            ]
+
+    monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_jobs", fake_enqueue_asset_jobs)
+    monkeypatch.setitem(prelabels_service.PRELABEL_ADAPTER_REGISTRY, "florence2", lambda *, model_name, decoding_profile: FakeBatchAdapter())
+    monkeypatch.setattr(prelabels_service.get_settings(), "frame_dedup_mode", "off")
+    monkeypatch.setattr(prelabels_service.get_settings(), "prelabel_job_assets", 2)
+
+    project = await _create_project(client, name="prelabel-deleted-asset")
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    await _create_category(client, project_id=project_id, task_id=task_id, name="person")
+    sequence, _ = await _create_sequence_with_frame(client, project_id=project_id, task_id=task_id, name="deleted")
+    for frame_index in range(1, 4):
+        await _upload_sequence_frame(client, project_id=project_id, sequence_id=sequence["id"], frame_index=frame_index)
+    created = await client.post(
+        f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels",
+        json={
+            "sequence_id": sequence["id"],
+            "source_type": "florence2",
+            "prompts": ["person"],
+            "frame_sampling": {"mode": "every_n_frames", "value": 1},
+        },
+    )
+    session_id = created.json()["session"]["id"]
+    assert [len(payload["asset_ids"]) for payload in enqueued_payloads] == [2, 2]
+
+    deleted_asset_id = enqueued_payloads[0]["asset_ids"][0]
+    assert (await client.delete(f"/api/v1/projects/{project_id}/assets/{deleted_asset_id}")).status_code == 204
+
+    results = [await prelabels_service.process_prelabel_assets_job(dict(payload)) for payload in enqueued_payloads]
+    assert [(result["generated_proposals"], result["skipped_missing"]) for result in results] == [(1, 1), (2, 0)]
+    assert len(batch_calls) == 3
+    async with SessionLocal() as db:
+        session = await db.get(PrelabelSession, session_id)
+        assert (session.status, session.processed_assets, session.generated_proposals) == ("completed", 4, 3)
+        assert session.error_message is None
+
+
+@pytest.mark.asyncio
+async def test_redelivered_prelabel_jobs_change_nothing(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued_payloads: list[dict[str, object]] = []
+    detect_calls: list[str] = []
+
+    async def fake_enqueue_asset_jobs(self, payloads) -> int:
+        enqueued_payloads.extend(payloads)
+        return len(enqueued_payloads)
+
+    class FakeAdapter:
+        name = "fake"
+
+        async def warmup(self) -> None:
+            return None
+
+        async def detect(self, *, asset_storage_uri: str, prompts: list[str], threshold: float, max_detections: int):
+            detect_calls.append(asset_storage_uri)
+            return [prelabels_service.DetectionResult(label_text="person", score=0.8, bbox_xyxy=(2.0, 2.0, 30.0, 30.0), raw={})]
+
+    monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_jobs", fake_enqueue_asset_jobs)
+    monkeypatch.setitem(prelabels_service.PRELABEL_ADAPTER_REGISTRY, "florence2", lambda *, model_name, decoding_profile: FakeAdapter())
+    monkeypatch.setattr(prelabels_service.get_settings(), "frame_dedup_mode", "off")
+    monkeypatch.setattr(prelabels_service.get_settings(), "prelabel_job_assets", 2)
+
+    project = await _create_project(client, name="prelabel-redelivery")
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    await _create_category(client, project_id=project_id, task_id=task_id, name="person")
+    sequence, _ = await _create_sequence_with_frame(client, project_id=project_id, task_id=task_id, name="redelivery")
+    for frame_index in range(1, 5):
+        await _upload_sequence_frame(client, project_id=project_id, sequence_id=sequence["id"], frame_index=frame_index)
+    created = await client.post(
+        f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels",
+        json={
+            "sequence_id": sequence["id"],
+            "source_type": "florence2",
+            "prompts": ["person"],
+            "frame_sampling": {"mode": "every_n_frames", "value": 1},
+        },
+    )
+    session_id = created.json()["session"]["id"]
+    assert [len(payload["asset_ids"]) for payload in enqueued_payloads] == [2, 2, 1]
+
+    async def snapshot() -> tuple[str, int, int, int, int]:
+        async with SessionLocal() as db:
+            session = await db.get(PrelabelSession, session_id)
+            proposals = (
+                await db.execute(select(func.count()).select_from(PrelabelProposal).where(PrelabelProposal.session_id == session_id))
+            ).scalar_one()
+            return session.status, session.processed_assets, session.generated_proposals, session.debug_detection_seq, proposals
+
+    first = await prelabels_service.process_prelabel_assets_job(dict(enqueued_payloads[0]))
+    assert first["generated_proposals"] == 2
+    after_first = await snapshot()
+    assert after_first == ("running", 2, 2, 2, 2)
+
+    # The worker died after the commit but before the ack: the same payload arrives again.
+    again = await prelabels_service.process_prelabel_assets_job(dict(enqueued_payloads[0]))
+    assert again["generated_proposals"] == 0
+    assert await snapshot() == after_first
+    assert len(detect_calls) == 2
+
+    # A redelivery into a session that has since failed leaves it failed.
+    await prelabels_service.mark_prelabel_session_failed(session_id, message="inference failed")
+    failed = await prelabels_service.process_prelabel_assets_job(dict(enqueued_payloads[1]))
+    assert failed["status"] == "failed"
+    assert await snapshot() == ("failed", 2, 2, 2, 2)
+    assert len(detect_calls) == 2
+
+
 @pytest.mark.asyncio
 async def test_close_input_keeps_live_sessions_running_until_queued_jobs_finish(
     client: AsyncClient,
@@ -637,7 +974,7 @@ async def test_close_input_keeps_live_sessions_running_until_queued_jobs_finish(
             ]
 
     monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_job", fake_enqueue)
-    monkeypatch.setitem(prelabels_service.PRELABEL_ADAPTER_REGISTRY, "florence2", lambda *, model_name: FakeFlorenceAdapter())
+    monkeypatch.setitem(prelabels_service.PRELABEL_ADAPTER_REGISTRY, "florence2", lambda *, model_name, decoding_profile: FakeFlorenceAdapter())
 
     project = await _create_project(client, name="webcam-close-input")
     project_id = project["id"]
@@ -870,3 +1207,167 @@ async def test_annotation_save_marks_prelabel_proposal_as_edited(client: AsyncCl
         assert proposal.reviewed_bbox_json == [7.0, 8.0, 28.0, 20.0]
         assert proposal.promoted_annotation_id == response.json()["id"]
         assert proposal.promoted_object_id == "edited-object"
+
+
+async def _create_webcam_prelabel_session(client: AsyncClient, *, name: str) -> tuple[str, str, str]:
+    project = await _create_project(client, name=name)
+    project_id = project["id"]
+    task_id = project["default_task_id"]
+    await _create_category(client, project_id=project_id, task_id=task_id, name="person")
+    created = await client.post(
+        f"/api/v1/projects/{project_id}/webcam-sessions",
+        json={"task_id": task_id, "name": name, "fps": 2, "prelabel_config": {"source_type": "florence2", "prompts": ["person"]}},
+    )
+    assert created.status_code == 200
+    return project_id, task_id, created.json()["prelabel_session_id"]
+
+
+def _debug_row(session_id: str, index: int) -> dict[str, object]:
+    return {
+        "session_id": session_id,
+        "asset_id": f"asset-{index}",
+        "asset_frame_index": index,
+        "label_text": f"label {index}",
+        "resolved_category_id": None,
+        "resolved_category_name": None,
+        "confidence": 0.5,
+        "bbox_xyxy_json": [0.0, 0.0, 4.0, 4.0],
+        "status": "unmatched",
+    }
+
+
+@pytest.mark.asyncio
+async def test_prelabel_debug_detections_keep_latest_rows_and_page_by_cursor(client: AsyncClient) -> None:
+    project_id, task_id, session_id = await _create_webcam_prelabel_session(client, name="debug-ring")
+    debug_url = f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/debug-detections"
+
+    empty = await client.get(debug_url)
+    assert empty.status_code == 200
+    assert empty.json() == {"items": [], "next_after": 0}
+
+    # 13 jobs of 20 detections; the session row only gets its seq counter bumped.
+    for job in range(13):
+        async with SessionLocal() as db:
+            session = await db.get(PrelabelSession, session_id)
+            await prelabels_service._append_debug_detections(
+                db,
+                session,
+                [_debug_row(session_id, job * 20 + offset + 1) for offset in range(20)],
+            )
+            await db.commit()
+
+    async with SessionLocal() as db:
+        session = await db.get(PrelabelSession, session_id)
+        stored = (
+            await db.execute(
+                select(func.count()).select_from(PrelabelDebugDetection).where(PrelabelDebugDetection.session_id == session_id)
+            )
+        ).scalar_one()
+    assert session.debug_detection_seq == 260
+    assert session.debug_detections_json == []
+    # Trimmed in steps of 50, so between 200 and 249 rows are stored.
+    assert 200 <= stored < 250
+
+    latest = (await client.get(debug_url, params={"limit": 3})).json()
+    assert [row["seq"] for row in latest["items"]] == [258, 259, 260]
+    assert latest["items"][-1]["label_text"] == "label 260"
+    assert latest["next_after"] == 260
+
+    # A stale cursor resumes at the oldest row still in the ring.
+    oldest = (await client.get(debug_url, params={"after": 0, "limit": 2})).json()
+    assert [row["seq"] for row in oldest["items"]] == [61, 62]
+    newer = (await client.get(debug_url, params={"after": 258})).json()
+    assert [row["seq"] for row in newer["items"]] == [259, 260]
+    assert (await client.get(debug_url, params={"after": 260})).json() == {"items": [], "next_after": 260}
+
+
+@pytest.mark.asyncio
+async def test_prelabel_debug_detections_seq_is_reserved_in_the_database(client: AsyncClient) -> None:
+    _, _, session_id = await _create_webcam_prelabel_session(client, name="debug-concurrent")
+
+    # Two workers load the session before either appends; the second one's in-memory seq is stale.
+    async with SessionLocal() as first_db, SessionLocal() as second_db:
+        first = await first_db.get(PrelabelSession, session_id)
+        second = await second_db.get(PrelabelSession, session_id)
+        await prelabels_service._append_debug_detections(first_db, first, [_debug_row(session_id, 1), _debug_row(session_id, 2)])
+        await first_db.commit()
+        await prelabels_service._append_debug_detections(second_db, second, [_debug_row(session_id, 3)])
+        second.processed_assets = 1
+        await second_db.commit()
+
+    async with SessionLocal() as db:
+        session = await db.get(PrelabelSession, session_id)
+        seqs = (
+            await db.execute(
+                select(PrelabelDebugDetection.seq, PrelabelDebugDetection.label_text)
+                .where(PrelabelDebugDetection.session_id == session_id)
+                .order_by(PrelabelDebugDetection.seq)
+            )
+        ).all()
+    assert session.debug_detection_seq == 3
+    assert [tuple(row) for row in seqs] == [(1, "label 1"), (2, "label 2"), (3, "label 3")]
+
+
+@pytest.mark.asyncio
+async def test_prelabel_debug_detections_migration_on_not_null_legacy_column() -> None:
+    # Databases created before the side table have debug_detections_json as JSON NOT NULL.
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(
+            text(
+                """
+                CREATE TABLE prelabel_sessions (
+                    id VARCHAR PRIMARY KEY,
+                    debug_detections_json JSON NOT NULL
+                )
+                """
+            )
+        )
+        await conn.execute(
+            text("INSERT INTO prelabel_sessions (id, debug_detections_json) VALUES (:id, :rows)"),
+            [
+                {
+                    "id": "session-1",
+                    "rows": json.dumps([{"asset_id": "a", "label_text": "person", "bbox_xyxy": [0, 0, 2, 2], "status": "matched"}]),
+                },
+                {"id": "session-2", "rows": "[]"},
+            ],
+        )
+        await conn.run_sync(PrelabelDebugDetection.__table__.create)
+
+    await _apply_prelabel_debug_detections_migration(engine)
+
+    async with engine.begin() as conn:
+        sessions = (
+            await conn.execute(text("SELECT id, debug_detection_seq, debug_detections_json FROM prelabel_sessions ORDER BY id"))
+        ).all()
+        moved = (await conn.execute(text("SELECT session_id, seq, label_text FROM prelabel_debug_detections"))).all()
+    assert [(row[0], row[1], json.loads(row[2])) for row in sessions] == [("session-1", 1, []), ("session-2", 0, [])]
+    assert [tuple(row) for row in moved] == [("session-1", 1, "person")]
+
+
+@pytest.mark.asyncio
+async def test_prelabel_debug_detections_migration_moves_inline_lists(client: AsyncClient) -> None:
+    project_id, task_id, session_id = await _create_webcam_prelabel_session(client, name="debug-migration")
+    legacy = [
+        {"asset_id": "asset-1", "asset_frame_index": 0, "label_text": "person", "bbox_xyxy": [1, 2, 3, 4], "status": "matched"},
+        # Rows the old normalizer would have dropped stay dropped.
+        {"asset_id": "asset-1", "label_text": "", "bbox_xyxy": [1, 2, 3, 4], "status": "matched"},
+        {"asset_id": "asset-2", "asset_frame_index": 1, "label_text": "horse", "bbox_xyxy": [0, 0, 8, 8], "status": "unmatched"},
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE prelabel_sessions SET debug_detections_json = :rows WHERE id = :id"),
+            {"rows": json.dumps(legacy), "id": session_id},
+        )
+
+    await _apply_prelabel_debug_detections_migration(engine)
+
+    session_response = await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}")
+    assert session_response.json()["session"]["debug_detection_seq"] == 2
+    items = (await client.get(f"/api/v1/projects/{project_id}/tasks/{task_id}/prelabels/{session_id}/debug-detections")).json()["items"]
+    assert [(row["seq"], row["label_text"], row["status"], row["bbox_xyxy"]) for row in items] == [
+        (1, "person", "matched", [1.0, 2.0, 3.0, 4.0]),
+        (2, "horse", "unmatched", [0.0, 0.0, 8.0, 8.0]),
+    ]
+
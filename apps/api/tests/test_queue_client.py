@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+
+from httpx import AsyncClient
+import pytest
+
+from sheriff_api.services import queue_client
+from sheriff_api.services.media_queue import MediaQueue
+from sheriff_api.services.prelabel_queue import PrelabelQueue, lane_key, lane_sessions_key, wake_key
+
+fakeredis = pytest.importorskip("fakeredis")
+
+REDIS_URL = "redis://queue-client-test:6379/0"
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(queue_client, "_clients", {})
+    monkeypatch.setattr(queue_client, "_metrics", {})
+    monkeypatch.setattr(queue_client, "_RPUSH_CHUNK", 4)
+
+    def _install() -> queue_client.QueueClient:
+        client = queue_client.QueueClient(REDIS_URL, redis=fakeredis.aioredis.FakeRedis(decode_responses=True))
+        queue_client.register_queue_client(client)
+        return client
+
+    return _install
+
+
+@pytest.mark.asyncio
+async def test_enqueue_many_pipelines_ordered_pushes_and_records_metrics(fake_client) -> None:
+    client = fake_client()
+    queue = PrelabelQueue(redis_url=REDIS_URL, queue_key="prelabel-test", fair=False)
+    media = MediaQueue(redis_url=REDIS_URL, queue_key="media-test")
+
+    payloads = [{"job_type": "prelabel_asset", "asset_id": f"a-{index}"} for index in range(10)]
+    assert await queue.enqueue_asset_jobs(payloads) == 10
+    assert await queue.enqueue_asset_jobs([]) == 0
+    await queue.enqueue_asset_job({"job_type": "prelabel_asset", "asset_id": "a-10"})
+    await media.enqueue_extract_video_job({"job_type": "extract_video"})
+
+    assert queue_client.get_queue_client(REDIS_URL) is client
+    stored = await client.redis.lrange("prelabel-test", 0, -1)
+    assert [json.loads(row)["asset_id"] for row in stored] == [f"a-{index}" for index in range(11)]
+    assert await queue.depth() == 11
+
+    metrics = queue_client.queue_metrics_snapshot()
+    assert metrics["prelabel-test"]["enqueued"] == 11
+    assert metrics["prelabel-test"]["round_trips"] == 2
+    assert metrics["prelabel-test"]["depth"] == 11
+    assert metrics["prelabel-test"]["latency_ms_p99"] is not None
+    assert metrics["media-test"]["enqueued"] == 1
+
+    await queue_client.close_queue_clients()
+    assert queue_client._clients == {}
+
+
+@pytest.mark.asyncio
+async def test_fair_prelabel_queue_pushes_jobs_into_session_lanes(fake_client) -> None:
+    client = fake_client()
+    queue = PrelabelQueue(redis_url=REDIS_URL, queue_key="prelabel-fair", fair=True)
+
+    bulk = [{"job_type": "prelabel_asset", "session_id": "bulk-1", "asset_id": f"a-{index}", "lane": "bulk"} for index in range(3)]
+    assert await queue.enqueue_asset_jobs(bulk) == 3
+    await queue.enqueue_asset_job({"job_type": "prelabel_asset", "session_id": "cam-1", "asset_id": "f-0", "lane": "live"})
+
+    redis = client.redis
+    assert await redis.llen("prelabel-fair") == 0
+    assert [json.loads(row)["asset_id"] for row in await redis.lrange(lane_key("prelabel-fair", "bulk", "bulk-1"), 0, -1)] == ["a-0", "a-1", "a-2"]
+    assert await redis.lrange(lane_key("prelabel-fair", "live", "cam-1"), 0, -1) != []
+    assert await redis.smembers(lane_sessions_key("prelabel-fair", "bulk")) == {"bulk-1"}
+    assert await redis.smembers(lane_sessions_key("prelabel-fair", "live")) == {"cam-1"}
+    assert await redis.lrange(wake_key("prelabel-fair"), 0, -1) == ["1"]
+    assert await queue.depth() == 4
+    assert queue_client.queue_metrics_snapshot()["prelabel-fair"]["enqueued"] == 4
+
+
+@pytest.mark.asyncio
+async def test_health_queues_reports_enqueue_metrics(client: AsyncClient, fake_client) -> None:
+    fake_client()
+    await MediaQueue(redis_url=REDIS_URL, queue_key="media-health").enqueue_dataset_export_job({"job_type": "export"})
+    response = await client.get("/api/v1/health/queues")
+    assert response.status_code == 200
+    assert response.json()["queues"]["media-health"]["enqueued"] == 1
+    assert response.json()["queues"]["media-health"]["depth"] == 1
@@ -6,6 +6,7 @@ import json
 import zipfile
 
 from httpx import AsyncClient
+from PIL import Image
 import pytest
 import sheriff_api.routers.video_imports as video_imports_router
 from sheriff_api.config import get_settings
@@ -157,6 +158,7 @@ async def test_webcam_sequence_detail_sorts_frames_and_marks_annotation_coverage
     assert [asset["source_kind"] for asset in payload["assets"]] == ["webcam_frame", "webcam_frame"]
     assert payload["assets"][0]["has_annotations"] is False
     assert payload["assets"][1]["has_annotations"] is True
+    assert payload["assets"][0]["thumbnail_url"] == f"/api/v1/assets/{payload['assets'][0]['id']}/thumbnail"
 
     duplicate = await client.post(
         f"/api/v1/projects/{project_id}/sequences/{sequence['id']}/frames",
@@ -167,6 +169,53 @@ async def test_webcam_sequence_detail_sorts_frames_and_marks_annotation_coverage
     assert duplicate.json()["error"]["code"] == "sequence_frame_exists"
 
 
+def _webcam_jpeg(*, reverse: bool = False, offset: int = 0) -> bytes:
+    image = Image.linear_gradient("L").rotate(90 if reverse else -90).resize((64, 48))
+    buffer = BytesIO()
+    image.point(lambda value: min(255, value // 2 + offset)).convert("RGB").save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_webcam_frames_near_duplicates_are_flagged_or_skipped(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    project = await _create_project(client, name="webcam-dedup")
+    created = await client.post(
+        f"/api/v1/projects/{project['id']}/webcam-sessions",
+        json={"task_id": project["default_task_id"], "name": "webcam-dedup", "fps": 2},
+    )
+    sequence = created.json()["sequence"]
+    frames_url = f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}/frames"
+
+    async def upload(frame_index: int, content: bytes) -> dict:
+        response = await client.post(
+            frames_url,
+            data={"frame_index": str(frame_index)},
+            files={"file": (f"frame_{frame_index + 1:06d}.jpg", content, "image/jpeg")},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    kept = await upload(0, _webcam_jpeg())
+    flagged = await upload(1, _webcam_jpeg(offset=5))
+    assert kept["perceptual_hash"] is not None
+    assert flagged["metadata_json"]["near_duplicate_of"] == kept["id"]
+    # Compared with the kept frame the flagged one points at, not with the flagged frame itself.
+    assert (await upload(2, _webcam_jpeg(offset=9)))["metadata_json"]["near_duplicate_of"] == kept["id"]
+
+    monkeypatch.setattr(get_settings(), "frame_dedup_mode", "skip")
+    skipped = await upload(3, _webcam_jpeg(offset=3))
+    assert skipped["id"] == kept["id"]
+    changed = await upload(4, _webcam_jpeg(reverse=True))
+    assert changed["frame_index"] == 4
+    assert "near_duplicate_of" not in changed["metadata_json"]
+
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert [asset["frame_index"] for asset in detail["assets"]] == [0, 1, 2, 4]
+
+
 @pytest.mark.asyncio
 async def test_webcam_session_create_accepts_explicit_folder_path(client: AsyncClient) -> None:
     project = await _create_project(client, name="webcam-folder-path")
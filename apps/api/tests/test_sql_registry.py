@@ -0,0 +1,171 @@
+import json
+import os
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from sheriff_api.services.dataset_store import DatasetStore
+from sheriff_api.services.deployment_store import DeploymentStore
+from sheriff_api.services.experiment_store import ExperimentStore, create_experiment_store
+from sheriff_api.services.model_store import FileProjectModelStore, create_project_model_store
+from sheriff_api.services.sql_registry import (
+    SqlDatasetStore,
+    SqlDeploymentStore,
+    SqlExperimentStore,
+    SqlProjectModelStore,
+    delete_registry_project,
+    import_file_registry,
+    registry_engine,
+    registry_experiment_attempts,
+    registry_sync_url,
+)
+
+
+def _database_url(tmp_path: Path) -> str:
+    return f"sqlite+aiosqlite:///{tmp_path / 'registry.db'}"
+
+
+def _permissive_schema(tmp_path: Path) -> Path:
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+    return path
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_registry_sync_url_maps_async_drivers() -> None:
+    assert registry_sync_url("sqlite+aiosqlite:///./pixel_sheriff.db") == "sqlite:///./pixel_sheriff.db"
+    assert registry_sync_url("postgresql+asyncpg://u:p@db:5432/app") == "postgresql+psycopg://u:p@db:5432/app"
+
+
+def test_sql_model_dataset_and_deployment_stores_match_file_contracts(tmp_path: Path) -> None:
+    database_url = _database_url(tmp_path)
+    models = create_project_model_store(str(tmp_path), database_url=database_url)
+    assert isinstance(models, SqlProjectModelStore)
+    first = models.create(project_id="project-a", name="first", config_json={"v": 1}, task_id="task-1")
+    second = models.create(project_id="project-a", name="second", config_json={"v": 2})
+    models.create(project_id="project-b", name="other", config_json={})
+    assert {row["id"] for row in models.list_by_project("project-a")} == {first["id"], second["id"]}
+    assert models.get("project-b", first["id"]) is None
+    assert models.update_config(project_id="project-a", model_id=first["id"], config_json={"v": 3})["config_json"] == {"v": 3}
+    assert models.get("project-a", first["id"])["config_json"] == {"v": 3}
+
+    datasets = SqlDatasetStore(str(tmp_path), database_url, schema_path=_permissive_schema(tmp_path))
+    old = datasets.create_version("project-a", {"name": "old", "task_id": "task-1", "created_at": "2025-01-01T00:00:00Z"})
+    new = datasets.create_version("project-a", {"name": "new", "task_id": "task-2", "created_at": "2025-01-02T00:00:00Z"})
+    old_id, new_id = old["dataset_version_id"], new["dataset_version_id"]
+    datasets.set_active("project-a", old_id)
+    datasets.archive_version("project-a", new_id)
+    datasets.set_export_artifact("project-a", old_id, {"hash": "abc"})
+    listing = datasets.list_versions("project-a")
+    assert listing["active_dataset_version_id"] == old_id
+    assert [(item["version"]["name"], item["is_active"], item["is_archived"]) for item in listing["items"]] == [
+        ("new", False, True),
+        ("old", True, False),
+    ]
+    assert [item["version"]["name"] for item in datasets.list_versions("project-a", task_id="task-1")["items"]] == ["old"]
+    assert datasets.get_export_artifact("project-a", old_id) == {"hash": "abc"}
+    datasets.delete_version("project-a", old_id)
+    assert datasets.get_version("project-a", old_id) is None
+    assert datasets.get_export_artifact("project-a", old_id) is None
+    assert datasets.list_versions("project-a")["active_dataset_version_id"] is None
+
+    deployments = SqlDeploymentStore(str(tmp_path), database_url)
+    deployment = deployments.create(
+        project_id="project-a",
+        name="d1",
+        task_id="task-1",
+        task="classification",
+        device_preference="auto",
+        source={"experiment_id": "exp-1", "attempt": 1},
+        model_key="k",
+        is_active=True,
+    )
+    deployment_id = deployment["deployment_id"]
+    assert deployments.list("project-a")["active_deployment_id"] == deployment_id
+    assert [item["deployment_id"] for item in deployments.list_referencing_experiment("project-a", "exp-1")] == [deployment_id]
+    patched = deployments.patch(project_id="project-a", deployment_id=deployment_id, status="archived")
+    assert patched["status"] == "archived"
+    assert deployments.list("project-a")["active_deployment_id"] is None
+    assert deployments.list_referencing_experiment("project-a", "exp-1") == []
+    assert len(deployments.list_referencing_experiment("project-a", "exp-1", include_archived=True)) == 1
+
+    delete_registry_project(database_url, "project-a")
+    assert models.list_by_project("project-a") == []
+    assert deployments.list("project-a")["items"] == []
+    assert len(models.list_by_project("project-b")) == 1
+
+
+def test_sql_experiment_store_tracks_status_attempts_and_trainer_file_writes(tmp_path: Path) -> None:
+    database_url = _database_url(tmp_path)
+    store = create_experiment_store(str(tmp_path), database_url=database_url)
+    assert isinstance(store, SqlExperimentStore)
+    experiment = store.create(project_id="p", model_id="m", task_id="t", name="exp", config_json={"epochs": 1})
+    experiment_id = experiment["id"]
+    assert not (tmp_path / "experiments" / "p" / "records.json").exists()
+    assert json.loads(store._status_path("p", experiment_id).read_text())["status"] == "draft"
+
+    store.init_run_attempt(project_id="p", experiment_id=experiment_id, job_id="job-1", dataset_export={"hash": "h"}, task="classification", model_family="resnet")
+    with registry_engine(database_url).connect() as conn:
+        assert conn.execute(select(func.count()).select_from(registry_experiment_attempts)).scalar_one() == 1
+    assert store._list_attempts("p", experiment_id) == [1]
+    assert store.set_cancel_requested(project_id="p", experiment_id=experiment_id, cancel_requested=True)["cancel_requested"] is True
+    assert json.loads(store._status_path("p", experiment_id).read_text())["cancel_requested"] is True
+
+    # The trainer writes status.json and summary.json directly; listing picks both up for active experiments.
+    status_path = store._status_path("p", experiment_id)
+    trainer_status = {**json.loads(status_path.read_text()), "status": "completed", "last_completed_attempt": 1}
+    status_path.write_text(json.dumps(trainer_status), encoding="utf-8")
+    _bump_mtime(status_path)
+    summary_path = store._summary_path("p", experiment_id)
+    summary_path.write_text(json.dumps({"best_metric_name": "accuracy", "best_metric_value": 0.9}), encoding="utf-8")
+    rows = store.list_by_project("p", model_id="m")
+    assert [(row["id"], row["status"], row["last_completed_attempt"]) for row in rows] == [(experiment_id, "completed", 1)]
+    assert rows[0]["summary_json"]["best_metric_value"] == 0.9
+    assert store.list_by_project("p", model_id="other") == []
+    assert store.get("p", experiment_id)["status"] == "completed"
+
+    assert store.delete(project_id="p", experiment_id=experiment_id) is True
+    assert store.get("p", experiment_id) is None
+    with registry_engine(database_url).connect() as conn:
+        assert conn.execute(select(func.count()).select_from(registry_experiment_attempts)).scalar_one() == 0
+    assert store.delete(project_id="p", experiment_id=experiment_id) is False
+
+
+def test_import_file_registry_copies_file_layout_and_is_idempotent(tmp_path: Path) -> None:
+    storage_root = str(tmp_path / "data")
+    experiments = ExperimentStore(storage_root)
+    experiment = experiments.create(project_id="p", model_id="m", task_id="t", name="exp", config_json={})
+    experiments.init_run_attempt(project_id="p", experiment_id=experiment["id"], job_id="job", dataset_export={}, task="bbox", model_family="detr")
+    experiments.set_status(project_id="p", experiment_id=experiment["id"], status="failed", error="boom")
+    model = FileProjectModelStore(storage_root).create(project_id="p", name="model", config_json={"a": 1})
+    dataset_doc = {
+        "active_dataset_version_id": "dv-1",
+        "items": [{"dataset_version_id": "dv-1", "name": "v1", "task_id": "t", "created_at": "2025-01-01T00:00:00Z"}],
+        "meta": {"archived_ids": ["dv-1"], "export_artifacts": {"dv-1": {"hash": "h"}}},
+    }
+    dataset_path = Path(storage_root) / "datasets" / "p" / "datasets.json"
+    dataset_path.parent.mkdir(parents=True)
+    dataset_path.write_text(json.dumps(dataset_doc), encoding="utf-8")
+    deployment = DeploymentStore(storage_root).create(
+        project_id="p", name="d", task_id="t", task="bbox", device_preference="cpu", source={"experiment_id": experiment["id"]}, model_key="k", is_active=True
+    )
+
+    database_url = _database_url(tmp_path)
+    counts = import_file_registry(storage_root, database_url)
+    assert counts == {"projects": 1, "experiments": 1, "attempts": 1, "models": 1, "dataset_versions": 1, "deployments": 1}
+    assert import_file_registry(storage_root, database_url)["experiments"] == 0
+
+    sql_experiments = SqlExperimentStore(storage_root, database_url)
+    imported = sql_experiments.get("p", experiment["id"])
+    assert (imported["status"], imported["error"], imported["current_run_attempt"]) == ("failed", "boom", 1)
+    assert sql_experiments.list_by_project("p")[0]["id"] == experiment["id"]
+    assert SqlProjectModelStore(database_url).get("p", model["id"]) == model
+    sql_datasets = SqlDatasetStore(storage_root, database_url)
+    assert sql_datasets.get_version("p", "dv-1") == DatasetStore(storage_root).get_version("p", "dv-1")
+    assert sql_datasets.get_export_artifact("p", "dv-1") == {"hash": "h"}
+    assert SqlDeploymentStore(storage_root, database_url).list("p") == DeploymentStore(storage_root).list("p")
+    assert deployment["deployment_id"] == SqlDeploymentStore(storage_root, database_url).list("p")["active_deployment_id"]
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from io import BytesIO
 import json
+import struct
 import subprocess
 from pathlib import Path
+import zlib
 
 from httpx import AsyncClient
+from PIL import Image
 import pytest
+from sqlalchemy import select
 import sheriff_api.routers.video_imports as video_imports_router
+import sheriff_api.services.prelabels as prelabels_service
 import sheriff_api.services.video_frames as video_frames
 from sheriff_api.config import get_settings
+from sheriff_api.db.models import Asset, PrelabelSession
 from sheriff_api.db.session import SessionLocal
+from sheriff_api.services.frame_dedup import NearDuplicateIndex, hamming_distance, perceptual_hash
+from sheriff_api.services.frame_stream import FrameStreamError, FrameStreamSplitter
 from sheriff_api.services.storage import LocalStorage
-from sheriff_api.services.video_frames import VideoFrameExtractionError, extract_video_sequence_job
+from sheriff_api.services.video_frames import (
+    FrameSegment,
+    detect_scene_changes,
+    extract_video_sequence_job,
+    plan_frame_segments,
+    plan_timestamp_segments,
+)
 
 
-async def _create_project(client: AsyncClient, *, name: str) -> dict:
-    response = await client.post("/api/v1/projects", json={"name": name})
+async def _create_project(client: AsyncClient, *, name: str, task_type: str | None = None) -> dict:
+    response = await client.post("/api/v1/projects", json={"name": name, **({"task_type": task_type} if task_type else {})})
     assert response.status_code == 200
     return response.json()
 
@@ -27,6 +44,7 @@ async def _create_video_import(
     project_id: str,
     task_id: str | None,
     name: str,
+    extra_data: dict[str, str] | None = None,
 ) -> tuple[dict, dict[str, object]]:
     enqueued: dict[str, object] = {}
 
@@ -36,13 +54,76 @@ async def _create_video_import(
     monkeypatch.setattr(video_imports_router.media_queue, "enqueue_extract_video_job", fake_enqueue)
     response = await client.post(
         f"/api/v1/projects/{project_id}/video-imports",
-        data={"task_id": task_id, "fps": "2", "max_frames": "8", "name": name},
+        data={"task_id": task_id, "fps": "2", "max_frames": "8", "name": name, **(extra_data or {})},
         files={"file": ("clip.mp4", b"fake-video", "video/mp4")},
     )
     assert response.status_code == 200
     return response.json()["sequence"], enqueued["payload"]
 
 
+def _png_bytes(width: int, height: int, *, shade: int = 0) -> bytes:
+    raw = (bytes([0]) + bytes([shade, 64, 128]) * width) * height
+
+    def chunk(chunk_type: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", zlib.crc32(chunk_type + payload))
+
+    ihdr = chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    return b"\x89PNG\r\n\x1a\n" + ihdr + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def _gradient_png(*, reverse: bool = False, offset: int = 0) -> bytes:
+    # A horizontal ramp; offset shifts the brightness the way sensor noise or exposure drift would.
+    image = Image.linear_gradient("L").rotate(90 if reverse else -90).resize((48, 32))
+    image = image.point(lambda value: min(255, value // 2 + offset))
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _stripes_png(*, offset: int = 0) -> bytes:
+    # Alternating bright and dark columns: far from both ramp directions.
+    image = Image.new("L", (18, 16))
+    image.putdata([(200 if (x // 2) % 2 == 0 else 50) + offset for _ in range(16) for x in range(18)])
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _jpeg_bytes(scan: bytes) -> bytes:
+    # SOI, an APP segment whose payload contains an EOI-like byte pair, SOF0 (32x16), SOS, scan data, EOI.
+    app = b"\xff\xe0" + struct.pack(">H", 6) + b"\xff\xd9\x00\x00"
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, 16, 32, 1) + b"\x01\x11\x00"
+    sos = b"\xff\xda" + struct.pack(">HB", 8, 1) + b"\x01\x00\x00\x3f\x00"
+    return b"\xff\xd8" + app + sof + sos + scan + b"\xff\xd9"
+
+
+class _FakeProcess:
+    def __init__(self, stdout: bytes, *, returncode: int = 0, stderr: bytes = b"") -> None:
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(stdout)
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_data(stderr)
+        self.stderr.feed_eof()
+        self.returncode: int | None = None
+        self._exit_code = returncode
+
+    async def wait(self) -> int:
+        self.returncode = self._exit_code
+        return self._exit_code
+
+    def kill(self) -> None:
+        self.returncode = -9
+
+
+def _fake_ffprobe(duration: str) -> subprocess.CompletedProcess[str]:
+    return _completed_process(
+        args=["ffprobe"],
+        returncode=0,
+        stdout=json.dumps({"streams": [{"width": 640, "height": 360, "avg_frame_rate": "30/1", "duration": duration}]}),
+    )
+
+
 def _completed_process(*, args: list[str], returncode: int, stdout: str = "", stderr: str = "") -> subprocess.CompletedProcess[str]:
     return subprocess.CompletedProcess(args=args, returncode=returncode, stdout=stdout, stderr=stderr)
 
@@ -81,6 +162,7 @@ async def test_extract_video_sequence_job_persists_ready_frames(
         return _completed_process(args=args, returncode=0)
 
     monkeypatch.setattr(video_frames, "_run_command", fake_run_command)
+    monkeypatch.setattr(get_settings(), "video_extract_mode", "files")
 
     result = await extract_video_sequence_job(
         payload,
@@ -133,13 +215,14 @@ async def test_extract_video_sequence_job_marks_failed_and_removes_partial_asset
         return _completed_process(args=args, returncode=1, stderr="ffmpeg exploded")
 
     monkeypatch.setattr(video_frames, "_run_command", fake_run_command)
+    monkeypatch.setattr(get_settings(), "video_extract_mode", "files")
 
-    with pytest.raises(VideoFrameExtractionError, match="ffmpeg exploded"):
-        await extract_video_sequence_job(
-            payload,
-            session_factory=SessionLocal,
-            storage=LocalStorage(get_settings().storage_root),
-        )
+    result = await extract_video_sequence_job(
+        payload,
+        session_factory=SessionLocal,
+        storage=LocalStorage(get_settings().storage_root),
+    )
+    assert result == {"status": "failed", "sequence_id": sequence["id"], "error_message": "ffmpeg exploded"}
 
     detail = await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")
     assert detail.status_code == 200
@@ -152,3 +235,459 @@ async def test_extract_video_sequence_job_marks_failed_and_removes_partial_asset
 
     source_video_path = Path(get_settings().storage_root) / str(payload["video_storage_uri"])
     assert not source_video_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_extract_video_sequence_job_redelivery_resumes_committed_frames(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    project = await _create_project(client, name="extract-redelivered")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name="extract-redelivered",
+    )
+
+    def fake_run_command(args: list[str]) -> subprocess.CompletedProcess[str]:
+        if args[0] == "ffprobe":
+            return _fake_ffprobe("2.0")
+        output_pattern = Path(args[-1])
+        output_pattern.parent.mkdir(parents=True, exist_ok=True)
+        (output_pattern.parent / "frame_000001.jpg").write_bytes(b"frame-a")
+        (output_pattern.parent / "frame_000002.jpg").write_bytes(b"frame-b")
+        return _completed_process(args=args, returncode=0)
+
+    monkeypatch.setattr(video_frames, "_run_command", fake_run_command)
+    monkeypatch.setattr(get_settings(), "video_extract_mode", "files")
+    monkeypatch.setattr(get_settings(), "video_extract_commit_frames", 1)
+    hash_frames = video_frames._hash_frames
+    hashed: list[list[int]] = []
+
+    def dying_hash_frames(chunk):
+        hashed.append([index for index, _ in chunk])
+        if len(hashed) == 2:
+            # The worker dies after the first frame was committed; nothing is cleaned up.
+            raise asyncio.CancelledError
+        return hash_frames(chunk)
+
+    monkeypatch.setattr(video_frames, "_hash_frames", dying_hash_frames)
+    with pytest.raises(asyncio.CancelledError):
+        await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(get_settings().storage_root))
+
+    def recording_hash_frames(chunk):
+        hashed.append([index for index, _ in chunk])
+        return hash_frames(chunk)
+
+    hashed.clear()
+    monkeypatch.setattr(video_frames, "_hash_frames", recording_hash_frames)
+    result = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(get_settings().storage_root))
+    assert result["status"] == "ready"
+    assert result["frame_count"] == 2
+    # Only the frame the first delivery did not commit is ingested again.
+    assert [index for indexes in hashed for index in indexes] == [1]
+
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert detail["status"] == "ready"
+    assert [asset["frame_index"] for asset in detail["assets"]] == [0, 1]
+
+    # A delivery after the job finished but before it was acknowledged leaves the sequence alone.
+    again = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(get_settings().storage_root))
+    assert again["status"] == "ready"
+    assert again["frame_count"] == 2
+
+
+def test_plan_frame_segments_splits_on_output_frames() -> None:
+    assert plan_frame_segments(duration_seconds=600.0, fps=2.0, max_frames=500, segments=4, min_segment_frames=50) == [
+        FrameSegment(start_frame=0, frame_count=125),
+        FrameSegment(start_frame=125, frame_count=125),
+        FrameSegment(start_frame=250, frame_count=125),
+        FrameSegment(start_frame=375, frame_count=125),
+    ]
+    assert plan_frame_segments(duration_seconds=10.5, fps=2.0, max_frames=500, segments=4, min_segment_frames=10) == [
+        FrameSegment(start_frame=0, frame_count=11),
+        FrameSegment(start_frame=11, frame_count=10),
+    ]
+    assert plan_frame_segments(duration_seconds=None, fps=2.0, max_frames=40, segments=4, min_segment_frames=1) == [
+        FrameSegment(start_frame=0, frame_count=40)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_extract_video_sequence_job_runs_segments_and_enqueues_prelabels_per_batch(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "video_extract_segments", 3)
+    monkeypatch.setattr(settings, "video_extract_min_segment_frames", 2)
+    monkeypatch.setattr(settings, "video_extract_commit_frames", 2)
+    monkeypatch.setattr(settings, "video_extract_mode", "files")
+    project = await _create_project(client, name="extract-segments", task_type="bbox")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name="extract-segments",
+        extra_data={
+            "prelabel_config": json.dumps(
+                {"source_type": "florence2", "prompts": ["person"], "frame_sampling": {"mode": "every_n_frames", "value": 3}}
+            )
+        },
+    )
+
+    ffmpeg_calls: list[list[str]] = []
+
+    def fake_run_command(args: list[str]) -> subprocess.CompletedProcess[str]:
+        if args[0] == "ffprobe":
+            return _completed_process(
+                args=args,
+                returncode=0,
+                stdout=json.dumps({"streams": [{"width": 640, "height": 360, "avg_frame_rate": "30/1", "duration": "3.0"}]}),
+            )
+        ffmpeg_calls.append(args)
+        start = float(args[args.index("-ss") + 1]) if "-ss" in args else 0.0
+        output_pattern = Path(args[-1])
+        for local_index in range(int(args[args.index("-frames:v") + 1])):
+            (output_pattern.parent / f"frame_{local_index + 1:06d}.jpg").write_bytes(f"frame-{start}-{local_index}".encode())
+        return _completed_process(args=args, returncode=0)
+
+    enqueued_batches: list[list[dict]] = []
+
+    async def fake_enqueue_asset_jobs(self, payloads) -> int:
+        enqueued_batches.append(list(payloads))
+        return len(enqueued_batches[-1])
+
+    monkeypatch.setattr(video_frames, "_run_command", fake_run_command)
+    monkeypatch.setattr(prelabels_service.PrelabelQueue, "enqueue_asset_jobs", fake_enqueue_asset_jobs)
+
+    result = await extract_video_sequence_job(
+        payload,
+        session_factory=SessionLocal,
+        storage=LocalStorage(settings.storage_root),
+    )
+
+    assert result["frame_count"] == 6
+    assert sorted(args[args.index("-ss") + 1] if "-ss" in args else "" for args in ffmpeg_calls) == ["", "1.000000", "2.000000"]
+
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert detail["status"] == "ready"
+    assert detail["frame_count"] == 6
+    assert [asset["frame_index"] for asset in detail["assets"]] == [0, 1, 2, 3, 4, 5]
+    assert detail["assets"][3]["file_name"] == "frame_000004.jpg"
+
+    # Every third frame is sampled, and jobs went out per committed batch rather than at the end.
+    assert all(len(batch) <= 1 for batch in enqueued_batches)
+    assert all(job["job_type"] == "prelabel_assets" for batch in enqueued_batches for job in batch)
+    enqueued_ids = [asset_id for batch in enqueued_batches for job in batch for asset_id in job["asset_ids"]]
+    sampled_ids = [asset["id"] for asset in detail["assets"] if asset["frame_index"] % 3 == 0]
+    assert sorted(enqueued_ids) == sorted(sampled_ids)
+    async with SessionLocal() as db:
+        prelabel_session = await db.get(PrelabelSession, str(payload["prelabel_session_id"]))
+        assert prelabel_session is not None
+        assert prelabel_session.enqueued_assets == 2
+        assert prelabel_session.input_closed_at is not None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_frame_stream_splitter_splits_jpeg_and_png_streams(chunk_size: int) -> None:
+    jpegs = [
+        _jpeg_bytes(b"\x12\xff\x00\x34\xff\xd0\x56"),
+        _jpeg_bytes(b"\xff\xff\x00\x78\xff\xd7"),
+    ]
+    pngs = [_png_bytes(4, 3, shade=shade) for shade in (0, 200)]
+    for frame_format, frames in (("jpeg", jpegs), ("png", pngs)):
+        stream = b"".join(frames)
+        splitter = FrameStreamSplitter(frame_format)
+        split: list[bytes] = []
+        for offset in range(0, len(stream), chunk_size):
+            split.extend(splitter.feed(stream[offset : offset + chunk_size]))
+        splitter.finish()
+        assert split == frames
+
+    truncated = FrameStreamSplitter("png")
+    assert truncated.feed(pngs[0] + pngs[1][:-4]) == [pngs[0]]
+    with pytest.raises(FrameStreamError):
+        truncated.finish()
+
+
+@pytest.mark.asyncio
+async def test_extract_video_sequence_job_streams_png_frames_from_ffmpeg_stdout(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "video_extract_segments", 2)
+    monkeypatch.setattr(settings, "video_extract_min_segment_frames", 2)
+    project = await _create_project(client, name="extract-pipe")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name="extract-pipe",
+        extra_data={"frame_format": "png", "resize_mode": "width", "resize_width": "8"},
+    )
+    assert payload["frame_format"] == "png"
+
+    spawned: list[list[str]] = []
+
+    async def fake_spawn_command(args: list[str]) -> _FakeProcess:
+        spawned.append(args)
+        count = int(args[args.index("-frames:v") + 1])
+        # ffmpeg stops at -frames:v; extra frames in the stream must not be ingested either.
+        return _FakeProcess(b"".join(_png_bytes(8, 5, shade=len(spawned) * 10 + index) for index in range(count + 1)))
+
+    monkeypatch.setattr(video_frames, "_run_command", lambda args: _fake_ffprobe("2.0"))
+    monkeypatch.setattr(video_frames, "_spawn_command", fake_spawn_command)
+
+    result = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(settings.storage_root))
+
+    assert result["frame_count"] == 4
+    assert all(args[-3:] == ["-f", "image2pipe", "pipe:1"] for args in spawned)
+    assert all(args[args.index("-c:v") + 1] == "png" for args in spawned)
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert [asset["frame_index"] for asset in detail["assets"]] == [0, 1, 2, 3]
+    assert detail["assets"][2]["file_name"] == "frame_000003.png"
+    async with SessionLocal() as db:
+        assets = (await db.execute(select(Asset).where(Asset.sequence_id == sequence["id"]))).scalars().all()
+    assert {(asset.mime_type, asset.width, asset.height) for asset in assets} == {("image/png", 8, 5)}
+    for asset in assets:
+        stored = (Path(settings.storage_root) / asset.metadata_json["storage_uri"]).read_bytes()
+        assert hashlib.sha256(stored).hexdigest() == asset.checksum
+
+
+@pytest.mark.asyncio
+async def test_extract_video_sequence_job_pipe_mode_reports_ffmpeg_failure(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    project = await _create_project(client, name="extract-pipe-failed")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name="extract-pipe-failed",
+    )
+
+    async def fake_spawn_command(args: list[str]) -> _FakeProcess:
+        return _FakeProcess(_jpeg_bytes(b"\x01\x02") + b"\xff\xd8\xff", returncode=1, stderr=b"decoder exploded\n")
+
+    monkeypatch.setattr(video_frames, "_run_command", lambda args: _fake_ffprobe("2.0"))
+    monkeypatch.setattr(video_frames, "_spawn_command", fake_spawn_command)
+
+    result = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(get_settings().storage_root))
+    assert result["status"] == "failed"
+
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert detail["status"] == "failed"
+    assert detail["error_message"] == "decoder exploded"
+    assert detail["assets"] == []
+
+
+def test_plan_timestamp_segments_keeps_one_frame_per_interval() -> None:
+    timestamps = [8.0, 0.0, 0.1, 2.0, 2.4, 4.1]
+    assert plan_timestamp_segments(timestamps, fps=0.5, max_frames=10) == [
+        FrameSegment(start_frame=0, frame_count=1, start_seconds=0.0),
+        FrameSegment(start_frame=1, frame_count=1, start_seconds=2.0),
+        FrameSegment(start_frame=2, frame_count=1, start_seconds=4.1),
+        FrameSegment(start_frame=3, frame_count=1, start_seconds=8.0),
+    ]
+    assert len(plan_timestamp_segments(timestamps, fps=0.5, max_frames=2)) == 2
+
+
+def test_detect_scene_changes_reads_showinfo_timestamps(monkeypatch: pytest.MonkeyPatch) -> None:
+    stderr = (
+        "[Parsed_showinfo_1 @ 0x1] n:   0 pts:  42000 pts_time:3.5     duration:1000 checksum:ab\n"
+        "[Parsed_showinfo_1 @ 0x1] n:   1 pts:  87000 pts_time:7.25    duration:1000 checksum:cd\n"
+    )
+    calls: list[list[str]] = []
+
+    def fake_run_command(args: list[str]) -> subprocess.CompletedProcess[str]:
+        calls.append(args)
+        return _completed_process(args=args, returncode=0, stderr=stderr)
+
+    monkeypatch.setattr(video_frames, "_run_command", fake_run_command)
+
+    assert detect_scene_changes(Path("clip.mp4"), threshold=0.4) == [0.0, 3.5, 7.25]
+    assert "select='gt(scene,0.4)',showinfo" in calls[0]
+
+
+@pytest.mark.asyncio
+async def test_extract_video_sequence_job_keyframe_sampling_seeks_to_each_iframe(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    project = await _create_project(client, name="extract-keyframes")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name="extract-keyframes",
+        extra_data={"sampling_mode": "keyframes", "fps": "0.2", "frame_format": "png"},
+    )
+    assert payload["sampling_mode"] == "keyframes"
+
+    def fake_run_command(args: list[str]) -> subprocess.CompletedProcess[str]:
+        if "-skip_frame" in args:
+            # I-frames every 2 s; at 0.2 fps only one per 5 s is kept.
+            return _completed_process(args=args, returncode=0, stdout="".join(f"{index * 2}.000000\n" for index in range(8)))
+        return _fake_ffprobe("16.0")
+
+    spawned: list[list[str]] = []
+
+    async def fake_spawn_command(args: list[str]) -> _FakeProcess:
+        spawned.append(args)
+        assert args[args.index("-frames:v") + 1] == "1"
+        return _FakeProcess(_png_bytes(4, 4, shade=len(spawned)))
+
+    monkeypatch.setattr(video_frames, "_run_command", fake_run_command)
+    monkeypatch.setattr(video_frames, "_spawn_command", fake_spawn_command)
+
+    result = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(get_settings().storage_root))
+
+    assert result["frame_count"] == 3
+    assert sorted(args[args.index("-ss") + 1] if "-ss" in args else "" for args in spawned) == ["", "11.999000", "5.999000"]
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert [(asset["frame_index"], asset["timestamp_seconds"]) for asset in detail["assets"]] == [(0, 0.0), (1, 6.0), (2, 12.0)]
+
+
+def test_perceptual_hash_matches_near_duplicates_against_previous_kept_frame() -> None:
+    ramp = perceptual_hash(_gradient_png())
+    assert ramp is not None and len(ramp) == 16
+    assert hamming_distance(ramp, perceptual_hash(_gradient_png(offset=6)) or "") == 0
+    reversed_ramp = perceptual_hash(_gradient_png(reverse=True))
+    assert reversed_ramp is not None and hamming_distance(ramp, reversed_ramp) > 32
+    assert perceptual_hash(b"not-an-image") is None
+
+    index = NearDuplicateIndex(max_distance=4)
+    index.keep(0, ramp, "asset-0")
+    index.keep(10, reversed_ramp, "asset-10")
+    # Compared with the closest earlier kept frame, whatever order frames arrive in.
+    assert index.match(12, ramp) is None
+    assert index.match(12, reversed_ramp) == "asset-10"
+    assert index.match(5, ramp) == "asset-0"
+    assert index.match(0, ramp) is None
+    assert index.match(5, None) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dedup_mode", ["flag", "skip"])
+async def test_extract_video_sequence_job_suppresses_near_duplicate_frames(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    dedup_mode: str,
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "frame_dedup_mode", dedup_mode)
+    monkeypatch.setattr(settings, "video_extract_segments", 1)
+    project = await _create_project(client, name=f"extract-dedup-{dedup_mode}")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name=f"extract-dedup-{dedup_mode}",
+        extra_data={"frame_format": "png"},
+    )
+    frames = [
+        _gradient_png(),
+        _gradient_png(offset=4),
+        _gradient_png(reverse=True),
+        _gradient_png(reverse=True, offset=8),
+        _gradient_png(offset=2),
+    ]
+
+    async def fake_spawn_command(args: list[str]) -> _FakeProcess:
+        return _FakeProcess(b"".join(frames))
+
+    monkeypatch.setattr(video_frames, "_run_command", lambda args: _fake_ffprobe("2.5"))
+    monkeypatch.setattr(video_frames, "_spawn_command", fake_spawn_command)
+
+    result = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(settings.storage_root))
+
+    assert result["near_duplicate_frames"] == 2
+    async with SessionLocal() as db:
+        assets = (
+            await db.execute(select(Asset).where(Asset.sequence_id == sequence["id"]).order_by(Asset.frame_index))
+        ).scalars().all()
+    assert all(asset.perceptual_hash is not None for asset in assets)
+    by_index = {asset.frame_index: asset for asset in assets}
+    if dedup_mode == "skip":
+        assert result["frame_count"] == 3
+        assert sorted(by_index) == [0, 2, 4]
+        assert all("near_duplicate_of" not in asset.metadata_json for asset in assets)
+    else:
+        assert result["frame_count"] == 5
+        assert by_index[1].metadata_json["near_duplicate_of"] == by_index[0].id
+        assert by_index[3].metadata_json["near_duplicate_of"] == by_index[2].id
+        assert "near_duplicate_of" not in by_index[4].metadata_json
+    detail = (await client.get(f"/api/v1/projects/{project['id']}/sequences/{sequence['id']}")).json()
+    assert detail["frame_count"] == result["frame_count"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dedup_mode", ["flag", "skip"])
+async def test_extract_video_sequence_job_dedups_out_of_order_segments_in_frame_order(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    dedup_mode: str,
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "frame_dedup_mode", dedup_mode)
+    monkeypatch.setattr(settings, "video_extract_segments", 2)
+    monkeypatch.setattr(settings, "video_extract_min_segment_frames", 2)
+    monkeypatch.setattr(settings, "video_extract_commit_frames", 1)
+    monkeypatch.setattr(settings, "video_extract_poll_seconds", 0.01)
+    project = await _create_project(client, name=f"extract-dedup-segments-{dedup_mode}")
+    sequence, payload = await _create_video_import(
+        client,
+        monkeypatch,
+        project_id=project["id"],
+        task_id=project["default_task_id"],
+        name=f"extract-dedup-segments-{dedup_mode}",
+        extra_data={"frame_format": "png"},
+    )
+    # Frame 3 opens the second segment and duplicates frame 2, the last kept frame of the first.
+    segments = [
+        [_gradient_png(), _gradient_png(offset=4), _gradient_png(reverse=True)],
+        [_gradient_png(reverse=True, offset=8), _stripes_png(), _stripes_png(offset=3)],
+    ]
+
+    async def fake_spawn_command(args: list[str]) -> _FakeProcess:
+        if "-ss" not in args:
+            # The first segment lands only after the second one has been stored.
+            await asyncio.sleep(0.2)
+            return _FakeProcess(b"".join(segments[0]))
+        return _FakeProcess(b"".join(segments[1]))
+
+    monkeypatch.setattr(video_frames, "_run_command", lambda args: _fake_ffprobe("3.0"))
+    monkeypatch.setattr(video_frames, "_spawn_command", fake_spawn_command)
+
+    result = await extract_video_sequence_job(payload, session_factory=SessionLocal, storage=LocalStorage(settings.storage_root))
+
+    assert result["near_duplicate_frames"] == 3
+    async with SessionLocal() as db:
+        assets = (await db.execute(select(Asset).where(Asset.sequence_id == sequence["id"]))).scalars().all()
+    by_index = {asset.frame_index: asset for asset in assets}
+    if dedup_mode == "skip":
+        assert result["frame_count"] == 3
+        assert sorted(by_index) == [0, 2, 4]
+        assert all("near_duplicate_of" not in asset.metadata_json for asset in assets)
+    else:
+        assert result["frame_count"] == 6
+        assert {index: asset.metadata_json.get("near_duplicate_of") for index, asset in by_index.items()} == {
+            0: None,
+            1: by_index[0].id,
+            2: None,
+            3: by_index[2].id,
+            4: None,
+            5: by_index[4].id,
+        }
+    stored = {path.name for path in (Path(settings.storage_root) / "assets" / project["id"]).rglob("frame_*")}
+    assert stored == {asset.file_name for asset in assets}
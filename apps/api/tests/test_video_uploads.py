@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+
+from httpx import AsyncClient
+import pytest
+
+import sheriff_api.routers.video_imports as video_imports_router
+from sheriff_api.services.resumable_uploads import ResumableUploadError, ResumableUploadStore
+from sheriff_api.services.storage import LocalStorage
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_resumable_store_rehashes_after_restart_and_rejects_bad_offsets(tmp_path) -> None:
+    storage = LocalStorage(str(tmp_path))
+    content = os.urandom(300_000)
+    store = ResumableUploadStore(storage)
+    upload = store.create(project_id="p", filename="clip.mp4", length=len(content))
+
+    assert (await store.append(upload.id, 0, _chunks(content[:1000], content[1000:120_000]))).offset == 120_000
+    with pytest.raises(ResumableUploadError) as mismatch:
+        await store.append(upload.id, 0, _chunks(content))
+    assert mismatch.value.details["offset"] == 120_000
+
+    restarted = ResumableUploadStore(storage)
+    with pytest.raises(ResumableUploadError) as too_long:
+        await restarted.append(upload.id, 120_000, _chunks(content[120_000:], b"extra"))
+    assert too_long.value.code == "upload_length_exceeded"
+    assert restarted.get(upload.id).complete
+    assert await restarted.checksum(upload.id) == hashlib.sha256(content).hexdigest()
+
+    target = tmp_path / "imports" / "clip.mp4"
+    restarted.complete(upload.id, target)
+    assert target.read_bytes() == content
+    with pytest.raises(ResumableUploadError):
+        restarted.get(upload.id)
+
+
+@pytest.mark.asyncio
+async def test_video_upload_resumes_and_finalizes_into_media_job(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued: list[dict] = []
+
+    async def fake_enqueue(payload: dict) -> None:
+        enqueued.append(payload)
+
+    monkeypatch.setattr(video_imports_router.media_queue, "enqueue_extract_video_job", fake_enqueue)
+    project = (await client.post("/api/v1/projects", json={"name": "resumable"})).json()
+    base = f"/api/v1/projects/{project['id']}/video-uploads"
+    content = os.urandom(200_000)
+    checksum = hashlib.sha256(content).hexdigest()
+
+    created = await client.post(
+        base,
+        json={"filename": "clip.mp4", "length": len(content), "checksum": checksum, "fps": 3, "max_frames": 9, "name": "clip"},
+    )
+    assert created.status_code == 201
+    upload_id = created.json()["id"]
+    assert created.headers["location"].endswith(upload_id)
+    headers = {"Content-Type": "application/offset+octet-stream"}
+
+    first = await client.patch(f"{base}/{upload_id}", content=content[:80_000], headers={**headers, "Upload-Offset": "0"})
+    assert first.json()["offset"] == 80_000
+    early = await client.post(f"{base}/{upload_id}/finalize")
+    assert early.status_code == 409
+    assert early.json()["error"]["code"] == "upload_incomplete"
+
+    stale = await client.patch(f"{base}/{upload_id}", content=content, headers={**headers, "Upload-Offset": "0"})
+    assert stale.status_code == 409
+    assert stale.json()["error"]["details"]["offset"] == 80_000
+    head = await client.head(f"{base}/{upload_id}")
+    assert head.headers["upload-offset"] == "80000"
+
+    rest = await client.patch(f"{base}/{upload_id}", content=content[80_000:], headers={**headers, "Upload-Offset": "80000"})
+    assert rest.headers["upload-offset"] == str(len(content))
+
+    finalized = await client.post(f"{base}/{upload_id}/finalize")
+    assert finalized.status_code == 200
+    sequence = finalized.json()["sequence"]
+    assert sequence["name"] == "clip"
+    assert sequence["status"] == "processing"
+    payload = enqueued[-1]
+    assert (payload["fps"], payload["max_frames"], payload["video_sha256"]) == (3.0, 9, checksum)
+    assert video_imports_router.storage.resolve(payload["video_storage_uri"]).read_bytes() == content
+    assert (await client.get(f"{base}/{upload_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_video_upload_finalize_keeps_upload_when_job_cannot_be_queued(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued: list[dict] = []
+
+    async def failing_enqueue(payload: dict) -> None:
+        raise ConnectionError("redis is down")
+
+    async def fake_enqueue(payload: dict) -> None:
+        enqueued.append(payload)
+
+    project = (await client.post("/api/v1/projects", json={"name": "resumable-retry"})).json()
+    base = f"/api/v1/projects/{project['id']}/video-uploads"
+    content = os.urandom(50_000)
+    upload_id = (await client.post(base, json={"filename": "clip.mp4", "length": len(content)})).json()["id"]
+    await client.patch(f"{base}/{upload_id}", content=content, headers={"Upload-Offset": "0"})
+
+    monkeypatch.setattr(video_imports_router.media_queue, "enqueue_extract_video_job", failing_enqueue)
+    unavailable = await client.post(f"{base}/{upload_id}/finalize")
+    assert unavailable.status_code == 503
+    assert unavailable.json()["error"]["code"] == "media_queue_unavailable"
+    assert (await client.get(f"{base}/{upload_id}")).json()["offset"] == len(content)
+
+    # Errors raised while placing the source keep their own status and code.
+    def missing_link(upload_id: str, target) -> None:
+        raise ResumableUploadError("upload_not_found", "Upload not found", {"upload_id": upload_id})
+
+    with monkeypatch.context() as patched:
+        patched.setattr(video_imports_router.video_uploads, "link", missing_link)
+        not_found = await client.post(f"{base}/{upload_id}/finalize")
+    assert not_found.status_code == 404
+    assert not_found.json()["error"]["code"] == "upload_not_found"
+
+    monkeypatch.setattr(video_imports_router.media_queue, "enqueue_extract_video_job", fake_enqueue)
+    retried = await client.post(f"{base}/{upload_id}/finalize")
+    assert retried.status_code == 200
+    assert video_imports_router.storage.resolve(enqueued[-1]["video_storage_uri"]).read_bytes() == content
+    assert (await client.get(f"{base}/{upload_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_video_upload_finalize_starts_one_import(
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued: list[dict] = []
+
+    async def slow_enqueue(payload: dict) -> None:
+        await asyncio.sleep(0.05)
+        enqueued.append(payload)
+
+    monkeypatch.setattr(video_imports_router.media_queue, "enqueue_extract_video_job", slow_enqueue)
+    project = (await client.post("/api/v1/projects", json={"name": "resumable-race"})).json()
+    base = f"/api/v1/projects/{project['id']}/video-uploads"
+    content = os.urandom(50_000)
+    upload_id = (await client.post(base, json={"filename": "clip.mp4", "length": len(content)})).json()["id"]
+    await client.patch(f"{base}/{upload_id}", content=content, headers={"Upload-Offset": "0"})
+
+    first, second = await asyncio.gather(
+        client.post(f"{base}/{upload_id}/finalize"),
+        client.post(f"{base}/{upload_id}/finalize"),
+    )
+
+    assert sorted([first.status_code, second.status_code]) == [200, 404]
+    loser = second if first.status_code == 200 else first
+    assert loser.json()["error"]["code"] == "upload_not_found"
+    assert len(enqueued) == 1
+    sequences = (await client.get(f"/api/v1/projects/{project['id']}/sequences")).json()
+    assert len(sequences) == 1
+
+
+@pytest.mark.asyncio
+async def test_video_upload_rejects_checksum_mismatch_and_unsupported_files(client: AsyncClient) -> None:
+    project = (await client.post("/api/v1/projects", json={"name": "resumable-checks"})).json()
+    base = f"/api/v1/projects/{project['id']}/video-uploads"
+
+    unsupported = await client.post(base, json={"filename": "notes.txt", "length": 4})
+    assert unsupported.status_code == 422
+    assert unsupported.json()["error"]["code"] == "video_import_type_unsupported"
+
+    created = await client.post(base, json={"filename": "clip.mp4", "length": 4, "checksum": "0" * 64})
+    upload_id = created.json()["id"]
+    await client.patch(f"{base}/{upload_id}", content=b"abcd", headers={"Upload-Offset": "0"})
+    mismatch = await client.post(f"{base}/{upload_id}/finalize")
+    assert mismatch.status_code == 422
+    assert mismatch.json()["error"]["code"] == "upload_checksum_mismatch"
+    assert (await client.delete(f"{base}/{upload_id}")).status_code == 204
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+from pixel_sheriff_trainer.io.events import EventLog
+from pixel_sheriff_trainer.io.storage import ExperimentStorage
+from pixel_sheriff_trainer.jobs import TrainJob
+from pixel_sheriff_trainer.utils.time import utc_now_iso
+
+
+EventCallback = Callable[[TrainJob, dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class ExecutorLimits:
+    max_memory_mb: int = 0
+    cpu_count: int = 0
+    nice: int = 0
+
+
+def limits_from_env() -> ExecutorLimits:
+    def _env_int(name: str) -> int:
+        try:
+            return max(0, int(os.getenv(name, "0")))
+        except ValueError:
+            return 0
+
+    return ExecutorLimits(
+        max_memory_mb=_env_int("TRAINER_MAX_MEMORY_MB"),
+        cpu_count=_env_int("TRAINER_CPU_COUNT"),
+        nice=_env_int("TRAINER_NICE"),
+    )
+
+
+def apply_limits(limits: ExecutorLimits) -> None:
+    """Apply resource limits to the current (training) process.
+
+    The memory limit caps the address space, so it is only meaningful for CPU
+    training; CUDA reserves large virtual mappings and should run unlimited.
+    """
+    if limits.nice > 0 and hasattr(os, "nice"):
+        os.nice(limits.nice)
+    if limits.cpu_count > 0:
+        if hasattr(os, "sched_getaffinity") and hasattr(os, "sched_setaffinity"):
+            allowed = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, set(allowed[: limits.cpu_count]))
+        try:
+            import torch
+
+            torch.set_num_threads(limits.cpu_count)
+        except Exception:
+            pass
+    if limits.max_memory_mb > 0:
+        try:
+            import resource
+        except ImportError:  # pragma: no cover - non-POSIX platforms
+            return
+        max_bytes = int(limits.max_memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def _child_main(storage_root: str, job: TrainJob, conn: Any, limits: ExecutorLimits) -> None:
+    cancel = threading.Event()
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: cancel.set())
+
+    def forward_event(event: dict[str, Any]) -> None:
+        try:
+            conn.send(("event", event))
+        except (BrokenPipeError, OSError):
+            pass
+
+    try:
+        apply_limits(limits)
+        from pixel_sheriff_trainer.runner import TrainRunner
+
+        runner = TrainRunner(storage_root, cancel_requested=cancel.is_set, event_listener=forward_event)
+        result = runner.process(job)
+    except BaseException as exc:
+        result = f"failed:trainer_error:{exc}"
+    try:
+        conn.send(("result", result))
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+class InlineTrainExecutor:
+    """Runs jobs in a worker thread of the service process (no isolation)."""
+
+    def __init__(self, storage_root: str, *, on_event: EventCallback | None = None) -> None:
+        from pixel_sheriff_trainer.runner import TrainRunner
+
+        self._on_event = on_event
+        self._current_job: TrainJob | None = None
+        self._runner = TrainRunner(storage_root, event_listener=self._forward_event)
+
+    def _forward_event(self, event: dict[str, Any]) -> None:
+        if self._on_event is not None and self._current_job is not None:
+            self._on_event(self._current_job, event)
+
+    async def run(self, job: TrainJob) -> str:
+        self._current_job = job
+        try:
+            return await asyncio.to_thread(self._runner.process, job)
+        finally:
+            self._current_job = None
+
+
+class ProcessTrainExecutor:
+    """Runs each job in a supervised child process.
+
+    Events are streamed back over a pipe, cancel requests are delivered as
+    SIGTERM (escalating to SIGKILL after a grace period), and a child that dies
+    without reporting a result has its run marked failed on its behalf.
+    """
+
+    def __init__(
+        self,
+        storage_root: str,
+        *,
+        limits: ExecutorLimits | None = None,
+        poll_seconds: float = 1.0,
+        cancel_grace_seconds: float = 30.0,
+        on_event: EventCallback | None = None,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._storage_root = storage_root
+        self._limits = limits or ExecutorLimits()
+        self._poll_seconds = max(0.05, float(poll_seconds))
+        self._cancel_grace_seconds = max(0.0, float(cancel_grace_seconds))
+        self._on_event = on_event
+        self._clock = clock or time.monotonic
+        self.storage = ExperimentStorage(storage_root)
+        self.events = EventLog(self.storage)
+        # Spawn rather than fork: the parent runs an event loop and the inference server.
+        self._context = multiprocessing.get_context("spawn")
+
+    async def run(self, job: TrainJob) -> str:
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_child_main,
+            args=(self._storage_root, job, child_conn, self._limits),
+            name=f"trainer-job-{job.job_id}",
+        )
+        process.start()
+        child_conn.close()
+
+        result: str | None = None
+        cancel_sent_at: float | None = None
+        next_cancel_check = self._clock()
+        killed = False
+        try:
+            while True:
+                ready = await asyncio.to_thread(parent_conn.poll, self._poll_seconds)
+                if ready:
+                    try:
+                        kind, payload = parent_conn.recv()
+                    except EOFError:
+                        break
+                    if kind == "result":
+                        result = str(payload)
+                    elif kind == "event" and self._on_event is not None and isinstance(payload, dict):
+                        self._on_event(job, payload)
+                elif not process.is_alive():
+                    break
+                # A chatty child keeps the pipe busy, so cancel handling runs on every
+                # iteration and is rate-limited by the clock rather than by poll timeouts.
+                now = self._clock()
+                if cancel_sent_at is None:
+                    if now >= next_cancel_check:
+                        next_cancel_check = now + self._poll_seconds
+                        if await asyncio.to_thread(self.storage.is_cancel_requested, job.project_id, job.experiment_id):
+                            process.terminate()
+                            cancel_sent_at = now
+                elif not killed and (now - cancel_sent_at) >= self._cancel_grace_seconds:
+                    process.kill()
+                    killed = True
+        finally:
+            if process.is_alive():
+                process.terminate()
+            await asyncio.to_thread(process.join)
+            parent_conn.close()
+
+        if result is not None:
+            return result
+        return await asyncio.to_thread(
+            self.finalize_without_result,
+            job,
+            exitcode=process.exitcode,
+            canceled=cancel_sent_at is not None,
+        )
+
+    def finalize_without_result(self, job: TrainJob, *, exitcode: int | None, canceled: bool) -> str:
+        status_row = self.storage.read_status(job.project_id, job.experiment_id)
+        if status_row.get("active_job_id") != job.job_id or str(status_row.get("status")) != "running":
+            return f"exited:code={exitcode}"
+
+        done_event: dict[str, Any] = {"type": "done", "attempt": job.attempt, "job_id": job.job_id, "ts": utc_now_iso()}
+        if canceled:
+            self.storage.set_experiment_status(job.project_id, job.experiment_id, "canceled")
+            done_event["status"] = "canceled"
+            outcome = "canceled:killed"
+        else:
+            message = f"Trainer process exited unexpectedly (exit code {exitcode})"
+            self.storage.set_experiment_status(job.project_id, job.experiment_id, "failed", error=message)
+            done_event.update({"status": "failed", "error_code": "trainer_process_exited", "message": message})
+            outcome = f"failed:trainer_process_exited:{exitcode}"
+        self.events.append(job.project_id, job.experiment_id, job.attempt, done_event)
+        self.storage.set_run_ended(job.project_id, job.experiment_id, job.attempt)
+        return outcome
+
+
+def create_executor(storage_root: str, *, on_event: EventCallback | None = None) -> InlineTrainExecutor | ProcessTrainExecutor:
+    mode = os.getenv("TRAINER_EXECUTOR", "process").strip().lower()
+    if mode == "inline":
+        return InlineTrainExecutor(storage_root, on_event=on_event)
+    return ProcessTrainExecutor(
+        storage_root,
+        limits=limits_from_env(),
+        poll_seconds=float(os.getenv("TRAINER_EXECUTOR_POLL_SECONDS", "1")),
+        cancel_grace_seconds=float(os.getenv("TRAINER_CANCEL_GRACE_SECONDS", "30")),
+        on_event=on_event,
+    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import gc
+import logging
 import math
 import os
 from pathlib import Path
@@ -13,6 +14,8 @@ from fastapi import FastAPI, HTTPException
 from PIL import Image
 import torch
 
+from .batching import MicroBatcher, run_onnx_rows, supports_dynamic_batch
+from .florence_inputs import FlorenceInputCache, florence_text_inputs
 from .preprocess import (
     PreprocessContext,
     load_metadata,
@@ -22,27 +25,51 @@ from .preprocess import (
 )
 from .schemas import (
     DetectionBox,
+    FlorenceDetectBatchItem,
+    FlorenceDetectBatchRequest,
+    FlorenceDetectBatchResponse,
     FlorenceDetectRequest,
     FlorenceDetectResponse,
     FlorenceDetectionBox,
     FlorenceWarmupRequest,
+    InferClassificationBatchItem,
+    InferClassificationBatchRequest,
+    InferClassificationBatchResponse,
     InferClassificationRequest,
     InferClassificationResponse,
     InferClassificationWarmupRequest,
+    InferDetectionBatchItem,
+    InferDetectionBatchRequest,
+    InferDetectionBatchResponse,
     InferDetectionRequest,
     InferDetectionResponse,
     InferDetectionWarmupRequest,
+    InferItemError,
+    InferSegmentationBatchItem,
+    InferSegmentationBatchRequest,
+    InferSegmentationBatchResponse,
     InferSegmentationRequest,
     InferSegmentationResponse,
+    InferStatsResponse,
     InferWarmupResponse,
     PredictionRow,
     SegmentationObject,
 )
-from .session_cache import CacheBusyError, SessionCache, sha256_file
+from .session_cache import CacheBusyError, ModelIdentityCache, SessionCache, sha256_file
 
 
 _FLORENCE_CACHE: dict[str, tuple[object, object, str]] = {}
 _FLORENCE_CACHE_LOCK = threading.Lock()
+# "fast" decodes greedily, one forward step per token; "quality" keeps the model card's 3-beam search.
+# Both reuse the decoder KV cache instead of re-running the whole prefix at every step.
+FLORENCE_DECODING_PROFILES: dict[str, dict[str, Any]] = {
+    "fast": {"max_new_tokens": 256, "num_beams": 1, "do_sample": False, "use_cache": True},
+    "quality": {"max_new_tokens": 256, "num_beams": 3, "do_sample": False, "use_cache": True},
+}
+DEFAULT_FLORENCE_DECODING_PROFILE = "quality"
+# ids of loaded models whose generate failed with the KV cache on; they decode without it.
+_FLORENCE_NO_KV_CACHE: set[int] = set()
+logger = logging.getLogger(__name__)
 
 
 def _top_k_predictions(logits: np.ndarray, top_k: int) -> tuple[list[PredictionRow], int]:
@@ -83,9 +110,80 @@ def _run_onnx(session: object, tensor: np.ndarray) -> np.ndarray:
     return np.asarray(first, dtype=np.float32)
 
 
+async def _resolve_model_key(identities: ModelIdentityCache, *, onnx_path: Path, model_key: str | None) -> str:
+    # Safety check for aliasing/mismatch across paths; the digest is memoized per file stat.
+    onnx_hash = await identities.get(onnx_path, sha256_file)
+    if model_key is not None and onnx_hash != model_key:
+        raise HTTPException(
+            status_code=409,
+            detail={"code": "model_key_mismatch", "message": "Provided model_key does not match ONNX content"},
+        )
+    return onnx_hash
+
+
+async def _acquire_model_session(
+    cache: SessionCache,
+    *,
+    model_key: str,
+    onnx_path: Path,
+    device_preference: str,
+) -> tuple[object, str]:
+    try:
+        return await cache.acquire_session(model_key=model_key, onnx_path=onnx_path, device_preference=device_preference)
+    except CacheBusyError as exc:
+        raise HTTPException(status_code=503, detail={"code": "cache_busy", "message": "Inference cache is busy"}) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=503, detail={"code": "session_load_failed", "message": str(exc)}) from exc
+
+
+def _resolve_model_artifacts(storage_root: Path, *, onnx_relpath: str, metadata_relpath: str) -> tuple[Path, Path]:
+    try:
+        onnx_path, metadata_path, _asset_path = _resolve_paths(
+            storage_root,
+            onnx_relpath=onnx_relpath,
+            metadata_relpath=metadata_relpath,
+            asset_relpath=None,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail={"code": "path_invalid", "message": str(exc)}) from exc
+    if not onnx_path.exists() or not metadata_path.exists():
+        raise HTTPException(status_code=404, detail={"code": "artifact_not_found", "message": "Inference artifacts not found"})
+    return onnx_path, metadata_path
+
+
+def _preprocess_batch_item(
+    storage_root: Path,
+    asset_relpath: str,
+    metadata: dict[str, Any],
+) -> tuple[np.ndarray, PreprocessContext] | InferItemError:
+    try:
+        asset_path = _resolve_asset_path(storage_root, asset_relpath=asset_relpath)
+    except ValueError as exc:
+        return InferItemError(code="path_invalid", message=str(exc))
+    if not asset_path.exists():
+        return InferItemError(code="artifact_not_found", message="Asset not found")
+    try:
+        return preprocess_asset_with_context(asset_path, metadata)
+    except Exception as exc:
+        return InferItemError(code="preprocess_failed", message=str(exc))
+
+
+async def _preprocess_batch(
+    storage_root: Path,
+    asset_relpaths: list[str],
+    metadata: dict[str, Any],
+) -> list[tuple[np.ndarray, PreprocessContext] | InferItemError]:
+    return list(
+        await asyncio.gather(
+            *(asyncio.to_thread(_preprocess_batch_item, storage_root, relpath, metadata) for relpath in asset_relpaths)
+        )
+    )
+
+
 async def _warmup_session(
     *,
     cache: SessionCache,
+    identities: ModelIdentityCache,
     onnx_path: Path,
     metadata_path: Path,
     device_preference: str,
@@ -94,13 +192,7 @@ async def _warmup_session(
     if not onnx_path.exists() or not metadata_path.exists():
         raise HTTPException(status_code=404, detail={"code": "artifact_not_found", "message": "Inference artifacts not found"})
 
-    resolved_model_key = model_key or await asyncio.to_thread(sha256_file, onnx_path)
-    onnx_hash = await asyncio.to_thread(sha256_file, onnx_path)
-    if onnx_hash != resolved_model_key:
-        raise HTTPException(
-            status_code=409,
-            detail={"code": "model_key_mismatch", "message": "Provided model_key does not match ONNX content"},
-        )
+    resolved_model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=model_key)
 
     try:
         _session, device_selected = await cache.acquire_session(
@@ -124,6 +216,15 @@ def create_app() -> FastAPI:
         max_models_cpu=int(os.getenv("INFERENCE_CACHE_MAX_MODELS_CPU", "3")),
         ttl_seconds=int(os.getenv("INFERENCE_CACHE_TTL_SECONDS", "600")),
     )
+    identities = ModelIdentityCache(max_entries=int(os.getenv("INFERENCE_IDENTITY_CACHE_MAX_ENTRIES", "64")))
+    max_batch_size = max(1, int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "16")))
+    batcher = MicroBatcher(
+        window_seconds=float(os.getenv("INFERENCE_MICROBATCH_WINDOW_MS", "2")) / 1000.0,
+        max_batch_size=max_batch_size,
+    )
+    florence_max_batch_size = max(1, int(os.getenv("FLORENCE_MAX_BATCH_SIZE", "8")))
+    florence_input_cache_images = int(os.getenv("FLORENCE_INPUT_CACHE_IMAGES", "8"))
+    florence_inputs = FlorenceInputCache(max_images=florence_input_cache_images) if florence_input_cache_images > 0 else None
     app = FastAPI(title="pixel-sheriff-trainer-inference", version="0.1.0")
 
     @app.post("/infer/classification", response_model=InferClassificationResponse)
@@ -141,15 +242,8 @@ def create_app() -> FastAPI:
         if not onnx_path.exists() or not metadata_path.exists() or asset_path is None or not asset_path.exists():
             raise HTTPException(status_code=404, detail={"code": "artifact_not_found", "message": "Inference artifacts not found"})
 
-        metadata = await asyncio.to_thread(load_metadata, metadata_path)
-        model_key = payload.model_key or await asyncio.to_thread(sha256_file, onnx_path)
-        # Safety check for aliasing/mismatch across paths.
-        onnx_hash = await asyncio.to_thread(sha256_file, onnx_path)
-        if onnx_hash != model_key:
-            raise HTTPException(
-                status_code=409,
-                detail={"code": "model_key_mismatch", "message": "Provided model_key does not match ONNX content"},
-            )
+        metadata = await identities.get(metadata_path, load_metadata)
+        model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=payload.model_key)
 
         try:
             session, device_selected = await cache.acquire_session(
@@ -164,7 +258,10 @@ def create_app() -> FastAPI:
 
         try:
             tensor = await asyncio.to_thread(preprocess_asset, asset_path, metadata)
-            logits = await asyncio.to_thread(_run_onnx, session, tensor)
+            if supports_dynamic_batch(metadata):
+                logits = await batcher.run((model_key, device_selected), session, tensor)
+            else:
+                logits = await asyncio.to_thread(_run_onnx, session, tensor)
             rows, output_dim = _top_k_predictions(logits, payload.top_k)
             return InferClassificationResponse(
                 device_selected=device_selected,
@@ -187,6 +284,7 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=422, detail={"code": "path_invalid", "message": str(exc)}) from exc
         return await _warmup_session(
             cache=cache,
+            identities=identities,
             onnx_path=onnx_path,
             metadata_path=metadata_path,
             device_preference=payload.device_preference,
@@ -208,12 +306,9 @@ def create_app() -> FastAPI:
         if not onnx_path.exists() or not metadata_path.exists() or asset_path is None or not asset_path.exists():
             raise HTTPException(status_code=404, detail={"code": "artifact_not_found", "message": "Inference artifacts not found"})
 
-        metadata = await asyncio.to_thread(load_metadata, metadata_path)
+        metadata = await identities.get(metadata_path, load_metadata)
         class_names: list[str] = metadata.get("class_names", [])
-        model_key = payload.model_key or await asyncio.to_thread(sha256_file, onnx_path)
-        onnx_hash = await asyncio.to_thread(sha256_file, onnx_path)
-        if onnx_hash != model_key:
-            raise HTTPException(status_code=409, detail={"code": "model_key_mismatch", "message": "Provided model_key does not match ONNX content"})
+        model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=payload.model_key)
 
         try:
             session, device_selected = await cache.acquire_session(
@@ -250,6 +345,7 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=422, detail={"code": "path_invalid", "message": str(exc)}) from exc
         return await _warmup_session(
             cache=cache,
+            identities=identities,
             onnx_path=onnx_path,
             metadata_path=metadata_path,
             device_preference=payload.device_preference,
@@ -271,12 +367,9 @@ def create_app() -> FastAPI:
         if not onnx_path.exists() or not metadata_path.exists() or asset_path is None or not asset_path.exists():
             raise HTTPException(status_code=404, detail={"code": "artifact_not_found", "message": "Inference artifacts not found"})
 
-        metadata = await asyncio.to_thread(load_metadata, metadata_path)
+        metadata = await identities.get(metadata_path, load_metadata)
         class_names = metadata.get("class_names", [])
-        model_key = payload.model_key or await asyncio.to_thread(sha256_file, onnx_path)
-        onnx_hash = await asyncio.to_thread(sha256_file, onnx_path)
-        if onnx_hash != model_key:
-            raise HTTPException(status_code=409, detail={"code": "model_key_mismatch", "message": "Provided model_key does not match ONNX content"})
+        model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=payload.model_key)
 
         try:
             session, device_selected = await cache.acquire_session(
@@ -289,12 +382,124 @@ def create_app() -> FastAPI:
 
         try:
             tensor = await asyncio.to_thread(preprocess_asset, asset_path, metadata)
-            logits = await asyncio.to_thread(_run_onnx, session, tensor)
+            if supports_dynamic_batch(metadata):
+                logits = await batcher.run((model_key, device_selected), session, tensor)
+            else:
+                logits = await asyncio.to_thread(_run_onnx, session, tensor)
             objects = _parse_segmentation_output(logits, class_names=class_names)
             return InferSegmentationResponse(device_selected=device_selected, objects=objects)
         finally:
             await cache.release(model_key, device_selected)
 
+    @app.post("/infer/classification/batch", response_model=InferClassificationBatchResponse)
+    async def infer_classification_batch(payload: InferClassificationBatchRequest) -> InferClassificationBatchResponse:
+        onnx_path, metadata_path = _resolve_model_artifacts(
+            storage_root,
+            onnx_relpath=payload.onnx_relpath,
+            metadata_relpath=payload.metadata_relpath,
+        )
+        metadata = await identities.get(metadata_path, load_metadata)
+        model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=payload.model_key)
+        prepared = await _preprocess_batch(storage_root, payload.asset_relpaths, metadata)
+        session, device_selected = await _acquire_model_session(
+            cache, model_key=model_key, onnx_path=onnx_path, device_preference=payload.device_preference,
+        )
+        try:
+            tensors = [entry[0] for entry in prepared if not isinstance(entry, InferItemError)]
+            if supports_dynamic_batch(metadata):
+                logits_rows = await asyncio.to_thread(run_onnx_rows, session, tensors, max_batch_size=max_batch_size)
+            else:
+                logits_rows = [await asyncio.to_thread(_run_onnx, session, tensor) for tensor in tensors]
+        finally:
+            await cache.release(model_key, device_selected)
+
+        items: list[InferClassificationBatchItem] = []
+        logits_iter = iter(logits_rows)
+        for asset_relpath, entry in zip(payload.asset_relpaths, prepared, strict=True):
+            if isinstance(entry, InferItemError):
+                items.append(InferClassificationBatchItem(asset_relpath=asset_relpath, error=entry))
+                continue
+            rows, output_dim = _top_k_predictions(next(logits_iter), payload.top_k)
+            items.append(InferClassificationBatchItem(asset_relpath=asset_relpath, predictions=rows, output_dim=output_dim))
+        return InferClassificationBatchResponse(device_selected=device_selected, items=items)
+
+    @app.post("/infer/detection/batch", response_model=InferDetectionBatchResponse)
+    async def infer_detection_batch(payload: InferDetectionBatchRequest) -> InferDetectionBatchResponse:
+        onnx_path, metadata_path = _resolve_model_artifacts(
+            storage_root,
+            onnx_relpath=payload.onnx_relpath,
+            metadata_relpath=payload.metadata_relpath,
+        )
+        metadata = await identities.get(metadata_path, load_metadata)
+        class_names: list[str] = metadata.get("class_names", [])
+        model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=payload.model_key)
+        prepared = await _preprocess_batch(storage_root, payload.asset_relpaths, metadata)
+        session, device_selected = await _acquire_model_session(
+            cache, model_key=model_key, onnx_path=onnx_path, device_preference=payload.device_preference,
+        )
+        items: list[InferDetectionBatchItem] = []
+        try:
+            # Detection exports carry post-processed (NMS) outputs without a per-image
+            # batch axis, so images run one at a time on a single session checkout.
+            for asset_relpath, entry in zip(payload.asset_relpaths, prepared, strict=True):
+                if isinstance(entry, InferItemError):
+                    items.append(InferDetectionBatchItem(asset_relpath=asset_relpath, error=entry))
+                    continue
+                tensor, preprocess_context = entry
+                raw_outputs = await asyncio.to_thread(_run_onnx_detection, session, tensor)
+                boxes = _parse_detection_output(
+                    raw_outputs,
+                    class_names=class_names,
+                    score_threshold=payload.score_threshold,
+                    preprocess_context=preprocess_context,
+                )
+                items.append(InferDetectionBatchItem(asset_relpath=asset_relpath, boxes=boxes))
+        finally:
+            await cache.release(model_key, device_selected)
+        return InferDetectionBatchResponse(device_selected=device_selected, items=items)
+
+    @app.post("/infer/segmentation/batch", response_model=InferSegmentationBatchResponse)
+    async def infer_segmentation_batch(payload: InferSegmentationBatchRequest) -> InferSegmentationBatchResponse:
+        onnx_path, metadata_path = _resolve_model_artifacts(
+            storage_root,
+            onnx_relpath=payload.onnx_relpath,
+            metadata_relpath=payload.metadata_relpath,
+        )
+        metadata = await identities.get(metadata_path, load_metadata)
+        class_names = metadata.get("class_names", [])
+        model_key = await _resolve_model_key(identities, onnx_path=onnx_path, model_key=payload.model_key)
+        prepared = await _preprocess_batch(storage_root, payload.asset_relpaths, metadata)
+        session, device_selected = await _acquire_model_session(
+            cache, model_key=model_key, onnx_path=onnx_path, device_preference=payload.device_preference,
+        )
+        try:
+            tensors = [entry[0] for entry in prepared if not isinstance(entry, InferItemError)]
+            if supports_dynamic_batch(metadata):
+                logits_rows = await asyncio.to_thread(run_onnx_rows, session, tensors, max_batch_size=max_batch_size)
+            else:
+                logits_rows = [await asyncio.to_thread(_run_onnx, session, tensor) for tensor in tensors]
+        finally:
+            await cache.release(model_key, device_selected)
+
+        items: list[InferSegmentationBatchItem] = []
+        logits_iter = iter(logits_rows)
+        for asset_relpath, entry in zip(payload.asset_relpaths, prepared, strict=True):
+            if isinstance(entry, InferItemError):
+                items.append(InferSegmentationBatchItem(asset_relpath=asset_relpath, error=entry))
+                continue
+            objects = _parse_segmentation_output(next(logits_iter), class_names=class_names)
+            items.append(InferSegmentationBatchItem(asset_relpath=asset_relpath, objects=objects))
+        return InferSegmentationBatchResponse(device_selected=device_selected, items=items)
+
+    @app.get("/infer/stats", response_model=InferStatsResponse)
+    async def inference_stats() -> InferStatsResponse:
+        return InferStatsResponse(
+            model_identity=identities.stats(),
+            sessions=cache.stats(),
+            micro_batching=batcher.stats(),
+            florence_inputs=florence_inputs.stats() if florence_inputs is not None else None,
+        )
+
     @app.post("/infer/florence/warmup", response_model=InferWarmupResponse)
     async def warmup_florence(payload: FlorenceWarmupRequest) -> InferWarmupResponse:
         try:
@@ -313,22 +518,102 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=404, detail={"code": "artifact_not_found", "message": "Asset not found"})
         try:
             model, processor, device_selected = await asyncio.to_thread(_load_florence_runtime, payload.model_name)
-            boxes = await asyncio.to_thread(
-                _run_florence_detection,
-                model,
-                processor,
-                device_selected,
-                asset_path,
-                payload.prompts,
-                payload.score_threshold,
-                payload.max_detections,
-            )
+            if payload.prompt_mode == "per_prompt":
+                boxes = await asyncio.to_thread(
+                    _run_florence_detection_per_prompt,
+                    model,
+                    processor,
+                    device_selected,
+                    asset_path,
+                    payload.prompts,
+                    payload.score_threshold,
+                    payload.max_detections,
+                    payload.decoding_profile,
+                    florence_inputs,
+                    florence_max_batch_size,
+                )
+            else:
+                boxes = await asyncio.to_thread(
+                    _run_florence_detection,
+                    model,
+                    processor,
+                    device_selected,
+                    asset_path,
+                    payload.prompts,
+                    payload.score_threshold,
+                    payload.max_detections,
+                    payload.decoding_profile,
+                    florence_inputs,
+                )
         except HTTPException:
             raise
         except Exception as exc:
             raise HTTPException(status_code=503, detail={"code": "florence_inference_failed", "message": str(exc)}) from exc
         return FlorenceDetectResponse(device_selected=device_selected, boxes=boxes)
 
+    @app.post("/infer/florence/detect/batch", response_model=FlorenceDetectBatchResponse)
+    async def florence_detect_batch(payload: FlorenceDetectBatchRequest) -> FlorenceDetectBatchResponse:
+        asset_paths: list[Path | InferItemError] = []
+        for asset_relpath in payload.asset_relpaths:
+            try:
+                asset_path = _resolve_asset_path(storage_root, asset_relpath=asset_relpath)
+            except ValueError as exc:
+                asset_paths.append(InferItemError(code="path_invalid", message=str(exc)))
+                continue
+            if not asset_path.exists():
+                asset_paths.append(InferItemError(code="artifact_not_found", message="Asset not found"))
+                continue
+            asset_paths.append(asset_path)
+        runnable = [entry for entry in asset_paths if isinstance(entry, Path)]
+        boxes_rows: list[list[FlorenceDetectionBox]] = []
+        try:
+            model, processor, device_selected = await asyncio.to_thread(_load_florence_runtime, payload.model_name)
+            if payload.prompt_mode == "per_prompt":
+                # Prompts of one image already fill each generate batch; images run one after another.
+                for asset_path in runnable:
+                    boxes_rows.append(
+                        await asyncio.to_thread(
+                            _run_florence_detection_per_prompt,
+                            model,
+                            processor,
+                            device_selected,
+                            asset_path,
+                            payload.prompts,
+                            payload.score_threshold,
+                            payload.max_detections,
+                            payload.decoding_profile,
+                            florence_inputs,
+                            florence_max_batch_size,
+                        )
+                    )
+            else:
+                for start in range(0, len(runnable), florence_max_batch_size):
+                    boxes_rows.extend(
+                        await asyncio.to_thread(
+                            _run_florence_detection_batch,
+                            model,
+                            processor,
+                            device_selected,
+                            runnable[start : start + florence_max_batch_size],
+                            payload.prompts,
+                            payload.score_threshold,
+                            payload.max_detections,
+                            payload.decoding_profile,
+                            florence_inputs,
+                        )
+                    )
+        except Exception as exc:
+            raise HTTPException(status_code=503, detail={"code": "florence_inference_failed", "message": str(exc)}) from exc
+
+        items: list[FlorenceDetectBatchItem] = []
+        boxes_iter = iter(boxes_rows)
+        for asset_relpath, entry in zip(payload.asset_relpaths, asset_paths, strict=True):
+            if isinstance(entry, InferItemError):
+                items.append(FlorenceDetectBatchItem(asset_relpath=asset_relpath, error=entry))
+                continue
+            items.append(FlorenceDetectBatchItem(asset_relpath=asset_relpath, boxes=next(boxes_iter)))
+        return FlorenceDetectBatchResponse(device_selected=device_selected, items=items)
+
     return app
 
 
@@ -623,10 +908,30 @@ def _create_florence_runtime(*, model_name: str, low_cpu_mem_usage: bool | None)
     model = AutoModelForCausalLM.from_pretrained(model_name, **model_kwargs)
     model = model.to(device_selected)
     model.eval()
+    quantization = os.getenv("FLORENCE_QUANTIZATION", "none").strip().lower()
+    if quantization == "int8":
+        if device_selected == "cpu":
+            _quantize_florence_language_model(model)
+        else:
+            logger.info("FLORENCE_QUANTIZATION=int8 applies to CPU inference only; keeping %s weights", device_selected)
     processor = AutoProcessor.from_pretrained(model_name, trust_remote_code=True)
     return model, processor, device_selected
 
 
+def _quantize_florence_language_model(model: object) -> object:
+    """Swap the language model's ``nn.Linear`` layers for dynamic int8 ones, in place.
+
+    The encoder-decoder that generates tokens dominates CPU time; the vision
+    tower runs once per image and stays in float32.
+    """
+    owner = model if hasattr(model, "language_model") else getattr(model, "model", None)
+    language_model = getattr(owner, "language_model", None)
+    if not isinstance(language_model, torch.nn.Module):
+        raise RuntimeError("Florence model has no language_model to quantize")
+    owner.language_model = torch.ao.quantization.quantize_dynamic(language_model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
 def _load_florence_runtime(model_name: str) -> tuple[object, object, str]:
     normalized_name = str(model_name or "microsoft/Florence-2-base-ft").strip() or "microsoft/Florence-2-base-ft"
     cached = _FLORENCE_CACHE.get(normalized_name)
@@ -650,9 +955,13 @@ def _load_florence_runtime(model_name: str) -> tuple[object, object, str]:
         return cached
 
 
-def _normalize_florence_prompt_text(prompts: list[str]) -> tuple[str, str]:
+def _normalize_florence_prompts(prompts: list[str]) -> list[str]:
     normalized_prompts = [" ".join(str(value or "").strip().split()) for value in prompts]
-    normalized_prompts = [value for value in normalized_prompts if value]
+    return [value for value in normalized_prompts if value]
+
+
+def _normalize_florence_prompt_text(prompts: list[str]) -> tuple[str, str]:
+    normalized_prompts = _normalize_florence_prompts(prompts)
     task = "<OPEN_VOCABULARY_DETECTION>"
     prompt_text = ", ".join(normalized_prompts) if normalized_prompts else "object"
     return task, f"{task} {prompt_text}"
@@ -712,6 +1021,59 @@ def _parse_florence_generation(
     return detections
 
 
+def _florence_generate(
+    model: object,
+    generate_inputs: dict[str, Any],
+    decoding_profile: str,
+    *,
+    generate: Any = None,
+) -> Any:
+    """Run ``generate`` (``model.generate`` by default) with ``decoding_profile``'s options."""
+    generate = model.generate if generate is None else generate
+    options = dict(FLORENCE_DECODING_PROFILES[decoding_profile])
+    if id(model) in _FLORENCE_NO_KV_CACHE:
+        options["use_cache"] = False
+    try:
+        return generate(**generate_inputs, **options)
+    except Exception:
+        if not options["use_cache"]:
+            raise
+        # Some Florence-2 remote-code revisions break on past_key_values with current transformers releases.
+        logger.warning("Florence-2 generate failed with the KV cache on; decoding without it", exc_info=True)
+        _FLORENCE_NO_KV_CACHE.add(id(model))
+        return generate(**generate_inputs, **{**options, "use_cache": False})
+
+
+def _florence_model_inputs(
+    processor: object,
+    device_selected: str,
+    asset_paths: list[Path],
+    prompt_text: str,
+    input_cache: FlorenceInputCache | None,
+) -> tuple[Any, list[tuple[int, int]]]:
+    """Processor outputs for ``asset_paths`` under one prompt, and each image's (width, height)."""
+    if input_cache is None:
+        images: list[Image.Image] = []
+        for asset_path in asset_paths:
+            with Image.open(asset_path) as image:
+                images.append(image.convert("RGB"))
+        if len(images) == 1:
+            model_inputs = processor(text=prompt_text, images=images[0], return_tensors="pt")
+        else:
+            model_inputs = processor(text=[prompt_text] * len(images), images=images, return_tensors="pt", padding=True)
+        if hasattr(model_inputs, "to"):
+            model_inputs = model_inputs.to(device_selected)
+        return model_inputs, [(image.width, image.height) for image in images]
+
+    cached = [input_cache.pixel_values(processor, asset_path) for asset_path in asset_paths]
+    text_inputs = input_cache.text_inputs(processor, prompt_text)
+    # One prompt for the whole batch, so token rows are repeated rather than padded.
+    model_inputs = {name: value.repeat(len(cached), 1) for name, value in text_inputs.items()}
+    model_inputs["pixel_values"] = torch.cat([pixel_values for pixel_values, _size in cached])
+    model_inputs = {name: value.to(device_selected) for name, value in model_inputs.items()}
+    return model_inputs, [image_size for _pixel_values, image_size in cached]
+
+
 def _run_florence_detection(
     model: object,
     processor: object,
@@ -720,28 +1082,208 @@ def _run_florence_detection(
     prompts: list[str],
     score_threshold: float,
     max_detections: int,
+    decoding_profile: str = DEFAULT_FLORENCE_DECODING_PROFILE,
+    input_cache: FlorenceInputCache | None = None,
 ) -> list[FlorenceDetectionBox]:
-    with Image.open(asset_path) as image:
-        rgb_image = image.convert("RGB")
-        task, prompt_text = _normalize_florence_prompt_text(prompts)
-        processor_inputs = processor(text=prompt_text, images=rgb_image, return_tensors="pt")
-        if hasattr(processor_inputs, "to"):
-            processor_inputs = processor_inputs.to(device_selected)
-        generated_ids = model.generate(
-            input_ids=processor_inputs["input_ids"],
-            pixel_values=processor_inputs["pixel_values"],
-            max_new_tokens=256,
-            num_beams=3,
-            do_sample=False,
-            use_cache=False,
+    task, prompt_text = _normalize_florence_prompt_text(prompts)
+    model_inputs, image_sizes = _florence_model_inputs(processor, device_selected, [asset_path], prompt_text, input_cache)
+    generated_ids = _florence_generate(
+        model,
+        {"input_ids": model_inputs["input_ids"], "pixel_values": model_inputs["pixel_values"]},
+        decoding_profile,
+    )
+    decoded = processor.batch_decode(generated_ids, skip_special_tokens=False)
+    generated_text = decoded[0] if isinstance(decoded, list) and decoded else ""
+    return _parse_florence_generation(
+        processor,
+        generated_text=generated_text,
+        task=task,
+        image_size=image_sizes[0],
+        score_threshold=score_threshold,
+        max_detections=max_detections,
+    )
+
+
+def _run_florence_detection_batch(
+    model: object,
+    processor: object,
+    device_selected: str,
+    asset_paths: list[Path],
+    prompts: list[str],
+    score_threshold: float,
+    max_detections: int,
+    decoding_profile: str = DEFAULT_FLORENCE_DECODING_PROFILE,
+    input_cache: FlorenceInputCache | None = None,
+) -> list[list[FlorenceDetectionBox]]:
+    """Detect on several images with one batched ``generate`` call.
+
+    Every image gets the same prompt, so the token rows line up without
+    padding. If the batched call fails (a processor without batch support, or
+    memory pressure), images run one at a time.
+    """
+    if not asset_paths:
+        return []
+    task, prompt_text = _normalize_florence_prompt_text(prompts)
+    try:
+        model_inputs, image_sizes = _florence_model_inputs(processor, device_selected, asset_paths, prompt_text, input_cache)
+        generated_ids = _florence_generate(
+            model,
+            {"input_ids": model_inputs["input_ids"], "pixel_values": model_inputs["pixel_values"]},
+            decoding_profile,
         )
         decoded = processor.batch_decode(generated_ids, skip_special_tokens=False)
-        generated_text = decoded[0] if isinstance(decoded, list) and decoded else ""
-        return _parse_florence_generation(
+        if not isinstance(decoded, list) or len(decoded) != len(asset_paths):
+            raise RuntimeError("Florence batch decode returned an unexpected number of sequences")
+    except Exception:
+        if len(asset_paths) == 1:
+            raise
+        return [
+            _run_florence_detection(
+                model,
+                processor,
+                device_selected,
+                asset_path,
+                prompts,
+                score_threshold,
+                max_detections,
+                decoding_profile,
+                input_cache,
+            )
+            for asset_path in asset_paths
+        ]
+    return [
+        _parse_florence_generation(
             processor,
             generated_text=generated_text,
             task=task,
-            image_size=(rgb_image.width, rgb_image.height),
+            image_size=image_size,
             score_threshold=score_threshold,
             max_detections=max_detections,
         )
+        for generated_text, image_size in zip(decoded, image_sizes, strict=True)
+    ]
+
+
+def _florence_image_features(model: object, pixel_values: Any) -> Any:
+    """Vision tower plus projection: one row of image token embeddings per image."""
+    # Remote-code checkpoints name it ``_encode_image``; the transformers port ``get_image_features``.
+    encode_image = getattr(model, "_encode_image", None)
+    if callable(encode_image):
+        return encode_image(pixel_values)
+    return model.get_image_features(pixel_values)
+
+
+def _florence_prompt_encoder_inputs(model: object, image_features: Any, text_rows: list[Any]) -> tuple[Any, Any]:
+    """Language-encoder ``inputs_embeds`` and ``attention_mask`` pairing one image's features with each prompt.
+
+    ``text_rows`` are ``input_ids`` of shape (1, length). Prompts tokenized with
+    ``<image>`` placeholders (the transformers port) get the features scattered
+    into them; otherwise (remote code) the features are prepended, as the
+    model's own merge does. Rows are right-padded and masked.
+    """
+    embed_tokens = model.get_input_embeddings()
+    image_token_id = getattr(getattr(model, "config", None), "image_token_id", None)
+    rows: list[Any] = []
+    for input_ids in text_rows:
+        text_embeds = embed_tokens(input_ids)
+        features = image_features.to(text_embeds.device, text_embeds.dtype)
+        placeholder = input_ids == image_token_id if image_token_id is not None else None
+        if placeholder is not None and bool(placeholder.any()):
+            rows.append(text_embeds.masked_scatter(placeholder.unsqueeze(-1).expand_as(text_embeds), features))
+        else:
+            rows.append(torch.cat([features, text_embeds], dim=1))
+    length = max(row.shape[1] for row in rows)
+    inputs_embeds = rows[0].new_zeros((len(rows), length, rows[0].shape[-1]))
+    attention_mask = torch.zeros((len(rows), length), dtype=torch.long, device=rows[0].device)
+    for index, row in enumerate(rows):
+        inputs_embeds[index, : row.shape[1]] = row[0]
+        attention_mask[index, : row.shape[1]] = 1
+    return inputs_embeds, attention_mask
+
+
+def _run_florence_detection_per_prompt(
+    model: object,
+    processor: object,
+    device_selected: str,
+    asset_path: Path,
+    prompts: list[str],
+    score_threshold: float,
+    max_detections: int,
+    decoding_profile: str = DEFAULT_FLORENCE_DECODING_PROFILE,
+    input_cache: FlorenceInputCache | None = None,
+    prompt_batch_size: int = 8,
+) -> list[FlorenceDetectionBox]:
+    """Detect every prompt separately while running the vision tower once.
+
+    One open-vocabulary prompt listing a large taxonomy gets long and loses
+    recall. Here the image features are computed once and each prompt is
+    encoded and decoded against them, ``prompt_batch_size`` prompts per
+    ``generate`` call, so vision cost stays flat as categories grow. Boxes are
+    labelled with the prompt that produced them and interleaved across prompts
+    up to ``max_detections``.
+    """
+    phrases = _normalize_florence_prompts(prompts)
+    if len(phrases) <= 1:
+        return _run_florence_detection(
+            model,
+            processor,
+            device_selected,
+            asset_path,
+            prompts,
+            score_threshold,
+            max_detections,
+            decoding_profile,
+            input_cache,
+        )
+    task, _prompt_text = _normalize_florence_prompt_text(phrases)
+    if input_cache is not None:
+        pixel_values, image_size = input_cache.pixel_values(processor, asset_path)
+    else:
+        with Image.open(asset_path) as image:
+            rgb_image = image.convert("RGB")
+        pixel_values = processor.image_processor(rgb_image, return_tensors="pt")["pixel_values"]
+        image_size = (rgb_image.width, rgb_image.height)
+    image_features = _florence_image_features(model, pixel_values.to(device_selected))
+    # Remote code generates from its language model; the transformers port from the model itself.
+    generate = model.language_model.generate if callable(getattr(model, "_encode_image", None)) else model.generate
+    encoder = model.get_encoder()
+
+    per_prompt: list[list[FlorenceDetectionBox]] = []
+    for start in range(0, len(phrases), max(1, prompt_batch_size)):
+        chunk = phrases[start : start + max(1, prompt_batch_size)]
+        text_rows = []
+        for phrase in chunk:
+            prompt_text = f"{task} {phrase}"
+            if input_cache is not None:
+                text_inputs = input_cache.text_inputs(processor, prompt_text)
+            else:
+                text_inputs = florence_text_inputs(processor, prompt_text)
+            text_rows.append(text_inputs["input_ids"].to(device_selected))
+        inputs_embeds, attention_mask = _florence_prompt_encoder_inputs(model, image_features, text_rows)
+        encoder_outputs = encoder(inputs_embeds=inputs_embeds, attention_mask=attention_mask)
+        generated_ids = _florence_generate(
+            model,
+            {"encoder_outputs": encoder_outputs, "attention_mask": attention_mask},
+            decoding_profile,
+            generate=generate,
+        )
+        decoded = processor.batch_decode(generated_ids, skip_special_tokens=False)
+        if not isinstance(decoded, list) or len(decoded) != len(chunk):
+            raise RuntimeError("Florence decode returned an unexpected number of sequences")
+        for phrase, generated_text in zip(chunk, decoded, strict=True):
+            boxes = _parse_florence_generation(
+                processor,
+                generated_text=generated_text,
+                task=task,
+                image_size=image_size,
+                score_threshold=score_threshold,
+                max_detections=max_detections,
+            )
+            per_prompt.append([box.model_copy(update={"label_text": phrase}) for box in boxes])
+
+    detections: list[FlorenceDetectionBox] = []
+    for rank in range(max((len(boxes) for boxes in per_prompt), default=0)):
+        for boxes in per_prompt:
+            if rank < len(boxes):
+                detections.append(boxes[rank])
+    return detections[:max_detections]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+import numpy as np
+
+
+def supports_dynamic_batch(metadata: dict[str, Any]) -> bool:
+    """Return True when the export declares a dynamic batch axis on its first input."""
+    onnx_meta = metadata.get("onnx")
+    if not isinstance(onnx_meta, dict):
+        return False
+    dynamic_axes = onnx_meta.get("dynamic_axes")
+    input_names = onnx_meta.get("input_names")
+    if not isinstance(dynamic_axes, dict) or not dynamic_axes:
+        return False
+    if not isinstance(input_names, list) or not input_names:
+        return False
+    axes = dynamic_axes.get(str(input_names[0]))
+    if not isinstance(axes, dict):
+        return False
+    # JSON round trips turn the integer axis keys into strings.
+    return 0 in axes or "0" in axes
+
+
+def _run_first_output(session: object, tensor: np.ndarray) -> np.ndarray:
+    input_name = session.get_inputs()[0].name
+    outputs = session.run(None, {input_name: tensor})
+    return np.asarray(outputs[0], dtype=np.float32)
+
+
+def run_onnx_rows(session: object, tensors: list[np.ndarray], *, max_batch_size: int = 16) -> list[np.ndarray]:
+    """Run single-image tensors through one session, stacked along the batch axis.
+
+    Each returned array keeps a leading batch dimension of 1 so callers can
+    parse it exactly like a single-image result. If a stacked run fails or its
+    output does not split back into one row per input, the chunk is re-run one
+    tensor at a time.
+    """
+    if not tensors:
+        return []
+    chunk_size = max(1, int(max_batch_size))
+    rows: list[np.ndarray] = []
+    for start in range(0, len(tensors), chunk_size):
+        chunk = tensors[start : start + chunk_size]
+        if len(chunk) == 1:
+            rows.append(_run_first_output(session, chunk[0]))
+            continue
+        try:
+            output = _run_first_output(session, np.concatenate(chunk, axis=0))
+        except Exception:
+            output = None
+        if output is None or output.ndim == 0 or output.shape[0] != len(chunk):
+            rows.extend(_run_first_output(session, tensor) for tensor in chunk)
+            continue
+        rows.extend(output[index : index + 1] for index in range(len(chunk)))
+    return rows
+
+
+@dataclass
+class _PendingBatch:
+    session: object
+    items: list[tuple[np.ndarray, asyncio.Future[np.ndarray]]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-image runs against one session into a batched ONNX call.
+
+    The first request for a key opens a window of ``window_seconds``; requests
+    for the same key that arrive within it (up to ``max_batch_size``) are run
+    together. A window of 0 disables coalescing.
+    """
+
+    def __init__(self, *, window_seconds: float = 0.002, max_batch_size: int = 16) -> None:
+        self._window_seconds = max(0.0, float(window_seconds))
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._pending: dict[Hashable, _PendingBatch] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def run(self, key: Hashable, session: object, tensor: np.ndarray) -> np.ndarray:
+        if self._window_seconds <= 0 or self._max_batch_size <= 1:
+            self.batches += 1
+            self.items += 1
+            rows = await asyncio.to_thread(run_onnx_rows, session, [tensor], max_batch_size=1)
+            return rows[0]
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[np.ndarray] = loop.create_future()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _PendingBatch(session=session)
+            self._pending[key] = pending
+            pending.timer = loop.call_later(self._window_seconds, self._flush, key)
+        pending.items.append((tensor, future))
+        if len(pending.items) >= self._max_batch_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._execute(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, pending: _PendingBatch) -> None:
+        tensors = [tensor for tensor, _future in pending.items]
+        self.batches += 1
+        self.items += len(tensors)
+        try:
+            rows = await asyncio.to_thread(run_onnx_rows, pending.session, tensors, max_batch_size=self._max_batch_size)
+        except Exception as exc:
+            for _tensor, future in pending.items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_tensor, future), row in zip(pending.items, rows, strict=True):
+            if not future.done():
+                future.set_result(row)
+
+    def stats(self) -> dict[str, int]:
+        return {"batches": self.batches, "items": self.items}
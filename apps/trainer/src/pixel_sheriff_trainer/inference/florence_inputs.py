@@ -0,0 +1,80 @@
+"""Florence-2 processor outputs reused across requests.
+
+The processor turns an image into ``pixel_values`` (decode, resize and
+normalise to the vision tower's resolution) and a prompt into ``input_ids``.
+The two do not depend on each other, so each is computed once: pixel values
+per image file, reused while the file's (size, mtime_ns, inode) signature is
+unchanged, and token ids per prompt text. Running several prompts or
+decoding profiles over one frame then preprocesses the frame once.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+import threading
+from typing import Any
+
+from PIL import Image
+
+from .session_cache import StatSignature, stat_signature
+
+_MAX_PROMPTS = 256
+
+
+def florence_text_inputs(processor: object, prompt_text: str) -> dict[str, Any]:
+    """Tokenize ``prompt_text`` on its own, with a batch axis of 1."""
+    # Florence processors only tokenize alongside an image; the ids do not depend on its content.
+    encoded = processor(text=prompt_text, images=Image.new("RGB", (32, 32)), return_tensors="pt")
+    return {name: value for name, value in encoded.items() if name != "pixel_values"}
+
+
+class FlorenceInputCache:
+    def __init__(self, *, max_images: int) -> None:
+        self._max_images = max(1, int(max_images))
+        self._images: OrderedDict[tuple[int, str], tuple[StatSignature, Any, tuple[int, int]]] = OrderedDict()
+        self._prompts: OrderedDict[tuple[int, str], dict[str, Any]] = OrderedDict()
+        # Florence requests run on worker threads.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def pixel_values(self, processor: object, asset_path: Path) -> tuple[Any, tuple[int, int]]:
+        """``pixel_values`` of one image (batch axis of 1) and its original (width, height)."""
+        key = (id(processor), str(asset_path))
+        signature = stat_signature(asset_path)
+        with self._lock:
+            entry = self._images.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                self._images.move_to_end(key)
+                return entry[1], entry[2]
+            self.misses += 1
+        with Image.open(asset_path) as image:
+            rgb_image = image.convert("RGB")
+        pixel_values = processor.image_processor(rgb_image, return_tensors="pt")["pixel_values"]
+        image_size = (rgb_image.width, rgb_image.height)
+        with self._lock:
+            self._images[key] = (signature, pixel_values, image_size)
+            self._images.move_to_end(key)
+            while len(self._images) > self._max_images:
+                self._images.popitem(last=False)
+        return pixel_values, image_size
+
+    def text_inputs(self, processor: object, prompt_text: str) -> dict[str, Any]:
+        """Tokenized ``prompt_text`` (``input_ids`` and any other text fields) with a batch axis of 1."""
+        key = (id(processor), prompt_text)
+        with self._lock:
+            cached = self._prompts.get(key)
+            if cached is not None:
+                self._prompts.move_to_end(key)
+                return cached
+        text_inputs = florence_text_inputs(processor, prompt_text)
+        with self._lock:
+            self._prompts[key] = text_inputs
+            while len(self._prompts) > _MAX_PROMPTS:
+                self._prompts.popitem(last=False)
+        return text_inputs
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._images)}
@@ -37,6 +37,61 @@ class InferWarmupResponse(BaseModel):
     warmed: bool = True
 
 
+class InferItemError(BaseModel):
+    code: str
+    message: str
+
+
+class InferClassificationBatchRequest(BaseModel):
+    onnx_relpath: str
+    metadata_relpath: str
+    asset_relpaths: list[str] = Field(min_length=1, max_length=256)
+    device_preference: Literal["auto", "cuda", "cpu"] = "auto"
+    top_k: int = Field(default=5, ge=1, le=100)
+    model_key: str | None = None
+
+
+class InferClassificationBatchItem(BaseModel):
+    asset_relpath: str
+    predictions: list[PredictionRow] = Field(default_factory=list)
+    output_dim: int | None = None
+    error: InferItemError | None = None
+
+
+class InferClassificationBatchResponse(BaseModel):
+    device_selected: Literal["cuda", "cpu"]
+    items: list[InferClassificationBatchItem]
+
+
+class ModelIdentityCacheStats(BaseModel):
+    hits: int = Field(ge=0)
+    misses: int = Field(ge=0)
+    entries: int = Field(ge=0)
+
+
+class SessionCacheStats(BaseModel):
+    entries: int = Field(ge=0)
+    in_use: int = Field(ge=0)
+
+
+class MicroBatchStats(BaseModel):
+    batches: int = Field(ge=0)
+    items: int = Field(ge=0)
+
+
+class FlorenceInputCacheStats(BaseModel):
+    hits: int = Field(ge=0)
+    misses: int = Field(ge=0)
+    entries: int = Field(ge=0)
+
+
+class InferStatsResponse(BaseModel):
+    model_identity: ModelIdentityCacheStats
+    sessions: SessionCacheStats
+    micro_batching: MicroBatchStats
+    florence_inputs: FlorenceInputCacheStats | None = None
+
+
 # --- Detection ---
 
 class InferDetectionRequest(BaseModel):
@@ -67,6 +122,26 @@ class InferDetectionWarmupRequest(BaseModel):
     model_key: str | None = None
 
 
+class InferDetectionBatchRequest(BaseModel):
+    onnx_relpath: str
+    metadata_relpath: str
+    asset_relpaths: list[str] = Field(min_length=1, max_length=256)
+    device_preference: Literal["auto", "cuda", "cpu"] = "auto"
+    score_threshold: float = Field(default=0.3, ge=0.0, le=1.0)
+    model_key: str | None = None
+
+
+class InferDetectionBatchItem(BaseModel):
+    asset_relpath: str
+    boxes: list[DetectionBox] = Field(default_factory=list)
+    error: InferItemError | None = None
+
+
+class InferDetectionBatchResponse(BaseModel):
+    device_selected: Literal["cuda", "cpu"]
+    items: list[InferDetectionBatchItem]
+
+
 # --- Segmentation ---
 
 class InferSegmentationRequest(BaseModel):
@@ -90,6 +165,32 @@ class InferSegmentationResponse(BaseModel):
     objects: list[SegmentationObject]
 
 
+class InferSegmentationBatchRequest(BaseModel):
+    onnx_relpath: str
+    metadata_relpath: str
+    asset_relpaths: list[str] = Field(min_length=1, max_length=256)
+    device_preference: Literal["auto", "cuda", "cpu"] = "auto"
+    score_threshold: float = Field(default=0.3, ge=0.0, le=1.0)
+    model_key: str | None = None
+
+
+class InferSegmentationBatchItem(BaseModel):
+    asset_relpath: str
+    objects: list[SegmentationObject] = Field(default_factory=list)
+    error: InferItemError | None = None
+
+
+class InferSegmentationBatchResponse(BaseModel):
+    device_selected: Literal["cuda", "cpu"]
+    items: list[InferSegmentationBatchItem]
+
+
+FlorenceDecodingProfile = Literal["fast", "quality"]
+# "combined" asks for every prompt in one open-vocabulary query; "per_prompt"
+# decodes each prompt separately against image features computed once.
+FlorencePromptMode = Literal["combined", "per_prompt"]
+
+
 class FlorenceWarmupRequest(BaseModel):
     model_name: str = "microsoft/Florence-2-base-ft"
 
@@ -100,6 +201,8 @@ class FlorenceDetectRequest(BaseModel):
     prompts: list[str] = Field(default_factory=list)
     score_threshold: float = Field(default=0.25, ge=0.0, le=1.0)
     max_detections: int = Field(default=20, ge=1, le=200)
+    decoding_profile: FlorenceDecodingProfile = "quality"
+    prompt_mode: FlorencePromptMode = "combined"
 
 
 class FlorenceDetectionBox(BaseModel):
@@ -111,3 +214,24 @@ class FlorenceDetectionBox(BaseModel):
 class FlorenceDetectResponse(BaseModel):
     device_selected: Literal["cuda", "cpu"]
     boxes: list[FlorenceDetectionBox]
+
+
+class FlorenceDetectBatchRequest(BaseModel):
+    asset_relpaths: list[str] = Field(min_length=1, max_length=256)
+    model_name: str = "microsoft/Florence-2-base-ft"
+    prompts: list[str] = Field(default_factory=list)
+    score_threshold: float = Field(default=0.25, ge=0.0, le=1.0)
+    max_detections: int = Field(default=20, ge=1, le=200)
+    decoding_profile: FlorenceDecodingProfile = "quality"
+    prompt_mode: FlorencePromptMode = "combined"
+
+
+class FlorenceDetectBatchItem(BaseModel):
+    asset_relpath: str
+    boxes: list[FlorenceDetectionBox] = Field(default_factory=list)
+    error: InferItemError | None = None
+
+
+class FlorenceDetectBatchResponse(BaseModel):
+    device_selected: Literal["cuda", "cpu"]
+    items: list[FlorenceDetectBatchItem]
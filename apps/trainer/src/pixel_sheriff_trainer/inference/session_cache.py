@@ -5,8 +5,9 @@ import hashlib
 import time
 from collections import OrderedDict
 from dataclasses import dataclass
+import os
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
 
 try:
     import onnxruntime as ort
@@ -37,6 +38,69 @@ def sha256_file(path: Path) -> str:
     return digest.hexdigest()
 
 
+StatSignature = tuple[int, int, int]
+
+
+@dataclass
+class IdentityEntry:
+    signature: StatSignature
+    value: Any
+
+
+def stat_signature(path: Path) -> StatSignature:
+    stat = os.stat(path)
+    return (int(stat.st_size), int(stat.st_mtime_ns), int(stat.st_ino))
+
+
+class ModelIdentityCache:
+    """Memoizes per-file derived values (ONNX digests, parsed metadata).
+
+    Entries are keyed by resolved path and loader and are reused while the
+    file's (size, mtime_ns, inode) signature is unchanged, so replacing an
+    artifact in place or via rename invalidates the cached value.
+    """
+
+    def __init__(self, *, max_entries: int = 64) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple[str, Callable[[Path], Any]], IdentityEntry] = OrderedDict()
+        self._key_locks: dict[tuple[str, Callable[[Path], Any]], asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lock_for(self, key: tuple[str, Callable[[Path], Any]]) -> asyncio.Lock:
+        lock = self._key_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._key_locks[key] = lock
+        return lock
+
+    async def get(self, path: Path, loader: Callable[[Path], Any]) -> Any:
+        key = (str(path), loader)
+        async with self._lock_for(key):
+            signature = await asyncio.to_thread(stat_signature, path)
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+
+            self.misses += 1
+            value = await asyncio.to_thread(loader, path)
+            # Re-stat so a write racing with the load is not cached under the old signature.
+            if await asyncio.to_thread(stat_signature, path) == signature:
+                self._entries[key] = IdentityEntry(signature=signature, value=value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    evicted_key, _entry = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted_key, None)
+            else:
+                self._entries.pop(key, None)
+            return value
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
 class SessionCache:
     def __init__(
         self,
@@ -58,6 +122,12 @@ class SessionCache:
             raise RuntimeError("onnxruntime is not available")
         self._providers = set(ort.get_available_providers())
 
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "in_use": sum(1 for entry in self._entries.values() if entry.in_use > 0),
+        }
+
     def _provider_available(self, provider: str) -> bool:
         return provider in self._providers
 
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Callable
 
 from pixel_sheriff_trainer.io.storage import ExperimentStorage
 from pixel_sheriff_trainer.utils.time import utc_now_iso
 
 
 class EventLog:
-    def __init__(self, storage: ExperimentStorage) -> None:
+    def __init__(self, storage: ExperimentStorage, *, listener: Callable[[dict[str, Any]], None] | None = None) -> None:
         self.storage = storage
+        self.listener = listener
 
     def append(self, project_id: str, experiment_id: str, attempt: int, event: dict[str, Any]) -> int:
         payload = dict(event)
@@ -34,5 +35,7 @@ class EventLog:
             json.dumps({"line_count": line_count, "updated_at": utc_now_iso()}, indent=2, sort_keys=True),
             encoding="utf-8",
         )
+        if self.listener is not None:
+            self.listener(payload)
         return line_count
 
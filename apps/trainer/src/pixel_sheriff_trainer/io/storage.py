@@ -40,6 +40,9 @@ class ExperimentStorage:
     def status_path(self, project_id: str, experiment_id: str) -> Path:
         return self.experiment_dir(project_id, experiment_id) / "status.json"
 
+    def summary_path(self, project_id: str, experiment_id: str) -> Path:
+        return self.experiment_dir(project_id, experiment_id) / "summary.json"
+
     def run_dir(self, project_id: str, experiment_id: str, attempt: int) -> Path:
         return self.experiment_dir(project_id, experiment_id) / "runs" / str(attempt)
 
@@ -151,6 +154,8 @@ class ExperimentStorage:
 
     def set_summary(self, project_id: str, experiment_id: str, summary: dict[str, Any]) -> None:
         self.update_record(project_id, experiment_id, lambda row: row.__setitem__("summary_json", summary))
+        # The API's SQL registry has no records.json to update; it picks the summary up from this file.
+        self._write_json(self.summary_path(project_id, experiment_id), summary)
 
     def is_cancel_requested(self, project_id: str, experiment_id: str) -> bool:
         status_row = self.read_status(project_id, experiment_id)
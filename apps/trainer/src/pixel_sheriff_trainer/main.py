@@ -3,13 +3,38 @@ from __future__ import annotations
 import asyncio
 import os
 from pathlib import Path
+from typing import Any
 
 from redis.asyncio import Redis
 import uvicorn
 
+from pixel_sheriff_trainer.executor import create_executor
 from pixel_sheriff_trainer.inference.app import create_app
-from pixel_sheriff_trainer.jobs import parse_train_job
-from pixel_sheriff_trainer.runner import TrainRunner
+from pixel_sheriff_trainer.jobs import TrainJob, parse_train_job
+from sheriff_worker.queues.reliable import ReliableQueue, RetryPolicy
+
+
+def log_job_event(job: TrainJob, event: dict[str, Any]) -> None:
+    event_type = event.get("type")
+    if event_type == "metric":
+        print(
+            f"[trainer] progress job_id={job.job_id} epoch={event.get('epoch')} train_loss={event.get('train_loss')}",
+            flush=True,
+        )
+    elif event_type in {"status", "done"}:
+        message = event.get("message")
+        suffix = f" message={message}" if message else ""
+        print(f"[trainer] {event_type} job_id={job.job_id} status={event.get('status')}{suffix}", flush=True)
+
+
+def build_retry_policy() -> RetryPolicy:
+    # Crashed or OOM-killed training runs are redelivered; the lease is heartbeated while a job runs.
+    return RetryPolicy(
+        max_attempts=max(1, int(os.getenv("TRAINER_MAX_ATTEMPTS", "3"))),
+        visibility_timeout_seconds=max(1.0, float(os.getenv("TRAINER_VISIBILITY_TIMEOUT_SECONDS", "300"))),
+        backoff_base_seconds=max(0.0, float(os.getenv("TRAINER_RETRY_BACKOFF_SECONDS", "30"))),
+        backoff_max_seconds=max(0.0, float(os.getenv("TRAINER_RETRY_BACKOFF_MAX_SECONDS", "600"))),
+    )
 
 
 async def worker_loop() -> None:
@@ -24,25 +49,36 @@ async def worker_loop() -> None:
 
     print(f"[trainer] boot redis={redis_url} queue={queue_key} storage={storage_root}", flush=True)
     redis = Redis.from_url(redis_url, decode_responses=True)
-    runner = TrainRunner(storage_root)
+    queue = ReliableQueue(redis, queue_key, policy=build_retry_policy())
+    executor = create_executor(storage_root, on_event=log_job_event)
+    reaper = asyncio.create_task(queue.run_reaper(), name="trainer-reaper")
 
     try:
         while True:
-            popped = await redis.blpop(queue_key, timeout=timeout_seconds)
-            if popped is None:
+            reservation = await queue.reserve(timeout=timeout_seconds)
+            if reservation is None:
                 continue
-            _queue_name, raw_payload = popped
             try:
-                job = parse_train_job(raw_payload)
+                job = parse_train_job(reservation.payload_raw)
             except Exception as exc:
                 print(f"[trainer] invalid job payload: {exc}", flush=True)
+                await queue.bury(reservation, error=f"invalid payload: {exc}")
+                continue
+            try:
+                result = await queue.process(reservation, lambda _payload_raw: executor.run(job))
+            except Exception as exc:
+                print(
+                    f"[trainer] job_id={job.job_id} failed on delivery {reservation.attempt}/{queue.policy.max_attempts}: {exc!r}",
+                    flush=True,
+                )
                 continue
-            result = runner.process(job)
             print(
                 f"[trainer] processed job_id={job.job_id} project={job.project_id} experiment={job.experiment_id} attempt={job.attempt} result={result}",
                 flush=True,
             )
     finally:
+        reaper.cancel()
+        await asyncio.gather(reaper, return_exceptions=True)
         await redis.aclose()
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 
 from pixel_sheriff_trainer.classification.train import (
     resolve_device,
@@ -20,10 +20,19 @@ from pixel_sheriff_trainer.utils.time import utc_now_iso
 
 
 class TrainRunner:
-    def __init__(self, storage_root: str) -> None:
+    def __init__(
+        self,
+        storage_root: str,
+        *,
+        cancel_requested: Callable[[], bool] | None = None,
+        event_listener: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
         self.storage = ExperimentStorage(storage_root)
         configure_torchvision_cache(storage_root)
-        self.events = EventLog(self.storage)
+        self.events = EventLog(self.storage, listener=event_listener)
+        # When supervised by an executor, cancellation arrives as a signal and is
+        # surfaced through this hook instead of re-reading status.json every batch.
+        self._cancel_requested = cancel_requested
 
     def _status_summary(self, status: str, attempt: int, job_id: str, message: str | None = None) -> dict[str, Any]:
         payload: dict[str, Any] = {
@@ -213,6 +222,8 @@ class TrainRunner:
                 emit_status(f"checkpoint write failed kind={result.kind} epoch={result.epoch}: {result.error}")
 
         def should_cancel() -> bool:
+            if self._cancel_requested is not None:
+                return self._cancel_requested()
             return self.storage.is_cancel_requested(job.project_id, job.experiment_id)
 
         try:
@@ -349,7 +360,8 @@ class TrainRunner:
                 )
             except RuntimeError as exc:
                 message = str(exc)
-                if "shared memory" not in message.lower() or self._num_workers_from_config(effective_training_config) <= 0:
+                loader_workers = max(self._num_workers_from_config(effective_training_config), int(getattr(loaders.train, "num_workers", 0) or 0))
+                if "shared memory" not in message.lower() or loader_workers <= 0:
                     raise
                 effective_training_config = self._config_with_num_workers(effective_training_config, 0)
                 emit_status("shared-memory error detected; retrying with num_workers=0")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
@@ -8,11 +9,14 @@ from typing import Any
 
 import numpy as np
 import torch
-from PIL import Image, ImageDraw
+from PIL import Image
 from torch.utils.data import DataLoader, Dataset
 from torchvision import transforms
 
 from pixel_sheriff_trainer.augmentation import apply_segmentation_augmentation, resolve_training_augmentation
+from pixel_sheriff_trainer.segmentation.mask_cache import MaskCache, annotation_digest, category_mapping_digest, rasterize_mask
+
+DEFAULT_MAX_NUM_WORKERS = 4
 
 
 @dataclass
@@ -30,6 +34,8 @@ class SegmentationDataset(Dataset):
     Rasterizes polygon annotations to pixel masks (H×W LongTensor, class indices).
     Supports polygon (segmentation field) and bbox fallback.
     Background class = 0. Category classes start at 1.
+    With a ``mask_cache`` each mask is rasterized once and read back as PNG on
+    later epochs (and by later experiments on the same annotations).
     """
 
     def __init__(
@@ -42,6 +48,7 @@ class SegmentationDataset(Dataset):
         augmentation_steps: list[Any] | None = None,
         target_width: int,
         target_height: int,
+        mask_cache: MaskCache | None = None,
     ) -> None:
         self.samples = samples
         self.annotations = annotations
@@ -50,51 +57,44 @@ class SegmentationDataset(Dataset):
         self.augmentation_steps = list(augmentation_steps or [])
         self.target_width = target_width
         self.target_height = target_height
+        self.mask_cache = mask_cache
+        self._mapping_digest = category_mapping_digest(cat_id_to_idx)
+        self._annotation_digests = (
+            {sample.image_id: annotation_digest(annotations.get(sample.image_id, [])) for sample in samples}
+            if mask_cache is not None
+            else {}
+        )
 
     def __len__(self) -> int:
         return len(self.samples)
 
+    def _mask_for(self, sample: SegmentationSample, source_size: tuple[int, int]) -> Image.Image:
+        target_size = (self.target_width, self.target_height)
+        anns = self.annotations.get(sample.image_id, [])
+        if self.mask_cache is None:
+            return rasterize_mask(anns, self.cat_id_to_idx, source_size=source_size, target_size=target_size)
+
+        key = self.mask_cache.key(
+            asset_id=sample.asset_id,
+            source_size=source_size,
+            target_size=target_size,
+            mapping_digest=self._mapping_digest,
+            annotations_digest=self._annotation_digests[sample.image_id],
+        )
+        mask = self.mask_cache.load(key)
+        if mask is None or mask.size != target_size:
+            mask = rasterize_mask(anns, self.cat_id_to_idx, source_size=source_size, target_size=target_size)
+            self.mask_cache.store(key, mask)
+        return mask
+
     def __getitem__(self, index: int) -> tuple[Any, Any]:
         sample = self.samples[index]
         with Image.open(sample.path) as img:
             image = img.convert("RGB")
 
-        orig_width, orig_height = image.size
+        source_size = image.size
         image = image.resize((self.target_width, self.target_height), Image.BILINEAR)
-
-        mask = Image.new("L", (self.target_width, self.target_height), 0)
-        draw = ImageDraw.Draw(mask)
-        scale_x = self.target_width / max(orig_width, 1)
-        scale_y = self.target_height / max(orig_height, 1)
-
-        anns = self.annotations.get(sample.image_id, [])
-        for ann in anns:
-            cat_id = int(ann.get("category_id", -1))
-            class_idx = self.cat_id_to_idx.get(cat_id)
-            if class_idx is None:
-                continue
-            fill_val = class_idx + 1  # 1-indexed (0 = background)
-
-            segmentation = ann.get("segmentation")
-            if isinstance(segmentation, list) and segmentation:
-                for polygon in segmentation:
-                    if not isinstance(polygon, list) or len(polygon) < 6:
-                        continue
-                    scaled_pts = [
-                        (float(polygon[i]) * scale_x, float(polygon[i + 1]) * scale_y)
-                        for i in range(0, len(polygon) - 1, 2)
-                    ]
-                    if len(scaled_pts) >= 3:
-                        draw.polygon(scaled_pts, fill=fill_val)
-            else:
-                bbox = ann.get("bbox")
-                if isinstance(bbox, list) and len(bbox) >= 4:
-                    x, y, w, h = bbox
-                    x0 = float(x) * scale_x
-                    y0 = float(y) * scale_y
-                    x1 = (float(x) + float(w)) * scale_x
-                    y1 = (float(y) + float(h)) * scale_y
-                    draw.rectangle([x0, y0, x1, y1], fill=fill_val)
+        mask = self._mask_for(sample, source_size)
 
         if self.augmentation_steps:
             image, mask = apply_segmentation_augmentation(image, mask, self.augmentation_steps)
@@ -132,6 +132,7 @@ def build_segmentation_loaders(
     workdir: Path,
     model_config: dict[str, Any],
     training_config: dict[str, Any],
+    mask_cache_dir: Path | None = None,
 ) -> LoadedSegmentationData:
     dataset_dir = _extract_if_missing(export_zip_path, workdir)
     coco_path = dataset_dir / "coco_instances.json"
@@ -240,23 +241,50 @@ def build_segmentation_loaders(
 
     batch_size = max(1, int(training_config.get("batch_size", 4)))
 
+    runtime = training_config.get("runtime")
+    advanced = training_config.get("advanced")
+    # Unlike classification, default to worker processes: image decode + resize dominate
+    # once masks come from the cache, and they parallelize cleanly.
+    num_workers = min(DEFAULT_MAX_NUM_WORKERS, max(0, (os.cpu_count() or 1) - 1))
+    if isinstance(runtime, dict) and isinstance(runtime.get("num_workers"), int):
+        num_workers = max(0, int(runtime["num_workers"]))
+    elif isinstance(advanced, dict) and isinstance(advanced.get("num_workers"), int):
+        num_workers = max(0, int(advanced["num_workers"]))
+
+    persistent_workers = num_workers > 0
+    if isinstance(runtime, dict) and isinstance(runtime.get("persistent_workers"), bool):
+        persistent_workers = bool(runtime["persistent_workers"]) and num_workers > 0
+    prefetch_factor = 2
+    if isinstance(runtime, dict) and isinstance(runtime.get("prefetch_factor"), int):
+        prefetch_factor = max(1, int(runtime["prefetch_factor"]))
+    pin_memory = False
+    if isinstance(runtime, dict) and isinstance(runtime.get("pin_memory"), bool):
+        pin_memory = bool(runtime["pin_memory"])
+
+    use_mask_cache = True
+    if isinstance(runtime, dict) and isinstance(runtime.get("cache_masks"), bool):
+        use_mask_cache = bool(runtime["cache_masks"])
+    mask_cache = MaskCache(mask_cache_dir or workdir / "mask_cache") if use_mask_cache else None
+
     train_dataset = SegmentationDataset(
         train_samples, annotations_by_image, cat_id_to_idx, image_transform,
         augmentation_steps=augmentation_steps,
         target_width=target_width, target_height=target_height,
+        mask_cache=mask_cache,
     )
     val_dataset = SegmentationDataset(
         val_samples, annotations_by_image, cat_id_to_idx, image_transform,
         augmentation_steps=[],
         target_width=target_width, target_height=target_height,
+        mask_cache=mask_cache,
     )
 
-    train_loader: DataLoader[Any] = DataLoader(
-        train_dataset, batch_size=batch_size, shuffle=True, num_workers=0,
-    )
-    val_loader: DataLoader[Any] = DataLoader(
-        val_dataset, batch_size=batch_size, shuffle=False, num_workers=0,
-    )
+    loader_kwargs: dict[str, Any] = {"batch_size": batch_size, "num_workers": num_workers, "pin_memory": pin_memory}
+    if num_workers > 0:
+        loader_kwargs["persistent_workers"] = persistent_workers
+        loader_kwargs["prefetch_factor"] = prefetch_factor
+    train_loader: DataLoader[Any] = DataLoader(train_dataset, shuffle=True, **loader_kwargs)
+    val_loader: DataLoader[Any] = DataLoader(val_dataset, shuffle=False, **loader_kwargs)
 
     return LoadedSegmentationData(
         train_loader=train_loader,
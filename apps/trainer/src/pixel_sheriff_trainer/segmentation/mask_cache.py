@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+import uuid
+
+from PIL import Image, ImageDraw
+
+# Bump when rasterization changes so stale masks are never reused.
+MASK_CACHE_VERSION = 1
+
+
+def annotation_digest(annotations: list[dict[str, Any]]) -> str:
+    """Hash of the geometry that feeds a mask; ids, areas and provenance are ignored."""
+    shapes = [
+        [ann.get("category_id"), ann.get("segmentation"), ann.get("bbox")]
+        for ann in annotations
+    ]
+    raw = json.dumps(shapes, separators=(",", ":"), sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def category_mapping_digest(cat_id_to_idx: dict[int, int]) -> str:
+    raw = json.dumps(sorted(cat_id_to_idx.items()), separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def rasterize_mask(
+    annotations: list[dict[str, Any]],
+    cat_id_to_idx: dict[int, int],
+    *,
+    source_size: tuple[int, int],
+    target_size: tuple[int, int],
+) -> Image.Image:
+    """Draw polygons (bbox fallback) into an "L" mask of class indices; 0 is background."""
+    target_width, target_height = target_size
+    mask = Image.new("L", (target_width, target_height), 0)
+    draw = ImageDraw.Draw(mask)
+    scale_x = target_width / max(source_size[0], 1)
+    scale_y = target_height / max(source_size[1], 1)
+
+    for ann in annotations:
+        cat_id = int(ann.get("category_id", -1))
+        class_idx = cat_id_to_idx.get(cat_id)
+        if class_idx is None:
+            continue
+        fill_val = class_idx + 1  # 1-indexed (0 = background)
+
+        segmentation = ann.get("segmentation")
+        if isinstance(segmentation, list) and segmentation:
+            for polygon in segmentation:
+                if not isinstance(polygon, list) or len(polygon) < 6:
+                    continue
+                scaled_pts = [
+                    (float(polygon[i]) * scale_x, float(polygon[i + 1]) * scale_y)
+                    for i in range(0, len(polygon) - 1, 2)
+                ]
+                if len(scaled_pts) >= 3:
+                    draw.polygon(scaled_pts, fill=fill_val)
+        else:
+            bbox = ann.get("bbox")
+            if isinstance(bbox, list) and len(bbox) >= 4:
+                x, y, w, h = bbox
+                x0 = float(x) * scale_x
+                y0 = float(y) * scale_y
+                x1 = (float(x) + float(w)) * scale_x
+                y1 = (float(y) + float(h)) * scale_y
+                draw.rectangle([x0, y0, x1, y1], fill=fill_val)
+    return mask
+
+
+class MaskCache:
+    """Content-addressed PNG store for rasterized masks.
+
+    A mask is keyed by asset, source and target size, category mapping and
+    annotation geometry, so any experiment whose dataset version resolves to the
+    same inputs reuses it, and edited annotations simply miss the cache.
+    Writes go through a temp file and ``os.replace`` so concurrent loader
+    workers never observe a partial PNG.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def key(
+        self,
+        *,
+        asset_id: str,
+        source_size: tuple[int, int],
+        target_size: tuple[int, int],
+        mapping_digest: str,
+        annotations_digest: str,
+    ) -> str:
+        raw = json.dumps(
+            [MASK_CACHE_VERSION, asset_id, list(source_size), list(target_size), mapping_digest, annotations_digest],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.png"
+
+    def load(self, key: str) -> Image.Image | None:
+        path = self.path(key)
+        try:
+            with Image.open(path) as cached:
+                cached.load()
+                return cached if cached.mode == "L" else cached.convert("L")
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, mask: Image.Image) -> None:
+        path = self.path(key)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.partial")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            mask.save(tmp_path, format="PNG", compress_level=1)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A read-only or full cache volume only costs re-rasterizing next epoch.
+            tmp_path.unlink(missing_ok=True)
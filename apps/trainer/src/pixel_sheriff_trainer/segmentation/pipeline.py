@@ -37,6 +37,8 @@ class SegmentationPipeline(TaskPipeline):
             workdir=workdir,
             model_config=job.model_config,
             training_config=job.training_config,
+            # Shared by the project's experiments; entries are keyed by content, so nothing is invalidated.
+            mask_cache_dir=storage_root / "derived" / "segmentation_masks" / str(job.project_id),
         )
         return TaskLoaders(
             train=loaded.train_loader,
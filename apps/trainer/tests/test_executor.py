@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+from pathlib import Path
+import threading
+import time
+import uuid
+
+import pytest
+
+from pixel_sheriff_trainer.executor import ExecutorLimits, ProcessTrainExecutor, limits_from_env
+from pixel_sheriff_trainer.io.events import EventLog
+from pixel_sheriff_trainer.io.storage import ExperimentStorage
+from pixel_sheriff_trainer.jobs import TrainJob
+
+
+def _job(project_id: str, experiment_id: str, job_id: str) -> TrainJob:
+    return TrainJob(
+        job_id=job_id,
+        job_version="1",
+        job_type="train",
+        attempt=1,
+        project_id=project_id,
+        experiment_id=experiment_id,
+        model_id="model-1",
+        task="classification",
+        task_id=None,
+        model_config={},
+        training_config={},
+        dataset_export={},
+    )
+
+
+def _seed_status(root: Path, project_id: str, experiment_id: str, **fields) -> None:
+    storage = ExperimentStorage(str(root))
+    records_path = storage.records_path(project_id)
+    records_path.parent.mkdir(parents=True, exist_ok=True)
+    records_path.write_text(json.dumps([{"id": experiment_id, "status": fields.get("status", "queued")}]), encoding="utf-8")
+    storage.write_status(project_id, experiment_id, {"current_run_attempt": 1, **fields})
+
+
+class _ChildEnd:
+    """The child's end of the pipe; the executor closes its copy right after start."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def send(self, message) -> None:
+        self._conn.send(message)
+
+    def close(self) -> None:
+        pass
+
+
+class _ChattyProcess:
+    """Stands in for a child that streams events without pause and ignores SIGTERM."""
+
+    def __init__(self, target, args, name) -> None:
+        self._conn = args[2]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._stream, daemon=True)
+        self.signals: list[str] = []
+        self.exitcode: int | None = None
+
+    def _stream(self) -> None:
+        for _ in range(1000):
+            if self._stop.is_set():
+                break
+            self._conn.send(("event", {"type": "metric"}))
+            time.sleep(0.005)
+        self.exitcode = -9 if self._stop.is_set() else 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def terminate(self) -> None:
+        self.signals.append("terminate")
+
+    def kill(self) -> None:
+        self.signals.append("kill")
+        self._stop.set()
+
+    def join(self) -> None:
+        self._thread.join()
+
+
+class _ChattyContext:
+    def __init__(self) -> None:
+        self.processes: list[_ChattyProcess] = []
+
+    def Pipe(self, duplex: bool = True):
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=duplex)
+        return parent_conn, _ChildEnd(child_conn)
+
+    def Process(self, target, args, name) -> _ChattyProcess:
+        process = _ChattyProcess(target, args, name)
+        self.processes.append(process)
+        return process
+
+
+def test_limits_from_env_ignores_invalid_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TRAINER_MAX_MEMORY_MB", "2048")
+    monkeypatch.setenv("TRAINER_CPU_COUNT", "bogus")
+    monkeypatch.delenv("TRAINER_NICE", raising=False)
+    assert limits_from_env() == ExecutorLimits(max_memory_mb=2048, cpu_count=0, nice=0)
+
+
+def test_event_log_notifies_listener(tmp_path: Path) -> None:
+    received: list[dict] = []
+    events = EventLog(ExperimentStorage(str(tmp_path)), listener=received.append)
+    events.append("p1", "e1", 1, {"type": "status", "status": "running"})
+    assert received[0]["type"] == "status"
+    assert received[0]["attempt"] == 1
+
+
+def test_process_executor_returns_child_result(tmp_path: Path) -> None:
+    project_id, experiment_id = str(uuid.uuid4()), str(uuid.uuid4())
+    _seed_status(tmp_path, project_id, experiment_id, status="queued", active_job_id="other-job")
+    executor = ProcessTrainExecutor(str(tmp_path), poll_seconds=0.1)
+
+    result = asyncio.run(executor.run(_job(project_id, experiment_id, "job-1")))
+
+    assert result == "ignored:stale_job_id"
+
+
+def test_finalize_without_result_marks_running_job_failed(tmp_path: Path) -> None:
+    project_id, experiment_id = str(uuid.uuid4()), str(uuid.uuid4())
+    _seed_status(tmp_path, project_id, experiment_id, status="running", active_job_id="job-1")
+    executor = ProcessTrainExecutor(str(tmp_path))
+    job = _job(project_id, experiment_id, "job-1")
+
+    result = executor.finalize_without_result(job, exitcode=-9, canceled=False)
+
+    assert result == "failed:trainer_process_exited:-9"
+    status = executor.storage.read_status(project_id, experiment_id)
+    assert status["status"] == "failed"
+    assert status["active_job_id"] is None
+    events_path = executor.storage.events_path(project_id, experiment_id, 1)
+    done = json.loads(events_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert done["type"] == "done"
+    assert done["error_code"] == "trainer_process_exited"
+
+    assert executor.finalize_without_result(job, exitcode=-9, canceled=False) == "exited:code=-9"
+
+
+def test_finalize_without_result_marks_killed_cancel_as_canceled(tmp_path: Path) -> None:
+    project_id, experiment_id = str(uuid.uuid4()), str(uuid.uuid4())
+    _seed_status(tmp_path, project_id, experiment_id, status="running", active_job_id="job-1", cancel_requested=True)
+    executor = ProcessTrainExecutor(str(tmp_path))
+
+    result = executor.finalize_without_result(_job(project_id, experiment_id, "job-1"), exitcode=-9, canceled=True)
+
+    assert result == "canceled:killed"
+    assert executor.storage.read_status(project_id, experiment_id)["status"] == "canceled"
+
+
+def test_process_executor_cancels_child_that_never_stops_talking(tmp_path: Path) -> None:
+    project_id, experiment_id = str(uuid.uuid4()), str(uuid.uuid4())
+    _seed_status(tmp_path, project_id, experiment_id, status="running", active_job_id="job-1", cancel_requested=True)
+    events: list[dict] = []
+    executor = ProcessTrainExecutor(
+        str(tmp_path),
+        poll_seconds=0.5,
+        cancel_grace_seconds=0.2,
+        on_event=lambda _job, event: events.append(event),
+    )
+    context = _ChattyContext()
+    executor._context = context
+
+    started = time.monotonic()
+    result = asyncio.run(executor.run(_job(project_id, experiment_id, "job-1")))
+
+    assert result == "canceled:killed"
+    assert context.processes[0].signals == ["terminate", "kill"]
+    assert time.monotonic() - started < 3.0
+    assert events
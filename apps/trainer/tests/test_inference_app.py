@@ -1,4 +1,5 @@
 from __future__ import annotations
+import asyncio
 import json
 from pathlib import Path
 import math
@@ -8,10 +9,18 @@ import types
 
 from PIL import Image
 import pytest
+import torch
 
 import pixel_sheriff_trainer.inference.app as inference_app_module
 import pixel_sheriff_trainer.inference.session_cache as session_cache_module
-from pixel_sheriff_trainer.inference.schemas import InferDetectionRequest, InferDetectionWarmupRequest
+from pixel_sheriff_trainer.inference.batching import MicroBatcher
+from pixel_sheriff_trainer.inference.schemas import (
+    FlorenceDetectBatchRequest,
+    FlorenceDetectRequest,
+    InferClassificationBatchRequest,
+    InferDetectionRequest,
+    InferDetectionWarmupRequest,
+)
 
 
 @pytest.mark.asyncio
@@ -66,6 +75,149 @@ async def test_detection_warmup_endpoint_returns_selected_device(tmp_path: Path,
     assert response.model_dump() == {"device_selected": "cuda", "warmed": True}
 
 
+@pytest.mark.asyncio
+async def test_warmup_reuses_cached_model_identity_and_reports_stats(tmp_path: Path, monkeypatch) -> None:
+    storage_root = tmp_path / "storage"
+    onnx_path = storage_root / "models" / "demo.onnx"
+    metadata_path = storage_root / "models" / "demo.metadata.json"
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    onnx_path.write_bytes(b"fake-onnx")
+    metadata_path.write_text("{}", encoding="utf-8")
+
+    hashed: list[Path] = []
+
+    def _sha256_file(path: Path) -> str:
+        hashed.append(path)
+        return "model-key"
+
+    monkeypatch.setenv("STORAGE_ROOT", str(storage_root))
+    monkeypatch.setattr(inference_app_module, "sha256_file", _sha256_file)
+    monkeypatch.setattr(
+        session_cache_module,
+        "ort",
+        type(
+            "_DummyOrt",
+            (),
+            {
+                "get_available_providers": staticmethod(lambda: ["CPUExecutionProvider"]),
+                "InferenceSession": object,
+            },
+        ),
+    )
+
+    async def _acquire_session(self, *, model_key: str, onnx_path: Path, device_preference: str):
+        return object(), "cpu"
+
+    async def _release(self, model_key: str, device_selected: str) -> None:
+        return None
+
+    monkeypatch.setattr(inference_app_module.SessionCache, "acquire_session", _acquire_session)
+    monkeypatch.setattr(inference_app_module.SessionCache, "release", _release)
+
+    app = inference_app_module.create_app()
+    warmup_route = next(route for route in app.routes if getattr(route, "path", None) == "/infer/detection/warmup")
+    stats_route = next(route for route in app.routes if getattr(route, "path", None) == "/infer/stats")
+    payload = InferDetectionWarmupRequest(
+        onnx_relpath="models/demo.onnx",
+        metadata_relpath="models/demo.metadata.json",
+        model_key="model-key",
+    )
+
+    await warmup_route.endpoint(payload)
+    await warmup_route.endpoint(payload)
+    assert hashed == [onnx_path.resolve()]
+
+    stats = await stats_route.endpoint()
+    assert stats.model_identity.model_dump() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+class _BatchSession:
+    def __init__(self, num_classes: int = 3) -> None:
+        self.batch_sizes: list[int] = []
+        self._num_classes = num_classes
+
+    def get_inputs(self):
+        return [types.SimpleNamespace(name="input")]
+
+    def run(self, _output_names, feeds):
+        tensor = feeds["input"]
+        self.batch_sizes.append(int(tensor.shape[0]))
+        # Row i favours class i so results can be matched back to their inputs.
+        logits = np.zeros((tensor.shape[0], self._num_classes), dtype=np.float32)
+        for index in range(tensor.shape[0]):
+            logits[index, int(round(float(tensor[index, 0, 0, 0]))) % self._num_classes] = 5.0
+        return [logits]
+
+
+@pytest.mark.asyncio
+async def test_classification_batch_endpoint_stacks_images_into_one_run(tmp_path: Path, monkeypatch) -> None:
+    storage_root = tmp_path / "storage"
+    onnx_path = storage_root / "models" / "demo.onnx"
+    metadata_path = storage_root / "models" / "demo.metadata.json"
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    onnx_path.write_bytes(b"fake-onnx")
+    metadata_path.write_text(
+        json.dumps(
+            {
+                "preprocess": {
+                    "resize_policy": "stretch",
+                    "resize": {"width": 8, "height": 8},
+                    "normalization": {"type": "none"},
+                },
+                "onnx": {"input_names": ["input"], "dynamic_axes": {"input": {"0": "batch_size"}}},
+            }
+        ),
+        encoding="utf-8",
+    )
+    (storage_root / "assets").mkdir(parents=True)
+    for index in range(3):
+        # Red channel 0/255/0 -> normalized pixel 0.0/1.0/0.0 selects class 0/1/0.
+        Image.new("RGB", (16, 16), color=(255 if index == 1 else 0, 0, 0)).save(storage_root / "assets" / f"{index}.png")
+
+    session = _BatchSession()
+    monkeypatch.setenv("STORAGE_ROOT", str(storage_root))
+    monkeypatch.setattr(inference_app_module, "sha256_file", lambda _path: "model-key")
+
+    async def _acquire_session(self, *, model_key: str, onnx_path: Path, device_preference: str):
+        return session, "cpu"
+
+    async def _release(self, model_key: str, device_selected: str) -> None:
+        return None
+
+    monkeypatch.setattr(inference_app_module.SessionCache, "acquire_session", _acquire_session)
+    monkeypatch.setattr(inference_app_module.SessionCache, "release", _release)
+
+    app = inference_app_module.create_app()
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/infer/classification/batch")
+    payload = InferClassificationBatchRequest(
+        onnx_relpath="models/demo.onnx",
+        metadata_relpath="models/demo.metadata.json",
+        asset_relpaths=["assets/0.png", "assets/missing.png", "assets/1.png", "assets/2.png"],
+        top_k=1,
+    )
+
+    response = await route.endpoint(payload)
+
+    assert session.batch_sizes == [3]
+    assert [item.asset_relpath for item in response.items] == payload.asset_relpaths
+    assert response.items[1].error is not None and response.items[1].error.code == "artifact_not_found"
+    assert [item.predictions[0].class_index for item in response.items if item.error is None] == [0, 1, 0]
+    assert all(item.output_dim == 3 for item in response.items if item.error is None)
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_coalesces_concurrent_requests() -> None:
+    session = _BatchSession()
+    batcher = MicroBatcher(window_seconds=0.05, max_batch_size=8)
+    tensors = [np.full((1, 3, 2, 2), float(index), dtype=np.float32) for index in range(3)]
+
+    rows = await asyncio.gather(*(batcher.run(("model-key", "cpu"), session, tensor) for tensor in tensors))
+
+    assert session.batch_sizes == [3]
+    assert [int(np.argmax(row[0])) for row in rows] == [0, 1, 2]
+    assert batcher.stats() == {"batches": 1, "items": 3}
+
+
 def test_parse_detection_output_supports_separate_outputs_with_one_based_labels() -> None:
     detections = inference_app_module._parse_detection_output(
         [
@@ -233,9 +385,10 @@ def test_parse_florence_generation_skips_malformed_entries() -> None:
     ]
 
 
-def test_run_florence_detection_disables_generation_cache(tmp_path: Path) -> None:
+def test_run_florence_detection_decoding_profiles_fall_back_without_kv_cache(tmp_path: Path) -> None:
     image_path = tmp_path / "frame.jpg"
     Image.new("RGB", (32, 24), color=(12, 34, 56)).save(image_path)
+    generate_calls: list[dict[str, object]] = []
 
     class _FakeInputs(dict):
         def to(self, _device: str):
@@ -265,31 +418,210 @@ def test_run_florence_detection_disables_generation_cache(tmp_path: Path) -> Non
             }
 
     class _FakeModel:
+        def __init__(self, *, kv_cache_breaks: bool) -> None:
+            self.kv_cache_breaks = kv_cache_breaks
+
         def generate(self, **kwargs):
-            assert kwargs["use_cache"] is False
-            assert kwargs["num_beams"] == 3
-            assert kwargs["do_sample"] is False
+            generate_calls.append({key: kwargs[key] for key in ("num_beams", "use_cache", "do_sample")})
+            if kwargs["use_cache"] and self.kv_cache_breaks:
+                raise AttributeError("'NoneType' object has no attribute 'shape'")
             return [[101, 102]]
 
-    detections = inference_app_module._run_florence_detection(
-        _FakeModel(),
-        _FakeProcessor(),
-        "cpu",
-        image_path,
-        ["human"],
-        0.25,
-        20,
+    def run(model: _FakeModel, profile: str) -> list[dict[str, object]]:
+        detections = inference_app_module._run_florence_detection(
+            model, _FakeProcessor(), "cpu", image_path, ["human"], 0.25, 20, profile
+        )
+        return [item.model_dump() for item in detections]
+
+    expected = [{"label_text": "human", "score": 0.9, "bbox": [1.0, 2.0, 10.0, 20.0]}]
+    assert run(_FakeModel(kv_cache_breaks=False), "quality") == expected
+    assert run(_FakeModel(kv_cache_breaks=False), "fast") == expected
+    assert generate_calls == [
+        {"num_beams": 3, "use_cache": True, "do_sample": False},
+        {"num_beams": 1, "use_cache": True, "do_sample": False},
+    ]
+
+    # A model whose remote code cannot decode with the KV cache is retried without it, then remembered.
+    generate_calls.clear()
+    broken = _FakeModel(kv_cache_breaks=True)
+    try:
+        assert run(broken, "fast") == expected
+        assert run(broken, "fast") == expected
+    finally:
+        inference_app_module._FLORENCE_NO_KV_CACHE.discard(id(broken))
+    assert [call["use_cache"] for call in generate_calls] == [True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_florence_detect_batch_preprocesses_each_image_once_across_profiles(tmp_path: Path, monkeypatch) -> None:
+    storage_root = tmp_path / "storage"
+    (storage_root / "assets").mkdir(parents=True)
+    for name, size in (("a.jpg", (32, 24)), ("b.jpg", (40, 30)), ("c.jpg", (16, 16))):
+        Image.new("RGB", size, color=(12, 34, 56)).save(storage_root / "assets" / name)
+
+    image_sizes: list[tuple[int, int]] = []
+    prompt_calls: list[str] = []
+    generate_calls: list[tuple[int, int, int]] = []
+
+    class _FakeImageProcessor:
+        def __call__(self, image, *, return_tensors: str):
+            image_sizes.append(image.size)
+            return {"pixel_values": torch.zeros((1, 3, 4, 4))}
+
+    class _FakeProcessor:
+        image_processor = _FakeImageProcessor()
+
+        def __call__(self, *, text: str, images, return_tensors: str):
+            prompt_calls.append(text)
+            return {"input_ids": torch.tensor([[1, 2]]), "pixel_values": torch.zeros((1, 3, 4, 4))}
+
+        def batch_decode(self, generated_ids, *, skip_special_tokens: bool):
+            return [f"seq-{index}" for index in range(len(generated_ids))]
+
+        def post_process_generation(self, _generated_text: str, *, task: str, image_size: tuple[int, int]):
+            width, height = image_size
+            return {task: {"bboxes": [[0.0, 0.0, float(width), float(height)]], "labels": ["human"], "scores": [0.9]}}
+
+    class _FakeModel:
+        def generate(self, **kwargs):
+            assert kwargs["use_cache"] is True
+            assert kwargs["input_ids"].shape[0] == kwargs["pixel_values"].shape[0]
+            generate_calls.append((kwargs["input_ids"].shape[0], kwargs["num_beams"], kwargs["max_new_tokens"]))
+            return torch.zeros((kwargs["input_ids"].shape[0], 1), dtype=torch.long)
+
+    monkeypatch.setenv("STORAGE_ROOT", str(storage_root))
+    monkeypatch.setenv("FLORENCE_MAX_BATCH_SIZE", "2")
+    runtime = (_FakeModel(), _FakeProcessor(), "cpu")
+    monkeypatch.setattr(inference_app_module, "_load_florence_runtime", lambda _name: runtime)
+    app = inference_app_module.create_app()
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/infer/florence/detect/batch")
+    relpaths = ["assets/a.jpg", "assets/missing.jpg", "assets/b.jpg", "assets/c.jpg"]
+
+    response = await route.endpoint(FlorenceDetectBatchRequest(asset_relpaths=relpaths, prompts=["human"]))
+
+    assert generate_calls == [(2, 3, 256), (1, 3, 256)]
+    assert prompt_calls == ["<OPEN_VOCABULARY_DETECTION> human"]
+    assert image_sizes == [(32, 24), (40, 30), (16, 16)]
+    assert [item.asset_relpath for item in response.items] == relpaths
+    assert response.items[1].error is not None and response.items[1].error.code == "artifact_not_found"
+    assert [item.boxes[0].bbox for item in response.items if item.error is None] == [
+        [0.0, 0.0, 32.0, 24.0],
+        [0.0, 0.0, 40.0, 30.0],
+        [0.0, 0.0, 16.0, 16.0],
+    ]
+
+    # Another profile and prompt over the same frames reuses their pixel values.
+    generate_calls.clear()
+    await route.endpoint(
+        FlorenceDetectBatchRequest(asset_relpaths=relpaths, prompts=["dog"], decoding_profile="fast")
     )
+    assert generate_calls == [(2, 1, 256), (1, 1, 256)]
+    assert prompt_calls == ["<OPEN_VOCABULARY_DETECTION> human", "<OPEN_VOCABULARY_DETECTION> dog"]
+    assert len(image_sizes) == 3
+    stats = await next(route for route in app.routes if getattr(route, "path", None) == "/infer/stats").endpoint()
+    assert stats.florence_inputs is not None
+    assert (stats.florence_inputs.hits, stats.florence_inputs.misses) == (3, 3)
 
-    assert [item.model_dump() for item in detections] == [
-        {
-            "label_text": "human",
-            "score": 0.9,
-            "bbox": [1.0, 2.0, 10.0, 20.0],
-        }
+
+@pytest.mark.asyncio
+async def test_florence_detect_per_prompt_encodes_image_once_and_labels_boxes_by_prompt(tmp_path: Path, monkeypatch) -> None:
+    storage_root = tmp_path / "storage"
+    (storage_root / "assets").mkdir(parents=True)
+    Image.new("RGB", (32, 24), color=(12, 34, 56)).save(storage_root / "assets" / "a.jpg")
+    image_token_id = 9
+    vision_calls: list[tuple[int, ...]] = []
+    encoder_calls: list[tuple[list[int], list[list[int]]]] = []
+    generate_calls: list[tuple[int, int]] = []
+
+    class _FakeImageProcessor:
+        def __call__(self, image, *, return_tensors: str):
+            return {"pixel_values": torch.zeros((1, 3, 4, 4))}
+
+    class _FakeProcessor:
+        image_processor = _FakeImageProcessor()
+
+        def __call__(self, *, text: str, images, return_tensors: str):
+            # Two image placeholders, then one token per word.
+            return {"input_ids": torch.tensor([[image_token_id, image_token_id] + [1] * len(text.split())])}
+
+        def batch_decode(self, generated_ids, *, skip_special_tokens: bool):
+            return ["ignored"] * len(generated_ids)
+
+        def post_process_generation(self, _generated_text: str, *, task: str, image_size: tuple[int, int]):
+            return {task: {"bboxes": [[0.0, 0.0, 8.0, 8.0], [4.0, 4.0, 16.0, 16.0]], "labels": ["thing", "thing"]}}
+
+    class _FakeModel:
+        config = types.SimpleNamespace(image_token_id=image_token_id)
+
+        def __init__(self) -> None:
+            self.embeddings = torch.nn.Embedding(16, 4)
+
+        def get_image_features(self, pixel_values):
+            vision_calls.append(tuple(pixel_values.shape))
+            return torch.ones((pixel_values.shape[0], 2, 4))
+
+        def get_input_embeddings(self):
+            return self.embeddings
+
+        def get_encoder(self):
+            def encode(*, inputs_embeds, attention_mask):
+                # Image features land in the placeholder slots of every prompt row.
+                assert torch.equal(inputs_embeds[:, :2], torch.ones((inputs_embeds.shape[0], 2, 4)))
+                encoder_calls.append((list(inputs_embeds.shape), attention_mask.tolist()))
+                return {"last_hidden_state": inputs_embeds}
+
+            return encode
+
+        def generate(self, *, encoder_outputs, attention_mask, **options):
+            generate_calls.append((attention_mask.shape[0], options["num_beams"]))
+            return torch.zeros((attention_mask.shape[0], 1), dtype=torch.long)
+
+    monkeypatch.setenv("STORAGE_ROOT", str(storage_root))
+    monkeypatch.setenv("FLORENCE_MAX_BATCH_SIZE", "2")
+    runtime = (_FakeModel(), _FakeProcessor(), "cpu")
+    monkeypatch.setattr(inference_app_module, "_load_florence_runtime", lambda _name: runtime)
+    app = inference_app_module.create_app()
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/infer/florence/detect")
+
+    response = await route.endpoint(
+        FlorenceDetectRequest(
+            asset_relpath="assets/a.jpg",
+            prompts=["person", "traffic cone", "dog"],
+            max_detections=4,
+            prompt_mode="per_prompt",
+        )
+    )
+
+    assert vision_calls == [(1, 3, 4, 4)]
+    # "<OPEN_VOCABULARY_DETECTION> traffic cone" is one token longer; the shorter row is padded and masked.
+    assert encoder_calls == [
+        ([2, 5, 4], [[1, 1, 1, 1, 0], [1, 1, 1, 1, 1]]),
+        ([1, 4, 4], [[1, 1, 1, 1]]),
+    ]
+    assert generate_calls == [(2, 3), (1, 3)]
+    assert [(box.label_text, box.bbox) for box in response.boxes] == [
+        ("person", [0.0, 0.0, 8.0, 8.0]),
+        ("traffic cone", [0.0, 0.0, 8.0, 8.0]),
+        ("dog", [0.0, 0.0, 8.0, 8.0]),
+        ("person", [4.0, 4.0, 16.0, 16.0]),
     ]
 
 
+def test_quantize_florence_language_model_swaps_linear_layers() -> None:
+    class _FakeFlorence(torch.nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+            self.vision_tower = torch.nn.Linear(4, 4)
+            self.language_model = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.ReLU(), torch.nn.Linear(8, 4))
+
+    model = _FakeFlorence().eval()
+    inference_app_module._quantize_florence_language_model(model)
+
+    assert isinstance(model.vision_tower, torch.nn.Linear)
+    assert all(type(layer) is not torch.nn.Linear for layer in model.language_model if not isinstance(layer, torch.nn.ReLU))
+    assert model.language_model(torch.ones((1, 4))).shape == (1, 4)
+
+
 def test_load_florence_runtime_retries_meta_tensor_failure(monkeypatch) -> None:
     inference_app_module._FLORENCE_CACHE.clear()
 
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from pixel_sheriff_trainer.inference.session_cache import CacheBusyError, SessionCache
+from pixel_sheriff_trainer.inference.session_cache import CacheBusyError, ModelIdentityCache, SessionCache, sha256_file
 import pixel_sheriff_trainer.inference.session_cache as session_cache_module
 
 
@@ -94,3 +94,42 @@ async def test_cache_ttl_eviction_reloads_session() -> None:
     session_b, device_b = await cache.acquire_session(model_key="m1", onnx_path=Path("/tmp/m1.onnx"), device_preference="cpu")
     await cache.release("m1", device_b)
     assert session_a is not session_b
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_memoizes_until_file_stat_changes(tmp_path: Path) -> None:
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"weights-v1")
+    calls: list[Path] = []
+
+    def _loader(path: Path) -> str:
+        calls.append(path)
+        return path.read_bytes().decode("utf-8")
+
+    identities = ModelIdentityCache()
+    assert await identities.get(model_path, _loader) == "weights-v1"
+    assert await identities.get(model_path, _loader) == "weights-v1"
+    assert len(calls) == 1
+    assert identities.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    model_path.write_bytes(b"weights-v2-longer")
+    assert await identities.get(model_path, _loader) == "weights-v2-longer"
+    assert len(calls) == 2
+    assert identities.stats() == {"hits": 1, "misses": 2, "entries": 1}
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_keys_by_loader_and_evicts_lru(tmp_path: Path) -> None:
+    paths = [tmp_path / f"m{index}.onnx" for index in range(3)]
+    for path in paths:
+        path.write_bytes(path.name.encode("utf-8"))
+
+    identities = ModelIdentityCache(max_entries=2)
+    assert await identities.get(paths[0], sha256_file) == session_cache_module.sha256_file(paths[0])
+    assert await identities.get(paths[0], lambda path: path.name) == "m0.onnx"
+    await identities.get(paths[1], sha256_file)
+    await identities.get(paths[2], sha256_file)
+
+    assert identities.stats() == {"hits": 0, "misses": 4, "entries": 2}
+    await identities.get(paths[0], sha256_file)
+    assert identities.stats()["misses"] == 5
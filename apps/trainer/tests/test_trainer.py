@@ -990,6 +990,40 @@ def test_segmentation_loader_accepts_uuid_image_ids(tmp_path: Path) -> None:
     assert int(train_masks.max().item()) == 1
 
 
+def test_segmentation_mask_cache_is_reused_across_workdirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not HAS_TORCH:
+        pytest.skip("torch/torchvision not available")
+    import pixel_sheriff_trainer.segmentation.dataset as segmentation_dataset
+
+    project_id = str(uuid.uuid4())
+    zip_path = _write_tiny_coco_export_zip(tmp_path, project_id, include_segmentation=True)
+    cache_dir = tmp_path / "mask_cache"
+
+    def _masks(workdir: str, runtime: dict) -> list:
+        loaded = build_segmentation_loaders(
+            export_zip_path=zip_path,
+            workdir=tmp_path / workdir,
+            model_config={"input": {"input_size": [32, 32]}},
+            training_config={"batch_size": 1, "runtime": runtime},
+            mask_cache_dir=cache_dir,
+        )
+        dataset = loaded.val_loader.dataset
+        return [dataset[index][1] for index in range(len(dataset))]
+
+    expected = _masks("uncached", {"num_workers": 0, "cache_masks": False})
+    assert not cache_dir.exists()
+    first = _masks("first", {"num_workers": 0})
+    assert all(torch.equal(mask, reference) for mask, reference in zip(first, expected))
+    assert len(list(cache_dir.rglob("*.png"))) == len(expected)
+
+    def _fail(*_args: object, **_kwargs: object) -> None:
+        raise AssertionError("cached masks must not be rasterized again")
+
+    monkeypatch.setattr(segmentation_dataset, "rasterize_mask", _fail)
+    second = _masks("second", {"num_workers": 0})
+    assert all(torch.equal(mask, reference) for mask, reference in zip(second, expected))
+
+
 @pytest.mark.skipif(not HAS_TORCH, reason="torch is required")
 def test_runner_process_writes_events_metrics_and_checkpoints(tmp_path: Path) -> None:
     if not HAS_TORCH:
@@ -11,7 +11,7 @@ import { DatasetVersionsPanel } from "../../../../components/workspace/dataset/D
 import { ProjectSectionLayout } from "../../../../components/workspace/project-shell/ProjectSectionLayout";
 import { useProjectShell } from "../../../../components/workspace/project-shell/ProjectShellContext";
 import { useDatasetPageState } from "../../../../lib/hooks/useDatasetPageState";
-import { classDisplayName, selectedVersionName } from "../../../../lib/workspace/datasetPage";
+import { classDisplayName, selectedVersionName, thumbnailUrlForAsset } from "../../../../lib/workspace/datasetPage";
 import { buildModelCreateHref } from "../../../../lib/workspace/projectRouting";
 
 interface DatasetPageProps {
@@ -32,7 +32,7 @@ export default function DatasetPage({ params }: DatasetPageProps) {
     selectedTaskId,
     selectedTaskKind: selectedTask?.kind ?? null,
   });
-  const resolveDatasetAssetUri = (assetId: string) => resolveAssetUri(`/api/v1/assets/${assetId}/content`);
+  const resolveDatasetAssetUri = (assetId: string) => resolveAssetUri(thumbnailUrlForAsset(assetId));
   const trainModelHref = buildModelCreateHref(projectId, {
     taskId: selectedTaskId,
     datasetVersionId: state.browser.selectedDatasetVersionId,
@@ -2225,7 +2225,7 @@ export default function ExperimentDetailPage({ params }: ExperimentDetailPagePro
                             key={`${row.asset_id}-${index}`}
                             onClick={() => setSelectedSampleImage(row)}
                           >
-                            <img src={`/api/v1/assets/${encodeURIComponent(row.asset_id)}/content`} alt={row.asset_id} loading="lazy" />
+                            <img src={`/api/v1/assets/${encodeURIComponent(row.asset_id)}/thumbnail?size=256`} alt={row.asset_id} loading="lazy" />
                             <span>True: {classNames[row.true_class_index] ?? row.true_class_index}</span>
                             <span>Pred: {classNames[row.pred_class_index] ?? row.pred_class_index}</span>
                             <span>Conf: {row.confidence.toFixed(4)}</span>
@@ -2303,7 +2303,7 @@ export default function ExperimentDetailPage({ params }: ExperimentDetailPagePro
                     key={`${row.asset_id}-${index}`}
                     onClick={() => setSelectedSampleImage(row)}
                   >
-                    <img src={`/api/v1/assets/${encodeURIComponent(row.asset_id)}/content`} alt={row.asset_id} loading="lazy" />
+                    <img src={`/api/v1/assets/${encodeURIComponent(row.asset_id)}/thumbnail?size=256`} alt={row.asset_id} loading="lazy" />
                     <span>True: {classNames[row.true_class_index] ?? row.true_class_index}</span>
                     <span>Pred: {classNames[row.pred_class_index] ?? row.pred_class_index}</span>
                     <span>Conf: {row.confidence.toFixed(4)}</span>
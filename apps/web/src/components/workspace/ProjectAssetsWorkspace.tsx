@@ -815,6 +815,7 @@ export default function ProjectAssetsWorkspace() {
             />
             <AiPrelabelsPanel
               session={prelabelState.session}
+              debugDetections={prelabelState.debugDetections}
               proposals={prelabelState.proposals}
               selectedProposalId={prelabelState.selectedProposalId}
               onSelectProposal={prelabelState.setSelectedProposalId}
@@ -1,9 +1,10 @@
-import type { PrelabelProposal, PrelabelSession } from "../../../lib/api";
+import type { PrelabelDebugDetection, PrelabelProposal, PrelabelSession } from "../../../lib/api";
 import { resolvePrelabelBBox } from "../../../lib/workspace/prelabelGeometry.js";
 import { derivePrelabelSessionStatus } from "../../../lib/workspace/prelabelStatus.js";
 
 interface AiPrelabelsPanelProps {
   session: PrelabelSession | null;
+  debugDetections: PrelabelDebugDetection[];
   proposals: PrelabelProposal[];
   selectedProposalId: string | null;
   onSelectProposal: (proposalId: string | null) => void;
@@ -22,7 +23,7 @@ function formatPercent(value: number): string {
   return `${Math.round(Math.max(0, Math.min(1, value)) * 100)}%`;
 }
 
-function describeDebugDetectionStatus(detection: NonNullable<PrelabelSession["debug_detections"]>[number]): string {
+function describeDebugDetectionStatus(detection: PrelabelDebugDetection): string {
   if (detection.status === "matched") {
     return detection.resolved_category_name ? `matched to ${detection.resolved_category_name}` : "matched";
   }
@@ -36,6 +37,7 @@ function describeDebugDetectionStatus(detection: NonNullable<PrelabelSession["de
 
 export function AiPrelabelsPanel({
   session,
+  debugDetections: latestDebugDetections,
   proposals,
   selectedProposalId,
   onSelectProposal,
@@ -53,7 +55,7 @@ export function AiPrelabelsPanel({
   const progressDenominator = Math.max(session?.enqueued_assets ?? 0, 1);
   const progressValue = session ? (session.processed_assets ?? 0) / progressDenominator : 0;
   const sessionStatusView = derivePrelabelSessionStatus(session);
-  const debugDetections = session ? [...(session.debug_detections ?? [])].slice(-8).reverse() : [];
+  const debugDetections = session ? [...latestDebugDetections].reverse() : [];
 
   return (
     <section className="ai-prelabels-panel" aria-label="AI prelabels panel" data-testid="ai-prelabels-panel">
@@ -205,6 +205,19 @@ export function PrelabelSettingsSection({
               />
             </label>
           </div>
+          {resolvedValue.source_type === "florence2" ? (
+            <label className="project-field">
+              <span>Decoding</span>
+              <select
+                value={resolvedValue.decoding_profile ?? "quality"}
+                onChange={(event) => update({ decoding_profile: event.target.value === "fast" ? "fast" : "quality" })}
+              >
+                <option value="quality">Quality (beam search)</option>
+                <option value="fast">Fast (greedy)</option>
+              </select>
+              <span className="import-field-hint">Fast keeps up with live capture; quality finds more boxes per frame.</span>
+            </label>
+          ) : null}
           <label className="project-field">
             <span>Max detections / frame</span>
             <input
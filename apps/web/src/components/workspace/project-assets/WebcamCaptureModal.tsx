@@ -74,6 +74,7 @@ export function WebcamCaptureModal({
             frame_sampling: { mode: "every_n_frames", value: 2 },
             confidence_threshold: 0.25,
             max_detections_per_frame: 20,
+            decoding_profile: "fast",
           }
         : null,
     );
@@ -1,5 +1,5 @@
 import { ApiError, apiGet, apiPost, apiPostForm, requestNoContent } from "./client";
-import type { Asset, AssetCreatePayload } from "./types";
+import type { Asset, AssetBatchUploadResponse, AssetCreatePayload } from "./types";
 
 function inferMimeType(filename: string): string {
   const ext = filename.split(".").pop()?.toLowerCase() ?? "";
@@ -67,3 +67,14 @@ export function uploadAsset(projectId: string, file: File, relativePath?: string
     return apiPostForm<Asset>(`/projects/${projectId}/assets/upload`, formData);
   })();
 }
+
+export function uploadAssetBatch(projectId: string, files: File[], relativePaths?: string[]): Promise<AssetBatchUploadResponse> {
+  const formData = new FormData();
+  files.forEach((file, index) => {
+    // Slicing a File is lazy, so the browser streams each part instead of buffering the batch.
+    const part = file.type ? file : file.slice(0, file.size, inferMimeType(file.name));
+    formData.append("files", part, file.name);
+    if (relativePaths) formData.append("relative_paths", relativePaths[index] ?? "");
+  });
+  return apiPostForm<AssetBatchUploadResponse>(`/projects/${projectId}/assets/upload-batch`, formData);
+}
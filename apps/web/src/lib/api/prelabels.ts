@@ -1,5 +1,5 @@
 import { apiGet, apiPost } from "./client";
-import type { PrelabelConfig, PrelabelProposal, PrelabelSession, PrelabelSourceStatus } from "./types";
+import type { PrelabelConfig, PrelabelDebugDetection, PrelabelProposal, PrelabelSession, PrelabelSourceStatus } from "./types";
 
 
 export function listPrelabelSessions(projectId: string, taskId: string, sequenceId: string): Promise<{ items: PrelabelSession[] }> {
@@ -32,6 +32,21 @@ export function listPrelabelProposals(
   return apiGet<{ items: PrelabelProposal[] }>(`/projects/${projectId}/tasks/${taskId}/prelabels/${sessionId}/proposals${suffix}`);
 }
 
+export function listPrelabelDebugDetections(
+  projectId: string,
+  taskId: string,
+  sessionId: string,
+  params?: { after?: number | null; limit?: number },
+): Promise<{ items: PrelabelDebugDetection[]; next_after: number }> {
+  const query = new URLSearchParams();
+  if (params?.after !== undefined && params.after !== null) query.set("after", String(params.after));
+  if (params?.limit) query.set("limit", String(params.limit));
+  const suffix = query.toString() ? `?${query.toString()}` : "";
+  return apiGet<{ items: PrelabelDebugDetection[]; next_after: number }>(
+    `/projects/${projectId}/tasks/${taskId}/prelabels/${sessionId}/debug-detections${suffix}`,
+  );
+}
+
 export function acceptPrelabelProposals(
   projectId: string,
   taskId: string,
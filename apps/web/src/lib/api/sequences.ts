@@ -1,10 +1,11 @@
-import { apiGet, apiPost, apiPostForm } from "./client";
+import { apiGet, apiPost, apiPostForm, requestJson } from "./client";
 import type {
   Asset,
   AssetSequence,
   SequenceStatus,
   VideoImportPayload,
   VideoImportResponse,
+  VideoUpload,
   WebcamSessionCreatePayload,
   WebcamSessionCreateResponse,
 } from "./types";
@@ -47,17 +48,45 @@ export function uploadSequenceFrame(
   return apiPostForm<Asset>(`/projects/${projectId}/sequences/${sequenceId}/frames`, formData);
 }
 
-export function importVideo(projectId: string, file: File, payload: VideoImportPayload): Promise<VideoImportResponse> {
-  const formData = new FormData();
-  formData.append("file", file, file.name);
-  if (payload.task_id) formData.append("task_id", payload.task_id);
-  if (payload.folder_id) formData.append("folder_id", payload.folder_id);
-  if (payload.name) formData.append("name", payload.name);
-  formData.append("fps", String(payload.fps));
-  formData.append("max_frames", String(payload.max_frames));
-  formData.append("resize_mode", payload.resize_mode);
-  if (typeof payload.resize_width === "number") formData.append("resize_width", String(payload.resize_width));
-  if (typeof payload.resize_height === "number") formData.append("resize_height", String(payload.resize_height));
-   if (payload.prelabel_config) formData.append("prelabel_config", JSON.stringify(payload.prelabel_config));
-  return apiPostForm<VideoImportResponse>(`/projects/${projectId}/video-imports`, formData);
+const VIDEO_UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024;
+const VIDEO_UPLOAD_MAX_RETRIES = 5;
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+// Resumable import: the file is sent in PATCH chunks, and after a failed chunk the upload
+// continues from the offset the server reports instead of starting over.
+export async function importVideo(
+  projectId: string,
+  file: File,
+  payload: VideoImportPayload,
+  onProgress?: (uploadedBytes: number, totalBytes: number) => void,
+): Promise<VideoImportResponse> {
+  const base = `/projects/${projectId}/video-uploads`;
+  const upload = await apiPost<VideoUpload>(base, { ...payload, filename: file.name, length: file.size });
+  let offset = upload.offset;
+  let failures = 0;
+  while (offset < file.size) {
+    try {
+      const progress = await requestJson<VideoUpload>(`${base}/${upload.id}`, {
+        method: "PATCH",
+        headers: { "Upload-Offset": String(offset), "Content-Type": "application/offset+octet-stream" },
+        body: file.slice(offset, offset + VIDEO_UPLOAD_CHUNK_BYTES),
+      });
+      offset = progress.offset;
+      failures = 0;
+      onProgress?.(offset, file.size);
+    } catch (error) {
+      failures += 1;
+      if (failures > VIDEO_UPLOAD_MAX_RETRIES) throw error;
+      await sleep(500 * 2 ** (failures - 1));
+      try {
+        offset = (await apiGet<VideoUpload>(`${base}/${upload.id}`)).offset;
+      } catch {
+        // Keep the last known offset; a mismatch is reported and resolved on the next attempt.
+      }
+    }
+  }
+  return apiPost<VideoImportResponse>(`${base}/${upload.id}/finalize`, {});
 }
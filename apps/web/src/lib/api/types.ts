@@ -4,6 +4,7 @@ export type TaskKind = "classification" | "bbox" | "segmentation";
 export type TaskLabelMode = "single_label" | "multi_label";
 export type PrelabelSourceType = "active_deployment" | "florence2";
 export type PrelabelSamplingMode = "every_n_frames" | "every_n_seconds";
+export type PrelabelDecodingProfile = "fast" | "quality";
 export type PrelabelSessionStatus = "queued" | "running" | "completed" | "failed" | "cancelled";
 export type PrelabelProposalStatus = "pending" | "accepted" | "edited" | "rejected";
 export type PrelabelDebugDetectionStatus = "matched" | "unmatched" | "discarded";
@@ -59,9 +60,22 @@ export interface Asset {
   width: number | null;
   height: number | null;
   checksum: string;
+  perceptual_hash?: string | null;
   metadata_json: Record<string, unknown>;
 }
 
+export interface AssetUploadError {
+  index: number;
+  filename: string | null;
+  code: string;
+  message: string;
+}
+
+export interface AssetBatchUploadResponse {
+  items: Asset[];
+  errors: AssetUploadError[];
+}
+
 export interface AssetCreatePayload {
   type?: "image" | "video" | "frame";
   folder_id?: string | null;
@@ -151,6 +165,7 @@ export interface PrelabelConfig {
   frame_sampling: PrelabelFrameSampling;
   confidence_threshold: number;
   max_detections_per_frame: number;
+  decoding_profile?: PrelabelDecodingProfile;
 }
 
 export interface PrelabelSourceStatus {
@@ -176,6 +191,7 @@ export interface PrelabelSession {
   sampling_value: number;
   confidence_threshold: number;
   max_detections_per_frame: number;
+  decoding_profile: PrelabelDecodingProfile;
   live_mode: boolean;
   status: PrelabelSessionStatus;
   input_closed_at: string | null;
@@ -184,12 +200,13 @@ export interface PrelabelSession {
   generated_proposals: number;
   skipped_unmatched: number;
   error_message: string | null;
-  debug_detections: PrelabelDebugDetection[];
+  debug_detection_seq: number;
   created_at: string | null;
   updated_at: string | null;
 }
 
 export interface PrelabelDebugDetection {
+  seq: number;
   asset_id: string;
   asset_frame_index: number | null;
   label_text: string;
@@ -238,9 +255,22 @@ export interface VideoImportPayload {
   resize_mode: "original" | "width" | "height";
   resize_width?: number | null;
   resize_height?: number | null;
+  frame_format?: "jpeg" | "png";
+  jpeg_quality?: number | null;
+  sampling_mode?: "fps" | "seek" | "keyframes" | "scene";
+  scene_threshold?: number;
   prelabel_config?: PrelabelConfig | null;
 }
 
+export interface VideoUpload {
+  id: string;
+  project_id: string;
+  filename: string;
+  length: number;
+  offset: number;
+  expires_at: string;
+}
+
 export interface VideoImportResponse {
   sequence: AssetSequence;
   prelabel_session_id: string | null;
@@ -1,10 +1,12 @@
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 
 import {
   acceptPrelabelProposals,
   getPrelabelSession,
+  listPrelabelDebugDetections,
   listPrelabelProposals,
   rejectPrelabelProposals,
+  type PrelabelDebugDetection,
   type PrelabelProposal,
   type PrelabelSession,
 } from "../api";
@@ -38,6 +40,8 @@ interface GeometryPolygonObject {
 
 type GeometryObject = GeometryBBoxObject | GeometryPolygonObject;
 
+const DEBUG_DETECTIONS_SHOWN = 8;
+
 
 export function usePrelabels({
   projectId,
@@ -66,6 +70,28 @@ export function usePrelabels({
   const [isLoading, setIsLoading] = useState(false);
   const [isApplying, setIsApplying] = useState(false);
   const [error, setError] = useState<HookError | null>(null);
+  const [debugDetections, setDebugDetections] = useState<PrelabelDebugDetection[]>([]);
+  const debugCursorRef = useRef<{ sessionId: string; after: number } | null>(null);
+
+  const loadDebugDetections = useCallback(
+    async (nextSession: PrelabelSession, isActive: () => boolean) => {
+      if (!projectId || !taskId) return;
+      const cursor = debugCursorRef.current?.sessionId === nextSession.id ? debugCursorRef.current.after : null;
+      if (cursor !== null && nextSession.debug_detection_seq <= cursor) return;
+      // Only the latest rows are shown, so a cursor that fell far behind restarts from the tail.
+      const after = cursor !== null && nextSession.debug_detection_seq - cursor <= DEBUG_DETECTIONS_SHOWN ? cursor : null;
+      const response = await listPrelabelDebugDetections(projectId, taskId, nextSession.id, {
+        after,
+        limit: DEBUG_DETECTIONS_SHOWN,
+      });
+      if (!isActive()) return;
+      debugCursorRef.current = { sessionId: nextSession.id, after: response.next_after };
+      setDebugDetections((previous) =>
+        (after === null ? response.items : [...previous, ...response.items]).slice(-DEBUG_DETECTIONS_SHOWN),
+      );
+    },
+    [projectId, taskId],
+  );
 
   const load = useCallback(
     async (isActive: () => boolean = () => true) => {
@@ -73,6 +99,8 @@ export function usePrelabels({
         if (!isActive()) return;
         setSession(null);
         setProposals([]);
+        setDebugDetections([]);
+        debugCursorRef.current = null;
         setError(null);
         setIsLoading(false);
         return;
@@ -92,6 +120,8 @@ export function usePrelabels({
         if (!isActive()) return;
         setSession(sessionResponse.session);
         setProposals(proposalsResponse.items);
+        if (debugCursorRef.current?.sessionId !== sessionResponse.session.id) setDebugDetections([]);
+        await loadDebugDetections(sessionResponse.session, isActive);
       } catch (err) {
         if (!isActive()) return;
         setError(toHookError(err, "Failed to load AI prelabels"));
@@ -101,7 +131,7 @@ export function usePrelabels({
         if (isActive()) setIsLoading(false);
       }
     },
-    [currentAssetId, projectId, sessionId, taskId],
+    [currentAssetId, loadDebugDetections, projectId, sessionId, taskId],
   );
 
   useEffect(() => {
@@ -183,6 +213,7 @@ export function usePrelabels({
 
   return {
     session,
+    debugDetections,
     proposals,
     pendingCount,
     selectedProposal,
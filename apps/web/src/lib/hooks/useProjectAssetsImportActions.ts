@@ -1,10 +1,11 @@
 import { useMemo, useState, type Dispatch, type SetStateAction } from "react";
 
-import { createProject, importVideo, uploadAsset, type ProjectTaskType, type VideoImportPayload } from "../api";
+import { createProject, importVideo, uploadAssetBatch, type ProjectTaskType, type VideoImportPayload } from "../api";
 import { isImageCandidate, type ImportDialogState, type ImportProgressState } from "./useImportWorkflow";
 import {
   advanceImportProgress,
   buildImportResultMessage,
+  chunkImportFiles,
   createImportProgress,
   formatImportFailure,
   makeTimestampedAssetName,
@@ -159,17 +160,25 @@ export function useProjectAssetsImportActions({
       let uploadedCount = 0;
       const failures: string[] = [];
 
-      for (const file of files) {
-        setImportProgress((previous) => setActiveImportFile(previous, file.name));
+      for (const batch of chunkImportFiles(files)) {
+        setImportProgress((previous) => setActiveImportFile(previous, batch[0].name));
+        const rejected = new Map<number, unknown>();
         try {
-          const targetRelativePath = buildTargetRelativePath(file, folderName);
-          await uploadAsset(targetProjectId, file, targetRelativePath);
-          uploadedCount += 1;
-          setImportProgress((previous) => advanceImportProgress(previous, file.size, "uploaded"));
+          const targetRelativePaths = batch.map((file) => buildTargetRelativePath(file, folderName));
+          const result = await uploadAssetBatch(targetProjectId, batch, targetRelativePaths);
+          for (const error of result.errors) rejected.set(error.index, error);
         } catch (error) {
-          failures.push(formatImportFailure(file.name, error));
-          setImportProgress((previous) => advanceImportProgress(previous, file.size, "failed"));
+          batch.forEach((_, index) => rejected.set(index, error));
         }
+        batch.forEach((file, index) => {
+          const error = rejected.get(index);
+          if (error === undefined) {
+            uploadedCount += 1;
+          } else {
+            failures.push(formatImportFailure(file.name, error));
+          }
+          setImportProgress((previous) => advanceImportProgress(previous, file.size, error === undefined ? "uploaded" : "failed"));
+        });
       }
 
       await refetchProjects();
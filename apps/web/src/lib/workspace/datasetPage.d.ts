@@ -50,6 +50,8 @@ export function toggleFolderPathSelection(params: {
 
 export function contentUrlForAsset(assetId: string): string;
 
+export function thumbnailUrlForAsset(assetId: string, size?: number): string;
+
 export function datasetVersionIdOf(item: DatasetVersionSummaryEnvelope): string;
 
 export function summaryFromVersion(versionEnvelope: DatasetVersionSummaryEnvelope | null): DatasetSummaryPayload | null;
@@ -107,6 +107,10 @@ function contentUrlForAsset(assetId) {
   return `/api/v1/assets/${assetId}/content`;
 }
 
+function thumbnailUrlForAsset(assetId, size = 256) {
+  return `/api/v1/assets/${assetId}/thumbnail?size=${size}`;
+}
+
 function datasetVersionIdOf(item) {
   const version = item && typeof item === "object" ? item.version : null;
   const value = version && typeof version === "object" ? version.dataset_version_id : null;
@@ -232,6 +236,7 @@ module.exports = {
   folderCheckState,
   toggleFolderPathSelection,
   contentUrlForAsset,
+  thumbnailUrlForAsset,
   datasetVersionIdOf,
   summaryFromVersion,
   selectedVersionName,
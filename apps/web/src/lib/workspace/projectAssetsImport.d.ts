@@ -21,6 +21,12 @@ export function advanceImportProgress(
   fileSize: number,
   outcome: "uploaded" | "failed",
 ): ImportProgressShape | null;
+export const IMPORT_BATCH_MAX_FILES: number;
+export const IMPORT_BATCH_MAX_BYTES: number;
+export function chunkImportFiles<T extends { size: number }>(
+  files: T[],
+  limits?: { maxFiles?: number; maxBytes?: number },
+): T[][];
 export function formatImportFailure(fileName: string, error: unknown): string;
 export function mergeImportedFolderOptions(existingFolders: string[] | undefined, importedRelativePaths: string[]): string[];
 export function buildImportResultMessage(args: {
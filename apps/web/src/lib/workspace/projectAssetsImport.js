@@ -50,6 +50,26 @@ export function advanceImportProgress(progress, fileSize, outcome) {
   };
 }
 
+export const IMPORT_BATCH_MAX_FILES = 64;
+export const IMPORT_BATCH_MAX_BYTES = 32 * 1024 * 1024;
+
+export function chunkImportFiles(files, { maxFiles = IMPORT_BATCH_MAX_FILES, maxBytes = IMPORT_BATCH_MAX_BYTES } = {}) {
+  const batches = [];
+  let current = [];
+  let currentBytes = 0;
+  for (const file of files) {
+    if (current.length > 0 && (current.length >= maxFiles || currentBytes + file.size > maxBytes)) {
+      batches.push(current);
+      current = [];
+      currentBytes = 0;
+    }
+    current.push(file);
+    currentBytes += file.size;
+  }
+  if (current.length > 0) batches.push(current);
+  return batches;
+}
+
 export function formatImportFailure(fileName, error) {
   const responseBody = readResponseBody(error);
   const reason = responseBody ? ` (${responseBody})` : "";
@@ -6,6 +6,7 @@ const {
   classNamesFromVersion,
   buildDescendantsByPath,
   contentUrlForAsset,
+  thumbnailUrlForAsset,
   datasetVersionIdOf,
   fallbackClassName,
   filterPreviewAssets,
@@ -54,6 +55,11 @@ test("contentUrlForAsset returns stable API route", () => {
   assert.equal(contentUrlForAsset("asset-123"), "/api/v1/assets/asset-123/content");
 });
 
+test("thumbnailUrlForAsset requests a cached thumbnail size", () => {
+  assert.equal(thumbnailUrlForAsset("asset-123"), "/api/v1/assets/asset-123/thumbnail?size=256");
+  assert.equal(thumbnailUrlForAsset("asset-123", 128), "/api/v1/assets/asset-123/thumbnail?size=128");
+});
+
 test("previewAssetPrimaryCategoryId returns the primary category id when present", () => {
   assert.equal(previewAssetPrimaryCategoryId({ label_summary: { primary_category_id: "class-1" } }), "class-1");
   assert.equal(previewAssetPrimaryCategoryId({ label_summary: {} }), null);
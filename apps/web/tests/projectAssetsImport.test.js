@@ -10,6 +10,7 @@ const {
   formatImportFailure,
   mergeImportedFolderOptions,
   buildImportResultMessage,
+  chunkImportFiles,
 } = require("../src/lib/workspace/projectAssetsImport.js");
 
 test("project assets import helpers derive names and progress state", () => {
@@ -97,3 +98,16 @@ test("project assets import helpers format failures, folder options, and summari
     'Imported 2 images into "Vision/train".',
   );
 });
+
+test("chunkImportFiles splits uploads by file count and total bytes", () => {
+  const files = [{ size: 4 }, { size: 4 }, { size: 4 }, { size: 10 }, { size: 1 }];
+  assert.deepEqual(
+    chunkImportFiles(files, { maxFiles: 2, maxBytes: 100 }).map((batch) => batch.length),
+    [2, 2, 1],
+  );
+  assert.deepEqual(
+    chunkImportFiles(files, { maxFiles: 10, maxBytes: 9 }).map((batch) => batch.map((file) => file.size)),
+    [[4, 4], [4], [10], [1]],
+  );
+  assert.deepEqual(chunkImportFiles([]), []);
+});
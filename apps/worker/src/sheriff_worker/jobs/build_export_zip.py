@@ -1,4 +1,13 @@
+from __future__ import annotations
+
+from sheriff_api.services.dataset_export_builder import run_dataset_export_job
+
+
 def run(payload: dict) -> dict:
     if "dataset_version_id" not in payload:
         raise ValueError("dataset_version_id is required")
     return {"status": "done", "export_uri": f"exports/{payload['dataset_version_id']}.zip"}
+
+
+async def run_async(payload: dict) -> dict:
+    return await run_dataset_export_job(payload)
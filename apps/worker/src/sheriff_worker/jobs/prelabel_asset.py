@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from sheriff_api.services.prelabels import process_prelabel_asset_job
+from sheriff_api.services.prelabels import (
+    prelabel_contexts,
+    process_prelabel_asset_job,
+    process_prelabel_assets_job,
+    record_superseded_prelabel_assets,
+)
 
 
 def run(payload: dict) -> dict:
@@ -8,5 +13,14 @@ def run(payload: dict) -> dict:
 
 
 async def run_async(payload: dict) -> dict:
+    if str(payload.get("job_type") or "") == "prelabel_assets":
+        return await process_prelabel_assets_job(payload)
     return await process_prelabel_asset_job(payload)
 
+
+async def record_superseded(session_id: str, payloads_raw: list[str]) -> None:
+    await record_superseded_prelabel_assets(session_id, count=len(payloads_raw))
+
+
+async def close_contexts() -> None:
+    await prelabel_contexts.clear()
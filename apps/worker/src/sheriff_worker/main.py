@@ -4,11 +4,15 @@ import asyncio
 import json
 import logging
 import os
+import signal
 
 from redis.asyncio import Redis
 
 from sheriff_worker.jobs import build_export_zip, extract_frames, inference_suggest, prelabel_asset
+from sheriff_worker.pool import QueueSpec, WorkerPool
 from sheriff_worker.queues.broker import InMemoryBroker
+from sheriff_worker.queues.lanes import LaneDispatcher
+from sheriff_worker.queues.reliable import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -31,43 +35,120 @@ class Worker:
         return HANDLERS[job["job_name"]](job["payload"])
 
 
+def _decode_job(payload_raw: str) -> dict | None:
+    try:
+        payload = json.loads(payload_raw)
+    except json.JSONDecodeError:
+        logger.exception("Ignoring invalid worker job payload: %s", payload_raw)
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+async def handle_media_job(payload_raw: str) -> None:
+    payload = _decode_job(payload_raw)
+    if payload is None:
+        return
+    job_type = str(payload.get("job_type") or "").strip()
+    if job_type == "extract_video_frames":
+        result = await extract_frames.run_async(payload)
+    elif job_type == "build_dataset_export":
+        result = await build_export_zip.run_async(payload)
+    else:
+        logger.warning("Ignoring unknown media job type: %s", job_type)
+        return
+    logger.info("Completed media job %s", result)
+
+
+async def handle_prelabel_job(payload_raw: str) -> None:
+    payload = _decode_job(payload_raw)
+    if payload is None:
+        return
+    job_type = str(payload.get("job_type") or "").strip()
+    if job_type not in {"prelabel_asset", "prelabel_assets"}:
+        logger.warning("Ignoring unknown prelabel job type: %s", job_type)
+        return
+    result = await prelabel_asset.run_async(payload)
+    logger.info("Completed prelabel job %s", result)
+
+
+def prelabel_session_key(payload_raw: str) -> str | None:
+    # Session counters are read-modify-write, so jobs of one session must not overlap.
+    payload = _decode_job(payload_raw)
+    if payload is None:
+        return None
+    session_id = str(payload.get("session_id") or "").strip()
+    return session_id or None
+
+
+def build_retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=max(1, int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))),
+        visibility_timeout_seconds=max(1.0, float(os.getenv("WORKER_VISIBILITY_TIMEOUT_SECONDS", "120"))),
+        backoff_base_seconds=max(0.0, float(os.getenv("WORKER_RETRY_BACKOFF_SECONDS", "5"))),
+        backoff_max_seconds=max(0.0, float(os.getenv("WORKER_RETRY_BACKOFF_MAX_SECONDS", "300"))),
+    )
+
+
+def build_queue_specs() -> list[QueueSpec]:
+    return [
+        QueueSpec(
+            name="media",
+            key=os.getenv("MEDIA_QUEUE_KEY", "pixel_sheriff:media_jobs:v1"),
+            concurrency=max(1, int(os.getenv("MEDIA_WORKER_CONCURRENCY", "1"))),
+            handler=handle_media_job,
+        ),
+        QueueSpec(
+            name="prelabel",
+            key=os.getenv("PRELABEL_QUEUE_KEY", "pixel_sheriff:prelabel_jobs:v1"),
+            concurrency=max(1, int(os.getenv("PRELABEL_WORKER_CONCURRENCY", "4"))),
+            handler=handle_prelabel_job,
+            partition_key=prelabel_session_key,
+        ),
+    ]
+
+
+def build_prelabel_dispatcher(redis: Redis, prelabel_queue: QueueSpec) -> LaneDispatcher:
+    return LaneDispatcher(
+        redis,
+        prelabel_queue.key,
+        # Bounds how many bulk jobs a new live frame can queue behind.
+        target_depth=max(1, int(os.getenv("PRELABEL_DISPATCH_TARGET_DEPTH", str(2 * prelabel_queue.concurrency)))),
+        live_keep_latest=max(1, int(os.getenv("PRELABEL_LIVE_KEEP_LATEST", "1"))),
+        on_superseded=prelabel_asset.record_superseded,
+    )
+
+
 async def run_redis_worker() -> None:
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    queue_key = os.getenv("MEDIA_QUEUE_KEY", "pixel_sheriff:media_jobs:v1")
-    prelabel_queue_key = os.getenv("PRELABEL_QUEUE_KEY", "pixel_sheriff:prelabel_jobs:v1")
+    queues = build_queue_specs()
     redis = Redis.from_url(redis_url, decode_responses=True)
-    logger.info("Media worker listening on %s and %s", queue_key, prelabel_queue_key)
+    pool = WorkerPool(
+        redis,
+        queues,
+        drain_timeout_seconds=float(os.getenv("WORKER_DRAIN_TIMEOUT_SECONDS", "30")),
+        retry_policy=build_retry_policy(),
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    logger.info(
+        "Media worker listening on %s",
+        ", ".join(f"{queue.key} (concurrency={queue.concurrency})" for queue in queues),
+    )
+    prelabel_queue = next(queue for queue in queues if queue.name == "prelabel")
+    dispatcher = asyncio.create_task(
+        build_prelabel_dispatcher(redis, prelabel_queue).run(), name="prelabel-lane-dispatcher"
+    )
     try:
-        while True:
-            item = await redis.blpop([queue_key, prelabel_queue_key], timeout=5)
-            if item is None:
-                continue
-
-            queue_name, payload_raw = item
-            try:
-                payload = json.loads(payload_raw)
-            except json.JSONDecodeError:
-                logger.exception("Ignoring invalid media job payload: %s", payload_raw)
-                continue
-
-            job_type = str(payload.get("job_type") or "").strip()
-            try:
-                if queue_name == prelabel_queue_key:
-                    if job_type != "prelabel_asset":
-                        logger.warning("Ignoring unknown prelabel job type: %s", job_type)
-                        continue
-                    result = await prelabel_asset.run_async(payload)
-                    logger.info("Completed prelabel job %s", result)
-                    continue
-
-                if job_type != "extract_video_frames":
-                    logger.warning("Ignoring unknown media job type: %s", job_type)
-                    continue
-                result = await extract_frames.run_async(payload)
-                logger.info("Completed media job %s", result)
-            except Exception:
-                logger.exception("Worker job failed")
+        await pool.run(stop)
     finally:
+        dispatcher.cancel()
+        await asyncio.gather(dispatcher, return_exceptions=True)
+        await prelabel_asset.close_contexts()
         await redis.aclose()
 
 
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from sheriff_worker.queues.reliable import Reservation, ReliableQueue, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[str], Awaitable[Any]]
+PartitionKey = Callable[[str], str | None]
+
+
+@dataclass(frozen=True)
+class QueueSpec:
+    name: str
+    key: str
+    concurrency: int
+    handler: JobHandler
+    # Jobs that share a partition key run one at a time (e.g. prelabel jobs of one session).
+    partition_key: PartitionKey | None = None
+    # Overrides the pool's retry policy (e.g. a longer visibility timeout for slow jobs).
+    retry_policy: RetryPolicy | None = None
+
+
+class WorkerPool:
+    """Consumes several Redis lists with bounded per-queue parallelism.
+
+    Only queues with a free slot are polled, and the key order is rotated
+    between reservations so a long backlog on one queue cannot starve another.
+    Jobs are reserved through ``ReliableQueue``: a job stays in its queue's
+    processing list until the handler returns, failures are retried with
+    backoff and then dead-lettered, and a reaper per queue recovers jobs whose
+    consumer died. ``BLMOVE`` watches a single list, so an idle pool blocks on
+    the first available queue for ``poll_timeout / len(queues)`` at a time.
+
+    A job's partition is only known once it is reserved. A job whose partition
+    is busy gives its slot back and waits with its lease kept alive, so a burst
+    from one session cannot fill every slot; the partition's running job hands
+    its slot to the next waiter when it finishes. How many jobs can wait is
+    bounded by what is in the ready list (the prelabel lane dispatcher keeps it
+    at ``target_depth``).
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        queues: list[QueueSpec],
+        *,
+        poll_timeout_seconds: float = 1.0,
+        drain_timeout_seconds: float = 30.0,
+        retry_policy: RetryPolicy | None = None,
+        reap_interval_seconds: float | None = None,
+    ) -> None:
+        if not queues:
+            raise ValueError("at least one queue is required")
+        self._queues = list(queues)
+        self._queues_by_key = {queue.key: queue for queue in self._queues}
+        self._reliable = {
+            queue.key: ReliableQueue(redis, queue.key, policy=queue.retry_policy or retry_policy)
+            for queue in self._queues
+        }
+        self._reap_interval_seconds = reap_interval_seconds
+        self._poll_timeout_seconds = max(0.01, float(poll_timeout_seconds))
+        self._drain_timeout_seconds = max(0.0, float(drain_timeout_seconds))
+        self._in_flight: Counter[str] = Counter()
+        self._tasks: set[asyncio.Task[None]] = set()
+        # Busy partitions -> jobs waiting for them; an entry is dropped when its last job finishes.
+        self._partitions: dict[tuple[str, str], deque[asyncio.Future[None]]] = {}
+        self._slot_freed = asyncio.Event()
+        self._rotation = 0
+        self.completed: Counter[str] = Counter()
+        self.failed: Counter[str] = Counter()
+
+    def _available_keys(self) -> list[str]:
+        count = len(self._queues)
+        ordered = [self._queues[(self._rotation + offset) % count] for offset in range(count)]
+        return [queue.key for queue in ordered if self._in_flight[queue.key] < max(1, queue.concurrency)]
+
+    def _partition(self, queue: QueueSpec, payload_raw: str) -> tuple[str, str] | None:
+        if queue.partition_key is None:
+            return None
+        partition = queue.partition_key(payload_raw)
+        return (queue.key, partition) if partition is not None else None
+
+    def _join_partition(self, queue: QueueSpec, partition: tuple[str, str]) -> asyncio.Future[None] | None:
+        """Take ``partition`` when it is free (None); otherwise give the slot back and queue up behind it."""
+        waiters = self._partitions.get(partition)
+        if waiters is None:
+            self._partitions[partition] = deque()
+            return None
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        self._release_slot(queue.key)
+        return waiter
+
+    def _leave_partition(self, partition: tuple[str, str]) -> bool:
+        """Pass ``partition`` and the caller's slot to the next waiter; False when nobody waits."""
+        waiters = self._partitions[partition]
+        while waiters:
+            waiter = waiters.popleft()
+            if waiter.done():
+                # Cancelled while waiting.
+                continue
+            waiter.set_result(None)
+            return True
+        del self._partitions[partition]
+        return False
+
+    def _release_slot(self, key: str) -> None:
+        self._in_flight[key] -= 1
+        self._slot_freed.set()
+
+    async def _reserve(self, keys: list[str]) -> Reservation | None:
+        for key in keys:
+            reservation = await self._reliable[key].reserve()
+            if reservation is not None:
+                return reservation
+        return await self._reliable[keys[0]].reserve(timeout=self._poll_timeout_seconds / len(keys))
+
+    async def _run_job(self, queue: QueueSpec, reservation: Reservation) -> None:
+        started = time.perf_counter()
+        partition = self._partition(queue, reservation.payload_raw)
+        holds_slot = True
+        owns_partition = False
+
+        async def _handle(payload_raw: str) -> Any:
+            nonlocal holds_slot, owns_partition
+            if partition is not None:
+                waiter = self._join_partition(queue, partition)
+                if waiter is not None:
+                    holds_slot = False
+                    try:
+                        await waiter
+                    except asyncio.CancelledError:
+                        if not waiter.cancelled():
+                            # Handed the partition and a slot just before the cancellation.
+                            holds_slot = owns_partition = True
+                        raise
+                    holds_slot = True
+                owns_partition = True
+            return await queue.handler(payload_raw)
+
+        try:
+            await self._reliable[queue.key].process(reservation, _handle)
+            self.completed[queue.name] += 1
+        except Exception:
+            self.failed[queue.name] += 1
+            logger.exception("Worker job failed on %s queue (attempt %d)", queue.name, reservation.attempt)
+        finally:
+            handed_over = self._leave_partition(partition) if owns_partition and partition is not None else False
+            if holds_slot and not handed_over:
+                self._release_slot(queue.key)
+            logger.debug("%s job finished in %.3fs", queue.name, time.perf_counter() - started)
+
+    def _spawn(self, queue: QueueSpec, reservation: Reservation) -> None:
+        self._in_flight[queue.key] += 1
+        task = asyncio.create_task(self._run_job(queue, reservation), name=f"worker-{queue.name}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _wait_for_slot(self, stop: asyncio.Event) -> None:
+        self._slot_freed.clear()
+        stop_wait = asyncio.ensure_future(stop.wait())
+        slot_wait = asyncio.ensure_future(self._slot_freed.wait())
+        try:
+            await asyncio.wait({stop_wait, slot_wait}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_wait.cancel()
+            slot_wait.cancel()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        reapers = [
+            asyncio.create_task(reliable.run_reaper(interval_seconds=self._reap_interval_seconds), name=f"reaper-{key}")
+            for key, reliable in self._reliable.items()
+        ]
+        try:
+            while not stop.is_set():
+                keys = self._available_keys()
+                if not keys:
+                    await self._wait_for_slot(stop)
+                    continue
+                reservation = await self._reserve(keys)
+                self._rotation = (self._rotation + 1) % len(self._queues)
+                if reservation is None:
+                    continue
+                self._spawn(self._queues_by_key[reservation.queue_key], reservation)
+            await self.drain()
+        finally:
+            for reaper in reapers:
+                reaper.cancel()
+            await asyncio.gather(*reapers, return_exceptions=True)
+
+    async def drain(self) -> None:
+        if not self._tasks:
+            return
+        logger.info("Draining %d in-flight worker jobs", len(self._tasks))
+        _done, pending = await asyncio.wait(set(self._tasks), timeout=self._drain_timeout_seconds or None)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Cancelled %d worker jobs that did not finish within the drain timeout", len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,173 @@
+"""Dispatcher that feeds the prelabel ready list from per-session lanes.
+
+The API pushes prelabel jobs into per-session lists (see
+``sheriff_api.services.prelabel_queue``) rather than one FIFO list. The
+dispatcher is the only writer of the ready list the worker pool reserves from:
+
+* live lane: each live session's newest ``live_keep_latest`` frames are moved
+  to the head of the ready list on every pass. Older frames in its lane, and
+  frames this dispatcher moved earlier that no consumer has reserved yet, are
+  superseded; they are dropped and reported through ``on_superseded`` so the
+  session's counters still add up.
+* bulk lane: sessions are served by smooth weighted round-robin (weights from
+  the lane's weights hash, default 1). Jobs are moved only while the ready list
+  is shorter than ``target_depth``, so a live frame never waits behind more
+  than ``target_depth`` bulk jobs.
+
+Every move is a single ``LMOVE``/``LPOP``, so jobs are never lost or
+duplicated between lanes and the ready list, and several worker processes
+can run dispatchers against the same queue.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import Any, Awaitable, Callable
+
+from sheriff_api.services.prelabel_queue import BULK_LANE, LIVE_LANE, lane_key, lane_sessions_key, lane_weights_key, wake_key
+
+logger = logging.getLogger(__name__)
+
+SupersededCallback = Callable[[str, list[str]], Awaitable[None]]
+
+
+@dataclass
+class DispatchResult:
+    live: int = 0
+    bulk: int = 0
+    superseded: int = 0
+    # Bulk jobs were left in some lane because the ready list reached its target depth.
+    backlog: bool = False
+
+
+class LaneDispatcher:
+    def __init__(
+        self,
+        redis: Any,
+        queue_key: str,
+        *,
+        target_depth: int,
+        live_keep_latest: int = 1,
+        on_superseded: SupersededCallback | None = None,
+        idle_wait_seconds: float = 0.5,
+        refill_wait_seconds: float = 0.05,
+    ) -> None:
+        self.redis = redis
+        self.queue_key = queue_key
+        self.target_depth = max(1, int(target_depth))
+        self.live_keep_latest = max(1, int(live_keep_latest))
+        self._on_superseded = on_superseded
+        self._idle_wait_seconds = max(0.01, float(idle_wait_seconds))
+        self._refill_wait_seconds = max(0.01, float(refill_wait_seconds))
+        self._current_weights: dict[str, float] = {}
+        # Live frames moved to the ready list on an earlier pass, per session.
+        self._waiting_live: dict[str, list[str]] = {}
+
+    async def dispatch_once(self) -> DispatchResult:
+        result = DispatchResult()
+        await self._dispatch_live(result)
+        await self._dispatch_bulk(result)
+        return result
+
+    async def run(self) -> None:
+        """Dispatch until cancelled, sleeping on the producers' wake list between passes."""
+        while True:
+            try:
+                result = await self.dispatch_once()
+            except Exception:
+                logger.exception("Prelabel lane dispatch failed for %s", self.queue_key)
+                result = DispatchResult()
+            wait = self._refill_wait_seconds if result.backlog else self._idle_wait_seconds
+            await self.redis.blpop(wake_key(self.queue_key), timeout=wait)
+
+    async def _dispatch_live(self, result: DispatchResult) -> None:
+        live_sessions = await self.redis.smembers(lane_sessions_key(self.queue_key, LIVE_LANE))
+        for session_id in [session_id for session_id in self._waiting_live if session_id not in live_sessions]:
+            # Forget idle sessions once every frame they had waiting has been reserved.
+            positions = [await self.redis.lpos(self.queue_key, payload_raw) for payload_raw in self._waiting_live[session_id]]
+            if all(position is None for position in positions):
+                del self._waiting_live[session_id]
+        for session_id in sorted(live_sessions):
+            key = lane_key(self.queue_key, LIVE_LANE, session_id)
+            queued = int(await self.redis.llen(key))
+            dropped: list[str] = []
+            if queued > self.live_keep_latest:
+                dropped.extend(await self.redis.lpop(key, queued - self.live_keep_latest) or [])
+            if queued:
+                # LREM only succeeds while no consumer has reserved the frame, so a running job is never dropped.
+                for payload_raw in self._waiting_live.pop(session_id, []):
+                    if await self.redis.lrem(self.queue_key, 1, payload_raw):
+                        dropped.append(payload_raw)
+            result.superseded += len(dropped)
+            await self._report_superseded(session_id, dropped)
+            moved: list[str] = []
+            for _ in range(self.live_keep_latest):
+                # Head of the ready list: live frames overtake every queued bulk job.
+                payload_raw = await self.redis.lmove(key, self.queue_key, "LEFT", "LEFT")
+                if payload_raw is None:
+                    break
+                moved.append(payload_raw)
+            if moved:
+                self._waiting_live[session_id] = moved
+                result.live += len(moved)
+            await self._retire_if_empty(LIVE_LANE, session_id)
+
+    async def _dispatch_bulk(self, result: DispatchResult) -> None:
+        budget = self.target_depth - int(await self.redis.llen(self.queue_key))
+        sessions = sorted(await self.redis.smembers(lane_sessions_key(self.queue_key, BULK_LANE)))
+        if not sessions:
+            self._current_weights.clear()
+            return
+        if budget <= 0:
+            result.backlog = True
+            return
+        raw_weights = await self.redis.hmget(lane_weights_key(self.queue_key), sessions)
+        weights = {session_id: _weight(raw) for session_id, raw in zip(sessions, raw_weights)}
+        self._current_weights = {session_id: self._current_weights.get(session_id, 0.0) for session_id in weights}
+        while budget > 0 and weights:
+            session_id = self._next_bulk_session(weights)
+            moved = await self.redis.lmove(lane_key(self.queue_key, BULK_LANE, session_id), self.queue_key, "LEFT", "RIGHT")
+            if moved is None:
+                weights.pop(session_id)
+                self._current_weights.pop(session_id, None)
+                await self._retire_if_empty(BULK_LANE, session_id)
+                continue
+            result.bulk += 1
+            budget -= 1
+        result.backlog = bool(weights)
+
+    def _next_bulk_session(self, weights: dict[str, float]) -> str:
+        # Smooth weighted round-robin: interleaves sessions instead of bursting the heaviest one.
+        total = sum(weights.values())
+        for session_id, weight in weights.items():
+            self._current_weights[session_id] = self._current_weights.get(session_id, 0.0) + weight
+        chosen = max(weights, key=lambda session_id: self._current_weights[session_id])
+        self._current_weights[chosen] -= total
+        return chosen
+
+    async def _retire_if_empty(self, lane: str, session_id: str) -> None:
+        key = lane_key(self.queue_key, lane, session_id)
+        if await self.redis.llen(key):
+            return
+        sessions_key = lane_sessions_key(self.queue_key, lane)
+        await self.redis.srem(sessions_key, session_id)
+        # A producer may have pushed between LLEN and SREM; keep the session visible if so.
+        if await self.redis.llen(key):
+            await self.redis.sadd(sessions_key, session_id)
+
+    async def _report_superseded(self, session_id: str, dropped: list[str]) -> None:
+        if not dropped or self._on_superseded is None:
+            return
+        try:
+            await self._on_superseded(session_id, dropped)
+        except Exception:
+            logger.exception("Failed to record %d superseded live frames for session %s", len(dropped), session_id)
+
+
+def _weight(raw: Any) -> float:
+    try:
+        weight = float(raw)
+    except (TypeError, ValueError):
+        return 1.0
+    return weight if weight > 0 else 1.0
@@ -0,0 +1,289 @@
+"""At-least-once consumption of the Redis job lists the API pushes to.
+
+``BLPOP`` removes a job before it runs, so a crash, OOM kill or deploy mid-job
+loses it. ``ReliableQueue`` instead moves the raw payload into a processing
+list with ``(B)LMOVE`` and records a lease deadline for it. The consumer
+heartbeats the lease while the handler runs and acks (removes) the payload
+when it finishes. A failed job goes to a delayed set with exponential backoff
+until it exhausts ``max_attempts`` and lands in the dead-letter list. A
+reaper returns payloads whose lease expired (the consumer died) to the same
+retry path.
+
+Keys derived from a queue key ``K``::
+
+    K              ready list (producers keep using RPUSH)
+    K:processing   payloads currently reserved by a consumer
+    K:leases       zset payload -> lease deadline (unix seconds)
+    K:attempts     hash payload -> reservations so far
+    K:delayed      zset payload -> time it becomes ready again
+    K:dead         list of JSON dead-letter records
+
+The raw payload string is the job identity, which is unique for every job the
+API enqueues. Every transition that takes a job out of the processing list
+starts with ``LREM``; the caller whose ``LREM`` removed the payload owns
+it, so concurrent reapers and late acks never requeue a job twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Literal, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+FailOutcome = Literal["retry", "dead", "lost"]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    visibility_timeout_seconds: float = 60.0
+    backoff_base_seconds: float = 5.0
+    backoff_max_seconds: float = 300.0
+
+    def backoff_seconds(self, attempt: int) -> float:
+        """Delay before retrying after the ``attempt``-th reservation failed (1-based)."""
+        return min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** max(0, attempt - 1)))
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        return max(0.05, self.visibility_timeout_seconds / 3.0)
+
+
+@dataclass(frozen=True)
+class Reservation:
+    queue_key: str
+    payload_raw: str
+    attempt: int
+
+
+@dataclass
+class ReapResult:
+    promoted: int = 0
+    requeued: int = 0
+    dead: int = 0
+    orphans: int = 0
+
+
+class ReliableQueue:
+    def __init__(
+        self,
+        redis: Any,
+        key: str,
+        *,
+        policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.redis = redis
+        self.key = key
+        self.policy = policy or RetryPolicy()
+        self._clock = clock
+        self.processing_key = f"{key}:processing"
+        self.leases_key = f"{key}:leases"
+        self.attempts_key = f"{key}:attempts"
+        self.delayed_key = f"{key}:delayed"
+        self.dead_key = f"{key}:dead"
+
+    async def reserve(self, timeout: float = 0) -> Reservation | None:
+        """Move the next payload into the processing list; blocks up to ``timeout`` seconds when positive."""
+        if timeout > 0:
+            payload_raw = await self.redis.blmove(self.key, self.processing_key, timeout, "LEFT", "RIGHT")
+        else:
+            payload_raw = await self.redis.lmove(self.key, self.processing_key, "LEFT", "RIGHT")
+        if payload_raw is None:
+            return None
+        # A crash before this pipeline leaves a lease-less payload; the reaper leases it on its next pass.
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.leases_key, {payload_raw: self._deadline()})
+            pipe.hincrby(self.attempts_key, payload_raw, 1)
+            _added, attempt = await pipe.execute()
+        return Reservation(queue_key=self.key, payload_raw=payload_raw, attempt=int(attempt))
+
+    async def heartbeat(self, reservation: Reservation) -> bool:
+        """Extend the lease; False means the reaper already took the job back."""
+        updated = await self.redis.zadd(
+            self.leases_key, {reservation.payload_raw: self._deadline()}, xx=True, ch=True
+        )
+        return bool(updated)
+
+    async def ack(self, reservation: Reservation) -> bool:
+        """Finish the job; False if the lease had expired and the job was already taken back."""
+        if not await self.redis.lrem(self.processing_key, 1, reservation.payload_raw):
+            # Leave the attempt count alone: it belongs to the redelivered copy now.
+            return False
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.leases_key, reservation.payload_raw)
+            pipe.hdel(self.attempts_key, reservation.payload_raw)
+            await pipe.execute()
+        return True
+
+    async def fail(self, reservation: Reservation, error: str | None = None) -> FailOutcome:
+        """Schedule a retry with backoff, or dead-letter the job once attempts are exhausted."""
+        if not await self._claim(reservation.payload_raw):
+            return "lost"
+        return await self._retry_or_bury(reservation.payload_raw, reservation.attempt, error)
+
+    async def bury(self, reservation: Reservation, error: str | None = None) -> bool:
+        """Dead-letter immediately (e.g. a payload that can never parse); False if the lease was lost."""
+        if not await self._claim(reservation.payload_raw):
+            return False
+        await self._bury(reservation.payload_raw, reservation.attempt, error)
+        return True
+
+    async def release(self, reservation: Reservation) -> bool:
+        """Put an unfinished job back at the head of the queue without spending an attempt (shutdown)."""
+        if not await self._claim(reservation.payload_raw):
+            return False
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(self.attempts_key, reservation.payload_raw, -1)
+            pipe.lpush(self.key, reservation.payload_raw)
+            await pipe.execute()
+        return True
+
+    async def process(self, reservation: Reservation, handler: Callable[[str], Awaitable[T]]) -> T:
+        """Run ``handler`` while heartbeating the lease, then ack, or fail and re-raise."""
+        heartbeat = asyncio.create_task(self._keep_alive(reservation), name=f"lease-{self.key}")
+        try:
+            result = await handler(reservation.payload_raw)
+        except asyncio.CancelledError:
+            await self.release(reservation)
+            raise
+        except Exception as exc:
+            outcome = await self.fail(reservation, error=f"{type(exc).__name__}: {exc}")
+            logger.warning("Job on %s failed (attempt %d): %s", self.key, reservation.attempt, outcome)
+            raise
+        else:
+            if not await self.ack(reservation):
+                logger.warning("Job on %s finished after its lease expired; it may run again", self.key)
+            return result
+        finally:
+            heartbeat.cancel()
+
+    async def reap(self, *, limit: int = 100) -> ReapResult:
+        """Promote due retries, take back payloads with expired leases and lease orphaned ones."""
+        result = ReapResult()
+        now = self._clock()
+
+        due = await self.redis.zrangebyscore(self.delayed_key, "-inf", now, start=0, num=limit)
+        if due:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for payload_raw in due:
+                    pipe.zrem(self.delayed_key, payload_raw)
+                removed = await pipe.execute()
+            ready = [payload_raw for payload_raw, claimed in zip(due, removed) if claimed]
+            if ready:
+                await self.redis.rpush(self.key, *ready)
+                result.promoted = len(ready)
+
+        expired = await self.redis.zrangebyscore(self.leases_key, "-inf", now, start=0, num=limit)
+        if expired:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for payload_raw in expired:
+                    pipe.lrem(self.processing_key, 1, payload_raw)
+                    pipe.hget(self.attempts_key, payload_raw)
+                replies = await pipe.execute()
+            for index, payload_raw in enumerate(expired):
+                claimed, attempts = replies[2 * index], replies[2 * index + 1]
+                await self.redis.zrem(self.leases_key, payload_raw)
+                if not claimed:
+                    # Acked or failed between the two reads; only the stale lease was left.
+                    continue
+                outcome = await self._retry_or_bury(payload_raw, int(attempts or 1), "lease expired")
+                if outcome == "dead":
+                    result.dead += 1
+                else:
+                    result.requeued += 1
+
+        in_flight = await self.redis.lrange(self.processing_key, 0, -1)
+        if in_flight:
+            deadline = self._deadline()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for payload_raw in in_flight:
+                    pipe.zadd(self.leases_key, {payload_raw: deadline}, nx=True)
+                result.orphans = sum(int(added) for added in await pipe.execute())
+        if result.requeued or result.dead or result.orphans:
+            logger.info(
+                "Reaped %s: requeued=%d dead=%d orphans=%d", self.key, result.requeued, result.dead, result.orphans
+            )
+        return result
+
+    async def run_reaper(self, *, interval_seconds: float | None = None) -> None:
+        """Reap forever; run as a background task and cancel it on shutdown."""
+        interval = interval_seconds if interval_seconds is not None else self.policy.heartbeat_seconds
+        while True:
+            try:
+                await self.reap()
+            except Exception:
+                logger.exception("Reaper pass failed for %s", self.key)
+            await asyncio.sleep(interval)
+
+    async def stats(self) -> dict[str, int]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.llen(self.key)
+            pipe.llen(self.processing_key)
+            pipe.zcard(self.delayed_key)
+            pipe.llen(self.dead_key)
+            ready, processing, delayed, dead = await pipe.execute()
+        return {"ready": int(ready), "processing": int(processing), "delayed": int(delayed), "dead": int(dead)}
+
+    async def dead_letters(self, limit: int = 100) -> list[dict[str, Any]]:
+        return [json.loads(row) for row in await self.redis.lrange(self.dead_key, 0, max(0, limit - 1))]
+
+    async def replay_dead_letters(self, limit: int = 100) -> int:
+        """Move up to ``limit`` dead-lettered payloads back onto the ready list with fresh attempts."""
+        replayed = 0
+        for _ in range(limit):
+            row = await self.redis.lpop(self.dead_key)
+            if row is None:
+                break
+            await self.redis.rpush(self.key, json.loads(row)["payload"])
+            replayed += 1
+        return replayed
+
+    async def _keep_alive(self, reservation: Reservation) -> None:
+        while True:
+            await asyncio.sleep(self.policy.heartbeat_seconds)
+            try:
+                held = await self.heartbeat(reservation)
+            except Exception:
+                logger.exception("Lease heartbeat failed on %s", self.key)
+                continue
+            if not held:
+                logger.warning("Lost lease on %s job; it will be retried by another consumer", self.key)
+                return
+
+    def _deadline(self) -> float:
+        return self._clock() + self.policy.visibility_timeout_seconds
+
+    async def _claim(self, payload_raw: str) -> bool:
+        removed = await self.redis.lrem(self.processing_key, 1, payload_raw)
+        if removed:
+            await self.redis.zrem(self.leases_key, payload_raw)
+        return bool(removed)
+
+    async def _retry_or_bury(self, payload_raw: str, attempt: int, error: str | None) -> FailOutcome:
+        if attempt >= self.policy.max_attempts:
+            await self._bury(payload_raw, attempt, error)
+            return "dead"
+        await self.redis.zadd(self.delayed_key, {payload_raw: self._clock() + self.policy.backoff_seconds(attempt)})
+        return "retry"
+
+    async def _bury(self, payload_raw: str, attempt: int, error: str | None) -> None:
+        record = {
+            "queue": self.key,
+            "payload": payload_raw,
+            "attempts": attempt,
+            "error": error,
+            "failed_at": self._clock(),
+        }
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(self.dead_key, json.dumps(record, separators=(",", ":")))
+            pipe.hdel(self.attempts_key, payload_raw)
+            pipe.zrem(self.leases_key, payload_raw)
+            await pipe.execute()
+        logger.warning("Dead-lettered job on %s after %d attempts: %s", self.key, attempt, error)
@@ -0,0 +1,174 @@
+"""In-process stand-in for the Redis commands the worker pool, reliable queue and lane dispatcher use."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+
+class _InMemoryPipeline:
+    """Queues commands and runs them in order on ``execute`` (the stand-in is single-threaded)."""
+
+    def __init__(self, redis: "InMemoryRedis") -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def _queue(*args, **kwargs) -> "_InMemoryPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list:
+        commands, self._commands = self._commands, []
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self) -> "_InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._commands = []
+
+
+class InMemoryRedis:
+    """Minimal asyncio stand-in for the Redis list, sorted-set and hash commands the worker pool uses."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, deque[str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self._changed = asyncio.Condition()
+
+    def pipeline(self, transaction: bool = True) -> _InMemoryPipeline:
+        return _InMemoryPipeline(self)
+
+    async def rpush(self, key: str, *values: str) -> int:
+        async with self._changed:
+            items = self.lists.setdefault(key, deque())
+            items.extend(values)
+            self._changed.notify_all()
+            return len(items)
+
+    async def lpush(self, key: str, *values: str) -> int:
+        async with self._changed:
+            items = self.lists.setdefault(key, deque())
+            items.extendleft(values)
+            self._changed.notify_all()
+            return len(items)
+
+    async def lpop(self, key: str) -> str | None:
+        items = self.lists.get(key)
+        return items.popleft() if items else None
+
+    async def llen(self, key: str) -> int:
+        return len(self.lists.get(key, ()))
+
+    async def lrange(self, key: str, start: int, end: int) -> list[str]:
+        items = list(self.lists.get(key, ()))
+        return items[start:] if end == -1 else items[start : end + 1]
+
+    async def lrem(self, key: str, count: int, value: str) -> int:
+        items = self.lists.get(key)
+        removed = 0
+        while items and value in items and (count == 0 or removed < abs(count)):
+            items.remove(value)
+            removed += 1
+        return removed
+
+    def _pop_first(self, keys: list[str]) -> tuple[str, str] | None:
+        for key in keys:
+            items = self.lists.get(key)
+            if items:
+                return key, items.popleft()
+        return None
+
+    async def blpop(self, keys: list[str] | str, timeout: float = 0) -> tuple[str, str] | None:
+        key_list = [keys] if isinstance(keys, str) else list(keys)
+        async with self._changed:
+            popped = self._pop_first(key_list)
+            if popped is not None or timeout < 0:
+                return popped
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: any(self.lists.get(key) for key in key_list)),
+                    timeout=timeout or None,
+                )
+            except asyncio.TimeoutError:
+                return None
+            return self._pop_first(key_list)
+
+    async def lmove(self, source: str, destination: str, src: str = "LEFT", dest: str = "RIGHT") -> str | None:
+        items = self.lists.get(source)
+        if not items:
+            return None
+        value = items.popleft() if src == "LEFT" else items.pop()
+        target = self.lists.setdefault(destination, deque())
+        if dest == "LEFT":
+            target.appendleft(value)
+        else:
+            target.append(value)
+        return value
+
+    async def blmove(
+        self, first_list: str, second_list: str, timeout: float, src: str = "LEFT", dest: str = "RIGHT"
+    ) -> str | None:
+        popped = await self.blpop(first_list, timeout=timeout)
+        if popped is None:
+            return None
+        # Put it back at the head so lmove takes exactly this value.
+        self.lists[first_list].appendleft(popped[1])
+        return await self.lmove(first_list, second_list, src, dest)
+
+    async def zadd(
+        self, key: str, mapping: dict[str, float], nx: bool = False, xx: bool = False, ch: bool = False
+    ) -> int:
+        zset = self.zsets.setdefault(key, {})
+        changed = 0
+        for member, score in mapping.items():
+            exists = member in zset
+            if (nx and exists) or (xx and not exists):
+                continue
+            if not exists or (ch and zset[member] != float(score)):
+                changed += 1
+            zset[member] = float(score)
+        return changed
+
+    async def zrem(self, key: str, *members: str) -> int:
+        zset = self.zsets.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    async def zcard(self, key: str) -> int:
+        return len(self.zsets.get(key, {}))
+
+    async def zrangebyscore(
+        self, key: str, min: float | str, max: float | str, start: int | None = None, num: int | None = None
+    ) -> list[str]:
+        low = float("-inf") if min == "-inf" else float(min)
+        high = float("inf") if max == "+inf" else float(max)
+        members = sorted(
+            (score, member) for member, score in self.zsets.get(key, {}).items() if low <= score <= high
+        )
+        ordered = [member for _score, member in members]
+        if start is not None and num is not None:
+            ordered = ordered[start : start + num]
+        return ordered
+
+    async def zscore(self, key: str, member: str) -> float | None:
+        return self.zsets.get(key, {}).get(member)
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        values = self.hashes.setdefault(key, {})
+        value = int(values.get(field, 0)) + amount
+        values[field] = str(value)
+        return value
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        values = self.hashes.get(key, {})
+        return sum(1 for field in fields if values.pop(field, None) is not None)
+
+    async def aclose(self) -> None:
+        return None
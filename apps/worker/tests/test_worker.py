@@ -1,8 +1,14 @@
 import asyncio
+import json
 
+import pytest
+
+from sheriff_worker import main as worker_main
 from sheriff_worker.main import Worker
-from sheriff_worker.jobs import extract_frames
+from sheriff_worker.jobs import build_export_zip, extract_frames
 from sheriff_worker.queues.broker import InMemoryBroker
+
+from in_memory_redis import InMemoryRedis
 
 
 def test_worker_jobs() -> None:
@@ -31,3 +37,333 @@ def test_async_extract_frames_job_delegates_to_video_service(monkeypatch) -> Non
     result = asyncio.run(extract_frames.run_async({"sequence_id": "seq-1", "project_id": "project-1"}))
     assert result == {"status": "ready", "sequence_id": "seq-1", "frame_count": 4}
     assert captured["payload"] == {"sequence_id": "seq-1", "project_id": "project-1"}
+
+
+def test_media_queue_dispatches_dataset_export_jobs(monkeypatch) -> None:
+    captured: list[dict[str, object]] = []
+
+    async def fake_export(payload: dict[str, object]) -> dict[str, object]:
+        captured.append(payload)
+        return {"status": "completed", "hash": "abc"}
+
+    monkeypatch.setattr(build_export_zip, "run_dataset_export_job", fake_export)
+
+    payload = {"job_type": "build_dataset_export", "project_id": "project-1", "dataset_version_id": "dv-1"}
+    asyncio.run(worker_main.handle_media_job(json.dumps(payload)))
+    asyncio.run(worker_main.handle_media_job(json.dumps({"job_type": "unknown"})))
+    assert captured == [payload]
+
+
+def test_worker_pool_bounds_parallelism_per_queue() -> None:
+    from sheriff_worker.pool import QueueSpec, WorkerPool
+
+    async def scenario() -> tuple[int, int, dict[str, int]]:
+        redis = InMemoryRedis()
+        active = {"media": 0, "prelabel": 0}
+        peak = {"media": 0, "prelabel": 0}
+        stop = asyncio.Event()
+
+        def handler(name: str):
+            async def _handle(_payload: str) -> None:
+                active[name] += 1
+                peak[name] = max(peak[name], active[name])
+                await asyncio.sleep(0.01)
+                active[name] -= 1
+                if pool.completed["media"] + pool.completed["prelabel"] >= 11:
+                    stop.set()
+
+            return _handle
+
+        pool = WorkerPool(
+            redis,
+            [
+                QueueSpec(name="media", key="media", concurrency=1, handler=handler("media")),
+                QueueSpec(name="prelabel", key="prelabel", concurrency=3, handler=handler("prelabel")),
+            ],
+            poll_timeout_seconds=0.05,
+        )
+        await redis.rpush("media", *["{}"] * 3)
+        await redis.rpush("prelabel", *["{}"] * 9)
+        await asyncio.wait_for(pool.run(stop), timeout=5)
+        return peak["media"], peak["prelabel"], dict(pool.completed)
+
+    media_peak, prelabel_peak, completed = asyncio.run(scenario())
+    assert media_peak == 1
+    assert prelabel_peak == 3
+    assert completed["media"] + completed["prelabel"] == 12
+
+
+def test_worker_pool_serializes_jobs_with_same_partition_key() -> None:
+    from sheriff_worker.main import prelabel_session_key
+    from sheriff_worker.pool import QueueSpec, WorkerPool
+
+    async def scenario() -> dict[str, int]:
+        redis = InMemoryRedis()
+        active: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        stop = asyncio.Event()
+
+        async def handle(payload_raw: str) -> None:
+            session_id = prelabel_session_key(payload_raw) or ""
+            active[session_id] = active.get(session_id, 0) + 1
+            peak[session_id] = max(peak.get(session_id, 0), active[session_id])
+            await asyncio.sleep(0.01)
+            active[session_id] -= 1
+            if pool.completed["prelabel"] >= 5:
+                stop.set()
+
+        pool = WorkerPool(
+            redis,
+            [QueueSpec(name="prelabel", key="prelabel", concurrency=4, handler=handle, partition_key=prelabel_session_key)],
+            poll_timeout_seconds=0.05,
+        )
+        jobs = [json.dumps({"job_type": "prelabel_asset", "session_id": session, "asset_id": str(index)}) for index, session in enumerate("aaabbb")]
+        await redis.rpush("prelabel", *jobs)
+        await asyncio.wait_for(pool.run(stop), timeout=5)
+        return peak
+
+    assert asyncio.run(scenario()) == {"a": 1, "b": 1}
+
+
+def test_worker_pool_busy_partition_does_not_hold_other_sessions_slots() -> None:
+    from sheriff_worker.main import prelabel_session_key
+    from sheriff_worker.pool import QueueSpec, WorkerPool
+
+    async def scenario() -> tuple[list[str], WorkerPool]:
+        redis = InMemoryRedis()
+        finished: list[str] = []
+        others_done = asyncio.Event()
+        stop = asyncio.Event()
+
+        async def handle(payload_raw: str) -> None:
+            session_id = prelabel_session_key(payload_raw) or ""
+            if session_id == "a":
+                # Session a's first job only finishes once the other sessions got to run.
+                await asyncio.wait_for(others_done.wait(), timeout=2)
+            finished.append(session_id)
+            if {"b", "c"} <= set(finished):
+                others_done.set()
+            if len(finished) == 8:
+                stop.set()
+
+        pool = WorkerPool(
+            redis,
+            [QueueSpec(name="prelabel", key="prelabel", concurrency=3, handler=handle, partition_key=prelabel_session_key)],
+            poll_timeout_seconds=0.05,
+        )
+        jobs = [
+            json.dumps({"job_type": "prelabel_asset", "session_id": session, "asset_id": str(index)})
+            for index, session in enumerate("aaaaaabc")
+        ]
+        await redis.rpush("prelabel", *jobs)
+        await asyncio.wait_for(pool.run(stop), timeout=5)
+        return finished, pool
+
+    finished, pool = asyncio.run(scenario())
+    assert finished[:2] in (["b", "c"], ["c", "b"])
+    assert finished[2:] == ["a"] * 6
+    assert pool._partitions == {}
+    assert pool._in_flight["prelabel"] == 0
+
+
+def _reliable_backends() -> list:
+
+    backends = [pytest.param(InMemoryRedis, id="in-memory")]
+    try:
+        import fakeredis
+    except ImportError:
+        return backends
+    backends.append(pytest.param(lambda: fakeredis.aioredis.FakeRedis(decode_responses=True), id="fakeredis"))
+    return backends
+
+
+@pytest.mark.parametrize("make_redis", _reliable_backends())
+def test_reliable_queue_retries_with_backoff_then_dead_letters(make_redis) -> None:
+    from sheriff_worker.queues.reliable import ReliableQueue, RetryPolicy
+
+    async def scenario() -> None:
+        now = [1000.0]
+        redis = make_redis()
+        queue = ReliableQueue(
+            redis,
+            "jobs",
+            policy=RetryPolicy(max_attempts=3, visibility_timeout_seconds=30, backoff_base_seconds=10),
+            clock=lambda: now[0],
+        )
+        await redis.rpush("jobs", "job-a", "job-b")
+
+        first = await queue.reserve()
+        assert (first.payload_raw, first.attempt) == ("job-a", 1)
+        assert await queue.stats() == {"ready": 1, "processing": 1, "delayed": 0, "dead": 0}
+        assert await queue.fail(first, error="boom") == "retry"
+        assert await queue.fail(first, error="boom") == "lost"
+
+        # The retry is held back for backoff_base * 2**0 seconds.
+        second = await queue.reserve()
+        assert second.payload_raw == "job-b"
+        await queue.ack(second)
+        assert await queue.reserve() is None
+        now[0] += 9
+        assert (await queue.reap()).promoted == 0
+        now[0] += 1
+        assert (await queue.reap()).promoted == 1
+
+        retry = await queue.reserve()
+        assert (retry.payload_raw, retry.attempt) == ("job-a", 2)
+        assert await queue.fail(retry, error="boom") == "retry"
+        now[0] += 20
+        await queue.reap()
+        last = await queue.reserve()
+        assert last.attempt == 3
+        assert await queue.fail(last, error="still boom") == "dead"
+
+        assert await queue.stats() == {"ready": 0, "processing": 0, "delayed": 0, "dead": 1}
+        [dead] = await queue.dead_letters()
+        assert dead["payload"] == "job-a"
+        assert dead["attempts"] == 3
+        assert dead["error"] == "still boom"
+        assert await queue.replay_dead_letters() == 1
+        assert (await queue.reserve()).attempt == 1
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("make_redis", _reliable_backends())
+def test_reliable_queue_reaper_recovers_expired_and_orphaned_leases(make_redis) -> None:
+    from sheriff_worker.queues.reliable import ReliableQueue, RetryPolicy
+
+    async def scenario() -> None:
+        now = [1000.0]
+        redis = make_redis()
+        queue = ReliableQueue(
+            redis,
+            "jobs",
+            policy=RetryPolicy(max_attempts=2, visibility_timeout_seconds=30, backoff_base_seconds=0),
+            clock=lambda: now[0],
+        )
+        await redis.rpush("jobs", "job-a")
+
+        crashed = await queue.reserve(timeout=0.05)
+        now[0] += 20
+        assert await queue.heartbeat(crashed)
+        now[0] += 29
+        assert (await queue.reap()).requeued == 0
+        now[0] += 2
+        assert (await queue.reap()).requeued == 1
+        assert not await queue.heartbeat(crashed)
+        await queue.ack(crashed)  # A late ack from the presumed-dead consumer is harmless.
+
+        await queue.reap()
+        redelivered = await queue.reserve()
+        assert (redelivered.payload_raw, redelivered.attempt) == ("job-a", 2)
+
+        # A consumer that died between BLMOVE and writing its lease leaves an orphan.
+        await redis.rpush("jobs:processing", "job-orphan")
+        assert (await queue.reap()).orphans == 1
+        now[0] += 31
+        reaped = await queue.reap()
+        assert (reaped.requeued, reaped.dead) == (1, 1)
+        assert [row["payload"] for row in await queue.dead_letters()] == ["job-a"]
+        assert (await queue.reap()).promoted == 1
+        assert await redis.lrange("jobs", 0, -1) == ["job-orphan"]
+
+    asyncio.run(scenario())
+
+
+def test_worker_pool_retries_failed_jobs_and_releases_on_drain() -> None:
+    from sheriff_worker.pool import QueueSpec, WorkerPool
+    from sheriff_worker.queues.reliable import RetryPolicy
+
+    async def scenario() -> tuple[list[str], dict, InMemoryRedis]:
+        redis = InMemoryRedis()
+        calls: list[str] = []
+        stop = asyncio.Event()
+
+        async def handle(payload_raw: str) -> None:
+            calls.append(payload_raw)
+            if payload_raw == "flaky" and calls.count("flaky") < 2:
+                raise RuntimeError("transient")
+            if payload_raw == "slow":
+                stop.set()
+                await asyncio.sleep(10)
+
+        pool = WorkerPool(
+            redis,
+            [QueueSpec(name="media", key="media", concurrency=2, handler=handle)],
+            poll_timeout_seconds=0.02,
+            drain_timeout_seconds=0.05,
+            retry_policy=RetryPolicy(max_attempts=3, visibility_timeout_seconds=5, backoff_base_seconds=0),
+            reap_interval_seconds=0.01,
+        )
+        await redis.rpush("media", "flaky")
+        runner = asyncio.create_task(pool.run(stop))
+        while pool.completed["media"] < 1:
+            await asyncio.sleep(0.01)
+        await redis.rpush("media", "slow")
+        await asyncio.wait_for(runner, timeout=5)
+        return calls, {"completed": pool.completed["media"], "failed": pool.failed["media"]}, redis
+
+    calls, counts, redis = asyncio.run(scenario())
+    assert calls == ["flaky", "flaky", "slow"]
+    assert counts == {"completed": 1, "failed": 1}
+    # The job cancelled by the drain timeout is back at the head of the queue with its attempt refunded.
+    assert list(redis.lists["media"]) == ["slow"]
+    assert not redis.lists["media:processing"]
+    assert redis.hashes["media:attempts"]["slow"] == "0"
+
+
+def test_lane_dispatcher_interleaves_sessions_and_prioritises_latest_live_frame() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    from sheriff_api.services.prelabel_queue import lane_key, lane_sessions_key, lane_weights_key
+    from sheriff_worker.queues.lanes import LaneDispatcher
+
+    async def scenario() -> None:
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        superseded: dict[str, list[str]] = {}
+
+        async def on_superseded(session_id: str, payloads: list[str]) -> None:
+            superseded.setdefault(session_id, []).extend(payloads)
+
+        dispatcher = LaneDispatcher(redis, "prelabel", target_depth=6, on_superseded=on_superseded)
+        await redis.rpush(lane_key("prelabel", "bulk", "big"), *[f"big-{index}" for index in range(100)])
+        await redis.rpush(lane_key("prelabel", "bulk", "small"), "small-0", "small-1")
+        await redis.rpush(lane_key("prelabel", "bulk", "heavy"), *[f"heavy-{index}" for index in range(10)])
+        await redis.sadd(lane_sessions_key("prelabel", "bulk"), "big", "small", "heavy")
+        await redis.hset(lane_weights_key("prelabel"), "heavy", 2)
+
+        first = await dispatcher.dispatch_once()
+        assert (first.bulk, first.backlog) == (6, True)
+        ready = await redis.lrange("prelabel", 0, -1)
+        assert sorted(item.split("-")[0] for item in ready) == ["big", "big", "heavy", "heavy", "heavy", "small"]
+        assert (await dispatcher.dispatch_once()).bulk == 0
+
+        await redis.rpush(lane_key("prelabel", "live", "cam"), "cam-0", "cam-1", "cam-2")
+        await redis.sadd(lane_sessions_key("prelabel", "live"), "cam")
+        live = await dispatcher.dispatch_once()
+        assert (live.live, live.superseded) == (1, 2)
+        assert superseded == {"cam": ["cam-0", "cam-1"]}
+        assert await redis.lindex("prelabel", 0) == "cam-2"
+        assert await redis.smembers(lane_sessions_key("prelabel", "live")) == set()
+
+        # A newer frame replaces the one still waiting (unreserved) in the ready list.
+        await redis.rpush(lane_key("prelabel", "live", "cam"), "cam-3")
+        await redis.sadd(lane_sessions_key("prelabel", "live"), "cam")
+        replaced = await dispatcher.dispatch_once()
+        assert (replaced.live, replaced.superseded) == (1, 1)
+        assert superseded["cam"][-1] == "cam-2"
+        assert await redis.lindex("prelabel", 0) == "cam-3"
+        assert await redis.lpos("prelabel", "cam-2") is None
+
+        # Drain everything: "small" runs out and is retired, nothing is lost or duplicated.
+        drained = list(await redis.lrange("prelabel", 0, -1))
+        await redis.delete("prelabel")
+        while True:
+            result = await dispatcher.dispatch_once()
+            drained.extend(await redis.lrange("prelabel", 0, -1))
+            await redis.delete("prelabel")
+            if not result.backlog and not result.bulk:
+                break
+        assert len(drained) == len(set(drained)) == 113
+        assert await redis.smembers(lane_sessions_key("prelabel", "bulk")) == set()
+
+    asyncio.run(scenario())
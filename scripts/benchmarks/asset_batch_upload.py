@@ -0,0 +1,103 @@
+"""Image import throughput: one request per file vs batched streaming uploads.
+
+Usage: python scripts/benchmarks/asset_batch_upload.py [--images 10000] [--batch-size 64] [--folders 20]
+
+Drives the API in-process against a SQLite database and local storage. Both
+modes upload the same ``--images`` small JPEGs with a relative path spread over
+``--folders`` folders: ``single`` posts each file to ``/assets/upload`` (what the
+web importer used to do), ``batch`` posts ``--batch-size`` files per request to
+``/assets/upload-batch``, which stages every part on disk and commits once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from io import BytesIO
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _jpegs(distinct: int) -> list[bytes]:
+    from PIL import Image
+
+    images: list[bytes] = []
+    for index in range(distinct):
+        buffer = BytesIO()
+        Image.new("RGB", (96, 72), color=(index * 7 % 256, index * 13 % 256, index * 29 % 256)).save(
+            buffer, format="JPEG", quality=85
+        )
+        images.append(buffer.getvalue())
+    return images
+
+
+def _files(count: int, folders: int, images: list[bytes]) -> list[tuple[str, bytes]]:
+    return [(f"import/f{index % folders:03d}/img-{index:06d}.jpg", images[index % len(images)]) for index in range(count)]
+
+
+async def _run(count: int, batch_size: int, folders: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.main import app
+
+    files = _files(count, folders, _jpegs(64))
+    total_bytes = sum(len(content) for _, content in files)
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+
+            async def project(name: str) -> str:
+                response = await client.post("/api/v1/projects", json={"name": name})
+                response.raise_for_status()
+                return response.json()["id"]
+
+            single_project = await project("single")
+            started = time.perf_counter()
+            for relative_path, content in files:
+                response = await client.post(
+                    f"/api/v1/projects/{single_project}/assets/upload",
+                    data={"relative_path": relative_path},
+                    files={"file": (relative_path.rsplit("/", 1)[-1], content, "image/jpeg")},
+                )
+                response.raise_for_status()
+            single = time.perf_counter() - started
+
+            batch_project = await project("batch")
+            started = time.perf_counter()
+            for offset in range(0, count, batch_size):
+                chunk = files[offset : offset + batch_size]
+                response = await client.post(
+                    f"/api/v1/projects/{batch_project}/assets/upload-batch",
+                    data={"relative_paths": [relative_path for relative_path, _ in chunk]},
+                    files=[("files", (path.rsplit("/", 1)[-1], content, "image/jpeg")) for path, content in chunk],
+                )
+                response.raise_for_status()
+                assert not response.json()["errors"]
+            batch = time.perf_counter() - started
+
+    megabytes = total_bytes / (1024 * 1024)
+    print(f"images={count} folders={folders} payload={megabytes:.1f}MiB")
+    print(f"  single  {single:8.2f}s  {count / single:8.1f} images/s")
+    print(f"  batch   {batch:8.2f}s  {count / batch:8.1f} images/s  batch_size={batch_size}  speedup={single / batch:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--folders", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(Path(tmp) / "data")
+        asyncio.run(_run(args.images, args.batch_size, args.folders))
+
+
+if __name__ == "__main__":
+    main()
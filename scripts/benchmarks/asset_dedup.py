@@ -0,0 +1,87 @@
+"""Disk usage and import time of repeated imports with content-addressed asset storage.
+
+Usage: python scripts/benchmarks/asset_dedup.py [--images 2000] [--image-kib 64] [--batch-size 64]
+
+Imports the same ``--images`` files three times through ``/assets/upload-batch``:
+into ``first/``, again into ``first/`` (a re-import: rows and files are reused)
+and into ``copy/`` (new rows hard-linked to the stored blobs). Reports the time
+of each pass, the logical bytes the asset files represent and the bytes
+actually allocated on disk (each inode counted once).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _disk_usage(root: Path) -> tuple[int, int]:
+    logical = 0
+    physical = 0
+    seen: set[int] = set()
+    for directory, _dirs, files in os.walk(root / "assets"):
+        for name in files:
+            stat = os.stat(os.path.join(directory, name))
+            logical += stat.st_size
+            if stat.st_ino not in seen:
+                seen.add(stat.st_ino)
+                physical += stat.st_size
+    return logical, physical
+
+
+async def _run(storage_root: Path, count: int, image_bytes: int, batch_size: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.main import app
+
+    files = [(f"img-{index:06d}.jpg", index.to_bytes(8, "big") + os.urandom(image_bytes - 8)) for index in range(count)]
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            response = await client.post("/api/v1/projects", json={"name": "dedup"})
+            project_id = response.json()["id"]
+            for label, folder in (("import", "first"), ("re-import", "first"), ("copy", "copy")):
+                started = time.perf_counter()
+                reused = 0
+                for offset in range(0, count, batch_size):
+                    chunk = files[offset : offset + batch_size]
+                    response = await client.post(
+                        f"/api/v1/projects/{project_id}/assets/upload-batch",
+                        data={"relative_paths": [f"{folder}/{name}" for name, _ in chunk]},
+                        files=[("files", (name, content, "image/jpeg")) for name, content in chunk],
+                    )
+                    response.raise_for_status()
+                    reused += response.json()["reused"]
+                elapsed = time.perf_counter() - started
+                logical, physical = _disk_usage(storage_root)
+                total = (await client.get(f"/api/v1/projects/{project_id}/assets/count")).json()["total"]
+                print(
+                    f"  {label:<10} {elapsed:7.2f}s  reused={reused:<6} assets={total:<6} "
+                    f"logical={logical / 2**20:8.1f}MiB  on_disk={physical / 2**20:8.1f}MiB"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=2000)
+    parser.add_argument("--image-kib", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_root = Path(tmp) / "data"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(storage_root)
+        print(f"images={args.images} size={args.image_kib}KiB batch_size={args.batch_size}")
+        asyncio.run(_run(storage_root, args.images, args.image_kib * 1024, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Asset and annotation listing latency: full-project responses vs keyset pages.
+
+Usage: python scripts/benchmarks/asset_pagination.py [--assets 200000] [--folders 400] [--page-size 200]
+
+Seeds one project in a SQLite database with ``--assets`` assets spread over
+``--folders`` folders (plus the project root) and one annotation per asset,
+then drives the API in-process. ``full`` is the unpaged list every client used
+before; ``path``/``created`` walk every keyset page and report per-page p50/p99;
+``count`` times the uncached and cached ``/assets/count``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _percentiles(timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))]
+    return f"p50={statistics.median(ordered):8.2f}ms  p99={p99:8.2f}ms  n={len(ordered)}"
+
+
+def _seed(database_path: Path, assets: int, folders: int) -> tuple[str, str]:
+    from sqlalchemy import create_engine, insert
+
+    from sheriff_api.db.models import Annotation, AnnotationStatus, Asset, Base, Folder, Project, Task, TaskKind, TaskLabelMode
+
+    engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(engine)
+    project_id, task_id = str(uuid.uuid4()), str(uuid.uuid4())
+    started = datetime(2025, 1, 1)
+    folder_rows = [
+        {"id": str(uuid.uuid4()), "project_id": project_id, "name": f"f{index:04d}", "path": f"split-{index % 4}/f{index:04d}"}
+        for index in range(folders)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"id": project_id, "name": "bench", "default_task_id": task_id}])
+        conn.execute(
+            insert(Task),
+            [{"id": task_id, "project_id": project_id, "kind": TaskKind.classification, "label_mode": TaskLabelMode.single_label, "name": "default"}],
+        )
+        conn.execute(insert(Folder), folder_rows)
+        batch: list[dict] = []
+        annotations: list[dict] = []
+        for index in range(assets):
+            asset_id = str(uuid.uuid4())
+            folder = folder_rows[index % (folders + 1) - 1] if index % (folders + 1) else None
+            relative_path = f"{folder['path']}/img-{index:07d}.jpg" if folder else f"img-{index:07d}.jpg"
+            batch.append(
+                {
+                    "id": asset_id,
+                    "project_id": project_id,
+                    "folder_id": folder["id"] if folder else None,
+                    "file_name": f"img-{index:07d}.jpg",
+                    "sort_path": relative_path,
+                    "uri": f"/api/v1/assets/{asset_id}/content",
+                    "mime_type": "image/jpeg",
+                    "width": 640,
+                    "height": 480,
+                    "checksum": f"{index:064x}",
+                    "metadata_json": {"relative_path": relative_path},
+                    "created_at": started + timedelta(milliseconds=index),
+                }
+            )
+            annotations.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "asset_id": asset_id,
+                    "project_id": project_id,
+                    "task_id": task_id,
+                    "status": AnnotationStatus.labeled if index % 3 else AnnotationStatus.unlabeled,
+                    "payload_json": {},
+                    "created_at": started + timedelta(milliseconds=index),
+                }
+            )
+            if len(batch) == 20000:
+                conn.execute(insert(Asset), batch)
+                conn.execute(insert(Annotation), annotations)
+                batch, annotations = [], []
+        if batch:
+            conn.execute(insert(Asset), batch)
+            conn.execute(insert(Annotation), annotations)
+    engine.dispose()
+    return project_id, task_id
+
+
+async def _walk(client, url: str, params: dict) -> tuple[list[float], int]:
+    timings: list[float] = []
+    rows = 0
+    cursor = None
+    while True:
+        started = time.perf_counter()
+        response = await client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        timings.append((time.perf_counter() - started) * 1000.0)
+        response.raise_for_status()
+        rows += len(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return timings, rows
+
+
+async def _run(project_id: str, task_id: str, page_size: int, full_samples: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.main import app
+    from sheriff_api.services.pagination import asset_counts
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            assets_url = f"/api/v1/projects/{project_id}/assets"
+            full: list[float] = []
+            for _ in range(full_samples):
+                started = time.perf_counter()
+                response = await client.get(assets_url)
+                full.append((time.perf_counter() - started) * 1000.0)
+                total = len(response.json())
+            print(f"  full assets        {_percentiles(full)}  rows={total}")
+
+            for label, params in (
+                ("path pages", {"limit": page_size}),
+                ("created pages", {"limit": page_size, "order": "created"}),
+                ("path id-only", {"limit": page_size, "fields": "id"}),
+            ):
+                timings, rows = await _walk(client, assets_url, params)
+                print(f"  {label:<18} {_percentiles(timings)}  rows={rows}")
+
+            annotations_url = f"/api/v1/projects/{project_id}/annotations"
+            started = time.perf_counter()
+            await client.get(annotations_url, params={"task_id": task_id})
+            print(f"  full annotations   {(time.perf_counter() - started) * 1000.0:8.2f}ms")
+            timings, rows = await _walk(client, annotations_url, {"task_id": task_id, "limit": page_size})
+            print(f"  annotation pages   {_percentiles(timings)}  rows={rows}")
+
+            uncached: list[float] = []
+            cached: list[float] = []
+            for _ in range(20):
+                asset_counts.invalidate(project_id)
+                for bucket in (uncached, cached):
+                    started = time.perf_counter()
+                    await client.get(f"{assets_url}/count", params={"status": "labeled"})
+                    bucket.append((time.perf_counter() - started) * 1000.0)
+            print(f"  count uncached     {_percentiles(uncached)}")
+            print(f"  count cached       {_percentiles(cached)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=200000)
+    parser.add_argument("--folders", type=int, default=400)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--full-samples", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = Path(tmp) / "bench.db"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database_path}"
+        os.environ["STORAGE_ROOT"] = str(Path(tmp) / "data")
+        started = time.perf_counter()
+        project_id, task_id = _seed(database_path, args.assets, args.folders)
+        print(f"assets={args.assets} folders={args.folders} page_size={args.page_size} seed={time.perf_counter() - started:.1f}s")
+        asyncio.run(_run(project_id, task_id, args.page_size, args.full_samples))
+
+
+if __name__ == "__main__":
+    main()
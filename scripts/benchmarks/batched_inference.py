@@ -0,0 +1,75 @@
+"""Single-image vs batched ONNX Runtime throughput for a classification export.
+
+Usage: python scripts/benchmarks/batched_inference.py [--images 64] [--size 224] [--threads 0]
+
+Exports an untrained torchvision ResNet-18 with a dynamic batch axis (the same
+axes the trainer export uses), then compares one ``session.run`` per image with
+``run_onnx_rows`` at several batch sizes on the CPU execution provider.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "trainer" / "src"))
+
+import numpy as np  # noqa: E402
+import onnxruntime as ort  # noqa: E402
+import torch  # noqa: E402
+import torchvision  # noqa: E402
+
+from pixel_sheriff_trainer.inference.batching import run_onnx_rows  # noqa: E402
+
+
+def _export(path: Path, size: int) -> None:
+    model = torchvision.models.resnet18(weights=None, num_classes=10).eval()
+    torch.onnx.export(
+        model,
+        torch.randn(1, 3, size, size),
+        str(path),
+        input_names=["input"],
+        output_names=["logits"],
+        dynamic_axes={"input": {0: "batch_size"}, "logits": {0: "batch_size"}},
+        opset_version=17,
+        dynamo=False,
+    )
+
+
+def _rate(images: int, fn) -> float:
+    fn()  # warm-up
+    started = time.perf_counter()
+    fn()
+    return images / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=64)
+    parser.add_argument("--size", type=int, default=224)
+    parser.add_argument("--threads", type=int, default=0, help="ORT intra-op threads (0 = ORT default)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        onnx_path = Path(tmp) / "model.onnx"
+        _export(onnx_path, args.size)
+        options = ort.SessionOptions()
+        if args.threads > 0:
+            options.intra_op_num_threads = args.threads
+        session = ort.InferenceSession(str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"])
+        tensors = [np.random.rand(1, 3, args.size, args.size).astype(np.float32) for _ in range(args.images)]
+
+        print(f"images={args.images} size={args.size} threads={args.threads or 'default'}")
+        baseline = _rate(args.images, lambda: run_onnx_rows(session, tensors, max_batch_size=1))
+        print(f"batch= 1  {baseline:8.1f} img/s  x1.00")
+        for batch_size in (4, 8, 16, 32):
+            rate = _rate(args.images, lambda: run_onnx_rows(session, tensors, max_batch_size=batch_size))
+            print(f"batch={batch_size:>2}  {rate:8.1f} img/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""In-memory vs streamed dataset export on a synthetic project.
+
+Usage: python scripts/benchmarks/coco_export_stream.py [--images 20000] [--image-kb 24]
+
+Writes ``--images`` random-content ``.jpg`` files to a temporary directory and
+packages them twice, each mode in its own subprocess so peak RSS is not shared:
+
+- ``memory``: the previous behaviour -- every asset is read into memory while
+  planning and the whole archive is deflated into a ``BytesIO``.
+- ``stream``: ``write_export_zip_file`` -- assets are copied in chunks from
+  disk, media entries are stored without compression, JSON is deflated.
+"""
+
+from __future__ import annotations
+
+import argparse
+from io import BytesIO
+import json
+import os
+from pathlib import Path
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _write_assets(root: Path, images: int, image_kb: int) -> None:
+    assets_dir = root / "assets"
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(images):
+        (assets_dir / f"img_{index:06d}.jpg").write_bytes(os.urandom(image_kb * 1024))
+
+
+def _plan_inputs(root: Path) -> dict:
+    paths = sorted((root / "assets").iterdir())
+    assets = [
+        {"id": f"asset-{index:06d}", "relative_path": path.name, "width": 640, "height": 480, "extension": ".jpg", "path": path}
+        for index, path in enumerate(paths)
+    ]
+    annotations = [
+        {"id": f"ann-{index:06d}", "asset_id": asset["id"], "payload": {"category_ids": [1 + index % 2]}}
+        for index, asset in enumerate(assets)
+    ]
+    return {
+        "assets": assets,
+        "annotations": annotations,
+        "categories": [{"id": 1, "name": "cat", "display_order": 0}, {"id": 2, "name": "dog", "display_order": 1}],
+    }
+
+
+def _run_mode(mode: str, root: Path) -> dict:
+    from sheriff_api.db.models import TaskType
+    from sheriff_api.services.exporter_coco import build_export_plan, write_export_zip_file
+
+    inputs = _plan_inputs(root)
+    started = time.perf_counter()
+    common = {
+        "project_id": "bench",
+        "project_name": "bench",
+        "task_type": TaskType.classification_single,
+        "selection_criteria": {},
+        **inputs,
+    }
+    if mode == "memory":
+        plan = build_export_plan(**common, locate_asset=lambda asset: asset["path"].read_bytes())
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr("manifest.json", json.dumps(plan.manifest, indent=2))
+            bundle.writestr("coco_instances.json", json.dumps(plan.coco, indent=2))
+            for zip_path, data in plan.asset_sources.items():
+                bundle.writestr(zip_path, data)
+        destination = root / "memory.zip"
+        destination.write_bytes(buffer.getvalue())
+    else:
+        plan = build_export_plan(**common, locate_asset=lambda asset: asset["path"])
+        destination = root / "stream.zip"
+        write_export_zip_file(plan, destination)
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"mode": mode, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024, "zip_mb": destination.stat().st_size / 2**20}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=20000)
+    parser.add_argument("--image-kb", type=int, default=24)
+    parser.add_argument("--mode", choices=("memory", "stream"), help=argparse.SUPPRESS)
+    parser.add_argument("--root", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.root)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_assets(root, args.images, args.image_kb)
+        print(f"images={args.images} image_kb={args.image_kb} source_mb={args.images * args.image_kb / 1024:.1f}")
+        for mode in ("memory", "stream"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--root", str(root)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{result['mode']:>6}  {result['seconds']:7.2f}s  "
+                f"peak_rss={result['peak_rss_mb']:8.1f} MiB  zip={result['zip_mb']:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Load test for experiment event streaming: per-subscriber polling vs the shared tail.
+
+Usage: python scripts/benchmarks/experiment_event_tail.py [--events 50000] [--subscribers 100] [--live-seconds 5]
+
+Seeds a run with ``--events`` lines, then appends one event every 100 ms for
+``--live-seconds`` followed by a ``done`` event while ``--subscribers`` readers
+follow the log from line 0. ``polling`` reproduces the previous SSE loop
+(``read_events`` + status + line count every 0.8 s per subscriber); ``tail``
+uses ``EventTailRegistry`` with inotify (falling back to polling).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+from sheriff_api.services.event_tail import EventTailRegistry, InotifyWatcher  # noqa: E402
+from sheriff_api.services.experiment_store import ExperimentStore  # noqa: E402
+
+PROJECT_ID = "bench-project"
+EXPERIMENT_ID = "bench-experiment"
+ATTEMPT = 1
+
+
+def _as_sse(row: dict) -> str:
+    # Mirrors routers.experiments.shared.as_sse, which the previous loop called per row and stream.
+    return f"data: {json.dumps(row, separators=(',', ':'))}\n\n"
+
+
+def _seed(store: ExperimentStore, events: int) -> Path:
+    path = store.events_path(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID, attempt=ATTEMPT)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(events):
+            handle.write(json.dumps({"type": "metric", "step": index, "loss": 1.0 / (index + 1)}) + "\n")
+    store.set_status(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID, status="running")
+    return path
+
+
+async def _append_live(store: ExperimentStore, seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    step = 0
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+        store.append_event(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID, attempt=ATTEMPT, event={"type": "live", "step": step})
+        step += 1
+    store.append_event(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID, attempt=ATTEMPT, event={"type": "done", "status": "completed"})
+
+
+async def _polling_subscriber(store: ExperimentStore) -> int:
+    cursor = 0
+    received = 0
+    while True:
+        rows = store.read_events(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID, attempt=ATTEMPT, from_line=cursor)
+        if rows:
+            received += sum(len(_as_sse(row)) > 0 for row in rows)
+            cursor = int(rows[-1]["line"])
+            if rows[-1]["event"].get("type") == "done":
+                return received
+            continue
+        store.get_status_row(PROJECT_ID, EXPERIMENT_ID)
+        store.get_event_line_count(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID, attempt=ATTEMPT)
+        await asyncio.sleep(0.8)
+
+
+async def _tail_subscriber(store: ExperimentStore, registry: EventTailRegistry, path: Path) -> int:
+    cursor = 0
+    received = 0
+    async with registry.subscribe(
+        "bench",
+        path=path,
+        attempt=ATTEMPT,
+        status_reader=lambda: store.get_status_row(PROJECT_ID, EXPERIMENT_ID),
+        watch_dirs=[path.parent, store.experiment_dir(project_id=PROJECT_ID, experiment_id=EXPERIMENT_ID)],
+    ) as tail:
+        while True:
+            rows, covered = await tail.rows_after(cursor)
+            if covered > cursor:
+                cursor = covered
+                received += sum(len(f"data: {row.encoded()}\n\n") > 0 for row in rows)
+                if rows and rows[-1].event.get("type") == "done":
+                    return received
+                continue
+            await tail.wait(cursor, timeout=15.0)
+
+
+async def _run(mode: str, events: int, subscribers: int, live_seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ExperimentStore(tmp)
+        path = _seed(store, events)
+        registry = EventTailRegistry(watch_mode="auto", poll_seconds=0.8)
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        if mode == "polling":
+            readers = [asyncio.create_task(_polling_subscriber(store)) for _ in range(subscribers)]
+        else:
+            readers = [asyncio.create_task(_tail_subscriber(store, registry, path)) for _ in range(subscribers)]
+        appender = asyncio.create_task(_append_live(store, live_seconds))
+        received = await asyncio.gather(*readers)
+        await appender
+        wall = time.perf_counter() - started_wall
+        cpu = time.process_time() - started_cpu
+        expected = path.read_bytes().count(b"\n")
+        ok = all(count == expected for count in received)
+        print(f"{mode:>8}  wall={wall:6.2f}s  cpu={cpu:7.2f}s  rows/subscriber={received[0]}  complete={ok}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--subscribers", type=int, default=100)
+    parser.add_argument("--live-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as probe:
+
+        async def _probe() -> bool:
+            try:
+                InotifyWatcher([Path(probe)]).close()
+                return True
+            except OSError:
+                return False
+
+        inotify = asyncio.run(_probe())
+    print(f"events={args.events} subscribers={args.subscribers} live_seconds={args.live_seconds} inotify={inotify}")
+    for mode in ("polling", "tail"):
+        asyncio.run(_run(mode, args.events, args.subscribers, args.live_seconds))
+
+
+if __name__ == "__main__":
+    main()
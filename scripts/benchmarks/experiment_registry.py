@@ -0,0 +1,71 @@
+"""Registry scaling: file documents vs the SQL registry as a project grows.
+
+Usage: python scripts/benchmarks/experiment_registry.py [--experiments 2000] [--samples 20]
+
+Seeds ``--experiments`` experiments into one project for each backend, then
+times ``list_by_project`` and single-record updates (rename, summary, status).
+The SQL registry runs on a SQLite file, the default local database.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+from sheriff_api.services.experiment_store import ExperimentStore, create_experiment_store  # noqa: E402
+
+PROJECT_ID = "bench-project"
+
+
+def _median_ms(action, samples: int) -> float:
+    timings = []
+    for index in range(samples):
+        started = time.perf_counter()
+        action(index)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+
+def _run(backend: str, experiments: int, samples: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{Path(tmp) / 'registry.db'}" if backend == "sql" else None
+        store: ExperimentStore = create_experiment_store(str(Path(tmp) / "data"), database_url=database_url)
+        started = time.perf_counter()
+        ids = [
+            store.create(project_id=PROJECT_ID, model_id=f"model-{index % 10}", task_id="task", name=f"exp-{index}", config_json={"epochs": 1})["id"]
+            for index in range(experiments)
+        ]
+        seed_s = time.perf_counter() - started
+
+        list_ms = _median_ms(lambda _: store.list_by_project(PROJECT_ID), max(3, samples // 4))
+        rename_ms = _median_ms(lambda i: store.update(project_id=PROJECT_ID, experiment_id=ids[i], name=f"renamed-{i}"), samples)
+        summary_ms = _median_ms(
+            lambda i: store.set_summary(project_id=PROJECT_ID, experiment_id=ids[i], summary_json={"best_epoch": i}),
+            samples,
+        )
+        status_ms = _median_ms(lambda i: store.set_status(project_id=PROJECT_ID, experiment_id=ids[i], status="failed"), samples)
+        print(
+            f"{backend:>5}  seed={seed_s:6.1f}s  list={list_ms:8.1f}ms  update={rename_ms:7.2f}ms  "
+            f"set_summary={summary_ms:7.2f}ms  set_status={status_ms:7.2f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--experiments", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+    print(f"experiments={args.experiments} samples={args.samples}")
+    for backend in ("file", "sql"):
+        _run(backend, args.experiments, args.samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Florence-2 decoding profiles: latency and proposal agreement, offline.
+
+Usage: python scripts/benchmarks/florence_decoding.py [--images 6] [--prompts 4] [--max-new-tokens 64]
+
+Builds a tiny randomly initialised ``Florence2ForConditionalGeneration``
+(transformers' native port, same processor and post-processing as the real
+checkpoints) so nothing is downloaded, then runs the trainer's
+``_run_florence_detection`` over ``--images`` noise images with:
+
+* ``baseline``: 3-beam search without the KV cache (the previous behaviour),
+* ``quality`` and ``fast`` as served,
+* both again after ``_quantize_florence_language_model`` (dynamic int8).
+
+Agreement is the F1 of each profile's boxes against ``baseline`` (same label,
+IoU >= 0.5). A random model emits no useful text on its own, so decoding is
+constrained to Florence's ``label <loc_x1><loc_y1><loc_x2><loc_y2>`` grammar;
+absolute timings are far below a real checkpoint, the ratios are what carry
+over. The last table runs ``--prompts`` prompt sets over every image with and
+without ``FlorenceInputCache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "trainer" / "src"))
+
+_LABELS = ["person", "car", "dog", "cat", "tree"]
+_WORDS = ["locate", "in", "the", "image", ".", ",", "a", "of", "object", *_LABELS]
+
+
+def _build_runtime(seed: int):
+    import torch
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+    from transformers import (
+        BartTokenizerFast,
+        CLIPImageProcessor,
+        Florence2Config,
+        Florence2ForConditionalGeneration,
+        Florence2Processor,
+    )
+
+    specials = ["<s>", "<pad>", "</s>", "<unk>"]
+    vocab = {token: index for index, token in enumerate(specials + ["▁" + word for word in _WORDS])}
+    backend = Tokenizer(models.WordLevel(vocab=vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Sequence([pre_tokenizers.Punctuation(), pre_tokenizers.Metaspace()])
+    backend.decoder = decoders.Metaspace()
+    tokenizer = BartTokenizerFast(
+        tokenizer_object=backend,
+        bos_token="<s>",
+        eos_token="</s>",
+        pad_token="<pad>",
+        unk_token="<unk>",
+        extra_special_tokens={"image_token": "<image>"},
+    )
+    tokenizer.add_tokens([f"<loc_{index}>" for index in range(1000)], special_tokens=True)
+
+    size = 384
+    image_processor = CLIPImageProcessor(
+        size={"height": size, "width": size},
+        do_center_crop=False,
+        image_mean=[0.485, 0.456, 0.406],
+        image_std=[0.229, 0.224, 0.225],
+    )
+    image_processor.image_seq_length = (size // 32) ** 2 + 1
+    processor = Florence2Processor(
+        image_processor=image_processor,
+        tokenizer=tokenizer,
+        post_processor_config={"description_with_bboxes": {}},
+    )
+    processor.tasks_answer_post_processing_type["<OPEN_VOCABULARY_DETECTION>"] = "description_with_bboxes"
+
+    config = Florence2Config(
+        text_config={
+            "vocab_size": len(tokenizer),
+            "d_model": 64,
+            "encoder_layers": 2,
+            "decoder_layers": 2,
+            "encoder_attention_heads": 4,
+            "decoder_attention_heads": 4,
+            "encoder_ffn_dim": 128,
+            "decoder_ffn_dim": 128,
+            "max_position_embeddings": 1024,
+            "bos_token_id": 0,
+            "pad_token_id": 1,
+            "eos_token_id": 2,
+            "decoder_start_token_id": 2,
+            "forced_bos_token_id": 0,
+            "init_std": 0.2,
+        },
+        vision_config={
+            "depths": (1, 1, 1, 1),
+            "embed_dim": (16, 32, 64, 64),
+            "num_heads": (1, 2, 4, 4),
+            "num_groups": (1, 2, 4, 4),
+            "projection_dim": 64,
+            "window_size": 12,
+        },
+        image_token_id=tokenizer.image_token_id,
+    )
+    torch.manual_seed(seed)
+    model = Florence2ForConditionalGeneration(config).eval()
+    phrase_ids = [tokenizer.convert_tokens_to_ids("▁" + label) for label in _LABELS]
+    loc_ids = tokenizer.convert_tokens_to_ids([f"<loc_{index}>" for index in range(1000)])
+    return model, processor, phrase_ids, loc_ids, tokenizer.eos_token_id
+
+
+def _constrain(model, *, phrase_ids: list[int], loc_ids: list[int], eos_id: int):
+    """Make ``model.generate`` follow ``(label <loc>x4)* </s>`` after the forced ``<s>``."""
+    import torch
+    from transformers import LogitsProcessor, LogitsProcessorList
+
+    class BoxGrammar(LogitsProcessor):
+        def __call__(self, input_ids, scores):
+            allowed_phrase = torch.full_like(scores, float("-inf"))
+            allowed_phrase[:, phrase_ids] = 0.0
+            allowed_loc = torch.full_like(scores, float("-inf"))
+            allowed_loc[:, loc_ids] = 0.0
+            # Rows start "</s> <s>"; every box is one phrase token and four loc tokens.
+            position = input_ids.shape[1] - 2
+            if position < 0:
+                return scores
+            if position % 5 == 0:
+                mask = allowed_phrase
+                if position > 0:
+                    mask[:, eos_id] = 0.0
+            else:
+                mask = allowed_loc
+            return scores + mask
+
+    generate = model.generate
+
+    def constrained_generate(*args, **kwargs):
+        return generate(*args, logits_processor=LogitsProcessorList([BoxGrammar()]), **kwargs)
+
+    model.generate = constrained_generate
+    return model
+
+
+def _iou(a: list[float], b: list[float]) -> float:
+    ax1, ay1, ax2, ay2 = min(a[0], a[2]), min(a[1], a[3]), max(a[0], a[2]), max(a[1], a[3])
+    bx1, by1, bx2, by2 = min(b[0], b[2]), min(b[1], b[3]), max(b[0], b[2]), max(b[1], b[3])
+    inter = max(0.0, min(ax2, bx2) - max(ax1, bx1)) * max(0.0, min(ay2, by2) - max(ay1, by1))
+    union = (ax2 - ax1) * (ay2 - ay1) + (bx2 - bx1) * (by2 - by1) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _agreement(reference: list[list], candidate: list[list]) -> float:
+    matched = 0
+    total_reference = 0
+    total_candidate = 0
+    for reference_boxes, candidate_boxes in zip(reference, candidate, strict=True):
+        total_reference += len(reference_boxes)
+        total_candidate += len(candidate_boxes)
+        unused = list(reference_boxes)
+        for box in candidate_boxes:
+            for index, other in enumerate(unused):
+                if other.label_text == box.label_text and _iou(other.bbox, box.bbox) >= 0.5:
+                    matched += 1
+                    del unused[index]
+                    break
+    if total_reference + total_candidate == 0:
+        return 1.0
+    return 2 * matched / (total_reference + total_candidate)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=6)
+    parser.add_argument("--prompts", type=int, default=4)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import torch
+    from PIL import Image
+
+    from pixel_sheriff_trainer.inference import app as inference_app
+    from pixel_sheriff_trainer.inference.florence_inputs import FlorenceInputCache
+
+    model, processor, phrase_ids, loc_ids, eos_id = _build_runtime(args.seed)
+    profiles = inference_app.FLORENCE_DECODING_PROFILES
+    profiles["baseline"] = {**profiles["quality"], "use_cache": False}
+    for options in profiles.values():
+        options["max_new_tokens"] = args.max_new_tokens
+    quantized = inference_app._quantize_florence_language_model(copy.deepcopy(model))
+    _constrain(model, phrase_ids=phrase_ids, loc_ids=loc_ids, eos_id=eos_id)
+    _constrain(quantized, phrase_ids=phrase_ids, loc_ids=loc_ids, eos_id=eos_id)
+    prompts = ["person, car", "dog", "cat, tree", "person"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(args.images):
+            path = Path(tmp) / f"frame_{index}.png"
+            Image.effect_noise((640, 480), 40 + index).convert("RGB").save(path)
+            paths.append(path)
+
+        def run(runtime_model, path: Path, profile: str, prompt: list[str], input_cache=None) -> list:
+            return inference_app._run_florence_detection(
+                runtime_model, processor, "cpu", path, prompt, 0.0, 100, profile, input_cache
+            )
+
+        print(f"{args.images} images, max_new_tokens={args.max_new_tokens}, threads={torch.get_num_threads()}")
+        with torch.no_grad():
+            run(model, paths[0], "fast", prompts[:1])
+            results: dict[str, list[list]] = {}
+            rows = [("baseline", model, "baseline"), ("quality", model, "quality"), ("fast", model, "fast"),
+                    ("quality+int8", quantized, "quality"), ("fast+int8", quantized, "fast")]
+            for label, runtime_model, profile in rows:
+                boxes: list[list] = []
+                started = time.perf_counter()
+                for path in paths:
+                    boxes.append(run(runtime_model, path, profile, prompts[:1]))
+                elapsed = time.perf_counter() - started
+                results[label] = boxes
+                agreement = _agreement(results["baseline"], boxes)
+                print(
+                    f"  {label:<13} {elapsed / len(paths) * 1000:8.1f}ms/image  "
+                    f"{sum(map(len, boxes)) / len(paths):5.1f} boxes/image  agreement={agreement:.2f}"
+                )
+
+            prompt_sets = [[prompt] for prompt in (prompts * args.prompts)[: args.prompts]]
+            print(f"{len(prompt_sets)} prompts per image, fast profile")
+            for input_cache in (None, FlorenceInputCache(max_images=args.images)):
+                started = time.perf_counter()
+                for path in paths:
+                    for prompt in prompt_sets:
+                        run(model, path, "fast", prompt, input_cache)
+                elapsed = time.perf_counter() - started
+                stats = input_cache.stats() if input_cache is not None else None
+                print(
+                    f"  input cache {'on ' if input_cache is not None else 'off'} "
+                    f"{elapsed / (len(paths) * len(prompt_sets)) * 1000:8.1f}ms/request"
+                    + (f"  hits={stats['hits']} misses={stats['misses']}" if stats else "")
+                )
+
+
+if __name__ == "__main__":
+    main()
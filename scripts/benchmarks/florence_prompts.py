@@ -0,0 +1,91 @@
+"""Florence-2 detection cost vs category count: combined prompt, one run per prompt, per-prompt mode.
+
+Usage: python scripts/benchmarks/florence_prompts.py [--categories 5,20,50] [--images 2] [--max-new-tokens 32]
+
+Uses the tiny random Florence-2 model of ``florence_decoding.py`` (offline,
+constrained to the box grammar) with the ``fast`` profile. For each category
+count it times, per image:
+
+* ``combined``: one ``<OPEN_VOCABULARY_DETECTION>`` prompt listing every category,
+* ``separate``: ``_run_florence_detection`` once per category, the vision
+  tower running every time,
+* ``per_prompt``: ``_run_florence_detection_per_prompt``, vision tower once
+  and ``--prompt-batch`` prompts per ``generate``.
+
+The tiny vision tower is far cheaper relative to its language model than
+Florence-2-base's DaViT at 768x768, so the vision share printed first is what
+``per_prompt`` saves per extra category on a real checkpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "trainer" / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", default="5,20,50")
+    parser.add_argument("--images", type=int, default=2)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--prompt-batch", type=int, default=8)
+    args = parser.parse_args()
+
+    import torch
+    from PIL import Image
+
+    from florence_decoding import _LABELS, _build_runtime, _constrain
+    from pixel_sheriff_trainer.inference import app as inference_app
+
+    model, processor, phrase_ids, loc_ids, eos_id = _build_runtime(0)
+    for options in inference_app.FLORENCE_DECODING_PROFILES.values():
+        options["max_new_tokens"] = args.max_new_tokens
+    _constrain(model, phrase_ids=phrase_ids, loc_ids=loc_ids, eos_id=eos_id)
+
+    with tempfile.TemporaryDirectory() as tmp, torch.no_grad():
+        paths = []
+        for index in range(args.images):
+            path = Path(tmp) / f"frame_{index}.png"
+            Image.effect_noise((640, 480), 40 + index).convert("RGB").save(path)
+            paths.append(path)
+
+        pixel_values = processor.image_processor(Image.open(paths[0]).convert("RGB"), return_tensors="pt")["pixel_values"]
+        started = time.perf_counter()
+        for _ in range(5):
+            inference_app._florence_image_features(model, pixel_values)
+        print(f"vision tower {(time.perf_counter() - started) / 5 * 1000:.1f}ms/image, fast profile, max_new_tokens={args.max_new_tokens}")
+
+        for count in [int(value) for value in args.categories.split(",") if value.strip()]:
+            categories = [_LABELS[index % len(_LABELS)] + ("" if index < len(_LABELS) else f" {index}") for index in range(count)]
+            modes = {
+                "combined": lambda path: inference_app._run_florence_detection(
+                    model, processor, "cpu", path, categories, 0.0, 200, "fast"
+                ),
+                "separate": lambda path: [
+                    box
+                    for category in categories
+                    for box in inference_app._run_florence_detection(model, processor, "cpu", path, [category], 0.0, 200, "fast")
+                ],
+                "per_prompt": lambda path: inference_app._run_florence_detection_per_prompt(
+                    model, processor, "cpu", path, categories, 0.0, 200, "fast", None, args.prompt_batch
+                ),
+            }
+            for mode, run in modes.items():
+                started = time.perf_counter()
+                boxes = sum(len(run(path)) for path in paths)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"  categories={count:<4} {mode:<10} {elapsed / len(paths) * 1000:9.1f}ms/image  "
+                    f"{boxes / len(paths):6.1f} boxes/image"
+                )
+
+
+if __name__ == "__main__":
+    main()
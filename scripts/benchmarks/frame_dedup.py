@@ -0,0 +1,106 @@
+"""Stored frames, bytes and prelabel candidates of a static webcam feed per FRAME_DEDUP_MODE.
+
+Usage: python scripts/benchmarks/frame_dedup.py [--frames 600] [--scene-frames 150] [--modes off,flag,skip]
+
+Builds a synthetic 1280x720 JPEG feed: a scene that changes every
+``--scene-frames`` frames, with fresh sensor-like noise on every frame. Each
+mode uploads the feed into its own webcam sequence through
+``POST /sequences/{id}/frames`` against a SQLite database. Reports the upload
+time per frame (perceptual hashing included), the frames stored, the bytes
+stored and the frames left for prelabeling (stored and not flagged).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from io import BytesIO
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _build_feed(frames: int, scene_frames: int) -> list[bytes]:
+    from PIL import Image
+
+    feed: list[bytes] = []
+    scene = None
+    for index in range(frames):
+        if index % scene_frames == 0:
+            scene = Image.effect_noise((32, 18), 80).resize((1280, 720), Image.Resampling.BICUBIC)
+        noise = Image.effect_noise((1280, 720), 40)
+        frame = Image.blend(scene, noise, 0.08).convert("RGB")
+        buffer = BytesIO()
+        frame.save(buffer, format="JPEG", quality=85)
+        feed.append(buffer.getvalue())
+    return feed
+
+
+async def _run(feed: list[bytes], modes: list[str]) -> None:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import select
+
+    from sheriff_api.config import get_settings
+    from sheriff_api.db.models import Asset
+    from sheriff_api.db.session import SessionLocal
+    from sheriff_api.main import app
+    from sheriff_api.services.frame_dedup import near_duplicate_of
+
+    settings = get_settings()
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            project = (await client.post("/api/v1/projects", json={"name": "frame-dedup"})).json()
+            for mode in modes:
+                settings.frame_dedup_mode = mode
+                created = await client.post(
+                    f"/api/v1/projects/{project['id']}/webcam-sessions",
+                    json={"task_id": project["default_task_id"], "name": f"dedup-{mode}", "fps": 2},
+                )
+                created.raise_for_status()
+                sequence_id = created.json()["sequence"]["id"]
+                started = time.perf_counter()
+                for index, content in enumerate(feed):
+                    response = await client.post(
+                        f"/api/v1/projects/{project['id']}/sequences/{sequence_id}/frames",
+                        data={"frame_index": str(index)},
+                        files={"file": (f"frame_{index + 1:06d}.jpg", content, "image/jpeg")},
+                    )
+                    response.raise_for_status()
+                elapsed = time.perf_counter() - started
+
+                async with SessionLocal() as db:
+                    assets = (await db.execute(select(Asset).where(Asset.sequence_id == sequence_id))).scalars().all()
+                stored_bytes = sum(int(asset.metadata_json.get("size_bytes") or 0) for asset in assets)
+                candidates = sum(1 for asset in assets if near_duplicate_of(asset) is None)
+                print(
+                    f"  {mode:<5} {elapsed / len(feed) * 1000:6.2f}ms/frame  stored={len(assets):<5} "
+                    f"{stored_bytes / 2**20:7.1f}MiB  prelabel_candidates={candidates}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--scene-frames", type=int, default=150)
+    parser.add_argument("--modes", default="off,flag,skip")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(Path(tmp) / "data")
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        feed = _build_feed(args.frames, args.scene_frames)
+        print(
+            f"{args.frames} frames of 1280x720 JPEG ({sum(map(len, feed)) / 2**20:.1f} MiB), "
+            f"new scene every {args.scene_frames} frames"
+        )
+        asyncio.run(_run(feed, [value.strip() for value in args.modes.split(",") if value.strip()]))
+
+
+if __name__ == "__main__":
+    main()
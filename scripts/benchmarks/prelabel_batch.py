@@ -0,0 +1,167 @@
+"""Bulk prelabel throughput, model time excluded: one job per asset vs chunked ``prelabel_assets`` jobs.
+
+Usage: python scripts/benchmarks/prelabel_batch.py [--frames 400] [--chunks 1,4,8,16] [--boxes 5]
+
+Uploads ``--frames`` frames into a webcam sequence against a SQLite database,
+then for each ``PRELABEL_JOB_ASSETS`` value in ``--chunks`` starts a bulk
+prelabel session on it and runs every enqueued job in order. The real
+Florence-2 adapter talks to an in-process HTTP server that answers
+``/infer/florence/detect`` and ``/infer/florence/detect/batch`` at once with
+``--boxes`` matching boxes per image, so the numbers cover the HTTP round
+trips, session bookkeeping commits and proposal inserts that chunking
+amortizes, but not the batched ``generate`` on the trainer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+async def _serve_trainer(boxes_per_image: int) -> tuple[asyncio.AbstractServer, str, list[int]]:
+    """HTTP/1.1 keep-alive server answering Florence single and batch requests; counts requests."""
+    boxes = [
+        {"label_text": "person", "score": 0.9, "bbox": [float(index), float(index), 20.0 + index, 20.0 + index]}
+        for index in range(boxes_per_image)
+    ]
+    requests = [0]
+
+    def respond(path: bytes, body: bytes) -> bytes:
+        if path.endswith(b"/batch"):
+            relpaths = json.loads(body).get("asset_relpaths") or []
+            payload = {"device_selected": "cpu", "items": [{"asset_relpath": relpath, "boxes": boxes} for relpath in relpaths]}
+        else:
+            payload = {"device_selected": "cpu", "boxes": boxes}
+        encoded = json.dumps(payload).encode()
+        return b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(encoded), encoded)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.split(b"\r\n")
+                length = 0
+                for line in lines:
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                body = await reader.readexactly(length)
+                requests[0] += 1
+                writer.write(respond(lines[0].split(b" ")[1], body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, f"http://{host}:{port}", requests
+
+
+async def _run(frames: int, chunks: list[int], boxes_per_image: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.config import get_settings
+    from sheriff_api.main import app
+    from sheriff_api.services import prelabels
+
+    settings = get_settings()
+    settings.frame_dedup_mode = "off"
+    server, trainer_url, requests = await _serve_trainer(boxes_per_image)
+    settings.trainer_inference_base_url = trainer_url
+    payloads: list[dict] = []
+
+    async def capture(self, job_payloads) -> int:
+        payloads.extend(job_payloads)
+        return len(payloads)
+
+    prelabels.PrelabelQueue.enqueue_asset_jobs = capture
+    png = _png_bytes()
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            project = (await client.post("/api/v1/projects", json={"name": "batch", "task_type": "bbox"})).json()
+            await client.post(
+                f"/api/v1/projects/{project['id']}/categories",
+                json={"task_id": project["default_task_id"], "name": "person"},
+            )
+            created = await client.post(
+                f"/api/v1/projects/{project['id']}/webcam-sessions",
+                json={"task_id": project["default_task_id"], "name": "bulk", "fps": 2},
+            )
+            sequence_id = created.json()["sequence"]["id"]
+            for index in range(frames):
+                await client.post(
+                    f"/api/v1/projects/{project['id']}/sequences/{sequence_id}/frames",
+                    data={"frame_index": str(index)},
+                    files={"file": (f"frame_{index + 1:06d}.png", png, "image/png")},
+                )
+
+            for chunk in chunks:
+                settings.prelabel_job_assets = chunk
+                payloads.clear()
+                requests[0] = 0
+                session = await client.post(
+                    f"/api/v1/projects/{project['id']}/tasks/{project['default_task_id']}/prelabels",
+                    json={
+                        "sequence_id": sequence_id,
+                        "source_type": "florence2",
+                        "prompts": ["person"],
+                        "frame_sampling": {"mode": "every_n_frames", "value": 1},
+                    },
+                )
+                session.raise_for_status()
+                started = time.perf_counter()
+                for payload in payloads:
+                    if payload["job_type"] == "prelabel_assets":
+                        await prelabels.process_prelabel_assets_job(dict(payload))
+                    else:
+                        await prelabels.process_prelabel_asset_job(dict(payload))
+                elapsed = time.perf_counter() - started
+                await prelabels.prelabel_contexts.clear()
+                print(
+                    f"  assets/job={chunk:<3} jobs={len(payloads):<5} trainer_requests={requests[0]:<5} "
+                    f"{elapsed / frames * 1000:7.2f}ms/asset  {frames / elapsed:8.1f} assets/s"
+                )
+    server.close()
+    await server.wait_closed()
+
+
+def _png_bytes() -> bytes:
+    import struct
+    import zlib
+
+    def chunk(chunk_type: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", zlib.crc32(chunk_type + payload))
+
+    raw = (b"\x00" + b"\x40\x80\xc0" * 64) * 48
+    ihdr = chunk(b"IHDR", struct.pack(">IIBBBBB", 64, 48, 8, 2, 0, 0, 0))
+    return b"\x89PNG\r\n\x1a\n" + ihdr + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=400)
+    parser.add_argument("--chunks", default="1,4,8,16")
+    parser.add_argument("--boxes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(Path(tmp) / "data")
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        print(f"{args.frames} frames, {args.boxes} matching boxes per frame")
+        chunks = [int(value) for value in args.chunks.split(",") if value.strip()]
+        asyncio.run(_run(args.frames, chunks, args.boxes))
+
+
+if __name__ == "__main__":
+    main()
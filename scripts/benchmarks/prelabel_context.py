@@ -0,0 +1,161 @@
+"""Per-asset prelabel job overhead, model time excluded: rebuilding the session context per job vs caching it.
+
+Usage: python scripts/benchmarks/prelabel_context.py [--frames 500] [--categories 40]
+
+Creates a bbox task with ``--categories`` categories and a webcam session of
+``--frames`` frames against a SQLite database, then runs
+``process_prelabel_asset_job`` for every frame with
+``PRELABEL_CONTEXT_CACHE_SESSIONS=0`` (category query, match maps and adapter
+rebuilt per asset, as before) and with the cache on. Two adapters are timed:
+``inline`` returns fixed detections without I/O, ``http`` is the real
+Florence-2 adapter talking to an in-process HTTP server that answers at once,
+so connection setup is included but inference is not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+_BOXES = [
+    {"label_text": "category 3", "score": 0.9, "bbox": [4.0, 4.0, 20.0, 20.0]},
+    {"label_text": "persons", "score": 0.8, "bbox": [8.0, 8.0, 30.0, 30.0]},
+    {"label_text": "unknown thing", "score": 0.7, "bbox": [1.0, 1.0, 9.0, 9.0]},
+]
+
+
+async def _serve_trainer() -> tuple[asyncio.AbstractServer, str]:
+    """HTTP/1.1 keep-alive server answering every request with ``_BOXES``."""
+    body = json.dumps({"boxes": _BOXES, "device_selected": "cpu"}).encode()
+    response = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, f"http://{host}:{port}"
+
+
+async def _run(frames: int, category_count: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.config import get_settings
+    from sheriff_api.main import app
+    from sheriff_api.services import prelabels
+    from sheriff_api.services.prelabel_adapters import DetectionResult, Florence2PrelabelAdapter
+    from sheriff_api.services.prelabel_context import PrelabelContextCache
+
+    settings = get_settings()
+    settings.frame_dedup_mode = "off"
+    server, trainer_url = await _serve_trainer()
+    settings.trainer_inference_base_url = trainer_url
+
+    class InlineAdapter:
+        name = "inline"
+
+        async def warmup(self) -> None:
+            return None
+
+        async def detect(self, *, asset_storage_uri: str, prompts: list[str], threshold: float, max_detections: int) -> list:
+            return [DetectionResult(label_text=row["label_text"], score=row["score"], bbox_xyxy=tuple(row["bbox"]), raw=row) for row in _BOXES]
+
+    adapters = {"inline": lambda *, model_name, decoding_profile: InlineAdapter(), "http": Florence2PrelabelAdapter}
+    payloads: list[dict] = []
+
+    async def capture(self, payload: dict) -> None:
+        payloads.append(payload)
+
+    prelabels.PrelabelQueue.enqueue_asset_job = capture
+    png = _png_bytes()
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            project = (await client.post("/api/v1/projects", json={"name": "context", "task_type": "bbox"})).json()
+            for index in range(category_count):
+                name = "person" if index == 0 else f"category {index}"
+                await client.post(f"/api/v1/projects/{project['id']}/categories", json={"task_id": project["default_task_id"], "name": name})
+
+            for adapter_name, factory in adapters.items():
+                prelabels.PRELABEL_ADAPTER_REGISTRY["florence2"] = factory
+                for cached in (False, True):
+                    prelabels.prelabel_contexts = PrelabelContextCache(64 if cached else 0)
+                    created = await client.post(
+                        f"/api/v1/projects/{project['id']}/webcam-sessions",
+                        json={
+                            "task_id": project["default_task_id"],
+                            "name": f"{adapter_name}-{cached}",
+                            "fps": 2,
+                            "prelabel_config": {"source_type": "florence2", "frame_sampling": {"mode": "every_n_frames", "value": 1}},
+                        },
+                    )
+                    sequence_id = created.json()["sequence"]["id"]
+                    payloads.clear()
+                    for index in range(frames):
+                        await client.post(
+                            f"/api/v1/projects/{project['id']}/sequences/{sequence_id}/frames",
+                            data={"frame_index": str(index)},
+                            files={"file": (f"frame_{index + 1:06d}.png", png, "image/png")},
+                        )
+                    started = time.perf_counter()
+                    for payload in payloads:
+                        await prelabels.process_prelabel_asset_job(dict(payload))
+                    elapsed = time.perf_counter() - started
+                    await prelabels.prelabel_contexts.clear()
+                    print(
+                        f"  {adapter_name:<6} cache={'on ' if cached else 'off'}  jobs={len(payloads):<5} "
+                        f"{elapsed / max(1, len(payloads)) * 1000:7.2f}ms/asset"
+                    )
+    server.close()
+    await server.wait_closed()
+
+
+def _png_bytes() -> bytes:
+    import struct
+    import zlib
+
+    def chunk(chunk_type: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", zlib.crc32(chunk_type + payload))
+
+    raw = (b"\x00" + b"\x40\x80\xc0" * 64) * 48
+    ihdr = chunk(b"IHDR", struct.pack(">IIBBBBB", 64, 48, 8, 2, 0, 0, 0))
+    return b"\x89PNG\r\n\x1a\n" + ihdr + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--categories", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(Path(tmp) / "data")
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        print(f"{args.frames} frames per session, {args.categories} categories")
+        asyncio.run(_run(args.frames, args.categories))
+
+
+if __name__ == "__main__":
+    main()
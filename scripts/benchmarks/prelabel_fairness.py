@@ -0,0 +1,140 @@
+"""Live-session latency while a bulk prelabel session drains: FIFO list vs per-session lanes.
+
+Usage: python scripts/benchmarks/prelabel_fairness.py [--bulk-jobs 1000] [--live-frames 20] [--job-ms 20] [--frame-interval-ms 100]
+
+A bulk session enqueues ``--bulk-jobs`` sequence frames in one batch, then a
+live session uploads ``--live-frames`` webcam frames every
+``--frame-interval-ms``. The worker pool (prelabel concurrency 4, jobs of one
+session serialized as in production) runs a handler that sleeps ``--job-ms``
+in place of inference. ``fifo`` pushes every job onto the single list
+(``PRELABEL_FAIR_QUEUE=false``); ``lanes`` uses the session lanes and the
+worker's ``LaneDispatcher``. Reported latency runs from a frame's enqueue to
+the end of its job, i.e. when its proposals would exist. Redis is an
+in-process fakeredis TCP server unless ``--redis-url`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import socket
+import sys
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+sys.path.insert(0, str(ROOT / "apps" / "worker" / "src"))
+
+from redis.asyncio import Redis  # noqa: E402
+
+from sheriff_api.services.prelabel_queue import PrelabelQueue  # noqa: E402
+from sheriff_api.services.queue_client import close_queue_clients  # noqa: E402
+from sheriff_worker.main import prelabel_session_key  # noqa: E402
+from sheriff_worker.pool import QueueSpec, WorkerPool  # noqa: E402
+from sheriff_worker.queues.lanes import LaneDispatcher  # noqa: E402
+
+
+def _start_fake_server() -> str:
+    from fakeredis import TcpFakeServer
+
+    class _NoDelayServer(TcpFakeServer):
+        def get_request(self):
+            request, address = super().get_request()
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return request, address
+
+    server = _NoDelayServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/0"
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def _run_mode(label: str, redis_url: str, args: argparse.Namespace) -> None:
+    queue_key = f"bench:prelabel:{label}"
+    redis = Redis.from_url(redis_url, decode_responses=True)
+    await redis.flushdb()
+    queue = PrelabelQueue(redis_url=redis_url, queue_key=queue_key, fair=label == "lanes")
+    live_latency_ms: list[float] = []
+    superseded = 0
+    first_live_at: list[float] = []
+    stop = asyncio.Event()
+    bulk_done = 0
+
+    async def handle(payload_raw: str) -> None:
+        nonlocal bulk_done
+        payload = json.loads(payload_raw)
+        await asyncio.sleep(args.job_ms / 1000.0)
+        if payload["lane"] == "live":
+            live_latency_ms.append((time.time() - payload["enqueued_at"]) * 1000.0)
+            if not first_live_at:
+                first_live_at.append(time.perf_counter())
+        else:
+            bulk_done += 1
+        if len(live_latency_ms) + superseded >= args.live_frames:
+            stop.set()
+
+    async def on_superseded(_session_id: str, payloads: list[str]) -> None:
+        nonlocal superseded
+        superseded += len(payloads)
+
+    pool = WorkerPool(
+        redis,
+        [QueueSpec(name="prelabel", key=queue_key, concurrency=4, handler=handle, partition_key=prelabel_session_key)],
+        poll_timeout_seconds=0.2,
+    )
+    dispatcher = None
+    if label == "lanes":
+        dispatcher = asyncio.create_task(
+            LaneDispatcher(redis, queue_key, target_depth=8, on_superseded=on_superseded).run()
+        )
+    bulk = [
+        {"job_type": "prelabel_asset", "session_id": "bulk", "asset_id": f"b-{index}", "lane": "bulk", "enqueued_at": time.time()}
+        for index in range(args.bulk_jobs)
+    ]
+    await queue.enqueue_asset_jobs(bulk)
+    runner = asyncio.create_task(pool.run(stop))
+    started = time.perf_counter()
+    for index in range(args.live_frames):
+        await queue.enqueue_asset_job(
+            {"job_type": "prelabel_asset", "session_id": "cam", "asset_id": f"f-{index}", "lane": "live", "enqueued_at": time.time()}
+        )
+        await asyncio.sleep(args.frame_interval_ms / 1000.0)
+    await runner
+    first_ms = (first_live_at[0] - started) * 1000.0
+    if dispatcher is not None:
+        dispatcher.cancel()
+        await asyncio.gather(dispatcher, return_exceptions=True)
+    print(
+        f"{label:>6}  first_live_proposal={first_ms:8.1f}ms  live_p50={_percentile(live_latency_ms, 0.5):8.1f}ms  "
+        f"live_p99={_percentile(live_latency_ms, 0.99):8.1f}ms  live_done={len(live_latency_ms)}  "
+        f"superseded={superseded}  bulk_done_meanwhile={bulk_done}"
+    )
+    await redis.flushdb()
+    await redis.aclose()
+    await close_queue_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulk-jobs", type=int, default=1000)
+    parser.add_argument("--live-frames", type=int, default=20)
+    parser.add_argument("--job-ms", type=float, default=20.0)
+    parser.add_argument("--frame-interval-ms", type=float, default=100.0)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    redis_url = args.redis_url or _start_fake_server()
+    print(f"bulk_jobs={args.bulk_jobs} live_frames={args.live_frames} job_ms={args.job_ms} redis={redis_url}")
+    for label in ("fifo", "lanes"):
+        asyncio.run(_run_mode(label, redis_url, args))
+
+
+if __name__ == "__main__":
+    main()
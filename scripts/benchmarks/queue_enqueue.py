@@ -0,0 +1,93 @@
+"""Prelabel enqueue cost: connection per job vs the pooled client vs ``enqueue_many``.
+
+Usage: python scripts/benchmarks/queue_enqueue.py [--jobs 10000] [--redis-url redis://localhost:6379/0]
+
+Without ``--redis-url`` a fakeredis ``TcpFakeServer`` runs in a background
+thread, so every mode pays a real TCP round trip. ``connect-per-job`` is the
+previous ``Redis.from_url`` + ``RPUSH`` + ``aclose`` per job; ``pooled`` reuses
+the shared ``QueueClient`` one job at a time; ``enqueue_many`` sends all jobs
+in one pipelined batch of multi-value ``RPUSH`` commands.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+from redis.asyncio import Redis  # noqa: E402
+
+from sheriff_api.services.prelabel_queue import PrelabelQueue  # noqa: E402
+from sheriff_api.services.queue_client import close_queue_clients, encode_job, queue_metrics_snapshot  # noqa: E402
+
+QUEUE_KEY = "bench:prelabel_jobs"
+
+
+def _start_fake_server() -> str:
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/0"
+
+
+def _payloads(jobs: int) -> list[dict]:
+    return [{"job_version": "1", "job_type": "prelabel_asset", "session_id": "bench-session", "asset_id": f"asset-{index}"} for index in range(jobs)]
+
+
+async def _connect_per_job(redis_url: str, payloads: list[dict]) -> None:
+    for payload in payloads:
+        redis = Redis.from_url(redis_url, decode_responses=True)
+        try:
+            await redis.rpush(QUEUE_KEY, encode_job(payload))
+        finally:
+            await redis.aclose()
+
+
+async def _pooled(queue: PrelabelQueue, payloads: list[dict]) -> None:
+    for payload in payloads:
+        await queue.enqueue_asset_job(payload)
+
+
+async def _run(redis_url: str, jobs: int) -> None:
+    payloads = _payloads(jobs)
+    queue = PrelabelQueue(redis_url=redis_url, queue_key=QUEUE_KEY)
+    modes = (
+        ("connect-per-job", lambda: _connect_per_job(redis_url, payloads)),
+        ("pooled", lambda: _pooled(queue, payloads)),
+        ("enqueue_many", lambda: queue.enqueue_asset_jobs(payloads)),
+    )
+    cleaner = Redis.from_url(redis_url)
+    for label, action in modes:
+        await cleaner.delete(QUEUE_KEY)
+        started = time.perf_counter()
+        await action()
+        elapsed = time.perf_counter() - started
+        depth = await cleaner.llen(QUEUE_KEY)
+        print(f"{label:>16}  total={elapsed * 1000.0:9.1f}ms  per_job={elapsed * 1e6 / jobs:8.1f}us  depth={depth}")
+    await cleaner.delete(QUEUE_KEY)
+    await cleaner.aclose()
+    metrics = queue_metrics_snapshot()[QUEUE_KEY]
+    print(f"metrics: enqueued={metrics['enqueued']} round_trips={metrics['round_trips']} p50={metrics['latency_ms_p50']}ms p99={metrics['latency_ms_p99']}ms")
+    await close_queue_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    redis_url = args.redis_url or _start_fake_server()
+    print(f"jobs={args.jobs} redis={redis_url}")
+    asyncio.run(_run(redis_url, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
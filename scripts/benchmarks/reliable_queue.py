@@ -0,0 +1,106 @@
+"""Consumer throughput: plain ``BLPOP`` vs ``ReliableQueue`` reserve/ack.
+
+Usage: python scripts/benchmarks/reliable_queue.py [--jobs 5000] [--redis-url redis://localhost:6379/0]
+
+Without ``--redis-url`` a fakeredis ``TcpFakeServer`` (with ``TCP_NODELAY``,
+as real Redis sets it) runs in a background thread, so every command pays a
+real TCP round trip. Handlers are no-ops, so
+the numbers are pure queue overhead per job. ``blpop`` is the previous
+consumer loop. ``reserve+ack`` is ``BLMOVE`` into the processing list plus
+the lease/attempt pipeline, then the ``LREM`` + cleanup ack. ``process`` also
+starts and cancels the lease-heartbeat task for every job, as the worker pool
+and trainer do.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import socket
+import sys
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "worker" / "src"))
+
+from redis.asyncio import Redis  # noqa: E402
+
+from sheriff_worker.queues.reliable import ReliableQueue  # noqa: E402
+
+QUEUE_KEY = "bench:reliable_jobs"
+
+
+def _start_fake_server() -> str:
+    from fakeredis import TcpFakeServer
+
+    class _NoDelayServer(TcpFakeServer):
+        # Redis sets TCP_NODELAY; without it every pipelined reply waits out a ~40ms delayed ACK.
+        def get_request(self):
+            request, address = super().get_request()
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return request, address
+
+    server = _NoDelayServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/0"
+
+
+async def _noop(_payload_raw: str) -> None:
+    return None
+
+
+async def _blpop(redis: Redis, _queue: ReliableQueue, jobs: int) -> None:
+    for _ in range(jobs):
+        _key, payload_raw = await redis.blpop(QUEUE_KEY, timeout=1)
+        await _noop(payload_raw)
+
+
+async def _reserve_ack(_redis: Redis, queue: ReliableQueue, jobs: int) -> None:
+    for _ in range(jobs):
+        reservation = await queue.reserve(timeout=1)
+        await _noop(reservation.payload_raw)
+        await queue.ack(reservation)
+
+
+async def _process(_redis: Redis, queue: ReliableQueue, jobs: int) -> None:
+    for _ in range(jobs):
+        reservation = await queue.reserve(timeout=1)
+        await queue.process(reservation, _noop)
+
+
+async def _run(redis_url: str, jobs: int) -> None:
+    redis = Redis.from_url(redis_url, decode_responses=True)
+    queue = ReliableQueue(redis, QUEUE_KEY)
+    keys = [QUEUE_KEY, queue.processing_key, queue.leases_key, queue.attempts_key, queue.delayed_key, queue.dead_key]
+    baseline = None
+    for label, consume in (("blpop", _blpop), ("reserve+ack", _reserve_ack), ("process", _process)):
+        await redis.delete(*keys)
+        await redis.rpush(QUEUE_KEY, *[f'{{"job_type":"bench","index":{index}}}' for index in range(jobs)])
+        started = time.perf_counter()
+        await consume(redis, queue, jobs)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        stats = await queue.stats()
+        print(
+            f"{label:>12}  total={elapsed * 1000.0:9.1f}ms  jobs/s={jobs / elapsed:8.0f}  "
+            f"per_job={elapsed * 1e6 / jobs:7.1f}us  x{elapsed / baseline:4.2f}  left={stats}"
+        )
+    await redis.delete(*keys)
+    await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    redis_url = args.redis_url or _start_fake_server()
+    print(f"jobs={args.jobs} redis={redis_url}")
+    asyncio.run(_run(redis_url, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
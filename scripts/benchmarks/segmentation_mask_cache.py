@@ -0,0 +1,105 @@
+"""Segmentation data-loading epoch time with and without the mask cache (CPU).
+
+Usage: python scripts/benchmarks/segmentation_mask_cache.py [--images 256] [--polygons 40] [--vertices 200] [--size 512] [--epochs 3]
+
+Builds a synthetic COCO export of ``--images`` 640x480 JPEGs, each with
+``--polygons`` polygons of ``--vertices`` points, and iterates the training
+loader for ``--epochs`` epochs. ``baseline`` rasterizes every mask on every
+``__getitem__`` with ``num_workers=0`` (the previous loader); ``cached`` fills
+the mask cache during epoch 1 and reads PNGs afterwards; ``cached+workers``
+also uses the default worker count. Model compute is excluded so the numbers
+isolate the input pipeline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import math
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "trainer" / "src"))
+
+from PIL import Image  # noqa: E402
+
+from pixel_sheriff_trainer.segmentation.dataset import build_segmentation_loaders  # noqa: E402
+
+
+def _polygon(rng: random.Random, vertices: int) -> list[float]:
+    cx, cy, radius = rng.uniform(60, 580), rng.uniform(60, 420), rng.uniform(20, 60)
+    points: list[float] = []
+    for index in range(vertices):
+        angle = 2 * math.pi * index / vertices
+        wobble = radius * (0.6 + 0.4 * rng.random())
+        points.extend([cx + wobble * math.cos(angle), cy + wobble * math.sin(angle)])
+    return points
+
+
+def _write_export(path: Path, images: int, polygons: int, vertices: int) -> None:
+    rng = random.Random(7)
+    coco: dict = {"images": [], "annotations": [], "categories": [{"id": index + 1, "name": f"c{index}"} for index in range(5)]}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as bundle:
+        for image_index in range(images):
+            buffer = io.BytesIO()
+            Image.new("RGB", (640, 480), (rng.randrange(256), 90, 120)).save(buffer, format="JPEG", quality=85)
+            file_name = f"images/img-{image_index:05d}.jpg"
+            bundle.writestr(file_name, buffer.getvalue())
+            coco["images"].append({"id": image_index + 1, "asset_id": f"asset-{image_index}", "file_name": file_name, "width": 640, "height": 480})
+            for _ in range(polygons):
+                coco["annotations"].append(
+                    {
+                        "id": len(coco["annotations"]) + 1,
+                        "image_id": image_index + 1,
+                        "category_id": rng.randint(1, 5),
+                        "segmentation": [_polygon(rng, vertices)],
+                    }
+                )
+        bundle.writestr("coco_instances.json", json.dumps(coco))
+
+
+def _run(label: str, export: Path, tmp: Path, runtime: dict, size: int, epochs: int) -> None:
+    loaded = build_segmentation_loaders(
+        export_zip_path=export,
+        workdir=tmp / label,
+        model_config={"input": {"input_size": [size, size]}},
+        training_config={"batch_size": 8, "runtime": runtime},
+        mask_cache_dir=tmp / "mask_cache",
+    )
+    timings = []
+    for _ in range(epochs):
+        started = time.perf_counter()
+        for _images, _masks in loaded.train_loader:
+            pass
+        timings.append(time.perf_counter() - started)
+    epochs_text = "  ".join(f"epoch{index + 1}={seconds:6.2f}s" for index, seconds in enumerate(timings))
+    print(f"{label:>15}  workers={loaded.train_loader.num_workers}  {epochs_text}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=256)
+    parser.add_argument("--polygons", type=int, default=40)
+    parser.add_argument("--vertices", type=int, default=200)
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as raw_tmp:
+        tmp = Path(raw_tmp)
+        export = tmp / "export.zip"
+        _write_export(export, args.images, args.polygons, args.vertices)
+        print(f"images={args.images} polygons={args.polygons} vertices={args.vertices} size={args.size}")
+        _run("baseline", export, tmp, {"num_workers": 0, "cache_masks": False}, args.size, args.epochs)
+        _run("cached", export, tmp, {"num_workers": 0}, args.size, args.epochs)
+        _run("cached+workers", export, tmp, {}, args.size, args.epochs)
+
+
+if __name__ == "__main__":
+    main()
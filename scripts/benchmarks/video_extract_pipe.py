@@ -0,0 +1,153 @@
+"""Disk bytes written and wall time per 1000 frames: temp-file vs stdout-pipe frame extraction.
+
+Usage: python scripts/benchmarks/video_extract_pipe.py [--minutes 10] [--fps 2] [--max-frames 1200] [--formats jpeg,png]
+
+Generates a synthetic ``--minutes`` long 1280x720 H.264 video with ffmpeg's
+``testsrc`` source (needs ffmpeg and ffprobe on PATH) and runs
+``extract_video_sequence_job`` against a SQLite database for every
+``VIDEO_EXTRACT_MODE`` (``files``, ``pipe``) and frame format. Disk bytes are
+the frame files ffmpeg left in its temp directories (``files`` only) plus what
+landed in the run's storage blob store; both are scaled to 1000 frames.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _generate_video(target: Path, minutes: float) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=duration={minutes * 60:g}:size=1280x720:rate=30",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            "60",
+            "-pix_fmt",
+            "yuv420p",
+            str(target),
+        ],
+        check=True,
+    )
+
+
+def _tree_bytes(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file()) if root.exists() else 0
+
+
+async def _run(storage_root: Path, video: Path, *, fps: float, max_frames: int, frame_formats: list[str]) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.config import get_settings
+    from sheriff_api.db.models import AssetSequence
+    from sheriff_api.db.session import SessionLocal
+    from sheriff_api.main import app
+    from sheriff_api.services import video_frames
+    from sheriff_api.services.storage import LocalStorage
+
+    settings = get_settings()
+    temp_bytes = [0]
+    run_command = video_frames._run_command
+
+    def _measured_run_command(args: list[str]) -> subprocess.CompletedProcess[str]:
+        # In files mode ffmpeg's frames stay in the segment directory until the job is done.
+        result = run_command(args)
+        if args[0] == "ffmpeg":
+            temp_bytes[0] += _tree_bytes(Path(args[-1]).parent)
+        return result
+
+    video_frames._run_command = _measured_run_command
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            project_id = (await client.post("/api/v1/projects", json={"name": "extract"})).json()["id"]
+
+        for frame_format in frame_formats:
+            for mode in ("files", "pipe"):
+                settings.video_extract_mode = mode
+                # A storage root per run, so frames identical to an earlier run's are not deduplicated away.
+                run_root = storage_root / f"{frame_format}-{mode}"
+                storage = LocalStorage(str(run_root))
+                async with SessionLocal() as db:
+                    sequence = AssetSequence(project_id=project_id, name=f"{mode}-{frame_format}", source_type="video_file")
+                    db.add(sequence)
+                    await db.commit()
+                video_uri = f"videos/{project_id}/{sequence.id}{video.suffix}"
+                target = storage.resolve(video_uri)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(video, target)
+
+                temp_bytes[0] = 0
+                started = time.perf_counter()
+                result = await video_frames.extract_video_sequence_job(
+                    {
+                        "project_id": project_id,
+                        "sequence_id": sequence.id,
+                        "video_storage_uri": video_uri,
+                        "fps": fps,
+                        "max_frames": max_frames,
+                        "frame_format": frame_format,
+                    },
+                    storage=storage,
+                )
+                elapsed = time.perf_counter() - started
+                stored = _tree_bytes(run_root / "objects")
+                per_1000 = 1000 / max(1, result["frame_count"])
+                print(
+                    f"  {frame_format:<5} {mode:<6} frames={result['frame_count']:<5} "
+                    f"{elapsed * per_1000:7.2f}s/1000  temp={temp_bytes[0] * per_1000 / 2**20:8.1f}MiB/1000  "
+                    f"stored={stored * per_1000 / 2**20:8.1f}MiB/1000  "
+                    f"written={(temp_bytes[0] + stored) * per_1000 / 2**20:8.1f}MiB/1000"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=2.0)
+    parser.add_argument("--max-frames", type=int, default=1200)
+    parser.add_argument("--formats", default="jpeg,png")
+    args = parser.parse_args()
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        sys.exit("ffmpeg and ffprobe must be on PATH")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_root = Path(tmp) / "data"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(storage_root)
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        video = Path(tmp) / "testsrc.mp4"
+        _generate_video(video, args.minutes)
+        print(f"{args.minutes:g} min testsrc video at {args.fps:g} fps, at most {args.max_frames} frames, cpus={os.cpu_count()}")
+        asyncio.run(
+            _run(
+                storage_root,
+                video,
+                fps=args.fps,
+                max_frames=args.max_frames,
+                frame_formats=[value.strip() for value in args.formats.split(",") if value.strip()],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Wall time of video frame extraction with one ffmpeg pass vs concurrent segments.
+
+Usage: python scripts/benchmarks/video_extract_segments.py [--minutes 10] [--fps 2] [--max-frames 1200] [--segments 1,2,4,8]
+
+Generates a synthetic ``--minutes`` long 1280x720 H.264 video with ffmpeg's
+``testsrc`` source (needs ffmpeg and ffprobe on PATH), then runs
+``extract_video_sequence_job`` against a SQLite database once per segment
+count. Reports the wall time, the time until the first frames were committed
+(what a client polling ``processed_frames`` waits before seeing progress) and
+the extracted frame count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _generate_video(target: Path, minutes: float) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=duration={minutes * 60:g}:size=1280x720:rate=30",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            "60",
+            "-pix_fmt",
+            "yuv420p",
+            str(target),
+        ],
+        check=True,
+    )
+
+
+async def _run(storage_root: Path, video: Path, *, fps: float, max_frames: int, segment_counts: list[int]) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.config import get_settings
+    from sheriff_api.db.models import AssetSequence
+    from sheriff_api.db.session import SessionLocal
+    from sheriff_api.main import app
+    from sheriff_api.services.storage import LocalStorage
+    from sheriff_api.services.video_frames import extract_video_sequence_job
+
+    settings = get_settings()
+    storage = LocalStorage(str(storage_root))
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            project_id = (await client.post("/api/v1/projects", json={"name": "extract"})).json()["id"]
+
+        for segments in segment_counts:
+            settings.video_extract_segments = segments
+            async with SessionLocal() as db:
+                sequence = AssetSequence(project_id=project_id, name=f"segments-{segments}", source_type="video_file")
+                db.add(sequence)
+                await db.commit()
+            video_uri = f"videos/{project_id}/{sequence.id}{video.suffix}"
+            target = storage.resolve(video_uri)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(video, target)
+
+            first_progress: list[float] = []
+
+            async def _watch_progress(started: float, sequence_id: str = sequence.id) -> None:
+                while not first_progress:
+                    async with SessionLocal() as db:
+                        current = await db.get(AssetSequence, sequence_id)
+                        if current is not None and int(current.processed_frames or 0) > 0:
+                            first_progress.append(time.perf_counter() - started)
+                            return
+                    await asyncio.sleep(0.05)
+
+            started = time.perf_counter()
+            watcher = asyncio.create_task(_watch_progress(started))
+            result = await extract_video_sequence_job(
+                {
+                    "project_id": project_id,
+                    "sequence_id": sequence.id,
+                    "video_storage_uri": video_uri,
+                    "fps": fps,
+                    "max_frames": max_frames,
+                },
+                storage=storage,
+            )
+            elapsed = time.perf_counter() - started
+            watcher.cancel()
+            first = f"{first_progress[0]:6.2f}s" if first_progress else "     -"
+            print(f"  segments={segments:<3} {elapsed:7.2f}s  first_commit={first}  frames={result['frame_count']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=2.0)
+    parser.add_argument("--max-frames", type=int, default=1200)
+    parser.add_argument("--segments", default="1,2,4,8")
+    args = parser.parse_args()
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        sys.exit("ffmpeg and ffprobe must be on PATH")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_root = Path(tmp) / "data"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(storage_root)
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        video = Path(tmp) / "testsrc.mp4"
+        started = time.perf_counter()
+        _generate_video(video, args.minutes)
+        print(f"generated {args.minutes:g} min testsrc video ({video.stat().st_size / 2**20:.1f} MiB) in {time.perf_counter() - started:.1f}s")
+        print(f"extracting at {args.fps:g} fps, at most {args.max_frames} frames, cpus={os.cpu_count()}")
+        asyncio.run(
+            _run(
+                storage_root,
+                video,
+                fps=args.fps,
+                max_frames=args.max_frames,
+                segment_counts=[int(value) for value in args.segments.split(",") if value.strip()],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
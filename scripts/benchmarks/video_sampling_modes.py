@@ -0,0 +1,133 @@
+"""Decode time of sparse video imports per sampling mode (fps, seek, keyframes, scene).
+
+Usage: python scripts/benchmarks/video_sampling_modes.py [--minutes 60] [--fps 0.2] [--gop 250] [--modes fps,seek,keyframes,scene]
+
+Generates a synthetic ``--minutes`` long 1280x720 H.264 video with ffmpeg's
+``testsrc`` source (needs ffmpeg and ffprobe on PATH; ``--gop`` frames per
+keyframe) and imports it once per ``sampling_mode`` at ``--fps`` frames per
+second. Reports the wall time (probe plus extraction), the frames kept and the
+time saved against ``fps``, which decodes every frame of the video.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "api" / "src"))
+
+
+def _generate_video(target: Path, minutes: float, gop: int) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=duration={minutes * 60:g}:size=1280x720:rate=30",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            str(gop),
+            "-pix_fmt",
+            "yuv420p",
+            str(target),
+        ],
+        check=True,
+    )
+
+
+async def _run(storage_root: Path, video: Path, *, fps: float, modes: list[str]) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from sheriff_api.db.models import AssetSequence
+    from sheriff_api.db.session import SessionLocal
+    from sheriff_api.main import app
+    from sheriff_api.services.storage import LocalStorage
+    from sheriff_api.services.video_frames import MAX_IMPORT_FRAMES, extract_video_sequence_job
+
+    storage = LocalStorage(str(storage_root))
+    baseline: float | None = None
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            project_id = (await client.post("/api/v1/projects", json={"name": "sampling"})).json()["id"]
+
+        for mode in modes:
+            async with SessionLocal() as db:
+                sequence = AssetSequence(project_id=project_id, name=mode, source_type="video_file")
+                db.add(sequence)
+                await db.commit()
+            video_uri = f"videos/{project_id}/{sequence.id}{video.suffix}"
+            target = storage.resolve(video_uri)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(video, target)
+
+            started = time.perf_counter()
+            result = await extract_video_sequence_job(
+                {
+                    "project_id": project_id,
+                    "sequence_id": sequence.id,
+                    "video_storage_uri": video_uri,
+                    "fps": fps,
+                    "max_frames": MAX_IMPORT_FRAMES,
+                    "sampling_mode": mode,
+                },
+                storage=storage,
+            )
+            elapsed = time.perf_counter() - started
+            if mode == "fps":
+                baseline = elapsed
+            saved = f"{(1 - elapsed / baseline) * 100:5.1f}%" if baseline else "    -"
+            print(
+                f"  {mode:<9} {elapsed:8.2f}s  frames={result['frame_count']:<5} "
+                f"{elapsed / max(1, result['frame_count']) * 1000:7.1f}ms/frame  saved_vs_fps={saved}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--fps", type=float, default=0.2)
+    parser.add_argument("--gop", type=int, default=250)
+    parser.add_argument("--modes", default="fps,seek,keyframes,scene")
+    args = parser.parse_args()
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        sys.exit("ffmpeg and ffprobe must be on PATH")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_root = Path(tmp) / "data"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["STORAGE_ROOT"] = str(storage_root)
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        video = Path(tmp) / "testsrc.mp4"
+        started = time.perf_counter()
+        _generate_video(video, args.minutes, args.gop)
+        print(
+            f"generated {args.minutes:g} min testsrc video, keyframe every {args.gop} frames, "
+            f"in {time.perf_counter() - started:.1f}s; sampling at {args.fps:g} fps, cpus={os.cpu_count()}"
+        )
+        asyncio.run(
+            _run(
+                storage_root,
+                video,
+                fps=args.fps,
+                modes=[value.strip() for value in args.modes.split(",") if value.strip()],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
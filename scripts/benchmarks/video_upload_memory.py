@@ -0,0 +1,139 @@
+"""API memory and throughput while receiving large video imports.
+
+Usage: python scripts/benchmarks/video_upload_memory.py [--sizes-mib 64,256,1024] [--chunk-mib 8] [--mode both]
+
+Starts the API under uvicorn in a subprocess (SQLite, temporary storage root)
+and uploads a sparse file of each size. ``resumable`` announces the file on
+``/video-uploads`` and streams it in ``--chunk-mib`` PATCH requests; ``multipart``
+posts it to ``/video-imports`` in one request. The media queue is not
+reachable, so the multipart import ends in 503 after the file was received,
+and resumable uploads are not finalized. Reports the upload rate and the API
+process's peak RSS (VmHWM) after each upload; the process is restarted per
+run so peaks do not carry over.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _peak_rss_mib(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024.0
+    return float("nan")
+
+
+def _start_api(tmp: Path) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT / "apps" / "api" / "src"),
+        "DATABASE_URL": f"sqlite+aiosqlite:///{tmp / 'bench.db'}",
+        "STORAGE_ROOT": str(tmp / "data"),
+        "REDIS_URL": "redis://127.0.0.1:1/0",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "sheriff_api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+    for _ in range(200):
+        try:
+            httpx.get(f"{base_url}/health", timeout=0.5)
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("API did not start")
+
+
+def _read_chunks(path: Path, start: int, length: int, chunk_bytes: int = 1024 * 1024):
+    with path.open("rb") as source:
+        source.seek(start)
+        remaining = length
+        while remaining > 0 and (chunk := source.read(min(chunk_bytes, remaining))):
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _upload_resumable(client: httpx.Client, project_id: str, video: Path, chunk_bytes: int) -> None:
+    size = video.stat().st_size
+    created = client.post(f"/projects/{project_id}/video-uploads", json={"filename": "bench.mp4", "length": size})
+    created.raise_for_status()
+    upload_id = created.json()["id"]
+    offset = 0
+    while offset < size:
+        length = min(chunk_bytes, size - offset)
+        response = client.patch(
+            f"/projects/{project_id}/video-uploads/{upload_id}",
+            content=_read_chunks(video, offset, length),
+            headers={"Upload-Offset": str(offset), "Content-Type": "application/offset+octet-stream"},
+        )
+        response.raise_for_status()
+        offset = response.json()["offset"]
+
+
+def _upload_multipart(client: httpx.Client, project_id: str, video: Path) -> None:
+    with video.open("rb") as source:
+        response = client.post(f"/projects/{project_id}/video-imports", files={"file": ("bench.mp4", source, "video/mp4")})
+    if response.status_code not in {200, 503}:
+        response.raise_for_status()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mib", default="64,256,1024")
+    parser.add_argument("--chunk-mib", type=int, default=8)
+    parser.add_argument("--mode", choices=["resumable", "multipart", "both"], default="both")
+    args = parser.parse_args()
+    modes = ["resumable", "multipart"] if args.mode == "both" else [args.mode]
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        for size_mib in (int(value) for value in args.sizes_mib.split(",")):
+            video = tmp / f"video-{size_mib}.bin"
+            with video.open("wb") as handle:
+                handle.truncate(size_mib * 1024 * 1024)
+            for mode in modes:
+                process, base_url = _start_api(tmp)
+                try:
+                    with httpx.Client(base_url=base_url, timeout=None) as client:
+                        project_id = client.post("/projects", json={"name": f"{mode}-{size_mib}"}).json()["id"]
+                        baseline = _peak_rss_mib(process.pid)
+                        started = time.perf_counter()
+                        if mode == "resumable":
+                            _upload_resumable(client, project_id, video, args.chunk_mib * 1024 * 1024)
+                        else:
+                            _upload_multipart(client, project_id, video)
+                        elapsed = time.perf_counter() - started
+                        peak = _peak_rss_mib(process.pid)
+                    print(
+                        f"  {mode:<9} {size_mib:6d}MiB  {size_mib / elapsed:8.1f}MiB/s  "
+                        f"peak_rss={peak:8.1f}MiB  (+{peak - baseline:.1f}MiB over idle)"
+                    )
+                finally:
+                    process.terminate()
+                    process.wait()
+            video.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Worker pool throughput against an in-process Redis stand-in.
+
+Usage: python scripts/benchmarks/worker_pool_throughput.py [--jobs 400] [--job-ms 20]
+
+Each job simulates an I/O-bound prelabel call (an inference HTTP round trip)
+with asyncio.sleep, so jobs/sec should scale close to linearly with the
+prelabel concurrency until the dispatcher becomes the bottleneck.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "apps" / "worker" / "src"))
+sys.path.insert(0, str(ROOT / "apps" / "worker" / "tests"))
+
+from in_memory_redis import InMemoryRedis  # noqa: E402
+from sheriff_worker.pool import QueueSpec, WorkerPool  # noqa: E402
+
+
+async def _measure(concurrency: int, *, jobs: int, job_seconds: float, sessions: int) -> float:
+    redis = InMemoryRedis()
+    stop = asyncio.Event()
+    done = 0
+
+    async def handle(_payload: str) -> None:
+        nonlocal done
+        await asyncio.sleep(job_seconds)
+        done += 1
+        if done >= jobs:
+            stop.set()
+
+    def session_key(payload_raw: str) -> str:
+        return str(json.loads(payload_raw)["session_id"])
+
+    pool = WorkerPool(
+        redis,
+        [QueueSpec(name="prelabel", key="prelabel", concurrency=concurrency, handler=handle, partition_key=session_key)],
+        poll_timeout_seconds=0.05,
+    )
+    await redis.rpush("prelabel", *[json.dumps({"session_id": f"s{index % sessions}"}) for index in range(jobs)])
+    started = time.perf_counter()
+    await pool.run(stop)
+    return jobs / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--job-ms", type=float, default=20.0)
+    parser.add_argument("--sessions", type=int, default=16, help="distinct prelabel sessions in the backlog")
+    args = parser.parse_args()
+
+    print(f"jobs={args.jobs} job_ms={args.job_ms} sessions={args.sessions}")
+    baseline = None
+    for concurrency in (1, 2, 4, 8, 16):
+        rate = asyncio.run(_measure(concurrency, jobs=args.jobs, job_seconds=args.job_ms / 1000.0, sessions=args.sessions))
+        baseline = baseline or rate
+        print(f"concurrency={concurrency:>2}  {rate:8.1f} jobs/s  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()